@@ -0,0 +1,154 @@
+"""Benchmark bot decision latency.
+
+Asks for ``--moves`` bot moves on random games (``--players`` players with
+``--avatars`` avatars each on a ``--size`` grid), ``--concurrency`` at a
+time, through a BotService with ``--workers`` worker processes, for the
+greedy policy and for MCTS with each of ``--budgets``. Reports the p50,
+p95, p99 and worst latency of a move as seen by the event loop, moves per
+second, the longest the event loop was held up meanwhile, and the size of
+a pickled game state. For contrast, the same moves are also computed on
+the event loop itself.
+
+Usage:
+    uv run python -m scripts.bench_bots [--moves 200] [--concurrency 8]
+        [--workers 4] [--budgets 0.05 0.2] [--players 2] [--avatars 3]
+        [--size 20]
+"""
+
+import argparse
+import asyncio
+import logging
+import pickle
+import random
+import statistics
+import time
+
+import structlog
+
+from pygridfight.services.bot_policies import (
+    BotPolicy,
+    BotState,
+    GreedyPolicy,
+    MCTSPolicy,
+    decide,
+)
+from pygridfight.services.bot_service import BotService
+
+
+def random_state(rng: random.Random, players: int, avatars: int, size: int):
+    cells = rng.sample(
+        [(x, y) for x in range(size) for y in range(size)], players * avatars
+    )
+    return BotState(
+        size,
+        size,
+        0,
+        tuple(rng.randrange(5) for _ in range(players)),
+        tuple(
+            (index % players, x, y, rng.randint(1, 3))
+            for index, (x, y) in enumerate(cells)
+        ),
+    )
+
+
+async def probe(stalls: list[float]) -> None:
+    """Record the longest gap between wake-ups of a 1 ms sleeper."""
+    last = time.perf_counter()
+    while True:
+        await asyncio.sleep(0.001)
+        now = time.perf_counter()
+        stalls[0] = max(stalls[0], now - last)
+        last = now
+
+
+async def in_pool(
+    bots: BotService, policy: BotPolicy, budget: float, states, concurrency: int
+) -> list[float]:
+    pending = iter(states)
+    latencies = []
+
+    async def worker() -> None:
+        for state in pending:
+            start = time.perf_counter()
+            await bots.decide(state, policy, budget)
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+async def on_loop(policy: BotPolicy, budget: float, states) -> list[float]:
+    latencies = []
+    for state in states:
+        start = time.perf_counter()
+        decide(policy, state, budget)
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0)
+    return latencies
+
+
+async def measure(run) -> tuple[list[float], float, float]:
+    stalls = [0.0]
+    prober = asyncio.create_task(probe(stalls))
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    latencies = await run
+    elapsed = time.perf_counter() - start
+    prober.cancel()
+    return latencies, elapsed, stalls[0]
+
+
+def report(name: str, latencies: list[float], elapsed: float, stall: float) -> None:
+    cuts = statistics.quantiles(latencies, n=100)
+    print(
+        f"{name:<24}{cuts[49] * 1000:>8.1f}{cuts[94] * 1000:>8.1f}"
+        f"{cuts[98] * 1000:>8.1f}{max(latencies) * 1000:>8.1f}"
+        f"{len(latencies) / elapsed:>9.1f}{stall * 1000:>10.1f}"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    rng = random.Random(0)
+    states = [
+        random_state(rng, args.players, args.avatars, args.size)
+        for _ in range(args.moves)
+    ]
+    size = statistics.mean(len(pickle.dumps(state)) for state in states)
+    print(
+        f"{args.moves} moves, {args.players} players x {args.avatars} avatars on "
+        f"{args.size}x{args.size}, {args.workers} workers, "
+        f"{args.concurrency} in flight, pickled state {size:.0f} B"
+    )
+    print(
+        f"{'mode':<24}{'p50 ms':>8}{'p95 ms':>8}{'p99 ms':>8}{'max ms':>8}"
+        f"{'moves/s':>9}{'stall ms':>10}"
+    )
+    configs = [(GreedyPolicy(), 0.0)] + [(MCTSPolicy(), b) for b in args.budgets]
+    bots = BotService(workers=args.workers, grace=60.0)
+    try:
+        await bots.start()
+        for policy, budget in configs:
+            name = f"{policy.name} {budget * 1000:g} ms" if budget else policy.name
+            run = in_pool(bots, policy, budget or 0.001, states, args.concurrency)
+            report(f"pool  {name}", *await measure(run))
+            loop_states = states[: max(2, args.moves // args.concurrency)]
+            run = on_loop(policy, budget or 0.001, loop_states)
+            report(f"loop  {name}", *await measure(run))
+    finally:
+        bots.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--moves", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--budgets", type=float, nargs="+", default=[0.05, 0.2])
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--avatars", type=int, default=3)
+    parser.add_argument("--size", type=int, default=20)
+    args = parser.parse_args()
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+    asyncio.run(main(args))
@@ -0,0 +1,124 @@
+"""Benchmark game broadcast latency against recipient count.
+
+Compares the former sequential broadcast (json.dumps per recipient, one
+send awaited at a time) with ConnectionManager.broadcast_to_game (encode
+once, queue per connection, one writer task per socket). Latency is measured
+until every recipient has received the message. Sockets are in-memory fakes
+whose send takes ``--send-ms`` to simulate network writes; the last scenario
+adds one client that never drains.
+
+Usage:
+    uv run python -m scripts.bench_broadcast [--send-ms 1] [--rounds 5]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+
+import structlog
+
+from pygridfight.api.websocket import ConnectionManager
+
+RECIPIENTS = (1, 8, 50, 200, 500)
+
+
+class FakeWebSocket:
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    async def accept(self, subprotocol: str | None = None):
+        pass
+
+    async def send_text(self, text: str):
+        await asyncio.sleep(self.delay)
+
+    async def close(self, code: int = 1000, reason: str | None = None):
+        pass
+
+
+async def legacy_broadcast(manager: ConnectionManager, message: dict, game_id: str):
+    # The implementation broadcast_to_game replaced, kept as the baseline.
+    for player_id in manager.registry.players_in(game_id):
+        websocket = manager.registry.get(player_id).websocket
+        await websocket.send_text(json.dumps(message))
+
+
+async def build(recipients: int, delay: float, stuck: bool = False):
+    manager = ConnectionManager(send_timeout=0.25)
+    for i in range(recipients):
+        socket = FakeWebSocket(3600 if stuck and i == 0 else delay)
+        await manager.connect(socket, f"p{i}")
+        manager.add_to_game(f"p{i}", "bench")
+    return manager
+
+
+def game_state(recipients: int) -> dict:
+    return {
+        "type": "game_state",
+        "turn": 12,
+        "players": {f"p{i}": {"score": i, "resources": 10} for i in range(8)},
+        "spectators": recipients,
+    }
+
+
+async def deliver(manager: ConnectionManager, message: dict, skip: str = "") -> None:
+    await manager.broadcast_to_game(message, "bench")
+    for player_id in list(manager.registry):
+        if player_id != skip:
+            await manager.registry.get(player_id).drained()
+
+
+def close(manager: ConnectionManager) -> None:
+    for player_id in list(manager.registry):
+        manager.disconnect(player_id)
+
+
+async def timed(fn, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await fn()
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+async def main(send_ms: float, rounds: int) -> None:
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.CRITICAL)
+    )
+    delay = send_ms / 1000
+    print(f"simulated send time: {send_ms} ms")
+    print(f"{'recipients':>10}{'sequential ms':>16}{'queued ms':>16}{'speedup':>9}")
+    for n in RECIPIENTS:
+        manager = await build(n, delay)
+        message = game_state(n)
+        await deliver(manager, message)  # warm up
+        old = await timed(
+            lambda m=manager, msg=message: legacy_broadcast(m, msg, "bench"), rounds
+        )
+        new = await timed(lambda m=manager, msg=message: deliver(m, msg), rounds)
+        print(f"{n:>10}{old:>16.1f}{new:>16.1f}{old / new:>8.1f}x")
+        close(manager)
+
+    print()
+    print("one stuck client among 50 (send timeout 250 ms):")
+    manager = await build(50, delay, stuck=True)
+    message = game_state(50)
+    start = time.perf_counter()
+    await manager.broadcast_to_game(message, "bench")
+    produced = (time.perf_counter() - start) * 1000
+    await deliver(manager, message, skip="p0")
+    delivered = (time.perf_counter() - start) * 1000
+    print(f"  producer returned after {produced:.2f} ms")
+    print(f"  other 49 clients received both messages after {delivered:.1f} ms")
+    await asyncio.sleep(0.3)
+    print(f"  stuck client evicted: {not manager.is_connected('p0')}")
+    close(manager)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--send-ms", type=float, default=1.0)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.send_ms, args.rounds))
@@ -0,0 +1,77 @@
+"""Benchmark connect, room lookup and mass disconnect in the connection registry.
+
+Compares the former ConnectionManager bookkeeping (a game -> players map
+scanned in full on every disconnect) with ConnectionRegistry's forward and
+reverse indexes, for a deploy-style mass disconnect of every player.
+
+Usage:
+    uv run python -m scripts.bench_connections [--games 5000] [--per-game 4]
+"""
+
+import argparse
+import time
+
+from pygridfight.infrastructure.connections import ConnectionRegistry
+
+
+class LegacyConnections:
+    # The bookkeeping ConnectionRegistry replaced, kept as the baseline.
+    def __init__(self):
+        self.active_connections: dict[str, object] = {}
+        self.game_connections: dict[str, set[str]] = {}
+
+    def connect(self, player_id: str, socket: object) -> None:
+        self.active_connections[player_id] = socket
+
+    def add_to_game(self, player_id: str, game_id: str) -> None:
+        self.game_connections.setdefault(game_id, set()).add(player_id)
+
+    def disconnect(self, player_id: str) -> None:
+        self.active_connections.pop(player_id, None)
+        for players in self.game_connections.values():
+            players.discard(player_id)
+
+
+def run_legacy(games: int, per_game: int) -> tuple[float, float]:
+    conns = LegacyConnections()
+    start = time.perf_counter()
+    for g in range(games):
+        for p in range(per_game):
+            conns.connect(f"p{g}-{p}", object())
+            conns.add_to_game(f"p{g}-{p}", f"g{g}")
+    connect = time.perf_counter() - start
+    start = time.perf_counter()
+    for player_id in list(conns.active_connections):
+        conns.disconnect(player_id)
+    return connect, time.perf_counter() - start
+
+
+def run_registry(games: int, per_game: int) -> tuple[float, float]:
+    registry = ConnectionRegistry()
+    start = time.perf_counter()
+    for g in range(games):
+        for p in range(per_game):
+            registry.register(f"p{g}-{p}", object())
+            registry.join(f"g{g}", f"p{g}-{p}")
+    connect = time.perf_counter() - start
+    start = time.perf_counter()
+    for player_id in list(registry):
+        registry.unregister(player_id)
+    return connect, time.perf_counter() - start
+
+
+def main(games: int, per_game: int) -> None:
+    players = games * per_game
+    print(f"{games} games x {per_game} players = {players} connections")
+    print(f"{'implementation':<16}{'connect ms':>12}{'disconnect all ms':>20}")
+    for name, run in (("legacy", run_legacy), ("registry", run_registry)):
+        connect, disconnect = run(games, per_game)
+        print(f"{name:<16}{connect * 1000:>12.1f}{disconnect * 1000:>20.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=5000)
+    parser.add_argument("--per-game", type=int, default=4)
+    args = parser.parse_args()
+    main(args.games, args.per_game)
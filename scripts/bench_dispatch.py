@@ -0,0 +1,89 @@
+"""Benchmark parsing and dispatch of incoming WebSocket messages.
+
+For each client message type, reports messages per second through:
+
+* ``loads + union``: ``json.loads`` to a dict, then validation against the
+  plain union of the message models, which tries them in turn (the
+  two-step path the dispatcher replaces);
+* ``json``: ``JsonSession.parse``, one validation pass straight from the
+  frame's text through the discriminated union on ``type``;
+* ``binary``: ``BinarySession.parse``, decoding a binary frame then
+  validating the dict through the same union.
+
+Each parsed message is then routed through a table of no-op handlers, as
+``handle_websocket_message`` does. Only the routed types are measured:
+``player_action`` and ``player_ready`` have no handler yet.
+
+Usage:
+    uv run python -m scripts.bench_dispatch [--rounds 50000]
+"""
+
+import argparse
+import json
+import time
+import uuid
+from collections.abc import Callable
+from typing import get_args
+
+from pydantic import TypeAdapter
+
+from pygridfight.api.protocol import BinaryClient, BinarySession, JsonSession
+from pygridfight.api.schemas.messages import ClientMessage
+
+MESSAGES = {
+    "ping": {"type": "ping"},
+    "join_game": {
+        "type": "join_game",
+        "game_id": str(uuid.uuid4()),
+        "player_name": "Alice",
+    },
+    "leave_game": {"type": "leave_game", "game_id": str(uuid.uuid4())},
+    "resume": {"type": "resume", "game_id": str(uuid.uuid4()), "last_seq": 41},
+    "set_view": {"type": "set_view", "game_id": str(uuid.uuid4()), "radius": 5},
+}
+
+# Legacy baseline: the models as an undiscriminated union.
+_union, _ = get_args(ClientMessage)
+LEGACY = TypeAdapter(_union)
+
+
+async def noop(message, player_id: str) -> None:
+    pass
+
+
+HANDLERS = {message["type"]: noop for message in MESSAGES.values()}
+
+
+def per_second(parse: Callable[[], object], rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        message = parse()
+        HANDLERS[message.type](message, "player").close()  # route, do not run
+    return rounds / (time.perf_counter() - start)
+
+
+def main(rounds: int) -> None:
+    json_session = JsonSession()
+    binary_session = BinarySession()
+    client = BinaryClient()
+    print(f"messages per second, {rounds} rounds")
+    print(f"{'message':<16}{'loads+union':>13}{'json':>11}{'binary':>11}{'speedup':>9}")
+    for name, message in MESSAGES.items():
+        text = json.dumps(message)
+        frame = client.encode(message)
+        legacy = per_second(
+            lambda text=text: LEGACY.validate_python(json.loads(text)), rounds
+        )
+        direct = per_second(lambda text=text: json_session.parse(text), rounds)
+        binary = per_second(lambda frame=frame: binary_session.parse(frame), rounds)
+        print(
+            f"{name:<16}{legacy:>13,.0f}{direct:>11,.0f}{binary:>11,.0f}"
+            f"{direct / legacy:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=50000)
+    args = parser.parse_args()
+    main(args.rounds)
@@ -0,0 +1,104 @@
+"""Benchmark the game loop against one task per game.
+
+Steps ``--games`` games every ``--timestep`` seconds for ``--seconds``
+seconds with a trivial system, first from one asyncio task per game, each
+sleeping for the timestep (started together, as after a restart), then
+from the shared GameLoop with ``--slots`` phases. Reports process CPU time
+per timestep, the most game ticks run between two wake-ups of a probe
+timer firing 20 times per timestep (how bursty the work is), the worst
+lateness of that probe, and the number of tasks.
+
+Usage:
+    uv run python -m scripts.bench_game_loop [--games 20000] [--timestep 0.1]
+        [--slots 10] [--seconds 3]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+import structlog
+
+from pygridfight.services.game_loop import GameLoop
+
+
+class Probe:
+    def __init__(self) -> None:
+        self.ticks = 0
+        self.burst = 0
+        self.lag = 0.0
+
+    def system(self, game_id: str, tick: int) -> None:
+        self.ticks += 1
+
+    async def run(self, period: float) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            due = loop.time() + period
+            await asyncio.sleep(period)
+            self.lag = max(self.lag, loop.time() - due)
+            self.burst = max(self.burst, self.ticks)
+            self.ticks = 0
+
+
+async def measure(start_games, games: int, timestep: float, slots: int, seconds):
+    probe = Probe()
+    prober = asyncio.create_task(probe.run(timestep / 20))
+    cpu = time.process_time()
+    tasks = await start_games(probe.system, games, timestep, slots, seconds)
+    cpu = time.process_time() - cpu
+    prober.cancel()
+    return cpu / (seconds / timestep), probe.burst, probe.lag, tasks
+
+
+async def per_task(system, games: int, timestep: float, slots: int, seconds):
+    async def run(game_id: str) -> None:
+        tick = 0
+        while True:
+            await asyncio.sleep(timestep)
+            tick += 1
+            system(game_id, tick)
+
+    workers = [asyncio.create_task(run(f"g{n}")) for n in range(games)]
+    await asyncio.sleep(seconds)
+    for worker in workers:
+        worker.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+    return len(workers)
+
+
+async def shared(system, games: int, timestep: float, slots: int, seconds):
+    game_loop = GameLoop(timestep=timestep, slots=slots)
+    game_loop.add_system(system)
+    for n in range(games):
+        game_loop.add(f"g{n}")
+    runner = asyncio.create_task(game_loop.run())
+    await asyncio.sleep(seconds)
+    runner.cancel()
+    await asyncio.gather(runner, return_exceptions=True)
+    return 1
+
+
+async def main(games: int, timestep: float, slots: int, seconds: float) -> None:
+    print(f"{games} games, {timestep:g} s timestep, {slots} phases, {seconds:g} s")
+    print(
+        f"{'mode':<16}{'cpu ms/step':>13}{'max burst':>11}"
+        f"{'worst lag ms':>14}{'tasks':>8}"
+    )
+    for name, start in (("task per game", per_task), ("game loop", shared)):
+        cpu, burst, lag, tasks = await measure(start, games, timestep, slots, seconds)
+        print(f"{name:<16}{cpu * 1000:>13.1f}{burst:>11}{lag * 1000:>14.1f}{tasks:>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=20_000)
+    parser.add_argument("--timestep", type=float, default=0.1)
+    parser.add_argument("--slots", type=int, default=10)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+    asyncio.run(main(args.games, args.timestep, args.slots, args.seconds))
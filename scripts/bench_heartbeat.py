@@ -0,0 +1,122 @@
+"""Benchmark heartbeat sweeps over many idle WebSocket connections.
+
+Connects ``--connections`` quiet connections through a real
+ConnectionManager and lets heartbeats run for ``--sweeps`` intervals,
+during which every connection is pinged each sweep, as idle players are.
+The shared monitor (one timer, batches of ``--batch``) is compared with
+the per-socket alternative, one task per connection sleeping for the
+interval and pinging its own socket. Reports process CPU time per sweep
+(including the writer tasks sending the pings), the event loop steps the
+heartbeats take per sweep and their median length (how long they can hold
+up the game), and the number of heartbeat tasks.
+
+Usage:
+    uv run python -m scripts.bench_heartbeat [--connections 20000] [--sweeps 5]
+        [--batch 500]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from typing import ClassVar
+
+import structlog
+
+from pygridfight.api.heartbeat import PING, HeartbeatMonitor
+from pygridfight.api.protocol import Payload
+from pygridfight.api.websocket import ConnectionManager
+
+INTERVAL = 0.5
+
+
+class CountingWebSocket:
+    async def accept(self, subprotocol: str | None = None):
+        pass
+
+    async def send_text(self, text: str):
+        pass
+
+    async def close(self, code: int = 1000, reason: str | None = None):
+        pass
+
+
+class TimedMonitor(HeartbeatMonitor):
+    steps: ClassVar[list[float]] = []
+
+    def check(self, queues, ping):
+        start = time.perf_counter()
+        reaped = super().check(queues, ping)
+        TimedMonitor.steps.append(time.perf_counter() - start)
+        return reaped
+
+
+async def shared(connections: int, sweeps: int, batch: int):
+    # missed is high so that nobody is reaped during the run.
+    heartbeats = TimedMonitor(interval=INTERVAL, missed=10**6, batch_size=batch)
+    manager = ConnectionManager(queue_size=16, heartbeats=heartbeats)
+    for n in range(connections):
+        await manager.connect(CountingWebSocket(), f"p{n}")
+    TimedMonitor.steps = []
+    cpu = time.process_time()
+    await asyncio.sleep(INTERVAL * sweeps + INTERVAL / 2)
+    cpu = time.process_time() - cpu
+    heartbeats.close()
+    for player_id in list(manager.registry):
+        manager.disconnect(player_id)
+    steps = sorted(TimedMonitor.steps)
+    return cpu / sweeps, len(steps) / sweeps, steps[len(steps) // 2], 0
+
+
+async def per_socket(connections: int, sweeps: int, batch: int):
+    manager = ConnectionManager(queue_size=16)
+    steps = []
+
+    async def heartbeat(queue) -> None:
+        while True:
+            await asyncio.sleep(INTERVAL)
+            start = time.perf_counter()
+            queue.put(Payload(PING))
+            steps.append(time.perf_counter() - start)
+
+    for n in range(connections):
+        await manager.connect(CountingWebSocket(), f"p{n}")
+    workers = [
+        asyncio.create_task(heartbeat(queue))
+        for queue in manager.registry.connections()
+    ]
+    cpu = time.process_time()
+    await asyncio.sleep(INTERVAL * sweeps + INTERVAL / 2)
+    cpu = time.process_time() - cpu
+    for worker in workers:
+        worker.cancel()
+    for player_id in list(manager.registry):
+        manager.disconnect(player_id)
+    steps.sort()
+    return cpu / sweeps, len(steps) / sweeps, steps[len(steps) // 2], len(workers)
+
+
+async def main(connections: int, sweeps: int, batch: int) -> None:
+    print(f"{connections} idle connections, {sweeps} sweeps {INTERVAL:g} s apart")
+    print(
+        f"{'mode':<18}{'cpu ms/sweep':>14}{'steps/sweep':>13}"
+        f"{'median step ms':>16}{'tasks':>8}"
+    )
+    for name, run in (("task per socket", per_socket), ("shared monitor", shared)):
+        cpu, steps, median, tasks = await run(connections, sweeps, batch)
+        print(
+            f"{name:<18}{cpu * 1000:>14.1f}{steps:>13.0f}"
+            f"{median * 1000:>16.3f}{tasks:>8}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connections", type=int, default=20_000)
+    parser.add_argument("--sweeps", type=int, default=5)
+    parser.add_argument("--batch", type=int, default=500)
+    args = parser.parse_args()
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+    asyncio.run(main(args.connections, args.sweeps, args.batch))
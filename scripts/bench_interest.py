@@ -0,0 +1,127 @@
+"""Benchmark area-of-interest filtering of game broadcasts on large grids.
+
+Scatters ``--avatars`` avatars per player over a ``--grid`` square grid for
+``--players`` players and broadcasts ``--ticks`` full ``game_state``
+updates with every avatar moved. Full visibility encodes the state once
+and sends it to everyone; area visibility (radius ``--radius``) sends each
+player only the avatars around their own, found with the spatial index.
+The index is also compared with a linear scan of all avatars per player.
+Reports CPU time per tick and bytes sent per player per tick.
+
+Usage:
+    uv run python -m scripts.bench_interest [--grid 200] [--players 8]
+        [--avatars 50] [--radius 8] [--ticks 50]
+"""
+
+import argparse
+import random
+import time
+
+from pygridfight.api.interest import InterestManager
+from pygridfight.api.protocol import Payload
+
+
+def states(grid: int, players: int, avatars: int, radius: int, ticks: int):
+    rng = random.Random(1)
+    positions = {
+        f"p{p}-a{a}": (f"p{p}", rng.randrange(grid), rng.randrange(grid))
+        for p in range(players)
+        for a in range(avatars)
+    }
+    for _ in range(ticks):
+        for avatar_id, (owner_id, x, y) in positions.items():
+            x = min(grid - 1, max(0, x + rng.choice((-1, 0, 1))))
+            y = min(grid - 1, max(0, y + rng.choice((-1, 0, 1))))
+            positions[avatar_id] = (owner_id, x, y)
+        yield {
+            "type": "game_state",
+            "game": {
+                "id": "g1",
+                "status": "active",
+                "avatars": {
+                    avatar_id: {
+                        "id": avatar_id,
+                        "owner_id": owner_id,
+                        "position": {"x": x, "y": y},
+                        "health": 3,
+                        "active": True,
+                    }
+                    for avatar_id, (owner_id, x, y) in positions.items()
+                },
+                "grid": {"width": grid, "height": grid},
+                "visibility": "area",
+                "view_radius": radius,
+            },
+        }
+
+
+def full(messages: list[dict], players: list[str]) -> int:
+    sent = 0
+    for message in messages:
+        size = len(Payload(message).text)
+        sent += size * len(players)
+    return sent
+
+
+def area(messages: list[dict], players: list[str]) -> int:
+    interest = InterestManager(bucket_size=8)
+    sent = 0
+    for message in messages:
+        interest.observe(message, "g1")
+        for _, payload in interest.fan_out(Payload(message), "g1", players):
+            sent += len(payload.text)
+    return sent
+
+
+def scan(messages: list[dict], players: list[str]) -> int:
+    sent = 0
+    for message in messages:
+        game = message["game"]
+        avatars = game["avatars"]
+        radius = game["view_radius"]
+        for player_id in players:
+            own = [
+                a["position"] for a in avatars.values() if a["owner_id"] == player_id
+            ]
+            visible = {
+                avatar_id: a
+                for avatar_id, a in avatars.items()
+                if any(
+                    abs(a["position"]["x"] - o["x"]) <= radius
+                    and abs(a["position"]["y"] - o["y"]) <= radius
+                    for o in own
+                )
+            }
+            trimmed = {**message, "game": {**game, "avatars": visible}}
+            sent += len(Payload(trimmed).text)
+    return sent
+
+
+def main(grid: int, players: int, avatars: int, radius: int, ticks: int) -> None:
+    messages = list(states(grid, players, avatars, radius, ticks))
+    player_ids = [f"p{p}" for p in range(players)]
+    print(
+        f"{players} players x {avatars} avatars on a {grid}x{grid} grid, "
+        f"radius {radius}, {ticks} ticks"
+    )
+    print(f"{'mode':<22}{'cpu ms/tick':>12}{'bytes/player/tick':>19}")
+    for name, run in (
+        ("full visibility", full),
+        ("area, linear scan", scan),
+        ("area, spatial index", area),
+    ):
+        start = time.process_time()
+        sent = run(messages, player_ids)
+        cpu = time.process_time() - start
+        print(f"{name:<22}{cpu / ticks * 1000:>12.2f}{sent // (ticks * players):>19}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--grid", type=int, default=200)
+    parser.add_argument("--players", type=int, default=8)
+    parser.add_argument("--avatars", type=int, default=50)
+    parser.add_argument("--radius", type=int, default=8)
+    parser.add_argument("--ticks", type=int, default=50)
+    args = parser.parse_args()
+    main(args.grid, args.players, args.avatars, args.radius, args.ticks)
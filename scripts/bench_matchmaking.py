@@ -0,0 +1,98 @@
+"""Load test for the matchmaking queue.
+
+Sustains a target enqueue rate (10k/s by default) while the matcher ticks on
+its normal interval, then reports the achieved rate and tick latencies.
+Exits non-zero if the target rate could not be sustained.
+
+Usage:
+    uv run python -m scripts.bench_matchmaking [--rate 10000] [--seconds 5]
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+
+import structlog
+
+from pygridfight.infrastructure.game_state import GameStateManager
+from pygridfight.services.matchmaking_service import (
+    MatchmakingService,
+    MatchPreferences,
+)
+
+PREFERENCES = [
+    MatchPreferences(max_players=2, grid_size=10),
+    MatchPreferences(max_players=4, grid_size=20),
+    MatchPreferences(max_players=8, grid_size=50),
+]
+
+
+async def produce(
+    service: MatchmakingService, rate: int, seconds: float, step: float
+) -> int:
+    per_step = max(1, int(rate * step))
+    total = int(rate * seconds)
+    sent = 0
+    start = time.perf_counter()
+    while sent < total:
+        for i in range(min(per_step, total - sent)):
+            service.enqueue(f"bot-{sent + i}", PREFERENCES[(sent + i) % 3])
+        sent += per_step
+        # Pace against the wall clock so slow ticks show up as a lower rate.
+        delay = start + sent / rate - time.perf_counter()
+        await asyncio.sleep(max(0.0, delay))
+    return min(sent, total)
+
+
+async def match(
+    service: MatchmakingService, interval: float, done: asyncio.Event
+) -> list[float]:
+    durations = []
+    while not done.is_set() or service.queue_size:
+        start = time.perf_counter()
+        await service.run_tick()
+        durations.append(time.perf_counter() - start)
+        await asyncio.sleep(interval)
+    return durations
+
+
+async def main(rate: int, seconds: float, interval: float, batch: int) -> bool:
+    manager = GameStateManager()
+    manager.reset()
+    service = MatchmakingService(manager, batch_size=batch)
+    done = asyncio.Event()
+
+    start = time.perf_counter()
+    matcher = asyncio.create_task(match(service, interval, done))
+    sent = await produce(service, rate, seconds, step=0.01)
+    produce_elapsed = time.perf_counter() - start
+    done.set()
+    durations = await matcher
+    drain_elapsed = time.perf_counter() - start
+
+    achieved = sent / produce_elapsed
+    games = len(await manager.list_active_games())
+    print(f"enqueued:        {sent} tickets in {produce_elapsed:.2f}s")
+    print(f"enqueue rate:    {achieved:,.0f}/s (target {rate:,}/s)")
+    print(f"fully matched:   {drain_elapsed:.2f}s, {games} games")
+    print(f"ticks:           {len(durations)}")
+    print(f"tick p50:        {statistics.median(durations) * 1000:.2f} ms")
+    print(f"tick max:        {max(durations) * 1000:.2f} ms")
+    return achieved >= rate * 0.95
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=int, default=10_000)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--interval", type=float, default=0.1)
+    parser.add_argument("--batch", type=int, default=5_000)
+    args = parser.parse_args()
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+    ok = asyncio.run(main(args.rate, args.seconds, args.interval, args.batch))
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,67 @@
+"""Benchmark metrics instrumentation overhead.
+
+Measures the cost of one observation for each instrument type as used on the
+hot paths (cached child, plus a timed histogram observation including both
+``perf_counter`` calls) and fails if any exceeds the 1µs budget.
+
+Usage:
+    uv run python -m scripts.bench_metrics [--observations 1000000]
+"""
+
+import argparse
+import sys
+import time
+from collections.abc import Callable
+
+from pygridfight.core.metrics import MetricsRegistry
+
+BUDGET_NS = 1000
+
+
+def per_call_ns(fn: Callable[[], object], observations: int) -> float:
+    loop = range(observations)
+    start = time.perf_counter_ns()
+    for _ in loop:
+        fn()
+    return (time.perf_counter_ns() - start) / observations
+
+
+def main(observations: int) -> int:
+    registry = MetricsRegistry()
+    counter = registry.counter("bench_total", "Bench.").labels()
+    gauge = registry.gauge("bench_gauge", "Bench.").labels()
+    histogram = registry.histogram("bench_seconds", "Bench.").labels()
+    labelled = registry.histogram(
+        "bench_route_seconds", "Bench.", ["method", "route", "status"]
+    )
+    perf_counter = time.perf_counter
+
+    def timed_observe() -> None:
+        start = perf_counter()
+        histogram.observe(perf_counter() - start)
+
+    cases = {
+        "counter.inc": counter.inc,
+        "gauge.set": lambda: gauge.set(1.0),
+        "histogram.observe": lambda: histogram.observe(0.0003),
+        "timed histogram.observe": timed_observe,
+        "labels(...).observe": lambda: labelled.labels("GET", "/games", "200").observe(
+            0.0003
+        ),
+    }
+    baseline = per_call_ns(lambda: None, observations)
+    failed = False
+    print(f"{'instrument':<26}{'ns/obs':>10}")
+    for name, fn in cases.items():
+        cost = per_call_ns(fn, observations) - baseline
+        failed |= cost > BUDGET_NS
+        print(f"{name:<26}{cost:>10.0f}{'  OVER BUDGET' if cost > BUDGET_NS else ''}")
+    print(f"budget: {BUDGET_NS} ns per observation")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--observations", type=int, default=1_000_000)
+    args = parser.parse_args()
+    sys.exit(main(args.observations))
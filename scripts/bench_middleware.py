@@ -0,0 +1,124 @@
+"""Benchmark per-request middleware overhead.
+
+Compares the former three-layer BaseHTTPMiddleware stack (request ID,
+logging, error handling) against the fused pure-ASGI RequestContextMiddleware.
+Requests are driven straight through the ASGI callable, so the numbers are
+middleware plus a trivial endpoint, with no network or client overhead.
+
+Usage:
+    uv run python -m scripts.bench_middleware [--requests 20000]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+import uuid
+
+import structlog
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from pygridfight.api.middleware import RequestContextMiddleware
+
+logger = structlog.get_logger(__name__)
+
+
+# The stack RequestContextMiddleware replaced, kept here as the baseline.
+class LegacyRequestIDMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        request_id = str(uuid.uuid4())
+        request.state.request_id = request_id
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+
+class LegacyLoggingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        log = logger.bind(request_id=getattr(request.state, "request_id", None))
+        log.info("Request started", method=request.method, url=str(request.url))
+        response = await call_next(request)
+        log.info("Request finished", status_code=response.status_code)
+        return response
+
+
+class LegacyErrorHandlingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        try:
+            return await call_next(request)
+        except Exception as exc:
+            log = logger.bind(request_id=getattr(request.state, "request_id", None))
+            log.error("Unhandled exception", error=str(exc))
+            raise
+
+
+async def ok(request):
+    return PlainTextResponse("ok")
+
+
+def build(middleware: list) -> Starlette:
+    app = Starlette(routes=[Route("/", ok)])
+    for cls in middleware:
+        app.add_middleware(cls)
+    return app
+
+
+async def drive(app, requests: int) -> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/",
+        "raw_path": b"/",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(200):  # warm up
+        await app(dict(scope), receive, send)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+async def main(requests: int) -> None:
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+    stacks = {
+        "no middleware": [],
+        "three BaseHTTPMiddleware": [
+            LegacyRequestIDMiddleware,
+            LegacyLoggingMiddleware,
+            LegacyErrorHandlingMiddleware,
+        ],
+        "fused pure ASGI": [RequestContextMiddleware],
+    }
+    timings = {name: await drive(build(mw), requests) for name, mw in stacks.items()}
+    bare = timings["no middleware"]
+    print(f"{'stack':<28}{'us/request':>12}{'overhead us':>13}")
+    for name, micros in timings.items():
+        print(f"{name:<28}{micros:>12.1f}{micros - bare:>13.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
@@ -0,0 +1,142 @@
+"""Benchmark the binary WebSocket protocol against JSON.
+
+For each message, reports the bytes on the wire (for binary, both the first
+frame on a session, which defines the id handles, and later frames that
+reuse them) and the CPU time to encode it for a game's recipients and to
+decode it on the receiving side. JSON is encoded once and the text shared;
+binary is compiled once and linked per recipient session, as
+ConnectionManager does.
+
+Usage:
+    uv run python -m scripts.bench_protocol [--players 8] [--rounds 2000]
+"""
+
+import argparse
+import json
+import time
+import uuid
+from collections.abc import Callable
+
+from pygridfight.api.protocol import (
+    BinaryClient,
+    BinarySession,
+    JsonSession,
+    Payload,
+)
+from pygridfight.api.responses import dumps
+
+
+def game_state(players: int, avatars_per_player: int) -> dict:
+    player_ids = [str(uuid.uuid4()) for _ in range(players)]
+    avatars = {}
+    for i, player_id in enumerate(player_ids):
+        for j in range(avatars_per_player):
+            avatar_id = str(uuid.uuid4())
+            avatars[avatar_id] = {
+                "id": avatar_id,
+                "owner_id": player_id,
+                "position": {"x": (i * 5 + j) % 50, "y": (i * 3 + j * 7) % 50},
+                "health": 3,
+                "active": True,
+            }
+    return {
+        "type": "game_state",
+        "game": {
+            "id": str(uuid.uuid4()),
+            "status": "active",
+            "turn": 42,
+            "players": {
+                player_id: {
+                    "id": player_id,
+                    "display_name": f"Player {i}",
+                    "score": i * 15,
+                    "avatar_ids": [
+                        aid for aid, a in avatars.items() if a["owner_id"] == player_id
+                    ],
+                }
+                for i, player_id in enumerate(player_ids)
+            },
+            "avatars": avatars,
+            "grid": {"width": 50, "height": 50},
+        },
+    }
+
+
+def player_action() -> dict:
+    return {
+        "type": "player_action",
+        "action": {
+            "type": "move",
+            "player_id": str(uuid.uuid4()),
+            "target_position": {"x": 12, "y": 31},
+        },
+    }
+
+
+def per_call_us(fn: Callable[[], object], rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def bench(name: str, message: dict, recipients: int, rounds: int) -> None:
+    sessions = [BinarySession() for _ in range(recipients)]
+    json_sessions = [JsonSession() for _ in range(recipients)]
+    first = sessions[0].render(Payload(message))
+    for session in sessions[1:]:
+        session.render(Payload(message))
+    text = Payload(message).text
+    steady = sessions[0].render(Payload(message))
+    client = BinaryClient()
+    client.decode(first)
+
+    def encode_json() -> None:
+        payload = Payload(message)
+        for session in json_sessions:
+            session.render(payload)
+
+    def encode_binary() -> None:
+        payload = Payload(message)
+        for session in sessions:
+            session.render(payload)
+
+    json_encode = per_call_us(encode_json, rounds)
+    binary_encode = per_call_us(encode_binary, rounds)
+    json_decode = per_call_us(lambda: json.loads(text), rounds)
+    binary_decode = per_call_us(lambda: client.decode(steady), rounds)
+    print(
+        f"{name:<24}{len(text):>7}{len(first):>8}{len(steady):>8}"
+        f"{json_encode:>10.1f}{binary_encode:>10.1f}"
+        f"{json_decode:>10.1f}{binary_decode:>10.1f}"
+    )
+
+
+def main(players: int, rounds: int) -> None:
+    print(f"encoding for {players} recipients; times in µs per message")
+    print(
+        f"{'message':<24}{'json B':>7}{'bin 1st':>8}{'bin B':>8}"
+        f"{'json enc':>10}{'bin enc':>10}{'json dec':>10}{'bin dec':>10}"
+    )
+    bench("game_state 8x4", game_state(players, 4), players, rounds)
+    bench("game_state 8x1", game_state(players, 1), players, rounds)
+    bench(
+        "turn_changed",
+        {
+            "type": "turn_changed",
+            "current_player_id": str(uuid.uuid4()),
+            "turn_number": 7,
+        },
+        players,
+        rounds * 10,
+    )
+    bench("player_action", player_action(), 1, rounds * 10)
+    print(f"(json encoder: {dumps.__module__}.dumps; json decoder: json.loads)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+    main(args.players, args.rounds)
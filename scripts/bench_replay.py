@@ -0,0 +1,88 @@
+"""Benchmark resuming reconnected players against full-state resends.
+
+Simulates a network blip: the ``--players`` players of each of ``--games``
+games reconnect at once after missing ``--missed`` broadcasts, one in ten of
+them a full ``game_state`` and the rest small events. Resuming from the
+replay buffer sends each player what it missed, reusing the encodings made
+for the live broadcast; the baseline builds and encodes a fresh snapshot of
+the game for every player, as a client refetching the state does. Reports
+CPU time for the whole storm and bytes sent per player.
+
+Usage:
+    uv run python -m scripts.bench_replay [--games 200] [--players 8]
+        [--missed 20]
+"""
+
+import argparse
+import copy
+import time
+
+from pygridfight.api.protocol import Payload
+from pygridfight.api.replay import ReplayBuffer
+from scripts.bench_protocol import game_state
+
+
+def broadcasts(missed: int, state: dict) -> list[dict]:
+    out = []
+    for n in range(missed):
+        if n % 10 == 9:
+            out.append(state)
+        else:
+            out.append({"type": "avatar_moved", "avatar_id": "a1", "x": n, "y": n})
+    return out
+
+
+def record(replay: ReplayBuffer, games: int, history: list[dict]) -> int:
+    sent = 0
+    for game in range(games):
+        for message in history:
+            # Encoded once when it was broadcast live.
+            sent += len(replay.record(message, f"g{game}").text)
+    return sent
+
+
+def resume(replay: ReplayBuffer, games: int, players: int, last_seq: int) -> int:
+    sent = 0
+    for game in range(games):
+        for _ in range(players):
+            for payload in replay.since(f"g{game}", last_seq):
+                sent += len(payload.text)
+    return sent
+
+
+def snapshot(games: int, players: int, state: dict) -> int:
+    sent = 0
+    for _ in range(games):
+        for _ in range(players):
+            # A fresh game.get_state() per request.
+            sent += len(Payload(copy.deepcopy(state)).text)
+    return sent
+
+
+def main(games: int, players: int, missed: int) -> None:
+    state = game_state(players, 4)
+    history = broadcasts(missed, state)
+    replay = ReplayBuffer(size=max(missed, 1), max_games=games)
+    record(replay, games, history)
+    clients = games * players
+    print(f"{clients} players of {games} games reconnect after {missed} broadcasts")
+    print(f"{'mode':<16}{'cpu ms':>10}{'bytes/player':>14}")
+
+    start = time.process_time()
+    sent = snapshot(games, players, state)
+    cpu = time.process_time() - start
+    print(f"{'full snapshot':<16}{cpu * 1000:>10.1f}{sent // clients:>14}")
+
+    start = time.process_time()
+    sent = resume(replay, games, players, 0)
+    cpu = time.process_time() - start
+    print(f"{'resume':<16}{cpu * 1000:>10.1f}{sent // clients:>14}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--players", type=int, default=8)
+    parser.add_argument("--missed", type=int, default=20)
+    args = parser.parse_args()
+    main(args.games, args.players, args.missed)
@@ -0,0 +1,90 @@
+"""Benchmark REST response encoding: jsonable_encoder path vs FastJSONResponse.
+
+For the payloads returned by create, get and list, measures how many
+responses per second each encoding path can build, then measures end-to-end
+requests per second through the ASGI app (no network).
+
+Usage:
+    uv run python -m scripts.bench_rest_responses [--seconds 1]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+
+import httpx
+import structlog
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from pygridfight.api.responses import FastJSONResponse, orjson
+from pygridfight.infrastructure.game_state import GameStateManager
+from pygridfight.main import create_app
+
+
+def rate(fn: Callable[[], object], seconds: float) -> float:
+    count = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(100):
+            fn()
+        count += 100
+    return count / seconds
+
+
+async def arate(fn, seconds: float) -> float:
+    count = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        await fn()
+        count += 1
+    return count / seconds
+
+
+async def main(seconds: float) -> None:
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+    logging.disable(logging.INFO)
+    GameStateManager().reset()
+    app = create_app()
+    transport = httpx.ASGITransport(app=app)
+    body = {"name": "Bench", "max_players": 8, "grid_size": 50}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        for _ in range(200):
+            created = (await c.post("/games", json=body)).json()
+        game_id = created["game"]["id"]
+        for i in range(7):
+            await c.post(f"/games/{game_id}/join", json={"player_name": f"P{i}"})
+        payloads = {
+            "create": created,
+            "get": (await c.get(f"/games/{game_id}")).json(),
+            "list": (await c.get("/games", params={"limit": 50})).json(),
+        }
+
+        encoder = "orjson" if orjson is not None else "pydantic TypeAdapter"
+        print(f"fast path encoder: {encoder}")
+        print(f"{'payload':<8}{'jsonable_encoder/s':>20}{'fast/s':>12}{'speedup':>9}")
+        for name, payload in payloads.items():
+            slow = rate(lambda p=payload: JSONResponse(jsonable_encoder(p)), seconds)
+            fast = rate(lambda p=payload: FastJSONResponse(p), seconds)
+            print(f"{name:<8}{slow:>20,.0f}{fast:>12,.0f}{fast / slow:>8.1f}x")
+
+        print()
+        print("end-to-end through the ASGI app:")
+        requests = {
+            "create": lambda: c.post("/games", json=body),
+            "get": lambda: c.get(f"/games/{game_id}"),
+            "list": lambda: c.get("/games", params={"limit": 50}),
+        }
+        for name, request in requests.items():
+            print(f"{name:<8}{await arate(request, seconds):>12,.0f} req/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=1.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.seconds))
@@ -0,0 +1,113 @@
+"""Benchmark spectator fan-out against per-viewer encoding.
+
+Connects ``--viewers`` spectators to one game (half JSON, half binary) and
+publishes ``--updates`` full ``game_state`` snapshots, each followed by a
+``turn_changed`` event. The spectator tier encodes every update once per
+wire protocol and all viewers send the same bytes; the baseline encodes
+each update separately for every viewer, as player broadcasts did before
+encode-once. Sockets only count frames. Reports process CPU time per
+update and the time to the last viewer's frame.
+
+Usage:
+    uv run python -m scripts.bench_spectators [--viewers 5000] [--updates 20]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+import structlog
+
+from pygridfight.api.protocol import BINARY_V1, Payload
+from pygridfight.api.spectators import SpectatorHub
+from scripts.bench_protocol import game_state
+
+
+class CountingWebSocket:
+    frames = 0
+
+    async def accept(self, subprotocol: str | None = None):
+        pass
+
+    async def send_text(self, text: str):
+        CountingWebSocket.frames += 1
+
+    async def send_bytes(self, data: bytes):
+        CountingWebSocket.frames += 1
+
+    async def close(self, code: int = 1000, reason: str | None = None):
+        pass
+
+
+def messages(updates: int) -> list[dict]:
+    out = []
+    for turn in range(updates):
+        state = game_state(8, 4)
+        state["game"]["turn"] = turn
+        out.append(state)
+        out.append({"type": "turn_changed", "turn_number": turn + 1})
+    return out
+
+
+async def connect(hub: SpectatorHub, viewers: int) -> list:
+    queues = []
+    for i in range(viewers):
+        protocol = BINARY_V1 if i % 2 else None
+        _, queue = await hub.join(CountingWebSocket(), "g1", protocol)
+        queues.append(queue)
+    return queues
+
+
+async def shared(viewers: int, feed: list[dict]) -> tuple[float, float]:
+    hub = SpectatorHub(delay=0, queue_size=len(feed) + 1)
+    queues = await connect(hub, viewers)
+    cpu, wall = time.process_time(), time.perf_counter()
+    for message in feed:
+        hub.publish(message, "g1")
+    await asyncio.sleep(0)
+    await asyncio.gather(*(queue.drained() for queue in queues))
+    cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+    hub.discard("g1")
+    return cpu, wall
+
+
+async def per_viewer(viewers: int, feed: list[dict]) -> tuple[float, float]:
+    # Baseline: every viewer's queue encodes its own copy of each update.
+    hub = SpectatorHub(delay=0, queue_size=len(feed) + 1)
+    queues = await connect(hub, viewers)
+    cpu, wall = time.process_time(), time.perf_counter()
+    for message in feed:
+        for queue in queues:
+            queue.put(Payload(message))
+    await asyncio.gather(*(queue.drained() for queue in queues))
+    cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+    hub.discard("g1")
+    return cpu, wall
+
+
+async def main(viewers: int, updates: int) -> None:
+    feed = messages(updates)
+    print(f"{viewers} spectators (half binary), {len(feed)} updates")
+    print(f"{'mode':<12}{'cpu ms/upd':>12}{'wall s':>9}{'frames':>10}{'cpu':>9}")
+    baseline = None
+    for name, run in (("per-viewer", per_viewer), ("shared", shared)):
+        CountingWebSocket.frames = 0
+        cpu, wall = await run(viewers, feed)
+        per_update = cpu / len(feed) * 1000
+        baseline = baseline or per_update
+        print(
+            f"{name:<12}{per_update:>12.2f}{wall:>9.2f}{CountingWebSocket.frames:>10}"
+            f"{per_update / baseline:>9.0%}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--viewers", type=int, default=5000)
+    parser.add_argument("--updates", type=int, default=20)
+    args = parser.parse_args()
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+    asyncio.run(main(args.viewers, args.updates))
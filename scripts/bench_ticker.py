@@ -0,0 +1,142 @@
+"""Benchmark tick batching of game broadcasts under a synthetic load.
+
+Simulates games of 8 players with 4 avatars each, where every avatar move
+publishes a full ``game_state`` snapshot (the PRD's "updates after each
+action"), and each turn ends with a ``turn_changed`` event. Moves arrive
+``--move-ms`` apart in every game. The same load runs without batching
+(every update broadcast immediately) and with each tick interval, through a
+real ConnectionManager whose sockets only count frames. Reports frames
+sent and process CPU time.
+
+Usage:
+    uv run python -m scripts.bench_ticker [--games 50] [--turns 4] [--move-ms 5]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+import uuid
+
+import structlog
+
+from pygridfight.api.ticker import GameTicker
+from pygridfight.api.websocket import ConnectionManager
+
+PLAYERS = 8
+AVATARS = 4
+INTERVALS = (0.0, 0.02, 0.05, 0.1)
+
+
+class CountingWebSocket:
+    frames = 0
+
+    async def accept(self, subprotocol: str | None = None):
+        pass
+
+    async def send_text(self, text: str):
+        CountingWebSocket.frames += 1
+
+    async def close(self, code: int = 1000, reason: str | None = None):
+        pass
+
+
+def new_state(game_id: str) -> dict:
+    players = [str(uuid.uuid4()) for _ in range(PLAYERS)]
+    avatars = {}
+    for i, player_id in enumerate(players):
+        for j in range(AVATARS):
+            avatar_id = str(uuid.uuid4())
+            avatars[avatar_id] = {
+                "id": avatar_id,
+                "owner_id": player_id,
+                "position": {"x": i, "y": j},
+                "health": 3,
+                "active": True,
+            }
+    return {
+        "id": game_id,
+        "status": "active",
+        "turn": 0,
+        "players": {
+            player_id: {
+                "id": player_id,
+                "display_name": f"Player {i}",
+                "score": 0,
+                "avatar_ids": [
+                    a for a, v in avatars.items() if v["owner_id"] == player_id
+                ],
+            }
+            for i, player_id in enumerate(players)
+        },
+        "avatars": avatars,
+        "grid": {"width": 20, "height": 20},
+    }
+
+
+async def play(ticker: GameTicker, game_id: str, turns: int, move_delay: float):
+    state = new_state(game_id)
+    avatar_ids = list(state["avatars"])
+    for turn in range(turns):
+        for avatar_id in avatar_ids:
+            await asyncio.sleep(move_delay)
+            # Snapshots are immutable once published: copy what changes.
+            avatar = dict(state["avatars"][avatar_id])
+            avatar["position"] = {"x": (avatar["position"]["x"] + 1) % 20, "y": turn}
+            state = {**state, "avatars": {**state["avatars"], avatar_id: avatar}}
+            ticker.publish({"type": "game_state", "game": state}, game_id)
+        ticker.publish({"type": "turn_changed", "turn_number": turn + 1}, game_id)
+    ticker.flush(game_id)
+
+
+async def run(interval: float, games: int, turns: int, move_delay: float):
+    manager = ConnectionManager(queue_size=4096)
+    ticker = GameTicker(manager, interval=interval)
+    for g in range(games):
+        for p in range(PLAYERS):
+            await manager.connect(CountingWebSocket(), f"g{g}-p{p}")
+            manager.add_to_game(f"g{g}-p{p}", f"g{g}")
+    CountingWebSocket.frames = 0
+    cpu = time.process_time()
+    wall = time.perf_counter()
+    await asyncio.gather(
+        *(play(ticker, f"g{g}", turns, move_delay) for g in range(games))
+    )
+    await manager.flush()
+    cpu = time.process_time() - cpu
+    wall = time.perf_counter() - wall
+    for player_id in list(manager.registry):
+        manager.disconnect(player_id)
+    return CountingWebSocket.frames, cpu, wall
+
+
+async def main(games: int, turns: int, move_ms: float) -> None:
+    move_delay = move_ms / 1000
+    updates = games * turns * PLAYERS * AVATARS
+    print(
+        f"{games} games x {PLAYERS} players x {AVATARS} avatars, {turns} turns, "
+        f"a move every {move_ms:g} ms per game: {updates} state updates"
+    )
+    print(f"{'tick':>8}{'frames':>10}{'cpu s':>9}{'wall s':>9}{'frames':>9}{'cpu':>9}")
+    baseline = None
+    for interval in INTERVALS:
+        frames, cpu, wall = await run(interval, games, turns, move_delay)
+        if baseline is None:
+            baseline = frames, cpu
+        label = f"{interval * 1000:g} ms" if interval else "off"
+        print(
+            f"{label:>8}{frames:>10}{cpu:>9.2f}{wall:>9.2f}"
+            f"{frames / baseline[0]:>9.0%}{cpu / baseline[1]:>9.0%}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=4)
+    parser.add_argument("--move-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+    asyncio.run(main(args.games, args.turns, args.move_ms))
@@ -0,0 +1,190 @@
+"""Benchmark turn deadlines for many games at once.
+
+Gives ``--games`` games a pending turn deadline, then changes every game's
+turn ``--changes`` times (replacing its deadline), cancels one game in ten
+and lets the rest expire. The timing wheel of TurnTimers is compared with an
+event loop timer per game (``call_later``, cancelled and recreated on each
+turn change) and with an asyncio task per game sleeping until its deadline.
+Reports microseconds per start / turn change / cancel, how late the last
+turn is ended, the longest the event loop was held up while turns expired,
+and the memory held while the deadlines are pending (measured in a separate
+pass, so tracing does not slow the timed one).
+
+Usage:
+    uv run python -m scripts.bench_turn_timers [--games 300000] [--changes 3]
+        [--timeout 10]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+import tracemalloc
+
+import structlog
+
+from pygridfight.services.turn_timer import TurnTimers
+
+TIMEOUT = 10.0  # long enough that no deadline passes during setup
+
+
+class Wheel:
+    name = "timing wheel"
+
+    def __init__(self) -> None:
+        self.expired = 0
+        self.timers = TurnTimers(timeout=TIMEOUT, on_expire=self.count)
+
+    def count(self, game_id, turn, action) -> None:
+        self.expired += 1
+
+    def start(self, game_id: str, turn: int) -> None:
+        self.timers.start(game_id, "p1", turn)
+
+    def cancel(self, game_id: str) -> None:
+        self.timers.cancel(game_id)
+
+    def close(self) -> None:
+        self.timers.close()
+
+
+class CallLater:
+    name = "timer per game"
+
+    def __init__(self) -> None:
+        self.expired = 0
+        self.handles: dict[str, asyncio.TimerHandle] = {}
+        self.loop = asyncio.get_running_loop()
+
+    def fire(self, game_id: str) -> None:
+        del self.handles[game_id]
+        self.expired += 1
+
+    def start(self, game_id: str, turn: int) -> None:
+        handle = self.handles.get(game_id)
+        if handle is not None:
+            handle.cancel()
+        self.handles[game_id] = self.loop.call_later(TIMEOUT, self.fire, game_id)
+
+    def cancel(self, game_id: str) -> None:
+        self.handles.pop(game_id).cancel()
+
+    def close(self) -> None:
+        for handle in self.handles.values():
+            handle.cancel()
+
+
+class TaskPerGame:
+    name = "task per game"
+
+    def __init__(self) -> None:
+        self.expired = 0
+        self.tasks: dict[str, asyncio.Task] = {}
+
+    async def wait(self, game_id: str) -> None:
+        await asyncio.sleep(TIMEOUT)
+        del self.tasks[game_id]
+        self.expired += 1
+
+    def start(self, game_id: str, turn: int) -> None:
+        task = self.tasks.get(game_id)
+        if task is not None:
+            task.cancel()
+        self.tasks[game_id] = asyncio.create_task(self.wait(game_id))
+
+    def cancel(self, game_id: str) -> None:
+        self.tasks.pop(game_id).cancel()
+
+    def close(self) -> None:
+        for task in self.tasks.values():
+            task.cancel()
+
+
+async def memory_per_game(kind, games: int) -> float:
+    game_ids = [f"g{n}" for n in range(games)]
+    tracemalloc.start()
+    timers = kind()
+    for game_id in game_ids:
+        timers.start(game_id, 0)
+    await asyncio.sleep(0)  # let tasks reach their sleep
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    timers.close()
+    await asyncio.sleep(0)
+    return memory / games
+
+
+async def probe(stalls: list[float]) -> None:
+    """Record the longest gap between wake-ups of a 1 ms sleeper."""
+    last = time.perf_counter()
+    while True:
+        await asyncio.sleep(0.001)
+        now = time.perf_counter()
+        stalls[0] = max(stalls[0], now - last)
+        last = now
+
+
+async def run(kind, games: int, changes: int) -> tuple:
+    game_ids = [f"g{n}" for n in range(games)]
+    timers = kind()
+    start = time.perf_counter()
+    for game_id in game_ids:
+        timers.start(game_id, 0)
+    started = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for turn in range(1, changes + 1):
+        for game_id in game_ids:
+            timers.start(game_id, turn)
+    changed = (time.perf_counter() - start) / changes
+
+    start = time.perf_counter()
+    for game_id in game_ids[::10]:
+        timers.cancel(game_id)
+    cancelled = time.perf_counter() - start
+
+    expected = games - len(game_ids[::10])
+    deadline = time.perf_counter() + TIMEOUT
+    stalls = [0.0]
+    await asyncio.sleep(0)
+    prober = asyncio.create_task(probe(stalls))
+    while timers.expired < expected:
+        await asyncio.sleep(0.01)
+    late = max(0.0, time.perf_counter() - deadline)
+    prober.cancel()
+    timers.close()
+    return (
+        started / games * 1e6,
+        changed / games * 1e6,
+        cancelled / len(game_ids[::10]) * 1e6,
+        late,
+        stalls[0],
+    )
+
+
+async def main(games: int, changes: int) -> None:
+    print(f"{games} games, {changes} turn changes each, {TIMEOUT:g} s turns")
+    print(
+        f"{'mode':<16}{'start us':>10}{'change us':>11}{'cancel us':>11}"
+        f"{'late ms':>10}{'stall ms':>10}{'bytes/game':>12}"
+    )
+    for kind in (TaskPerGame, CallLater, Wheel):
+        memory = await memory_per_game(kind, games)
+        start, change, cancel, late, stall = await run(kind, games, changes)
+        print(
+            f"{kind.name:<16}{start:>10.2f}{change:>11.2f}{cancel:>11.2f}"
+            f"{late * 1000:>10.0f}{stall * 1000:>10.1f}{memory:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=300_000)
+    parser.add_argument("--changes", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=TIMEOUT)
+    args = parser.parse_args()
+    TIMEOUT = args.timeout
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+    asyncio.run(main(args.games, args.changes))
@@ -0,0 +1,195 @@
+"""Server-driven WebSocket heartbeats and idle connection reaping.
+
+A client whose TCP connection died silently (typically a mobile app sent
+to the background) looks connected until a send to it fails, which may
+never happen for a quiet game: its queue and broadcast slots are wasted
+meanwhile. The monitor pings connections that have been quiet for an
+interval and closes those that miss too many pongs.
+
+One timer serves every connection: each sweep walks the watched
+connections in batches, yielding to the event loop between batches, so
+the cost is proportional to the number of connections per interval and
+never one task or timer per socket.
+"""
+
+import asyncio
+import itertools
+import time
+from collections.abc import Callable, Iterable, Iterator
+
+import structlog
+
+from pygridfight.api.outbound import OutboundQueue
+from pygridfight.api.protocol import Payload
+from pygridfight.core.config import get_server_settings
+from pygridfight.core.metrics import get_metrics_registry
+
+logger = structlog.get_logger(__name__)
+
+_metrics = get_metrics_registry()
+HEARTBEAT_PINGS = _metrics.counter(
+    "pygridfight_heartbeat_pings_total",
+    "Heartbeat pings sent to quiet WebSocket connections.",
+).labels()
+REAPED_CONNECTIONS = _metrics.counter(
+    "pygridfight_reaped_connections_total",
+    "WebSocket connections closed for missing heartbeats.",
+).labels()
+HEARTBEAT_SWEEP_SECONDS = _metrics.histogram(
+    "pygridfight_heartbeat_sweep_seconds",
+    "Time spent on one batch of a heartbeat sweep.",
+).labels()
+
+PING = {"type": "ping"}
+# Close code for reaped connections (1001: Going Away).
+REAP_CLOSE_CODE = 1001
+
+
+class HeartbeatMonitor:
+    """Pings quiet connections and reaps those that stop answering.
+
+    Any frame received from a client counts as a sign of life, so busy
+    connections are never pinged. A connection quiet for ``interval``
+    seconds is sent a ping on each sweep; once it has been quiet for
+    ``missed + 1`` intervals it has missed ``missed`` pings and is closed.
+
+    The sweep timer only runs while connections are watched.
+    """
+
+    def __init__(
+        self,
+        interval: float | None = None,
+        missed: int | None = None,
+        batch_size: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the monitor.
+
+        Args:
+            interval: Seconds between sweeps, and of quiet before a
+                connection is pinged; 0 disables heartbeats (default:
+                ServerSettings.ws_heartbeat_interval).
+            missed: Pings a connection may leave unanswered before it is
+                reaped (default: ServerSettings.ws_heartbeat_missed).
+            batch_size: Connections handled per batch of a sweep (default:
+                ServerSettings.ws_heartbeat_batch).
+            clock: Monotonic clock, in seconds.
+        """
+        settings = get_server_settings()
+        self.interval = (
+            interval if interval is not None else settings.ws_heartbeat_interval
+        )
+        self.missed = missed if missed is not None else settings.ws_heartbeat_missed
+        self.batch_size = batch_size or settings.ws_heartbeat_batch
+        self.clock = clock
+        # Watched connection -> when a frame was last received from it.
+        self._last_seen: dict[OutboundQueue, float] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._sweeping = False
+
+    def __len__(self) -> int:
+        return len(self._last_seen)
+
+    def watch(self, queue: OutboundQueue) -> None:
+        """Start watching a connection.
+
+        Must be called from the event loop.
+        """
+        if self.interval <= 0:
+            return
+        self._last_seen[queue] = self.clock()
+        if self._timer is None and not self._sweeping:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.interval, self.sweep
+            )
+
+    def touch(self, queue: OutboundQueue) -> None:
+        """Record that a frame was received on a connection."""
+        if queue in self._last_seen:
+            self._last_seen[queue] = self.clock()
+
+    def forget(self, queue: OutboundQueue) -> None:
+        """Stop watching a connection, e.g. when it disconnects."""
+        self._last_seen.pop(queue, None)
+
+    def sweep(self) -> None:
+        """Start a sweep over every watched connection.
+
+        The sweep continues in batches scheduled on the event loop; the
+        next one is timed ``interval`` seconds after this one started.
+        """
+        if self._timer is not None:
+            self._timer.cancel()  # when called ahead of the timer
+            self._timer = None
+        if self._sweeping:
+            return
+        loop = asyncio.get_running_loop()
+        self._sweeping = True
+        # Snapshot: reaping and disconnects change the table.
+        queues = list(self._last_seen)
+        batches = itertools.batched(queues, self.batch_size)
+        ping = Payload(PING)  # encoded once for the whole sweep
+        loop.call_soon(self._sweep_batch, batches, ping, loop.time())
+
+    def _sweep_batch(
+        self,
+        batches: Iterator[tuple[OutboundQueue, ...]],
+        ping: Payload,
+        started: float,
+    ) -> None:
+        batch = next(batches, None)
+        if batch is None:
+            self._sweeping = False
+            if self._last_seen:
+                loop = asyncio.get_running_loop()
+                delay = max(0.0, started + self.interval - loop.time())
+                self._timer = loop.call_later(delay, self.sweep)
+            return
+        start = time.perf_counter()
+        self.check(batch, ping)
+        HEARTBEAT_SWEEP_SECONDS.observe(time.perf_counter() - start)
+        asyncio.get_running_loop().call_soon(self._sweep_batch, batches, ping, started)
+
+    def check(self, queues: Iterable[OutboundQueue], ping: Payload) -> int:
+        """Ping or reap the quiet connections among ``queues``.
+
+        Returns:
+            Number of connections reaped.
+        """
+        now = self.clock()
+        quiet = self.interval
+        dead = self.interval * (self.missed + 1)
+        reaped = 0
+        for queue in queues:
+            last_seen = self._last_seen.get(queue)
+            if last_seen is None:
+                continue
+            if queue.closed:
+                del self._last_seen[queue]
+                continue
+            idle = now - last_seen
+            if idle >= dead:
+                del self._last_seen[queue]
+                REAPED_CONNECTIONS.inc()
+                logger.info(
+                    "Reaping unresponsive WebSocket",
+                    player_id=queue.player_id,
+                    idle=round(idle, 1),
+                )
+                queue.evict(REAP_CLOSE_CODE, "Heartbeat timeout")
+                reaped += 1
+            elif idle >= quiet:
+                queue.put(ping)
+                HEARTBEAT_PINGS.inc()
+        return reaped
+
+    def close(self) -> None:
+        """Stop sweeping and forget every connection."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._last_seen.clear()
+
+
+# Global heartbeat monitor for player and spectator connections
+heartbeats = HeartbeatMonitor()
@@ -0,0 +1,270 @@
+"""Area-of-interest filtering of game broadcasts for PyGridFight.
+
+In a game created with ``visibility: "area"``, each player is only sent
+what happens within their area of interest: by default the game's
+``view_radius`` cells around each of their avatars, or a viewport or
+radius they chose with ``set_view``. This is what lets area games have
+larger grids than full-visibility ones, where every update goes to
+everyone.
+
+* ``game_state`` broadcasts are cut down, for each player, to their own
+  avatars and the avatars in their area; players that see the same avatars
+  share one encoded payload.
+* Other broadcasts that carry a ``position`` only go to the players whose
+  area contains it; the rest go to everyone.
+
+A game's mode and avatar positions are read from its ``game_state``
+broadcasts and kept in the grid's spatial index, so filtering never reads
+the game store, and a query only looks at the part of the grid the area
+covers. Full-visibility games are left alone, and spectators always see
+the whole game.
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from pygridfight.api.protocol import Payload
+from pygridfight.core.config import get_server_settings
+from pygridfight.core.metrics import get_metrics_registry
+from pygridfight.domain.models.grid import SpatialIndex
+
+_metrics = get_metrics_registry()
+FILTERED_MESSAGES = _metrics.counter(
+    "pygridfight_interest_filtered_total",
+    "Game broadcasts to players of area games, by what they were sent.",
+    labelnames=("outcome",),
+)
+_TRIMMED = FILTERED_MESSAGES.labels("trimmed")
+_SKIPPED = FILTERED_MESSAGES.labels("skipped")
+
+AREA = "area"
+
+
+@dataclass(slots=True)
+class View:
+    """A player's chosen area of interest.
+
+    Attributes:
+        viewport: Fixed rectangle of cells (x0, y0, x1, y1), bounds included.
+        radius: Cells around each of the player's avatars, on both axes.
+    """
+
+    viewport: tuple[int, int, int, int] | None = None
+    radius: int | None = None
+
+
+class _Area:
+    """Interest state of one area game."""
+
+    __slots__ = ("index", "owners", "radius", "source", "views")
+
+    def __init__(self, radius: int, index: SpatialIndex) -> None:
+        self.radius = radius
+        # Avatars of the latest broadcast state, and who owns them.
+        self.index = index
+        self.owners: dict[str, list[str]] = {}
+        self.source: dict | None = None
+        self.views: dict[str, View] = {}
+
+    def visible(
+        self, player_id: str, index: SpatialIndex, owners: dict[str, list[str]]
+    ) -> set[str]:
+        """Avatars a player sees: their own and those in their area."""
+        own = owners.get(player_id, ())
+        view = self.views.get(player_id)
+        if view is not None and view.viewport is not None:
+            return index.query(*view.viewport).union(own)
+        radius = view.radius if view is not None and view.radius else self.radius
+        found = set(own)
+        for avatar_id in own:
+            cell = index.cell(avatar_id)
+            if cell is not None:
+                found |= index.query_radius(*cell, radius)
+        return found
+
+    def contains(self, player_id: str, x: int, y: int) -> bool:
+        """Whether a cell is in a player's area."""
+        view = self.views.get(player_id)
+        if view is not None and view.viewport is not None:
+            x0, y0, x1, y1 = view.viewport
+            return x0 <= x <= x1 and y0 <= y <= y1
+        radius = view.radius if view is not None and view.radius else self.radius
+        for avatar_id in self.owners.get(player_id, ()):
+            cell = self.index.cell(avatar_id)
+            if cell is not None and max(abs(cell[0] - x), abs(cell[1] - y)) <= radius:
+                return True
+        return False
+
+
+def _avatars(game: dict) -> Iterable[tuple[str, str, int, int]]:
+    for avatar_id, avatar in game.get("avatars", {}).items():
+        position = avatar["position"]
+        yield avatar_id, avatar["owner_id"], position["x"], position["y"]
+
+
+class InterestManager:
+    """Filters the broadcasts of area games down to each player's area."""
+
+    def __init__(self, bucket_size: int | None = None) -> None:
+        """Initialize the manager.
+
+        Args:
+            bucket_size: Side, in cells, of the spatial index buckets
+                (default: ServerSettings.interest_bucket_size).
+        """
+        self.bucket_size = bucket_size or get_server_settings().interest_bucket_size
+        self._areas: dict[str, _Area] = {}
+
+    def __len__(self) -> int:
+        return len(self._areas)
+
+    def observe(self, message: dict, game_id: str) -> bool:
+        """Track a live broadcast of a game.
+
+        A ``game_state`` sets the game's mode and moves its avatars in the
+        index.
+
+        Returns:
+            Whether the broadcast needs filtering with ``fan_out``.
+        """
+        if message.get("type") != "game_state":
+            return game_id in self._areas
+        game = message.get("game")
+        if not isinstance(game, dict) or game.get("visibility") != AREA:
+            self._areas.pop(game_id, None)
+            return False
+        area = self._area(game_id, game)
+        index = area.index
+        owners: dict[str, list[str]] = {}
+        for avatar_id, owner_id, x, y in _avatars(game):
+            index.place(avatar_id, x, y)
+            owners.setdefault(owner_id, []).append(avatar_id)
+        if len(index) > sum(map(len, owners.values())):
+            for avatar_ids in area.owners.values():
+                for avatar_id in avatar_ids:
+                    if avatar_id not in game["avatars"]:
+                        index.remove(avatar_id)
+        area.owners = owners
+        area.source = game
+        return True
+
+    def covers(self, message: dict, game_id: str) -> bool:
+        """Whether a past broadcast of a game needs filtering, e.g. a replay."""
+        if message.get("type") == "game_state":
+            game = message.get("game")
+            return isinstance(game, dict) and game.get("visibility") == AREA
+        return game_id in self._areas
+
+    def fan_out(
+        self, payload: Payload, game_id: str, player_ids: Iterable[str]
+    ) -> list[tuple[str, Payload]]:
+        """Get what each player is sent of a broadcast of an area game.
+
+        Returns:
+            (player ID, payload) pairs; players that see nothing of the
+            broadcast are left out.
+        """
+        message = payload.message
+        game = message.get("game")
+        if message.get("type") == "game_state" and isinstance(game, dict):
+            return self._trim_state(payload, game_id, game, player_ids)
+        if message.get("type") == "game_ended":
+            area = self._areas.pop(game_id, None)
+        else:
+            area = self._areas.get(game_id)
+        position = message.get("position")
+        if isinstance(position, dict):
+            x, y = position.get("x"), position.get("y")
+        else:
+            x = y = None
+        # Events without a cell are everyone's concern.
+        if area is None or not isinstance(x, int) or not isinstance(y, int):
+            return [(player_id, payload) for player_id in player_ids]
+        recipients = []
+        for player_id in player_ids:
+            if area.contains(player_id, x, y):
+                recipients.append((player_id, payload))
+            else:
+                _SKIPPED.inc()
+        return recipients
+
+    def _trim_state(
+        self, payload: Payload, game_id: str, game: dict, player_ids: Iterable[str]
+    ) -> list[tuple[str, Payload]]:
+        area = self._area(game_id, game)
+        if game is area.source:
+            index, owners = area.index, area.owners
+        else:
+            # A past state: index it on its own.
+            index = SpatialIndex(self.bucket_size)
+            owners = {}
+            for avatar_id, owner_id, x, y in _avatars(game):
+                index.place(avatar_id, x, y)
+                owners.setdefault(owner_id, []).append(avatar_id)
+        avatars = game.get("avatars", {})
+        # One payload per distinct set of visible avatars.
+        trimmed: dict[frozenset[str], Payload] = {}
+        recipients = []
+        for player_id in player_ids:
+            visible = frozenset(area.visible(player_id, index, owners))
+            item = trimmed.get(visible)
+            if item is None:
+                if len(visible) == len(avatars):
+                    item = payload
+                else:
+                    item = Payload(
+                        {
+                            **payload.message,
+                            "game": {
+                                **game,
+                                "avatars": {
+                                    avatar_id: avatar
+                                    for avatar_id, avatar in avatars.items()
+                                    if avatar_id in visible
+                                },
+                            },
+                        }
+                    )
+                    _TRIMMED.inc()
+                trimmed[visible] = item
+            recipients.append((player_id, item))
+        return recipients
+
+    def _area(self, game_id: str, game: dict) -> _Area:
+        area = self._areas.get(game_id)
+        radius = game.get("view_radius") or 1
+        if area is None:
+            area = self._areas[game_id] = _Area(radius, SpatialIndex(self.bucket_size))
+        else:
+            area.radius = radius
+        return area
+
+    def set_view(
+        self, game_id: str, player_id: str, view: View | None, radius: int
+    ) -> None:
+        """Choose a player's area of interest in an area game.
+
+        Args:
+            game_id: The game.
+            player_id: The player.
+            view: The area, or None for the game's default.
+            radius: The game's default radius, in case the game has not
+                broadcast yet.
+        """
+        area = self._areas.get(game_id)
+        if area is None:
+            area = self._areas[game_id] = _Area(radius, SpatialIndex(self.bucket_size))
+        if view is None:
+            area.views.pop(player_id, None)
+        else:
+            area.views[player_id] = view
+
+    def forget(self, game_id: str, player_id: str) -> None:
+        """Drop a player's chosen area, e.g. when they leave the game."""
+        area = self._areas.get(game_id)
+        if area is not None:
+            area.views.pop(player_id, None)
+
+    def discard(self, game_id: str) -> None:
+        """Forget a game, e.g. when it is deleted."""
+        self._areas.pop(game_id, None)
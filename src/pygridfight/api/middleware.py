@@ -1,44 +1,170 @@
 """Custom middleware for PyGridFight FastAPI app."""
 
+import time
 import uuid
+from collections.abc import Iterable
+from types import FrameType
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from pygridfight.core.config import get_server_settings
 from pygridfight.core.logging import get_logger
+from pygridfight.core.metrics import get_metrics_registry
+from pygridfight.infrastructure.rate_limit import RestRateLimiter, get_rest_limiter
 
 logger = get_logger(__name__)
 
+_metrics = get_metrics_registry()
+REQUEST_SECONDS = _metrics.histogram(
+    "pygridfight_http_request_duration_seconds",
+    "Time to handle an HTTP request, by route template and status code.",
+    labelnames=("method", "route", "status"),
+)
+REQUESTS_IN_FLIGHT = _metrics.gauge(
+    "pygridfight_http_requests_in_flight",
+    "HTTP requests currently being handled.",
+).labels()
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
-    """Middleware to add a unique request ID to each request."""
 
-    async def dispatch(self, request: Request, call_next):
-        request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
-        response = await call_next(request)
-        response.headers["X-Request-ID"] = request_id
-        return response
+class RequestContextMiddleware:
+    """Pure ASGI middleware for request IDs, access logs and error capture.
+
+    Does in one pass what separate ``BaseHTTPMiddleware`` layers would do in
+    three, without their per-request task and response stream wrapping:
+
+    * assigns a request ID, exposed as ``request.state.request_id`` and
+      returned in the ``X-Request-ID`` response header;
+    * logs request start and finish with that ID bound;
+    * tracks requests in flight and records the request duration per route
+      template and status code;
+    * logs unhandled exceptions before re-raising them.
 
+    WebSocket scopes get a request ID and error logging; their messages pass
+    through untouched.
+    """
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware to log request and response details."""
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
-    async def dispatch(self, request: Request, call_next):
-        log = logger.bind(request_id=getattr(request.state, "request_id", None))
-        log.info("Request started", method=request.method, url=str(request.url))
-        response = await call_next(request)
-        log.info("Request finished", status_code=response.status_code)
-        return response
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        request_id = str(uuid.uuid4())
+        scope.setdefault("state", {})["request_id"] = request_id
+        log = logger.bind(request_id=request_id)
 
+        if scope["type"] == "websocket":
+            try:
+                await self.app(scope, receive, send)
+            except Exception as exc:
+                log.error("Unhandled exception", error=str(exc), path=scope["path"])
+                raise
+            return
 
-class ErrorHandlingMiddleware(BaseHTTPMiddleware):
-    """Middleware to catch unhandled exceptions and log them."""
+        status_code = None
 
-    async def dispatch(self, request: Request, call_next):
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append("X-Request-ID", request_id)
+            await send(message)
+
+        log.info("Request started", method=scope["method"], path=scope["path"])
+        start = time.perf_counter()
+        REQUESTS_IN_FLIGHT.inc()
         try:
-            return await call_next(request)
+            await self.app(scope, receive, send_with_request_id)
         except Exception as exc:
-            log = logger.bind(request_id=getattr(request.state, "request_id", None))
+            status_code = 500
             log.error("Unhandled exception", error=str(exc))
             raise
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            # Label by route template, not raw path, to bound cardinality.
+            route = getattr(scope.get("route"), "path", "<unmatched>")
+            REQUEST_SECONDS.labels(scope["method"], route, str(status_code)).observe(
+                time.perf_counter() - start
+            )
+        log.info("Request finished", status_code=status_code)
+
+
+class RateLimitMiddleware:
+    """Pure ASGI middleware answering 429 to clients over their request rate.
+
+    Each HTTP request is charged to its client IP's token bucket before
+    anything else runs, so an over-limit client costs one bucket check.
+    Exempt paths (health probes, metrics scrapes) and WebSocket scopes,
+    which are limited per message, pass through.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiter: RestRateLimiter | None = None,
+        exempt: Iterable[str] | None = None,
+    ) -> None:
+        """Initialize the middleware.
+
+        Args:
+            app: The wrapped application.
+            limiter: Per-IP request limiter (default: the process-wide one,
+                None when rate limiting is disabled).
+            exempt: Paths never limited (default:
+                ServerSettings.rest_rate_limit_exempt).
+        """
+        self.app = app
+        self.limiter = limiter if limiter is not None else get_rest_limiter()
+        self.exempt = frozenset(
+            exempt
+            if exempt is not None
+            else get_server_settings().rest_rate_limit_exempt
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            self.limiter is None
+            or scope["type"] != "http"
+            or scope["path"] in self.exempt
+        ):
+            await self.app(scope, receive, send)
+            return
+        client = scope.get("client")
+        retry_after = self.limiter.check(client[0] if client else "unknown")
+        if retry_after is None:
+            await self.app(scope, receive, send)
+            return
+        response = JSONResponse(
+            {"message": "Too many requests"},
+            status_code=429,
+            headers={"Retry-After": str(retry_after)},
+        )
+        await response(scope, receive, send)
+
+
+def request_profile_tags(frame: FrameType) -> Iterable[str]:
+    """Tag a sampled stack with the request being handled in ``frame``.
+
+    ``frame`` runs ``RequestContextMiddleware.__call__``; its ``scope`` gives
+    the matched route template and the game id, taken from
+    ``request.state.game_id`` when a handler set it, else from the path.
+    """
+    scope = frame.f_locals.get("scope")
+    if not scope:
+        return ()
+    route = getattr(scope.get("route"), "path", "<unmatched>")
+    game_id = scope.get("state", {}).get("game_id") or scope.get("path_params", {}).get(
+        "game_id"
+    )
+    tags = [f"route={route}"]
+    if game_id:
+        tags.append(f"game_id={game_id}")
+    return tags
+
+
+# Taggers for SamplingProfiler: split profiles by request context.
+PROFILE_TAGGERS = {RequestContextMiddleware.__call__.__code__: request_profile_tags}
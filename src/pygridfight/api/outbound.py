@@ -0,0 +1,298 @@
+"""Per-connection outbound WebSocket queues for PyGridFight.
+
+Producers (handlers, the game engine, broadcasts) only append pre-encoded
+messages to a connection's bounded queue; a writer task per connection
+drains it to the socket in the connection's negotiated wire protocol. A
+slow client therefore only ever backs up its own queue, and what happens
+when that queue fills up is decided by policy.
+"""
+
+import asyncio
+import contextlib
+import time
+from collections import deque
+from collections.abc import Callable, Hashable
+
+import anyio
+import structlog
+from fastapi import WebSocket, WebSocketDisconnect
+
+from pygridfight.api.protocol import JsonSession, Payload, Session
+from pygridfight.core.metrics import get_metrics_registry
+
+logger = structlog.get_logger(__name__)
+
+_metrics = get_metrics_registry()
+PENDING_SENDS = _metrics.gauge(
+    "pygridfight_websocket_pending_sends",
+    "Outbound WebSocket messages queued but not yet sent.",
+).labels()
+DROPPED_MESSAGES = _metrics.counter(
+    "pygridfight_websocket_dropped_messages_total",
+    "Outbound WebSocket messages dropped before sending, by reason.",
+    labelnames=("reason",),
+)
+_COALESCED = DROPPED_MESSAGES.labels("coalesced")
+_OVERFLOW = DROPPED_MESSAGES.labels("overflow")
+_CLEARED = DROPPED_MESSAGES.labels("cleared")
+OVERFLOW_DISCONNECTS = _metrics.counter(
+    "pygridfight_websocket_overflow_disconnects_total",
+    "Connections closed because their outbound queue stayed full.",
+).labels()
+SEND_FAILURES = _metrics.counter(
+    "pygridfight_websocket_send_failures_total",
+    "WebSocket sends that failed and dropped the connection.",
+).labels()
+SEND_TIMEOUTS = _metrics.counter(
+    "pygridfight_websocket_send_timeouts_total",
+    "WebSocket sends that timed out and evicted the connection.",
+).labels()
+
+# Overflow policies.
+DROP_OLDEST = "drop_oldest"
+DISCONNECT = "disconnect"
+
+
+class _Entry:
+    """A queued message; ``live`` is cleared when a newer one supersedes it."""
+
+    __slots__ = ("live", "payload")
+
+    def __init__(self, payload: Payload) -> None:
+        self.payload = payload
+        self.live = True
+
+
+class OutboundQueue:
+    """Bounded outbound queue and writer task for one WebSocket.
+
+    Overflow policies:
+
+    * ``drop_oldest``: when full, the oldest queued message is dropped to
+      make room. Used for spectators, who only need recent state.
+    * ``disconnect``: the queue may run past ``maxsize`` (up to twice that)
+      to ride out short bursts, but a connection that stays over ``maxsize``
+      for ``overflow_grace`` seconds, or reaches the hard cap, is closed.
+      Used for players, who must not silently miss messages.
+
+    In both policies a message with a coalescing key replaces any queued,
+    not yet sent message with the same key (e.g. an older ``game_state``
+    for the same game), since only the newest one matters.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        player_id: str,
+        on_close: Callable[[str], None],
+        maxsize: int = 256,
+        policy: str = DISCONNECT,
+        send_timeout: float = 1.0,
+        overflow_grace: float = 5.0,
+        session: Session | None = None,
+    ) -> None:
+        """Initialize the queue and start its writer task.
+
+        Args:
+            websocket: The connected socket.
+            player_id: ID the connection is registered under.
+            on_close: Called with ``player_id`` when the writer gives up on
+                the connection (send failure, timeout or overflow).
+            maxsize: Queued messages before the overflow policy applies.
+            policy: ``drop_oldest`` or ``disconnect``.
+            send_timeout: Seconds a single send may take.
+            overflow_grace: Seconds the queue may stay over ``maxsize``
+                under the ``disconnect`` policy.
+            session: Wire protocol state of the connection (default: JSON).
+        """
+        self.websocket = websocket
+        self.player_id = player_id
+        self.maxsize = maxsize
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self.overflow_grace = overflow_grace
+        self.session = session if session is not None else JsonSession()
+        self._on_close = on_close
+        self._queue: deque[_Entry] = deque()
+        self._latest: dict[Hashable, _Entry] = {}
+        self._size = 0  # live entries in _queue
+        self._overflow_since: float | None = None
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self.closed = False
+        self._close_task: asyncio.Task | None = None
+        self._task = asyncio.create_task(self._run())
+
+    def __len__(self) -> int:
+        return self._size
+
+    def put(self, payload: Payload, coalesce_key: Hashable | None = None) -> bool:
+        """Queue a message without blocking.
+
+        The payload is encoded for this connection's protocol right away (at
+        most once per protocol, however many connections it is queued for),
+        so encoding errors surface to the producer.
+
+        Args:
+            payload: Message to send.
+            coalesce_key: Messages sharing a key supersede each other.
+
+        Returns:
+            False if the connection is closed (or was just closed because of
+            overflow), else True.
+        """
+        if self.closed:
+            return False
+        self.session.prepare(payload)
+        if coalesce_key is not None:
+            previous = self._latest.get(coalesce_key)
+            if previous is not None and previous.live:
+                previous.live = False
+                self._size -= 1
+                PENDING_SENDS.dec()
+                _COALESCED.inc()
+        if self._size >= self.maxsize and not self._overflow():
+            return False
+        entry = _Entry(payload)
+        if coalesce_key is not None:
+            self._latest[coalesce_key] = entry
+        self._queue.append(entry)
+        self._size += 1
+        PENDING_SENDS.inc()
+        self._idle.clear()
+        self._wakeup.set()
+        return True
+
+    async def drained(self) -> None:
+        """Wait until every queued message has been sent (or dropped)."""
+        await self._idle.wait()
+
+    def clear(self) -> int:
+        """Discard queued messages, keeping the connection open.
+
+        Returns:
+            Number of messages discarded.
+        """
+        dropped = self._size
+        if dropped:
+            PENDING_SENDS.dec(dropped)
+            _CLEARED.inc(dropped)
+        self._size = 0
+        self._queue.clear()
+        self._latest.clear()
+        self._overflow_since = None
+        return dropped
+
+    def close(self) -> None:
+        """Stop the writer and discard queued messages."""
+        if self.closed:
+            return
+        self.closed = True
+        PENDING_SENDS.dec(self._size)
+        self._size = 0
+        self._queue.clear()
+        self._latest.clear()
+        self._idle.set()
+        if self._task is not asyncio.current_task():
+            self._task.cancel()
+
+    def evict(self, close_code: int, reason: str) -> None:
+        """Close the connection from the server side, e.g. when it is idle.
+
+        The owner is notified as when the writer gives up, and the socket
+        close is bounded by ``send_timeout``.
+        """
+        if not self.closed:
+            self._give_up(close_code=close_code, reason=reason)
+
+    def _overflow(self) -> bool:
+        """Apply the overflow policy to a full queue.
+
+        Returns:
+            True if the new message may still be queued.
+        """
+        if self.policy == DROP_OLDEST:
+            while self._size >= self.maxsize:
+                entry = self._queue.popleft()
+                if entry.live:
+                    entry.live = False
+                    self._size -= 1
+                    PENDING_SENDS.dec()
+                    _OVERFLOW.inc()
+            return True
+        now = time.monotonic()
+        if self._overflow_since is None:
+            self._overflow_since = now
+        if (
+            now - self._overflow_since < self.overflow_grace
+            and self._size < 2 * self.maxsize
+        ):
+            return True
+        OVERFLOW_DISCONNECTS.inc()
+        logger.warning(
+            "Closing connection with sustained outbound overflow",
+            player_id=self.player_id,
+            queued=self._size,
+        )
+        self._give_up(close_code=1008, reason="Outbound queue overflow")
+        return False
+
+    async def _run(self) -> None:
+        while True:
+            if not self._queue:
+                self._idle.set()
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            entry = self._queue.popleft()
+            if not entry.live:
+                continue
+            entry.live = False
+            self._size -= 1
+            PENDING_SENDS.dec()
+            if self._size < self.maxsize:
+                self._overflow_since = None
+            if not await self._send(self.session.render(entry.payload)):
+                return
+
+    async def _send(self, data: str | bytes) -> bool:
+        try:
+            with anyio.fail_after(self.send_timeout):
+                if isinstance(data, bytes):
+                    await self.websocket.send_bytes(data)
+                else:
+                    await self.websocket.send_text(data)
+            return True
+        except TimeoutError:
+            SEND_TIMEOUTS.inc()
+            logger.warning(
+                "Evicting stuck WebSocket",
+                player_id=self.player_id,
+                timeout=self.send_timeout,
+            )
+            self._give_up(close_code=1008, reason="Send timed out")
+        except (WebSocketDisconnect, RuntimeError, OSError) as e:
+            # Gone, closed under us, or a transport error.
+            logger.error(
+                "Failed to send message", player_id=self.player_id, error=str(e)
+            )
+            self._give_up()
+        SEND_FAILURES.inc()
+        return False
+
+    def _give_up(self, close_code: int | None = None, reason: str = "") -> None:
+        """Close the queue, notify the owner and close the socket if asked."""
+        self.close()
+        self._on_close(self.player_id)
+        if close_code is not None:
+            # Closing may block on the same full buffer; bound it and keep
+            # it off the producer's path.
+            self._close_task = asyncio.create_task(
+                self._close_socket(close_code, reason)
+            )
+
+    async def _close_socket(self, code: int, reason: str) -> None:
+        with anyio.move_on_after(self.send_timeout):
+            with contextlib.suppress(WebSocketDisconnect, RuntimeError, OSError):
+                await self.websocket.close(code=code, reason=reason)
@@ -0,0 +1,1108 @@
+"""WebSocket wire protocols for PyGridFight.
+
+Clients choose a protocol when they connect by offering WebSocket
+subprotocols (``Sec-WebSocket-Protocol``) in order of preference:
+
+* ``pygridfight.json.v1``: JSON text frames. Also used when a client offers
+  no subprotocol, so existing clients keep working unchanged.
+* ``pygridfight.bin.v1``: compact binary frames, described below.
+
+A client offering only unknown protocols is refused, so incompatible
+versions fail at connect time instead of mid-game.
+
+Binary frames are laid out as::
+
+    type code | handle definitions | body
+
+Integers are LEB128 varints (signed ones zigzag encoded) and strings are a
+byte length followed by UTF-8. The type code is the 1-based position of the
+message type in ``MessageType`` (new types must be appended). The body holds
+the fields of that type's model from ``messages.py`` in declaration order,
+without names; the schemas are derived from those models, so the two cannot
+drift apart. Code 0 is a JSON escape whose body is a JSON object, used for
+any message that does not fit its schema.
+
+Ids (fields named ``id`` or ``*_id``, and keys of id-keyed maps) are sent as
+per-session integer handles. The server assigns a handle the first time it
+sends an id on a connection and defines it in that frame's handle
+definitions (a count, then handle and string pairs); the client keeps the
+mapping for the rest of the session. Clients send no definitions: they
+refer to ids by a handle they were given, or by handle 0 followed by the
+id string. Positions are two varints, so a coordinate below 128 takes one
+byte.
+
+Frames received from clients are parsed into the ``ClientMessage`` models
+of ``messages.py`` by one precompiled validator that picks the model from
+the ``type`` tag; JSON frames are validated straight from their text.
+"""
+
+import json
+import re
+import struct
+import types
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from datetime import datetime
+from enum import Enum
+from itertools import pairwise
+from operator import itemgetter
+from typing import Any, Union, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter
+from pydantic import ValidationError as PydanticValidationError
+
+from pygridfight.api.responses import dumps
+from pygridfight.api.schemas.actions import ActionType
+from pygridfight.api.schemas.messages import (
+    ClientMessage,
+    MessageType,
+    WebSocketMessage,
+)
+from pygridfight.core.exceptions import ProtocolError, ValidationError
+
+JSON_V1 = "pygridfight.json.v1"
+BINARY_V1 = "pygridfight.bin.v1"
+SUPPORTED_PROTOCOLS = (JSON_V1, BINARY_V1)
+
+JSON_CODE = 0
+
+# Marks an optional field that is absent from the message (as opposed to
+# present with a null value), so decoding gives back the same keys.
+_MISSING: Any = object()
+_DOUBLE = struct.Struct("<d")
+
+
+def select_protocol(offered: Sequence[str]) -> str | None:
+    """Pick the first supported protocol among those a client offered.
+
+    Args:
+        offered: Subprotocols from the handshake, in client preference order.
+
+    Returns:
+        The protocol to use, or None if none of them is supported.
+    """
+    for protocol in offered:
+        if protocol in SUPPORTED_PROTOCOLS:
+            return protocol
+    return None
+
+
+class _Mismatch(Exception):
+    """A message does not fit its schema; it is sent as JSON instead."""
+
+
+def _put_uint(buf: bytearray, n: int) -> None:
+    while n >= 0x80:
+        buf.append((n & 0x7F) | 0x80)
+        n >>= 7
+    buf.append(n)
+
+
+def _put_text(buf: bytearray, text: str) -> None:
+    data = text.encode()
+    _put_uint(buf, len(data))
+    buf += data
+
+
+class _Writer:
+    """Builds a frame body, noting where each id reference goes."""
+
+    __slots__ = ("buf", "ids", "offsets")
+
+    def __init__(self) -> None:
+        self.buf = bytearray()
+        self.ids: list[str] = []
+        self.offsets: list[int] = []
+
+
+class _Reader:
+    """Reads a binary frame, resolving id handles through ``ids``."""
+
+    __slots__ = ("data", "ids", "pos")
+
+    def __init__(self, data: bytes, ids: dict[int, str]) -> None:
+        self.data = data
+        self.ids = ids
+        self.pos = 0
+
+    def uint(self) -> int:
+        data = self.data
+        pos = self.pos
+        result = shift = 0
+        while True:
+            if pos >= len(data):
+                raise ProtocolError("Truncated frame")
+            byte = data[pos]
+            pos += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+            if shift > 63:
+                raise ProtocolError("Varint too long")
+        self.pos = pos
+        return result
+
+    def take(self, size: int) -> bytes:
+        end = self.pos + size
+        if end > len(self.data):
+            raise ProtocolError("Truncated frame")
+        data = self.data[self.pos : end]
+        self.pos = end
+        return data
+
+    def text(self) -> str:
+        try:
+            return self.take(self.uint()).decode()
+        except UnicodeDecodeError as e:
+            raise ProtocolError("Invalid UTF-8 string") from e
+
+
+class _Codegen:
+    """Source of one generated encoder or decoder function.
+
+    Schemas are compiled to straight-line Python, one function per message
+    type, so encoding and decoding a message runs no per-field dispatch:
+    every field's checks and varint handling are inlined in declaration
+    order, nested models included, and the function only calls out for
+    long varints and embedded JSON.
+
+    Encoders run with ``w`` (the _Writer) and its ``buf``, ``append``,
+    ``offsets`` and ``refs`` as locals. Decoders run with ``r`` (the
+    _Reader), its ``data`` and ``ids``, and ``pos``, the read position,
+    which is stored back to ``r.pos`` around any call that reads from
+    ``r`` itself.
+    """
+
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+        self.depth = 1
+        self.count = 0
+        self.namespace: dict[str, Any] = {
+            "_Mismatch": _Mismatch,
+            "_MISSING": _MISSING,
+            "ProtocolError": ProtocolError,
+            "_put_uint": _put_uint,
+            "_DOUBLE_PACK": _DOUBLE.pack,
+            "_DOUBLE_UNPACK": _DOUBLE.unpack_from,
+            "datetime": datetime,
+        }
+
+    def line(self, text: str) -> None:
+        self.lines.append("    " * self.depth + text)
+
+    @contextmanager
+    def block(self, header: str) -> Iterator[None]:
+        self.line(header)
+        self.depth += 1
+        yield
+        self.depth -= 1
+
+    def var(self) -> str:
+        """A fresh local variable name."""
+        self.count += 1
+        return f"v{self.count}"
+
+    def const(self, value: Any) -> str:
+        """Name under which the generated code sees ``value``."""
+        name = f"k{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    def put_uint(self, n: str) -> None:
+        with self.block(f"if {n} < 0x80:"):
+            self.line(f"append({n})")
+        with self.block("else:"):
+            self.line(f"_put_uint(buf, {n})")
+
+    def put_text(self, text: str) -> None:
+        data = self.var()
+        self.line(f"{data} = {text}.encode()")
+        self.put_uint(f"len({data})")
+        self.line(f"buf += {data}")
+
+    def uint(self, target: str) -> None:
+        self.line(f"{target} = data[pos]")
+        self.line("pos += 1")
+        with self.block(f"if {target} >= 0x80:"):
+            self.line("r.pos = pos - 1")
+            self.line(f"{target} = r.uint()")
+            self.line("pos = r.pos")
+
+    def text(self, target: str) -> None:
+        size = self.var()
+        self.uint(size)
+        with self.block(f"if pos + {size} > len(data):"):
+            self.line('raise ProtocolError("Truncated frame")')
+        with self.block("try:"):
+            self.line(f"{target} = data[pos : pos + {size}].decode()")
+        with self.block("except UnicodeDecodeError as e:"):
+            self.line('raise ProtocolError("Invalid UTF-8 string") from e')
+        self.line(f"pos += {size}")
+
+    def ref(self, target: str) -> None:
+        handle = self.var()
+        self.uint(handle)
+        with self.block(f"if {handle}:"):
+            self.line(f"{target} = ids.get({handle})")
+            with self.block(f"if {target} is None:"):
+                self.line(f'raise ProtocolError(f"Unknown id handle {{{handle}}}")')
+        with self.block("else:"):
+            self.text(target)
+
+    def compile_writer(self, schema: "_Struct") -> Callable[[_Writer, Any], None]:
+        self.line("buf = w.buf")
+        self.line("append = buf.append")
+        self.line("offsets = w.offsets")
+        self.line("refs = w.ids")
+        schema.emit_write(self, "value")
+        return self._compile("write", "w, value")
+
+    def compile_reader(self, schema: "_Struct") -> Callable[[_Reader, dict], dict]:
+        self.line("data = r.data")
+        self.line("ids = r.ids")
+        self.line("pos = r.pos")
+        with self.block("try:"):
+            schema.emit_fields(self, "result")
+        with self.block("except IndexError:"):
+            self.line('raise ProtocolError("Truncated frame") from None')
+        self.line("r.pos = pos")
+        self.line("return result")
+        return self._compile("read_into", "r, result")
+
+    def _compile(self, name: str, params: str) -> Callable[..., Any]:
+        source = "\n".join([f"def {name}({params}):", *self.lines])
+        # The source is built from the message models only, never from input.
+        exec(compile(source, f"<protocol {name}>", "exec"), self.namespace)  # noqa: S102
+        return self.namespace[name]
+
+
+class _Kind:
+    """Encoding of one schema field type, as code generated into codecs."""
+
+    __slots__ = ()
+
+    # Whether reading may give _MISSING (an absent optional field).
+    optional = False
+
+    def emit_write(self, g: _Codegen, value: str) -> None:
+        """Emit code writing local ``value``, or raising _Mismatch."""
+        raise NotImplementedError
+
+    def emit_read(self, g: _Codegen, target: str) -> None:
+        """Emit code reading a value into local ``target``."""
+        raise NotImplementedError
+
+
+class _Str(_Kind):
+    __slots__ = ()
+
+    def emit_write(self, g: _Codegen, value: str) -> None:
+        with g.block(f"if type({value}) is not str:"):
+            with g.block(f"if isinstance({value}, datetime):"):
+                g.line(f"{value} = {value}.isoformat()")
+            with g.block(f"elif not isinstance({value}, str):"):
+                g.line("raise _Mismatch")
+        g.put_text(value)
+
+    def emit_read(self, g: _Codegen, target: str) -> None:
+        g.text(target)
+
+
+class _Id(_Kind):
+    __slots__ = ()
+
+    def emit_write(self, g: _Codegen, value: str) -> None:
+        with g.block(f"if type({value}) is not str:"):
+            g.line("raise _Mismatch")
+        g.line("offsets.append(len(buf))")
+        g.line(f"refs.append({value})")
+
+    def emit_read(self, g: _Codegen, target: str) -> None:
+        g.ref(target)
+
+
+class _Int(_Kind):
+    __slots__ = ()
+
+    def emit_write(self, g: _Codegen, value: str) -> None:
+        with g.block(f"if type({value}) is not int:"):
+            g.line("raise _Mismatch")
+        n = g.var()
+        g.line(f"{n} = {value} << 1 if {value} >= 0 else (~{value} << 1) | 1")
+        g.put_uint(n)
+
+    def emit_read(self, g: _Codegen, target: str) -> None:
+        g.uint(target)
+        g.line(f"{target} = ({target} >> 1) ^ -({target} & 1)")
+
+
+class _Float(_Kind):
+    __slots__ = ()
+
+    def emit_write(self, g: _Codegen, value: str) -> None:
+        with g.block(f"if type({value}) is not float:"):
+            g.line("raise _Mismatch")
+        g.line(f"buf += _DOUBLE_PACK({value})")
+
+    def emit_read(self, g: _Codegen, target: str) -> None:
+        with g.block(f"if pos + {_DOUBLE.size} > len(data):"):
+            g.line('raise ProtocolError("Truncated frame")')
+        g.line(f"{target} = _DOUBLE_UNPACK(data, pos)[0]")
+        g.line(f"pos += {_DOUBLE.size}")
+
+
+class _Bool(_Kind):
+    __slots__ = ()
+
+    def emit_write(self, g: _Codegen, value: str) -> None:
+        with g.block(f"if type({value}) is not bool:"):
+            g.line("raise _Mismatch")
+        g.line(f"append({value})")
+
+    def emit_read(self, g: _Codegen, target: str) -> None:
+        g.uint(target)
+        with g.block(f"if {target} > 1:"):
+            g.line('raise ProtocolError("Invalid boolean")')
+        g.line(f"{target} = {target} == 1")
+
+
+class _Position(_Kind):
+    __slots__ = ()
+
+    def emit_write(self, g: _Codegen, value: str) -> None:
+        x, y = g.var(), g.var()
+        with g.block(f"if type({value}) is not dict or len({value}) != 2:"):
+            g.line("raise _Mismatch")
+        g.line(f'{x} = {value}.get("x")')
+        g.line(f'{y} = {value}.get("y")')
+        with g.block(
+            f"if type({x}) is not int or type({y}) is not int or {x} < 0 or {y} < 0:"
+        ):
+            g.line("raise _Mismatch")
+        with g.block(f"if {x} < 0x80 and {y} < 0x80:"):
+            g.line(f"append({x})")
+            g.line(f"append({y})")
+        with g.block("else:"):
+            g.line(f"_put_uint(buf, {x})")
+            g.line(f"_put_uint(buf, {y})")
+
+    def emit_read(self, g: _Codegen, target: str) -> None:
+        x, y = g.var(), g.var()
+        g.uint(x)
+        g.uint(y)
+        g.line(f'{target} = {{"x": {x}, "y": {y}}}')
+
+
+class _Choice(_Kind):
+    """A value from a fixed set (an Enum), sent as its index."""
+
+    __slots__ = ("index", "values")
+
+    def __init__(self, values: Sequence[str]) -> None:
+        self.values = tuple(values)
+        self.index = {value: i for i, value in enumerate(self.values)}
+
+    def emit_write(self, g: _Codegen, value: str) -> None:
+        n = g.var()
+        with g.block("try:"):
+            g.line(f"{n} = {g.const(self.index)}[{value}]")
+        with g.block("except (KeyError, TypeError):"):
+            g.line("raise _Mismatch from None")
+        g.put_uint(n)
+
+    def emit_read(self, g: _Codegen, target: str) -> None:
+        g.uint(target)
+        with g.block(f"if {target} >= {len(self.values)}:"):
+            g.line('raise ProtocolError("Invalid enum value")')
+        g.line(f"{target} = {g.const(self.values)}[{target}]")
+
+
+class _Optional(_Kind):
+    """An optional field: a tag (absent, null or present), then the value."""
+
+    __slots__ = ("inner",)
+
+    optional = True
+
+    def __init__(self, inner: _Kind) -> None:
+        self.inner = inner
+
+    def emit_write(self, g: _Codegen, value: str) -> None:
+        with g.block(f"if {value} is _MISSING:"):
+            g.line("append(0)")
+        with g.block(f"elif {value} is None:"):
+            g.line("append(1)")
+        with g.block("else:"):
+            g.line("append(2)")
+            self.inner.emit_write(g, value)
+
+    def emit_read(self, g: _Codegen, target: str) -> None:
+        g.uint(target)
+        with g.block(f"if {target} == 0:"):
+            g.line(f"{target} = _MISSING")
+        with g.block(f"elif {target} == 1:"):
+            g.line(f"{target} = None")
+        with g.block(f"elif {target} == 2:"):
+            self.inner.emit_read(g, target)
+        with g.block("else:"):
+            g.line('raise ProtocolError("Invalid optional tag")')
+
+
+class _List(_Kind):
+    __slots__ = ("item",)
+
+    def __init__(self, item: _Kind) -> None:
+        self.item = item
+
+    def emit_write(self, g: _Codegen, value: str) -> None:
+        item = g.var()
+        with g.block(f"if type({value}) is not list:"):
+            g.line("raise _Mismatch")
+        g.put_uint(f"len({value})")
+        with g.block(f"for {item} in {value}:"):
+            self.item.emit_write(g, item)
+
+    def emit_read(self, g: _Codegen, target: str) -> None:
+        count, item = g.var(), g.var()
+        g.uint(count)
+        g.line(f"{target} = []")
+        with g.block(f"for _ in range({count}):"):
+            self.item.emit_read(g, item)
+            g.line(f"{target}.append({item})")
+
+
+class _IdMap(_Kind):
+    """A dict keyed by id, sent as a count then (id, value) pairs."""
+
+    __slots__ = ("item",)
+
+    def __init__(self, item: _Kind) -> None:
+        self.item = item
+
+    def emit_write(self, g: _Codegen, value: str) -> None:
+        key, item = g.var(), g.var()
+        with g.block(f"if type({value}) is not dict:"):
+            g.line("raise _Mismatch")
+        g.put_uint(f"len({value})")
+        with g.block(f"for {key}, {item} in {value}.items():"):
+            with g.block(f"if not isinstance({key}, str):"):
+                g.line("raise _Mismatch")
+            g.line("offsets.append(len(buf))")
+            g.line(f"refs.append({key})")
+            self.item.emit_write(g, item)
+
+    def emit_read(self, g: _Codegen, target: str) -> None:
+        count, key, item = g.var(), g.var(), g.var()
+        g.uint(count)
+        g.line(f"{target} = {{}}")
+        with g.block(f"for _ in range({count}):"):
+            g.ref(key)
+            self.item.emit_read(g, item)
+            g.line(f"{target}[{key}] = {item}")
+
+
+class _Json(_Kind):
+    """Free-form data (``dict[str, Any]`` fields), sent as embedded JSON."""
+
+    __slots__ = ()
+
+    def emit_write(self, g: _Codegen, value: str) -> None:
+        g.line(f"{g.const(self.write)}(buf, {value})")
+
+    def emit_read(self, g: _Codegen, target: str) -> None:
+        g.line("r.pos = pos")
+        g.line(f"{target} = {g.const(self.read)}(r)")
+        g.line("pos = r.pos")
+
+    @staticmethod
+    def write(buf: bytearray, value: Any) -> None:
+        if value is _MISSING:
+            raise _Mismatch
+        try:
+            data = dumps(value)
+        except (TypeError, ValueError):
+            raise _Mismatch from None
+        _put_uint(buf, len(data))
+        buf += data
+
+    @staticmethod
+    def read(r: _Reader) -> Any:
+        try:
+            return json.loads(r.take(r.uint()))
+        except ValueError as e:
+            raise ProtocolError("Invalid embedded JSON") from e
+
+
+class _Struct(_Kind):
+    """A model's fields in declaration order, without their names.
+
+    ``write`` and ``read_into`` are the compiled codecs of the schema.
+    """
+
+    __slots__ = ("allowed", "fields", "read_into", "write")
+
+    def __init__(
+        self, fields: Sequence[tuple[str, _Kind]], implicit: Sequence[str] = ()
+    ) -> None:
+        self.fields = tuple(fields)
+        self.allowed = frozenset(name for name, _ in self.fields) | set(implicit)
+        self.write = _Codegen().compile_writer(self)
+        self.read_into = _Codegen().compile_reader(self)
+
+    def emit_write(self, g: _Codegen, value: str) -> None:
+        allowed = g.const(self.allowed)
+        with g.block(
+            f"if type({value}) is not dict or not {value}.keys() <= {allowed}:"
+        ):
+            g.line("raise _Mismatch")
+        get = g.var()
+        g.line(f"{get} = {value}.get")
+        for name, kind in self.fields:
+            field = g.var()
+            g.line(f"{field} = {get}({name!r}, _MISSING)")
+            kind.emit_write(g, field)
+
+    def emit_read(self, g: _Codegen, target: str) -> None:
+        g.line(f"{target} = {{}}")
+        self.emit_fields(g, target)
+
+    def emit_fields(self, g: _Codegen, target: str) -> None:
+        """Emit code reading the fields into the existing dict ``target``."""
+        for name, kind in self.fields:
+            field = g.var()
+            kind.emit_read(g, field)
+            if kind.optional:
+                with g.block(f"if {field} is not _MISSING:"):
+                    g.line(f"{target}[{name!r}] = {field}")
+            else:
+                g.line(f"{target}[{name!r}] = {field}")
+
+
+_STR = _Str()
+_ID = _Id()
+_INT = _Int()
+_FLOAT = _Float()
+_BOOL = _Bool()
+_POSITION = _Position()
+_JSON = _Json()
+
+
+def _is_id(name: str) -> bool:
+    return name == "id" or name.endswith(("_id", "_ids"))
+
+
+def _kind_for(annotation: Any, name: str) -> _Kind:
+    """Derive the wire encoding of a model field from its annotation."""
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+    if origin in (Union, types.UnionType):
+        inner = [arg for arg in args if arg is not type(None)]
+        if len(inner) != 1:
+            return _JSON
+        kind = _kind_for(inner[0], name)
+        return kind if len(inner) == len(args) else _Optional(kind)
+    if origin is list:
+        return _List(_kind_for(args[0], name))
+    if origin is dict:
+        if args[1] is Any:
+            return _JSON
+        return _IdMap(_kind_for(args[1], ""))
+    if annotation is bool:
+        return _BOOL
+    if annotation is int:
+        return _INT
+    if annotation is float:
+        return _FLOAT
+    if annotation in (str, datetime):
+        return _ID if _is_id(name) and annotation is str else _STR
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return _Choice([member.value for member in annotation])
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        if set(annotation.model_fields) == {"x", "y"}:
+            return _POSITION
+        return _struct_for(annotation)
+    return _JSON
+
+
+def _struct_for(model: type[BaseModel], skip: Sequence[str] = ()) -> _Struct:
+    fields = [
+        (name, _kind_for(field.annotation, name))
+        for name, field in model.model_fields.items()
+        if name not in skip
+    ]
+    return _Struct(fields, implicit=skip)
+
+
+# Layout of ``action`` in player_action messages (a free-form dict in
+# messages.py): the union of the action schemas in actions.py, whose fields
+# are ids and positions. Fields an action type does not use are absent.
+_ACTION = _Struct(
+    [
+        ("type", _kind_for(ActionType, "type")),
+        ("player_id", _ID),
+        ("target_position", _Optional(_POSITION)),
+        ("weapon_id", _Optional(_ID)),
+        ("item_id", _Optional(_ID)),
+    ]
+)
+_FIELD_OVERRIDES = {(MessageType.PLAYER_ACTION, "action"): _ACTION}
+
+
+def _build_schemas() -> dict[str, tuple[int, _Struct]]:
+    models = {
+        model.model_fields["type"].default: model
+        for model in get_args(WebSocketMessage)
+    }
+    schemas = {}
+    for code, message_type in enumerate(MessageType, start=1):
+        body = _struct_for(models[message_type], skip=("type",))
+        fields = [
+            (name, _FIELD_OVERRIDES.get((message_type, name), kind))
+            for name, kind in body.fields
+        ]
+        schemas[message_type.value] = (code, _Struct(fields, implicit=("type",)))
+    return schemas
+
+
+# Message type -> (type code, body schema), and the reverse.
+_SCHEMAS = _build_schemas()
+_TYPES_BY_CODE = {
+    code: (message_type, body) for message_type, (code, body) in _SCHEMAS.items()
+}
+
+
+class Frame:
+    """A binary message encoded up to its id handles.
+
+    The same Frame is shared by every binary session it is sent to; each
+    session links it to bytes with its own handles when it is sent. The body
+    is kept as a ``%b`` template with one slot per id reference, so linking
+    is a single C-level formatting call.
+    """
+
+    __slots__ = ("body", "code", "head", "ids", "pick")
+
+    def __init__(
+        self,
+        code: int,
+        body: bytes,
+        refs: Sequence[str] = (),
+        offsets: Sequence[int] = (),
+    ):
+        """Build a frame.
+
+        Args:
+            code: Message type code.
+            body: Encoded body, without the id references.
+            refs: Ids referenced by the body, in order.
+            offsets: Where in ``body`` each of ``refs`` goes.
+        """
+        self.code = code
+        # Type code and an empty handle definition count.
+        self.head = bytes((code, 0))
+        self.ids: tuple[str, ...] = ()
+        self.pick: Callable[[list[bytes]], tuple[bytes, ...]] | None = None
+        if not refs:
+            self.body = body
+            return
+        bounds = [0, *offsets, len(body)]
+        chunks = [body[start:end] for start, end in pairwise(bounds)]
+        if b"%" in body:
+            chunks = [chunk.replace(b"%", b"%%") for chunk in chunks]
+        self.body = b"%b".join(chunks)
+        index: dict[str, int] = {}
+        slots = [index.setdefault(id_, len(index)) for id_ in refs]
+        self.ids = tuple(index)
+        if len(slots) == 1:
+            self.pick = lambda handles: (handles[0],)
+        else:
+            self.pick = itemgetter(*slots)
+
+    def link(self, refs: list[bytes]) -> bytes:
+        """Fill in the body with the encoded reference for each id in ``ids``."""
+        if self.pick is None:
+            return self.body
+        return self.body % self.pick(refs)
+
+
+def compile_frame(message: dict) -> Frame:
+    """Encode a message to a session-independent binary Frame.
+
+    Messages that do not fit their type's schema (unknown types, extra keys,
+    values of the wrong type) use the JSON escape, so encoding never loses
+    data.
+    """
+    schema = _SCHEMAS.get(message.get("type", ""))
+    if schema is not None:
+        code, body = schema
+        w = _Writer()
+        try:
+            body.write(w, message)
+        except _Mismatch:
+            pass
+        else:
+            return Frame(code, bytes(w.buf), w.ids, w.offsets)
+    return Frame(JSON_CODE, dumps(message))
+
+
+def decode_frame(data: bytes, ids: dict[int, str], definitions: bool) -> dict:
+    """Decode a binary frame.
+
+    Args:
+        data: The frame.
+        ids: The session's handle table, updated with the frame's
+            definitions.
+        definitions: Whether the frame may define handles (only frames from
+            the server may).
+
+    Returns:
+        The decoded message.
+
+    Raises:
+        ProtocolError: If the frame is malformed.
+    """
+    r = _Reader(data, ids)
+    code = r.uint()
+    count = r.uint()
+    if count and not definitions:
+        raise ProtocolError("Client frames cannot define id handles")
+    for _ in range(count):
+        handle = r.uint()
+        ids[handle] = r.text()
+    if code == JSON_CODE:
+        return _loads_object(data[r.pos :])
+    try:
+        message_type, body = _TYPES_BY_CODE[code]
+    except KeyError:
+        raise ProtocolError(f"Unknown message type code {code}") from None
+    message = body.read_into(r, {"type": message_type})
+    if r.pos != len(data):
+        raise ProtocolError("Trailing bytes after message")
+    return message
+
+
+def _loads_object(data: str | bytes) -> dict:
+    try:
+        message = json.loads(data)
+    except ValueError:
+        raise ProtocolError("Invalid JSON format") from None
+    if not isinstance(message, dict):
+        raise ProtocolError("Messages must be JSON objects")
+    return message
+
+
+# Validates a client message into its model in one pass, dispatching on the
+# ``type`` tag instead of trying each model of the union in turn.
+CLIENT_MESSAGES: TypeAdapter[ClientMessage] = TypeAdapter(ClientMessage)
+
+# Validation errors about the frame itself rather than a message field.
+_FRAME_ERRORS = {
+    "json_invalid": "Invalid JSON format",
+    "dict_type": "Messages must be JSON objects",
+    "union_tag_not_found": "Messages must have a type",
+}
+
+
+def _invalid(error: PydanticValidationError) -> ProtocolError | ValidationError:
+    """Translate the first validation error of a client message."""
+    detail = error.errors(include_url=False)[0]
+    kind = detail["type"]
+    if kind == "union_tag_invalid":
+        return ProtocolError(f"Unknown message type: {detail['ctx']['tag']}")
+    if kind in _FRAME_ERRORS and not detail["loc"]:
+        return ProtocolError(_FRAME_ERRORS[kind])
+    # loc starts with the message type, then the path to the field.
+    field = ".".join(str(part) for part in detail["loc"][1:])
+    value = "" if kind == "missing" else str(detail["input"])
+    return ValidationError(field, value, detail["msg"])
+
+
+# A message's ``type`` key, looked for near the start of a JSON frame.
+_JSON_TYPE = re.compile(r'"type"\s*:\s*"([a-z_]{1,32})"')
+_JSON_TYPE_BYTES = re.compile(rb'"type"\s*:\s*"([a-z_]{1,32})"')
+_PEEK_WINDOW = 128
+
+
+def peek_json_type(data: str | bytes) -> str | None:
+    """Find the message type of a JSON frame without parsing it.
+
+    Takes the first ``"type"`` key within the frame's first bytes, which is
+    the message's own for frames built as documented; a crafted frame can
+    hide or misstate its type, so this is only good for cheap decisions
+    such as rate limiting, and parsing has the last word.
+    """
+    if isinstance(data, str):
+        match = _JSON_TYPE.search(data, 0, _PEEK_WINDOW)
+        return match[1] if match else None
+    raw = _JSON_TYPE_BYTES.search(data, 0, _PEEK_WINDOW)
+    return raw[1].decode() if raw else None
+
+
+def parse_json_message(data: str | bytes) -> ClientMessage:
+    """Validate a JSON frame from a client into its message model.
+
+    Raises:
+        ProtocolError: If the frame is not a JSON object of a client
+            message type.
+        ValidationError: If a field of the message is invalid.
+    """
+    try:
+        return CLIENT_MESSAGES.validate_json(data)
+    except PydanticValidationError as e:
+        raise _invalid(e) from None
+
+
+def parse_message(message: dict) -> ClientMessage:
+    """Validate a decoded client message into its message model.
+
+    Raises:
+        ProtocolError: If the message is not of a client message type.
+        ValidationError: If a field of the message is invalid.
+    """
+    try:
+        return CLIENT_MESSAGES.validate_python(message)
+    except PydanticValidationError as e:
+        raise _invalid(e) from None
+
+
+def _varint(n: int) -> bytes:
+    buf = bytearray()
+    _put_uint(buf, n)
+    return bytes(buf)
+
+
+_SMALL = [bytes((n,)) for n in range(0x80)]  # one-byte varints
+
+
+class Payload:
+    """An outgoing message, encoded at most once per wire format.
+
+    Broadcasts wrap a message once and queue the same Payload for every
+    recipient. The message must not be changed after it is wrapped.
+    """
+
+    __slots__ = ("_frame", "_linked", "_text", "message")
+
+    def __init__(self, message: dict) -> None:
+        self.message = message
+        self._text: str | None = None
+        self._frame: Frame | None = None
+        # (session, bytes) once linked by a SharedBinarySession.
+        self._linked: tuple[SharedBinarySession, bytes] | None = None
+
+    @property
+    def text(self) -> str:
+        """The message as compact JSON text."""
+        if self._text is None:
+            self._text = dumps(self.message).decode()
+        return self._text
+
+    @property
+    def frame(self) -> Frame:
+        """The message as a binary Frame."""
+        if self._frame is None:
+            self._frame = compile_frame(self.message)
+        return self._frame
+
+
+class JsonSession:
+    """Per-connection state of the JSON protocol (there is none)."""
+
+    protocol = JSON_V1
+
+    def prepare(self, payload: Payload) -> str:
+        """Encode a payload for this protocol ahead of sending."""
+        return payload.text
+
+    def render(self, payload: Payload) -> str:
+        """Get the frame to send for a payload."""
+        return payload.text
+
+    def decode(self, data: str | bytes) -> dict:
+        """Decode a frame received from the client.
+
+        Raises:
+            ProtocolError: If the frame is not a JSON object.
+        """
+        return _loads_object(data)
+
+    def peek_type(self, data: str | bytes) -> str | None:
+        """Find a received frame's message type without parsing it."""
+        return peek_json_type(data)
+
+    def parse(self, data: str | bytes) -> ClientMessage:
+        """Parse a frame received from the client into its message model."""
+        return parse_json_message(data)
+
+
+class BinarySession:
+    """Per-connection state of the binary protocol: the id handle table.
+
+    Handles are assigned in ``render``, when a frame is actually about to be
+    sent, so frames that are dropped or coalesced in the outbound queue
+    never define handles the client does not see.
+    """
+
+    protocol = BINARY_V1
+
+    def __init__(self) -> None:
+        self.handles: dict[str, int] = {}
+        self.ids: dict[int, str] = {}
+        # id -> its handle, encoded as a varint
+        self.refs: dict[str, bytes] = {}
+
+    def prepare(self, payload: Payload) -> Frame | bytes:
+        """Encode a payload for this protocol ahead of sending."""
+        return payload.frame
+
+    def render(self, payload: Payload) -> bytes:
+        """Link a payload's frame with this session's handles."""
+        return self.link(payload.frame)
+
+    def link(self, frame: Frame, define_all: bool = False) -> bytes:
+        """Serialize a frame, defining handles for ids new to the session.
+
+        Args:
+            frame: The frame to serialize.
+            define_all: Define every handle of the session instead, so a
+                client that missed earlier frames can catch up.
+        """
+        encoded = self.refs
+        if not define_all:
+            if not frame.ids:
+                return frame.head + frame.body
+            try:
+                # Every id already has a handle: nothing to define.
+                refs = [encoded[id_] for id_ in frame.ids]
+            except KeyError:
+                pass
+            else:
+                return frame.head + frame.link(refs)
+        handles = self.handles
+        definitions = bytearray()
+        count = 0
+        refs = []
+        for id_ in frame.ids:
+            ref = encoded.get(id_)
+            if ref is None:
+                handle = handles[id_] = len(handles) + 1
+                self.ids[handle] = id_
+                ref = encoded[id_] = (
+                    _SMALL[handle] if handle < 0x80 else _varint(handle)
+                )
+                count += 1
+                _put_uint(definitions, handle)
+                _put_text(definitions, id_)
+            refs.append(ref)
+        if define_all:
+            definitions.clear()
+            count = len(self.ids)
+            for handle, id_ in self.ids.items():
+                _put_uint(definitions, handle)
+                _put_text(definitions, id_)
+        head = bytearray((frame.code,))
+        _put_uint(head, count)
+        return b"".join((head, definitions, frame.link(refs)))
+
+    def decode(self, data: str | bytes) -> dict:
+        """Decode a frame received from the client.
+
+        Raises:
+            ProtocolError: If the frame is malformed.
+        """
+        if isinstance(data, str):
+            raise ProtocolError("Expected a binary frame")
+        return decode_frame(data, self.ids, definitions=False)
+
+    def peek_type(self, data: str | bytes) -> str | None:
+        """Find a received frame's message type from its type code.
+
+        JSON escape frames are peeked at like JSON frames.
+        """
+        if isinstance(data, str) or not data:
+            return None
+        if data[0] == JSON_CODE:
+            match = _JSON_TYPE_BYTES.search(data, 1, _PEEK_WINDOW)
+            return match[1].decode() if match else None
+        known = _TYPES_BY_CODE.get(data[0])
+        return known[0] if known is not None else None
+
+    def parse(self, data: str | bytes) -> ClientMessage:
+        """Parse a frame received from the client into its message model."""
+        return parse_message(self.decode(data))
+
+
+class SharedBinarySession(BinarySession):
+    """Binary protocol state shared by connections that get the same frames.
+
+    Used for the spectators of a game: each payload is linked once, in the
+    order payloads are queued, and every connection sends the same bytes.
+    Because a frame's handle definitions then reach only the connections it
+    is queued for, a connection that joins late or falls behind must first
+    be sent a payload from ``catch_up``, which defines the whole table.
+    """
+
+    def prepare(self, payload: Payload) -> bytes:
+        """Link a payload once for every connection sharing the session."""
+        linked = payload._linked
+        if linked is None or linked[0] is not self:
+            linked = payload._linked = (self, self.link(payload.frame))
+        return linked[1]
+
+    def render(self, payload: Payload) -> bytes:
+        """Get the shared bytes of a payload."""
+        return self.prepare(payload)
+
+    def catch_up(self, payload: Payload) -> Payload:
+        """Copy a payload, linked to define every handle of the session."""
+        copy = Payload(payload.message)
+        copy._text = payload._text
+        copy._frame = payload.frame
+        copy._linked = (self, self.link(payload.frame, define_all=True))
+        return copy
+
+
+Session = JsonSession | BinarySession
+
+
+def open_session(protocol: str | None) -> Session:
+    """Create the per-connection state for a negotiated protocol.
+
+    Args:
+        protocol: The protocol from ``select_protocol``, or None for a client
+            that did not negotiate one (JSON).
+    """
+    if protocol == BINARY_V1:
+        return BinarySession()
+    return JsonSession()
+
+
+class BinaryClient:
+    """Client side of the binary protocol, for tests, tools and bots."""
+
+    def __init__(self) -> None:
+        self.ids: dict[int, str] = {}
+        self.handles: dict[str, int] = {}
+
+    def decode(self, data: bytes) -> dict:
+        """Decode a frame from the server, learning its handle definitions."""
+        before = len(self.ids)
+        message = decode_frame(data, self.ids, definitions=True)
+        if len(self.ids) != before:
+            self.handles = {id_: handle for handle, id_ in self.ids.items()}
+        return message
+
+    def encode(self, message: dict) -> bytes:
+        """Encode a message for the server, using known handles for ids."""
+        frame = compile_frame(message)
+        refs = []
+        for id_ in frame.ids:
+            handle = self.handles.get(id_)
+            if handle is None:
+                ref = bytearray((0,))
+                _put_text(ref, id_)
+                refs.append(bytes(ref))
+            else:
+                refs.append(_varint(handle))
+        return frame.head + frame.link(refs)
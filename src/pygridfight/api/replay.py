@@ -0,0 +1,151 @@
+"""Sequence numbers and replay of recent game broadcasts for PyGridFight.
+
+Every game broadcast is numbered within its game (``seq``) and its payload
+kept in a bounded ring buffer. A client that lost its connection reconnects
+and sends ``resume`` with the last sequence number it received; it is then
+sent only the broadcasts it missed, with the encodings already made for
+everyone else, instead of every client of a game refetching the full state
+after a network blip. When the gap is older than the buffer, the client is
+sent a fresh snapshot instead.
+
+Sequence numbers are gapless per game, but a client may not see every one:
+a state update superseded while still queued (see ``OutboundQueue``) is
+never sent. They need not start at 1: a journal dropped to bound memory
+and created again continues above every number already handed out, so a
+client resuming from before the drop gets a snapshot, never the wrong
+frames.
+"""
+
+import itertools
+from collections import OrderedDict, deque
+
+from pygridfight.api.protocol import Payload
+from pygridfight.core.config import get_server_settings
+from pygridfight.core.metrics import get_metrics_registry
+
+_metrics = get_metrics_registry()
+RESUMES = _metrics.counter(
+    "pygridfight_websocket_resumes_total",
+    "Reconnected clients resumed, by how they were caught up.",
+    labelnames=("outcome",),
+)
+_REPLAYED = RESUMES.labels("replayed")
+_SNAPSHOT = RESUMES.labels("snapshot")
+REPLAYED_FRAMES = _metrics.counter(
+    "pygridfight_websocket_replayed_frames_total",
+    "Game broadcasts re-sent to resuming clients.",
+).labels()
+
+
+class _Journal:
+    """Sequence counter and recent payloads of one game."""
+
+    __slots__ = ("base", "frames", "seq")
+
+    def __init__(self, base: int, size: int) -> None:
+        self.base = base  # seq before the journal's first broadcast
+        self.seq = base
+        self.frames: deque[Payload] = deque(maxlen=size)
+
+
+class ReplayBuffer:
+    """Numbers game broadcasts and keeps the latest ones of each game.
+
+    Journals are kept for the ``max_games`` games broadcast to most
+    recently, so games that end without being discarded do not pile up.
+    """
+
+    def __init__(
+        self,
+        size: int | None = None,
+        max_games: int | None = None,
+        state_types: list[str] | None = None,
+    ) -> None:
+        """Initialize the buffer.
+
+        Args:
+            size: Broadcasts kept per game (default:
+                ServerSettings.ws_replay_size).
+            max_games: Games journals are kept for (default:
+                ServerSettings.ws_replay_games).
+            state_types: Full-state message types; a replay skips those
+                superseded by a later one (default:
+                ServerSettings.ws_coalesce_types).
+        """
+        settings = get_server_settings()
+        self.size = size if size is not None else settings.ws_replay_size
+        self.max_games = max_games or settings.ws_replay_games
+        self.state_types = frozenset(
+            state_types if state_types is not None else settings.ws_coalesce_types
+        )
+        self._journals: OrderedDict[str, _Journal] = OrderedDict()
+        # Above every seq of a dropped journal.
+        self._floor = 0
+
+    def __len__(self) -> int:
+        return len(self._journals)
+
+    def record(self, message: dict, game_id: str) -> Payload:
+        """Number a game broadcast and keep its payload.
+
+        Returns:
+            The payload to send, whose message carries ``seq``.
+        """
+        journal = self._journals.get(game_id)
+        if journal is None:
+            journal = self._journals[game_id] = _Journal(self._floor, self.size)
+            if len(self._journals) > self.max_games:
+                _, dropped = self._journals.popitem(last=False)
+                self._floor = max(self._floor, dropped.seq)
+        else:
+            self._journals.move_to_end(game_id)
+        journal.seq += 1
+        payload = Payload({**message, "seq": journal.seq})
+        journal.frames.append(payload)
+        return payload
+
+    def last_seq(self, game_id: str) -> int:
+        """Sequence number of a game's latest broadcast (0 if none)."""
+        journal = self._journals.get(game_id)
+        return journal.seq if journal is not None else 0
+
+    def since(self, game_id: str, seq: int) -> list[Payload] | None:
+        """Get the broadcasts of a game after ``seq``, for a resuming client.
+
+        Full-state messages superseded by a later one in the range are left
+        out, as they would have been from the client's queue.
+
+        Returns:
+            The payloads in order, or None if some of them are no longer
+            kept (or ``seq`` is unknown) and the client needs a snapshot.
+        """
+        journal = self._journals.get(game_id)
+        if journal is None or not journal.base <= seq <= journal.seq:
+            _SNAPSHOT.inc()
+            return None
+        missed = journal.seq - seq
+        if missed > len(journal.frames):
+            _SNAPSHOT.inc()
+            return None
+        frames = list(
+            itertools.islice(journal.frames, len(journal.frames) - missed, None)
+        )
+        replay = []
+        seen_states = set()
+        for payload in reversed(frames):
+            message_type = payload.message.get("type")
+            if message_type in self.state_types:
+                if message_type in seen_states:
+                    continue
+                seen_states.add(message_type)
+            replay.append(payload)
+        replay.reverse()
+        _REPLAYED.inc()
+        REPLAYED_FRAMES.inc(len(replay))
+        return replay
+
+    def discard(self, game_id: str) -> None:
+        """Forget a game's journal, e.g. when the game is deleted."""
+        dropped = self._journals.pop(game_id, None)
+        if dropped is not None:
+            self._floor = max(self._floor, dropped.seq)
@@ -0,0 +1,38 @@
+"""Fast JSON responses for PyGridFight REST handlers."""
+
+from typing import Any
+
+from pydantic import TypeAdapter
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
+
+# Built once at import: pydantic-core compiles the serializer up front, so each
+# response is a single call into Rust that emits JSON bytes directly.
+_json_adapter: TypeAdapter[Any] = TypeAdapter(Any)
+
+
+def dumps(content: Any) -> bytes:
+    """Encode a response payload straight to JSON bytes.
+
+    Handles the types our payloads contain (dicts, lists, str, int, bool,
+    None, datetime, str enums) without a jsonable_encoder pre-pass. Uses
+    orjson when it is installed, else the precompiled pydantic serializer.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return _json_adapter.dump_json(content)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse that renders with ``dumps``.
+
+    Return it directly from a handler: FastAPI then skips response_model
+    validation and ``jsonable_encoder``, and the payload is encoded once.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,96 +1,335 @@
 """REST API endpoints for PyGridFight."""
 
+import base64
+import platform
+import secrets
+import time
+from collections.abc import Callable
+from functools import lru_cache
+from typing import Any
+
+import anyio
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 
+from pygridfight.api.middleware import PROFILE_TAGGERS
+from pygridfight.api.responses import FastJSONResponse, dumps
 from pygridfight.api.schemas.game import (
+    GameBatchCreateRequest,
+    GameBatchJoinRequest,
+    GameBatchResponse,
     GameCreateRequest,
     GameJoinRequest,
     GameLeaveRequest,
     GameLeaveResponse,
+    GameListResponse,
+    GameStatus,
 )
+from pygridfight.api.schemas.matchmaking import MatchmakingRequest, MatchTicketInfo
+from pygridfight.api.ticker import ticker
+from pygridfight.core.config import get_server_settings, get_settings
 from pygridfight.core.exceptions import (
+    GameError,
     GameFullError,
     GameNotFoundError,
     PlayerNotFoundError,
     ValidationError,
 )
-from pygridfight.domain.models.game import GameSettings
+from pygridfight.core.metrics import get_metrics_registry
+from pygridfight.core.profiler import SamplingProfiler
+from pygridfight.domain.models.game import Game, GameSettings
+from pygridfight.infrastructure.admission import get_admission_controller
 from pygridfight.infrastructure.game_state import GameStateManager
+from pygridfight.infrastructure.loop_monitor import LoopLagMonitor, get_loop_monitor
+from pygridfight.services.matchmaking_service import (
+    MatchmakingService,
+    MatchPreferences,
+    MatchTicket,
+)
 
 logger = structlog.get_logger(__name__)
 
+# Batches with more items than this are streamed in chunks of
+# BATCH_STREAM_CHUNK results instead of being encoded in one piece.
+BATCH_STREAM_THRESHOLD = 200
+BATCH_STREAM_CHUNK = 100
+
+GET_STATE_SECONDS = (
+    get_metrics_registry()
+    .histogram(
+        "pygridfight_game_get_state_seconds",
+        "Time to build the full game state returned by game endpoints.",
+    )
+    .labels()
+)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Only one profile runs at a time.
+_profile_lock = anyio.Lock()
+
 
 def get_game_state_manager() -> GameStateManager:
     # Singleton pattern or however GameStateManager is meant to be instantiated
     return GameStateManager()
 
 
+@lru_cache
+def get_matchmaking_service() -> MatchmakingService:
+    return MatchmakingService(get_game_state_manager())
+
+
 router = APIRouter()
 
 
+@lru_cache
+def get_health_info() -> dict:
+    """Static part of the /health payload, built once at startup."""
+    settings = get_settings()
+    return {
+        "status": "healthy",
+        "service": "pygridfight",
+        "system": {
+            "python_version": platform.python_version(),
+            "platform": platform.system(),
+            "release": platform.release(),
+        },
+        "config": {
+            "host": settings.host,
+            "port": settings.port,
+            "grid_size": getattr(settings, "grid_size", None),
+            "max_players": getattr(settings, "max_players", None),
+        },
+    }
+
+
 @router.route("/health", methods=["GET", "OPTIONS"])
 async def health_check(request) -> JSONResponse:
     """Health check endpoint with system/config info and timestamp."""
-    import platform
-    import time
+    return JSONResponse(
+        content={
+            **get_health_info(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        }
+    )
 
-    from pygridfight.core.config import get_settings
 
-    settings = get_settings()
+@router.get("/ready")
+async def readiness_check(
+    monitor: LoopLagMonitor = Depends(get_loop_monitor),
+) -> JSONResponse:
+    """Readiness probe for load balancers.
+
+    Returns 503 while event loop lag exceeds ``ready_max_loop_lag`` so
+    traffic is routed to workers that are keeping up.
+    """
+    lag = monitor.current_lag()
+    ready = lag <= monitor.max_lag
     return JSONResponse(
+        status_code=status.HTTP_200_OK
+        if ready
+        else status.HTTP_503_SERVICE_UNAVAILABLE,
         content={
-            "status": "healthy",
-            "service": "pygridfight",
-            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-            "system": {
-                "python_version": platform.python_version(),
-                "platform": platform.system(),
-                "release": platform.release(),
-            },
-            "config": {
-                "host": settings.host,
-                "port": settings.port,
-                "grid_size": getattr(settings, "grid_size", None),
-                "max_players": getattr(settings, "max_players", None),
+            "status": "ready" if ready else "unready",
+            "loop_lag_seconds": round(lag, 6),
+            "max_loop_lag_seconds": monitor.max_lag,
+            "tasks": monitor.tasks,
+        },
+    )
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    """Expose all metrics in the Prometheus text exposition format."""
+    return PlainTextResponse(
+        get_metrics_registry().render(), media_type=PROMETHEUS_CONTENT_TYPE
+    )
+
+
+async def admit_lobby() -> None:
+    """Shed new lobbies with 503 and Retry-After while the server is saturated."""
+    rejection = get_admission_controller().check("lobby")
+    if rejection is not None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={"message": "Server busy, retry later", "reason": rejection.reason},
+            headers={"Retry-After": str(rejection.retry_after)},
+        )
+
+
+def require_admin(x_admin_token: str | None = Header(default=None)) -> None:
+    """Reject requests without the configured admin token."""
+    expected = get_server_settings().admin_token
+    if not expected:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={"message": "Admin endpoints are disabled"},
+        )
+    if x_admin_token is None or not secrets.compare_digest(
+        x_admin_token.encode(), expected.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={"message": "Invalid admin token"},
+        )
+
+
+@router.get(
+    "/admin/profile", include_in_schema=False, dependencies=[Depends(require_admin)]
+)
+async def profile(
+    seconds: float = Query(default=5.0, gt=0),
+    interval: float | None = Query(default=None, ge=0.001, le=1.0),
+) -> PlainTextResponse:
+    """Sample all thread stacks for ``seconds`` and return collapsed stacks.
+
+    Each line is ``frame;frame;... count``, ready for flamegraph.pl or
+    speedscope. Stacks sampled while a request was running start with
+    ``route=...`` and, when known, ``game_id=...`` tags.
+    """
+    settings = get_server_settings()
+    if seconds > settings.profiler_max_seconds:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "message": f"seconds must be at most {settings.profiler_max_seconds}"
             },
+        )
+    if _profile_lock.locked():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": "A profile is already running"},
+        )
+    async with _profile_lock:
+        profiler = SamplingProfiler(
+            interval=interval or settings.profiler_interval, taggers=PROFILE_TAGGERS
+        )
+        logger.info("Profiling started", seconds=seconds, interval=profiler.interval)
+        profiler.start()
+        try:
+            await anyio.sleep(seconds)
+        finally:
+            await anyio.to_thread.run_sync(profiler.stop)
+    logger.info("Profiling finished", samples=profiler.samples)
+    return PlainTextResponse(
+        profiler.collapsed(), headers={"X-Profile-Samples": str(profiler.samples)}
+    )
+
+
+def _game_details(game: Game) -> dict:
+    """Full game state plus lobby metadata, as returned by game endpoints."""
+    start = time.perf_counter()
+    state = game.get_state()
+    GET_STATE_SECONDS.observe(time.perf_counter() - start)
+    state.update(
+        {
+            "name": game.name,
+            "max_players": game.max_players,
+            "grid_size": game.grid_size,
+            "is_private": game.is_private,
+            "created_at": game.created_at,
+            "started_at": game.started_at,
+            "finished_at": game.finished_at,
+            "current_players": len(game.players),
+            "players": list(game.players.keys()),
+            "current_turn": None,
+            "turn_number": game.turn,
         }
     )
+    return state
+
+
+# Store versions restart at 0 with the process and differ between workers,
+# so every ETag carries a per-process nonce: a tag from before a restart
+# or from another worker never matches, instead of naming other content.
+_BOOT_ID = secrets.token_hex(6)
+
 
+def _etag(name: str, version: int) -> str:
+    return f'"{_BOOT_ID}-{name}-{version}"'
 
-@router.get("/games")
-async def list_games(manager: GameStateManager = Depends(get_game_state_manager)):
-    """List all active games."""
+
+def _cache_headers(etag: str) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Check whether ``If-None-Match`` names the current representation."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    # If-None-Match uses the weak comparison function (RFC 9110 13.1.2).
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _encode_cursor(after: int) -> str:
+    return base64.urlsafe_b64encode(str(after).encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> int:
     try:
-        game_ids = await manager.list_active_games()
-        games = []
-        for gid in game_ids:
-            game = await manager.get_game(gid)
-            if game:
-                state = game.get_state()
-                state.update(
-                    {
-                        "max_players": None,
-                        "grid_size": None,
-                        "is_private": None,
-                        "created_at": None,
-                        "started_at": None,
-                        "finished_at": None,
-                        "current_players": len(game.players),
-                        "players": list(game.players.keys()),
-                        "current_turn": None,
-                        "turn_number": game.turn,
-                    }
-                )
-                games.append(state)
-        return {"games": games, "total": len(games)}
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return int(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"message": "Invalid cursor"},
+        ) from e
+
+
+@router.get("/games", response_model=GameListResponse)
+async def list_games(
+    request: Request,
+    cursor: str | None = None,
+    limit: int = Query(default=50, ge=1, le=200),
+    status_filter: GameStatus | None = Query(default=None, alias="status"),
+    is_private: bool | None = None,
+    has_free_slots: bool | None = None,
+    manager: GameStateManager = Depends(get_game_state_manager),
+):
+    """List games as lightweight summaries, one page at a time.
+
+    Use ``next_cursor`` from the response as ``cursor`` to fetch the next
+    page. Full game state is only available from ``GET /games/{game_id}``.
+    """
+    after = _decode_cursor(cursor) if cursor else 0
+    etag = _etag("lobby", manager.version)
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=_cache_headers(etag))
+
+    try:
+        games, total, next_after = await manager.list_games_page(
+            after=after,
+            limit=limit,
+            status=status_filter.value if status_filter is not None else None,
+            is_private=is_private,
+            has_free_slots=has_free_slots,
+        )
+        return FastJSONResponse(
+            {
+                "games": [game.get_summary() for game in games],
+                "total": total,
+                "next_cursor": _encode_cursor(next_after) if next_after else None,
+            },
+            headers=_cache_headers(etag),
+        )
     except Exception as e:
         logger.error("Failed to list games", error=str(e))
         raise HTTPException(status_code=500, detail="Internal server error") from e
 
 
-@router.post("/games", status_code=201)
+@router.post("/games", status_code=201, dependencies=[Depends(admit_lobby)])
 async def create_game(
     req: GameCreateRequest, manager: GameStateManager = Depends(get_game_state_manager)
 ):
@@ -106,34 +345,16 @@ async def create_game(
             max_players=req.max_players,
             grid_size=req.grid_size,
             is_private=req.is_private,
+            visibility=req.visibility.value,
+            view_radius=req.view_radius,
         )
         game = await manager.create_game(game_id, settings)
-        # Persist metadata (redundant, but ensures all fields are set)
-        game.name = req.name
-        game.max_players = req.max_players
-        game.grid_size = req.grid_size
-        game.is_private = req.is_private
-        await manager.update_game(game_id, game)
         # Assume the creator is also the first player (not implemented)
         player_id = str(uuid.uuid4())
-        game = await manager.get_game(game_id)
-        state = game.get_state()
-        state.update(
-            {
-                "name": req.name,
-                "max_players": req.max_players,
-                "grid_size": req.grid_size,
-                "is_private": req.is_private,
-                "created_at": getattr(game, "created_at", None),
-                "started_at": getattr(game, "started_at", None),
-                "finished_at": getattr(game, "finished_at", None),
-                "current_players": len(game.players),
-                "players": list(game.players.keys()),
-                "current_turn": None,
-                "turn_number": game.turn,
-            }
+        state = _game_details(game)
+        return FastJSONResponse(
+            {"game": state, "player_id": player_id}, status_code=201
         )
-        return {"game": state, "player_id": player_id}
     except ValidationError as e:
         raise HTTPException(status_code=422, detail=e.message) from e
     except Exception as e:
@@ -141,32 +362,147 @@ async def create_game(
         raise HTTPException(status_code=500, detail="Internal server error") from e
 
 
+def _batch_error(index: int, exc: Exception, game_id: str | None = None) -> dict:
+    if isinstance(exc, GameNotFoundError):
+        code, http_status = exc.code, status.HTTP_404_NOT_FOUND
+    elif isinstance(exc, GameError):
+        code, http_status = exc.code, status.HTTP_400_BAD_REQUEST
+    else:
+        code, http_status = "INVALID_REQUEST", status.HTTP_400_BAD_REQUEST
+    return {
+        "index": index,
+        "status": http_status,
+        "game_id": game_id,
+        "error": {"code": code, "message": str(exc)},
+    }
+
+
+def _batch_response(results: list, to_item: Callable[[int, Any], dict]) -> Response:
+    """Encode per-item batch results, streaming them when the batch is large.
+
+    The streamed body is the same ``{"results": [...]}`` document, produced
+    in chunks so large batches never hold the whole encoded response.
+    """
+    if len(results) <= BATCH_STREAM_THRESHOLD:
+        return FastJSONResponse(
+            {"results": [to_item(i, result) for i, result in enumerate(results)]}
+        )
+
+    async def chunks():
+        yield b'{"results":['
+        for start in range(0, len(results), BATCH_STREAM_CHUNK):
+            items = [
+                to_item(i, results[i])
+                for i in range(start, min(start + BATCH_STREAM_CHUNK, len(results)))
+            ]
+            # Strip the list brackets so chunks concatenate into one array.
+            yield (b"," if start else b"") + dumps(items)[1:-1]
+        yield b"]}"
+
+    return StreamingResponse(chunks(), media_type="application/json")
+
+
+@router.post(
+    "/games/batch",
+    response_model=GameBatchResponse,
+    dependencies=[Depends(admit_lobby)],
+)
+async def create_games_batch(
+    req: GameBatchCreateRequest,
+    manager: GameStateManager = Depends(get_game_state_manager),
+):
+    """Create several games in one request and one store lock acquisition."""
+    import uuid
+
+    requests = [
+        (
+            str(uuid.uuid4()),
+            GameSettings(
+                name=item.name,
+                max_players=item.max_players,
+                grid_size=item.grid_size,
+                is_private=item.is_private,
+                visibility=item.visibility.value,
+                view_radius=item.view_radius,
+            ),
+        )
+        for item in req.games
+    ]
+    try:
+        results = await manager.create_games(requests)
+    except Exception as e:
+        logger.error("Failed to create games", error=str(e))
+        raise HTTPException(status_code=500, detail="Internal server error") from e
+
+    def to_item(index: int, result: Game | ValueError) -> dict:
+        if isinstance(result, Exception):
+            return _batch_error(index, result, requests[index][0])
+        return {
+            "index": index,
+            "status": status.HTTP_201_CREATED,
+            "game_id": result.id,
+            # Assume the creator is also the first player (not implemented)
+            "player_id": str(uuid.uuid4()),
+            "game": result.get_summary(),
+        }
+
+    return _batch_response(results, to_item)
+
+
+@router.post("/games/batch/join", response_model=GameBatchResponse)
+async def join_games_batch(
+    req: GameBatchJoinRequest,
+    manager: GameStateManager = Depends(get_game_state_manager),
+):
+    """Join several players to games in one request and one lock acquisition."""
+    import uuid
+
+    from pygridfight.domain.models.player import Player
+
+    requests = [
+        (item.game_id, Player(id=str(uuid.uuid4()), display_name=item.player_name))
+        for item in req.joins
+    ]
+    try:
+        results = await manager.join_games(requests)
+    except Exception as e:
+        logger.error("Failed to join games", error=str(e))
+        raise HTTPException(status_code=500, detail="Internal server error") from e
+
+    def to_item(index: int, result: Game | Exception) -> dict:
+        game_id, player = requests[index]
+        if isinstance(result, Exception):
+            return _batch_error(index, result, game_id)
+        return {
+            "index": index,
+            "status": status.HTTP_200_OK,
+            "game_id": game_id,
+            "player_id": player.id,
+            "game": result.get_summary(),
+        }
+
+    return _batch_response(results, to_item)
+
+
 @router.get("/games/{game_id}")
 async def get_game(
-    game_id: str, manager: GameStateManager = Depends(get_game_state_manager)
+    game_id: str,
+    request: Request,
+    manager: GameStateManager = Depends(get_game_state_manager),
 ):
-    """Get game details."""
+    """Get game details.
+
+    Supports conditional requests: the response carries a strong ETag and an
+    ``If-None-Match`` hit is answered with 304 without rebuilding the state.
+    """
     try:
         game = await manager.get_game(game_id)
         if not game:
             raise GameNotFoundError(f"Game {game_id} not found")
-        state = game.get_state()
-        state.update(
-            {
-                "name": getattr(game, "name", None),
-                "max_players": getattr(game, "max_players", None),
-                "grid_size": getattr(game, "grid_size", None),
-                "is_private": getattr(game, "is_private", None),
-                "created_at": getattr(game, "created_at", None),
-                "started_at": getattr(game, "started_at", None),
-                "finished_at": getattr(game, "finished_at", None),
-                "current_players": len(game.players),
-                "players": list(game.players.keys()),
-                "current_turn": None,
-                "turn_number": game.turn,
-            }
-        )
-        return state
+        etag = _etag(game.id, game.version)
+        if _etag_matches(request, etag):
+            return Response(status_code=304, headers=_cache_headers(etag))
+        return FastJSONResponse(_game_details(game), headers=_cache_headers(etag))
     except GameNotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail={"message": str(e)}
@@ -188,44 +524,17 @@ async def join_game(
     from pygridfight.domain.models.player import Player
 
     try:
-        game = await manager.get_game(game_id)
-        if not game:
-            raise GameNotFoundError(f"Game {game_id} not found")
-        max_players = getattr(game, "max_players", 4)
-        if len(game.players) >= max_players:
-            raise GameFullError(f"Game {game_id} is full")
         # Generate a new player and add to the game
         player_id = str(uuid.uuid4())
         player = Player(id=player_id, display_name=req.player_name)
-        try:
-            game.add_player(player)
-        except ValueError as e:
-            raise HTTPException(status_code=400, detail=str(e)) from e
-        # Persist the updated game state
-        await manager.update_game(game_id, game)
-        game = await manager.get_game(game_id)
-        state = game.get_state()
-        state.update(
-            {
-                "name": getattr(game, "name", None),
-                "max_players": max_players,
-                "grid_size": getattr(game, "grid_size", None),
-                "is_private": getattr(game, "is_private", None),
-                "created_at": getattr(game, "created_at", None),
-                "started_at": getattr(game, "started_at", None),
-                "finished_at": getattr(game, "finished_at", None),
-                "current_players": len(game.players),
-                "players": list(game.players.keys()),
-                "current_turn": None,
-                "turn_number": game.turn,
-            }
-        )
-        return {"game": state, "player_id": player_id}
+        game = await manager.join_game(game_id, player)
+        state = _game_details(game)
+        return FastJSONResponse({"game": state, "player_id": player_id})
     except GameNotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail={"message": str(e)}
         ) from e
-    except GameFullError as e:
+    except (GameFullError, ValueError) as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail={"message": str(e)}
         ) from e
@@ -244,6 +553,7 @@ async def delete_game(
         if not game:
             raise GameNotFoundError(f"Game {game_id} not found")
         await manager.delete_game(game_id)
+        ticker.discard(game_id)
         return JSONResponse(status_code=204, content=None)
     except GameNotFoundError as e:
         raise HTTPException(
@@ -281,3 +591,61 @@ async def leave_game(
     except Exception as e:
         logger.error("Failed to leave game", error=str(e))
         raise HTTPException(status_code=500, detail="Internal server error") from e
+
+
+def _ticket_info(ticket: MatchTicket) -> MatchTicketInfo:
+    return MatchTicketInfo(
+        id=ticket.id,
+        player_id=ticket.player_id,
+        status=ticket.status,
+        max_players=ticket.preferences.max_players,
+        grid_size=ticket.preferences.grid_size,
+        game_id=ticket.game_id,
+    )
+
+
+@router.post(
+    "/matchmaking/tickets",
+    status_code=202,
+    response_model=MatchTicketInfo,
+    dependencies=[Depends(admit_lobby)],
+)
+async def enqueue_for_match(
+    req: MatchmakingRequest,
+    service: MatchmakingService = Depends(get_matchmaking_service),
+) -> MatchTicketInfo:
+    """Enter the matchmaking queue; poll the ticket until it is matched."""
+    ticket = service.enqueue(
+        req.player_name,
+        MatchPreferences(max_players=req.max_players, grid_size=req.grid_size),
+    )
+    return _ticket_info(ticket)
+
+
+@router.get("/matchmaking/tickets/{ticket_id}", response_model=MatchTicketInfo)
+async def get_match_ticket(
+    ticket_id: str,
+    service: MatchmakingService = Depends(get_matchmaking_service),
+) -> MatchTicketInfo:
+    """Get the status of a matchmaking ticket."""
+    ticket = service.get_ticket(ticket_id)
+    if ticket is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"message": f"Ticket {ticket_id} not found"},
+        )
+    return _ticket_info(ticket)
+
+
+@router.delete("/matchmaking/tickets/{ticket_id}", status_code=204)
+async def cancel_match_ticket(
+    ticket_id: str,
+    service: MatchmakingService = Depends(get_matchmaking_service),
+):
+    """Leave the matchmaking queue."""
+    if not service.cancel(ticket_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"message": f"No queued ticket {ticket_id}"},
+        )
+    return JSONResponse(status_code=204, content=None)
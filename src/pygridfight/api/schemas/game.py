@@ -3,7 +3,9 @@
 from datetime import datetime
 from enum import Enum
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+from pygridfight.api.schemas.player import Position
 
 
 class GameStatus(str, Enum):
@@ -15,6 +17,17 @@ class GameStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+class Visibility(str, Enum):
+    """What each player of a game is sent."""
+
+    FULL = "full"  # every update
+    AREA = "area"  # only updates within the player's area of interest
+
+
+# Largest grid of a full-visibility game, whose updates all go to everyone.
+MAX_FULL_GRID_SIZE = 50
+
+
 class GameCreateRequest(BaseModel):
     """Request schema for creating a new game."""
 
@@ -22,8 +35,31 @@ class GameCreateRequest(BaseModel):
     max_players: int = Field(
         default=4, ge=2, le=8, description="Maximum number of players"
     )
-    grid_size: int = Field(default=20, ge=10, le=50, description="Grid size")
+    grid_size: int = Field(
+        default=20,
+        ge=10,
+        le=200,
+        description=f"Grid size (at most {MAX_FULL_GRID_SIZE} with full visibility)",
+    )
     is_private: bool = Field(default=False, description="Whether the game is private")
+    visibility: Visibility = Field(
+        default=Visibility.FULL, description="What each player is sent"
+    )
+    view_radius: int = Field(
+        default=8,
+        ge=1,
+        le=50,
+        description="Default area of interest of an area game, in cells around "
+        "each of the player's avatars",
+    )
+
+    @model_validator(mode="after")
+    def check_grid_size(self):
+        if self.visibility == Visibility.FULL and self.grid_size > MAX_FULL_GRID_SIZE:
+            raise ValueError(
+                f"Grids larger than {MAX_FULL_GRID_SIZE} need area visibility"
+            )
+        return self
 
 
 class GameJoinRequest(BaseModel):
@@ -68,11 +104,51 @@ class GameDetails(GameInfo):
     turn_number: int = Field(default=0, description="Current turn number")
 
 
+class GridDimensions(BaseModel):
+    """Grid dimensions schema."""
+
+    width: int = Field(..., gt=0, description="Grid width")
+    height: int = Field(..., gt=0, description="Grid height")
+
+
+class PlayerState(BaseModel):
+    """In-game player state schema."""
+
+    id: str = Field(..., description="Player ID")
+    display_name: str = Field(..., description="Player display name")
+    score: int = Field(default=0, ge=0, description="Player score")
+    avatar_ids: list[str] = Field(default_factory=list, description="Avatar IDs")
+
+
+class AvatarState(BaseModel):
+    """In-game avatar state schema."""
+
+    id: str = Field(..., description="Avatar ID")
+    owner_id: str = Field(..., description="Owning player ID")
+    position: Position = Field(..., description="Position on the grid")
+    health: int = Field(default=1, ge=0, description="Avatar health")
+    active: bool = Field(default=True, description="Whether the avatar is active")
+
+
+class GameSnapshot(BaseModel):
+    """Live game state schema, as built by ``Game.get_state``."""
+
+    id: str = Field(..., description="Game ID")
+    status: GameStatus = Field(..., description="Current game status")
+    turn: int = Field(..., description="Current turn number")
+    players: dict[str, PlayerState] = Field(..., description="Players by ID")
+    avatars: dict[str, AvatarState] = Field(..., description="Avatars by ID")
+    grid: GridDimensions = Field(..., description="Grid dimensions")
+
+
 class GameListResponse(BaseModel):
     """Response schema for listing games."""
 
     games: list[GameInfo] = Field(..., description="List of games")
     total: int = Field(..., description="Total number of games")
+    next_cursor: str | None = Field(
+        None, description="Cursor for the next page, or null on the last page"
+    )
 
 
 class GameCreateResponse(BaseModel):
@@ -88,6 +164,52 @@ class GameJoinResponse(BaseModel):
     game: GameDetails = Field(..., description="Game details")
 
 
+class GameBatchCreateRequest(BaseModel):
+    """Request schema for creating several games at once."""
+
+    games: list[GameCreateRequest] = Field(
+        ..., min_length=1, max_length=1000, description="Games to create"
+    )
+
+
+class GameBatchJoinItem(GameJoinRequest):
+    """A single join within a batch join request."""
+
+    game_id: str = Field(..., description="Game ID to join")
+
+
+class GameBatchJoinRequest(BaseModel):
+    """Request schema for joining several players to games at once."""
+
+    joins: list[GameBatchJoinItem] = Field(
+        ..., min_length=1, max_length=5000, description="Joins to apply"
+    )
+
+
+class BatchItemError(BaseModel):
+    """Error details for a failed batch item."""
+
+    code: str = Field(..., description="Error code")
+    message: str = Field(..., description="Error message")
+
+
+class BatchItemResult(BaseModel):
+    """Outcome of a single batch item."""
+
+    index: int = Field(..., description="Position of the item in the request")
+    status: int = Field(..., description="HTTP status the single request would get")
+    game_id: str | None = Field(None, description="Game ID")
+    player_id: str | None = Field(None, description="Created or joined player ID")
+    game: GameInfo | None = Field(None, description="Game summary on success")
+    error: BatchItemError | None = Field(None, description="Error on failure")
+
+
+class GameBatchResponse(BaseModel):
+    """Response schema for batch operations."""
+
+    results: list[BatchItemResult] = Field(..., description="Per-item results")
+
+
 class GameLeaveRequest(BaseModel):
     """Request schema for leaving a game."""
 
@@ -0,0 +1,28 @@
+"""Matchmaking-related Pydantic schemas for API."""
+
+from pydantic import BaseModel, Field
+
+from pygridfight.domain.enums import TicketStatus
+
+
+class MatchmakingRequest(BaseModel):
+    """Request schema for entering the matchmaking queue."""
+
+    player_name: str = Field(
+        ..., min_length=1, max_length=50, description="Player name"
+    )
+    max_players: int = Field(
+        default=4, ge=2, le=8, description="Desired maximum number of players"
+    )
+    grid_size: int = Field(default=20, ge=10, le=50, description="Desired grid size")
+
+
+class MatchTicketInfo(BaseModel):
+    """Matchmaking ticket schema."""
+
+    id: str = Field(..., description="Ticket ID")
+    player_id: str = Field(..., description="Player ID assigned to the queued player")
+    status: TicketStatus = Field(..., description="Current ticket status")
+    max_players: int = Field(..., description="Desired maximum number of players")
+    grid_size: int = Field(..., description="Desired grid size")
+    game_id: str | None = Field(None, description="Matched game ID, once matched")
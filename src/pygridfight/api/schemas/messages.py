@@ -1,12 +1,12 @@
 """WebSocket message schemas for API."""
 
 from enum import Enum
-from typing import Any
+from typing import Annotated, Any, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 from pygridfight.api.schemas.actions import ActionResult
-from pygridfight.api.schemas.game import GameDetails
+from pygridfight.api.schemas.game import GameDetails, GameSnapshot
 from pygridfight.api.schemas.player import PlayerProfile
 
 
@@ -31,30 +31,43 @@ class MessageType(str, Enum):
     TURN_CHANGED = "turn_changed"
     ACTION_RESULT = "action_result"
 
+    # Client to server (appended: binary type codes follow this order)
+    RESUME = "resume"
+    SET_VIEW = "set_view"
+
 
 class BaseMessage(BaseModel):
     """Base WebSocket message schema."""
 
     type: MessageType = Field(..., description="Message type")
     timestamp: str | None = Field(None, description="Message timestamp")
+    seq: int | None = Field(
+        None, description="Sequence number of a game broadcast within its game"
+    )
 
 
 class PingMessage(BaseMessage):
     """Ping message schema."""
 
-    type: MessageType = Field(default=MessageType.PING, description="Message type")
+    type: Literal[MessageType.PING] = Field(
+        default=MessageType.PING, description="Message type"
+    )
 
 
 class PongMessage(BaseMessage):
     """Pong message schema."""
 
-    type: MessageType = Field(default=MessageType.PONG, description="Message type")
+    type: Literal[MessageType.PONG] = Field(
+        default=MessageType.PONG, description="Message type"
+    )
 
 
 class ErrorMessage(BaseMessage):
     """Error message schema."""
 
-    type: MessageType = Field(default=MessageType.ERROR, description="Message type")
+    type: Literal[MessageType.ERROR] = Field(
+        default=MessageType.ERROR, description="Message type"
+    )
     message: str = Field(..., description="Error message")
     code: str | None = Field(None, description="Error code")
 
@@ -62,7 +75,9 @@ class ErrorMessage(BaseMessage):
 class JoinGameMessage(BaseMessage):
     """Join game message schema."""
 
-    type: MessageType = Field(default=MessageType.JOIN_GAME, description="Message type")
+    type: Literal[MessageType.JOIN_GAME] = Field(
+        default=MessageType.JOIN_GAME, description="Message type"
+    )
     game_id: str = Field(..., description="Game ID to join")
     player_name: str = Field(..., description="Player name")
 
@@ -70,7 +85,7 @@ class JoinGameMessage(BaseMessage):
 class LeaveGameMessage(BaseMessage):
     """Leave game message schema."""
 
-    type: MessageType = Field(
+    type: Literal[MessageType.LEAVE_GAME] = Field(
         default=MessageType.LEAVE_GAME, description="Message type"
     )
     game_id: str = Field(..., description="Game ID to leave")
@@ -79,16 +94,60 @@ class LeaveGameMessage(BaseMessage):
 class PlayerActionMessage(BaseMessage):
     """Player action message schema."""
 
-    type: MessageType = Field(
+    type: Literal[MessageType.PLAYER_ACTION] = Field(
         default=MessageType.PLAYER_ACTION, description="Message type"
     )
     action: dict[str, Any] = Field(..., description="Action data")
 
 
+class ResumeMessage(BaseMessage):
+    """Resume game updates after reconnecting."""
+
+    type: Literal[MessageType.RESUME] = Field(
+        default=MessageType.RESUME, description="Message type"
+    )
+    game_id: str = Field(..., description="Game ID to resume")
+    last_seq: int = Field(
+        ..., ge=0, description="Sequence number of the last game message received"
+    )
+
+
+class Viewport(BaseModel):
+    """Rectangle of grid cells."""
+
+    x: int = Field(..., ge=0, description="Leftmost column")
+    y: int = Field(..., ge=0, description="Top row")
+    width: int = Field(..., ge=1, le=200, description="Columns")
+    height: int = Field(..., ge=1, le=200, description="Rows")
+
+
+class SetViewMessage(BaseMessage):
+    """Choose the area of interest in an area-visibility game.
+
+    Sets either a fixed viewport or a radius around the player's avatars;
+    with neither, the game's default radius applies again.
+    """
+
+    type: Literal[MessageType.SET_VIEW] = Field(
+        default=MessageType.SET_VIEW, description="Message type"
+    )
+    game_id: str = Field(..., description="Game ID")
+    viewport: Viewport | None = Field(None, description="Cells to receive updates of")
+    radius: int | None = Field(
+        None, ge=1, le=50, description="Cells around each of the player's avatars"
+    )
+
+    @model_validator(mode="after")
+    def check_one_area(self):
+        if self.viewport is not None and self.radius is not None:
+            raise ValueError("Set either a viewport or a radius, not both")
+        return self
+
+
 class PlayerReadyMessage(BaseMessage):
     """Player ready message schema."""
 
-    type: MessageType = Field(
+    type: Literal[MessageType.PLAYER_READY] = Field(
         default=MessageType.PLAYER_READY, description="Message type"
     )
     ready: bool = Field(..., description="Ready status")
@@ -97,16 +156,16 @@ class PlayerReadyMessage(BaseMessage):
 class GameStateMessage(BaseMessage):
     """Game state message schema."""
 
-    type: MessageType = Field(
+    type: Literal[MessageType.GAME_STATE] = Field(
         default=MessageType.GAME_STATE, description="Message type"
     )
-    game: GameDetails = Field(..., description="Current game state")
+    game: GameSnapshot = Field(..., description="Current game state")
 
 
 class PlayerJoinedMessage(BaseMessage):
     """Player joined message schema."""
 
-    type: MessageType = Field(
+    type: Literal[MessageType.PLAYER_JOINED] = Field(
         default=MessageType.PLAYER_JOINED, description="Message type"
     )
     player: PlayerProfile = Field(..., description="Player who joined")
@@ -116,7 +175,7 @@ class PlayerJoinedMessage(BaseMessage):
 class PlayerLeftMessage(BaseMessage):
     """Player left message schema."""
 
-    type: MessageType = Field(
+    type: Literal[MessageType.PLAYER_LEFT] = Field(
         default=MessageType.PLAYER_LEFT, description="Message type"
     )
     player_id: str = Field(..., description="Player ID who left")
@@ -126,7 +185,7 @@ class PlayerLeftMessage(BaseMessage):
 class GameStartedMessage(BaseMessage):
     """Game started message schema."""
 
-    type: MessageType = Field(
+    type: Literal[MessageType.GAME_STARTED] = Field(
         default=MessageType.GAME_STARTED, description="Message type"
     )
     game: GameDetails = Field(..., description="Started game details")
@@ -135,7 +194,7 @@ class GameStartedMessage(BaseMessage):
 class GameEndedMessage(BaseMessage):
     """Game ended message schema."""
 
-    type: MessageType = Field(
+    type: Literal[MessageType.GAME_ENDED] = Field(
         default=MessageType.GAME_ENDED, description="Message type"
     )
     game_id: str = Field(..., description="Game ID")
@@ -146,7 +205,7 @@ class GameEndedMessage(BaseMessage):
 class TurnChangedMessage(BaseMessage):
     """Turn changed message schema."""
 
-    type: MessageType = Field(
+    type: Literal[MessageType.TURN_CHANGED] = Field(
         default=MessageType.TURN_CHANGED, description="Message type"
     )
     current_player_id: str = Field(..., description="Current player's turn")
@@ -156,7 +215,7 @@ class TurnChangedMessage(BaseMessage):
 class ActionResultMessage(BaseMessage):
     """Action result message schema."""
 
-    type: MessageType = Field(
+    type: Literal[MessageType.ACTION_RESULT] = Field(
         default=MessageType.ACTION_RESULT, description="Message type"
     )
     result: ActionResult = Field(..., description="Action execution result")
@@ -178,4 +237,19 @@ WebSocketMessage = (
     | GameEndedMessage
     | TurnChangedMessage
     | ActionResultMessage
+    | ResumeMessage
+    | SetViewMessage
 )
+
+# Messages clients may send, told apart by their ``type`` tag
+ClientMessage = Annotated[
+    PingMessage
+    | PongMessage
+    | JoinGameMessage
+    | LeaveGameMessage
+    | PlayerActionMessage
+    | PlayerReadyMessage
+    | ResumeMessage
+    | SetViewMessage,
+    Field(discriminator="type"),
+]
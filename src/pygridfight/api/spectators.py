@@ -0,0 +1,390 @@
+"""Spectator fan-out for PyGridFight.
+
+Spectators (PRD §5.5) watch a game read-only over their own WebSocket
+endpoint and may number in the thousands for a popular game, so they are
+served by a separate tier that never touches the player path:
+
+* spectators are not in the connection registry, so player broadcasts never
+  iterate over them;
+* the tier reads the game store only to check, when a spectator connects,
+  that the game exists; updates are handed over by the ticker as they are
+  broadcast to players, and the handover only schedules a callback;
+* in that callback each update is encoded once per game and wire protocol,
+  and every viewer sends the same bytes.
+
+Each game keeps its latest ``game_state`` as a keyframe plus the updates
+published since, so a viewer joining mid-game, or one that fell too far
+behind, starts from the keyframe and replays the deltas. A channel nobody
+watches is dropped once the game has ended or been quiet for
+``channel_ttl``, and a deleted game's channel at once.
+"""
+
+import asyncio
+import itertools
+import time
+from collections import deque
+from collections.abc import Callable
+from functools import partial
+
+import structlog
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse
+
+from pygridfight.api.heartbeat import HeartbeatMonitor, heartbeats
+from pygridfight.api.outbound import DISCONNECT, OutboundQueue
+from pygridfight.api.protocol import (
+    BINARY_V1,
+    JsonSession,
+    Payload,
+    Session,
+    SharedBinarySession,
+    select_protocol,
+)
+from pygridfight.api.schemas.messages import PingMessage, PongMessage
+from pygridfight.api.websocket import (
+    client_ip,
+    receive_frame,
+    reject_connection,
+    reject_protocol,
+    throttle,
+)
+from pygridfight.core.config import get_server_settings
+from pygridfight.core.exceptions import ProtocolError, ValidationError
+from pygridfight.core.metrics import get_metrics_registry
+from pygridfight.infrastructure.admission import get_admission_controller
+from pygridfight.infrastructure.game_state import GameStateManager
+from pygridfight.infrastructure.rate_limit import open_message_limiter
+
+logger = structlog.get_logger(__name__)
+
+_metrics = get_metrics_registry()
+SPECTATORS = _metrics.gauge(
+    "pygridfight_spectators",
+    "Currently connected spectators.",
+).labels()
+SPECTATOR_CATCH_UPS = _metrics.counter(
+    "pygridfight_spectator_catch_ups_total",
+    "Spectators sent the latest keyframe because they joined or fell behind.",
+).labels()
+
+
+class SpectatorChannel:
+    """Spectator state of one game: keyframe, deltas and viewers."""
+
+    def __init__(
+        self,
+        game_id: str,
+        state_types: frozenset[str],
+        max_deltas: int,
+        now: float = 0.0,
+    ) -> None:
+        self.game_id = game_id
+        self.state_types = state_types
+        self.keyframe: Payload | None = None
+        self.deltas: deque[Payload] = deque(maxlen=max_deltas)
+        self.viewers: dict[str, OutboundQueue] = {}
+        self.ended = False
+        # When the channel last released an update (or was opened).
+        self.last_release = now
+        # One session per protocol, shared by all the game's viewers.
+        self.json = JsonSession()
+        self.binary = SharedBinarySession()
+        self._full_keyframe: tuple[Payload, int, Payload] | None = None
+
+    def session(self, protocol: str | None) -> Session:
+        """Get the shared session for a viewer's protocol."""
+        return self.binary if protocol == BINARY_V1 else self.json
+
+    def release(self, message: dict, now: float = 0.0) -> None:
+        """Record an update and queue it for every viewer."""
+        self.last_release = now
+        payload = Payload(message)
+        message_type = message.get("type")
+        if message_type in self.state_types:
+            self.keyframe = payload
+            self.deltas.clear()
+        else:
+            self.deltas.append(payload)
+        if message_type == "game_ended":
+            self.ended = True
+        backlog = len(self.deltas) + (self.keyframe is not None)
+        # Snapshot: a put may close a viewer and remove it.
+        for queue in list(self.viewers.values()):
+            # Skip a full viewer ahead only if that leaves room for updates;
+            # otherwise its overflow policy decides.
+            if len(queue) >= queue.maxsize and backlog < queue.maxsize:
+                self.catch_up(queue)
+            else:
+                queue.put(payload)
+
+    def catch_up(self, queue: OutboundQueue) -> None:
+        """Replace a viewer's backlog with the keyframe and later deltas."""
+        SPECTATOR_CATCH_UPS.inc()
+        queue.clear()
+        payloads = [self.keyframe, *self.deltas] if self.keyframe else [*self.deltas]
+        if not payloads:
+            return
+        if queue.session is self.binary:
+            # The viewer has not seen earlier handle definitions.
+            payloads[0] = self._define_all(payloads[0])
+        for payload in payloads:
+            queue.put(payload)
+
+    def _define_all(self, payload: Payload) -> Payload:
+        # Reused until the keyframe or the handle table changes.
+        size = len(self.binary.ids)
+        cached = self._full_keyframe
+        if cached is not None and cached[0] is payload and cached[1] == size:
+            return cached[2]
+        full = self.binary.catch_up(payload)
+        self._full_keyframe = (payload, len(self.binary.ids), full)
+        return full
+
+
+class SpectatorHub:
+    """Spectator channels of every game."""
+
+    def __init__(
+        self,
+        delay: float | None = None,
+        queue_size: int | None = None,
+        max_deltas: int | None = None,
+        state_types: list[str] | None = None,
+        send_timeout: float | None = None,
+        heartbeats: HeartbeatMonitor | None = None,
+        channel_ttl: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the hub.
+
+        Args:
+            delay: Seconds updates are held back from spectators (default:
+                ServerSettings.spectator_delay).
+            queue_size: Messages queued per spectator before it is skipped
+                ahead (default: ServerSettings.spectator_queue_size).
+            max_deltas: Updates kept after the keyframe (default:
+                ServerSettings.spectator_max_deltas); capped below
+                ``queue_size`` so a catch-up fits in a viewer's queue.
+            state_types: Message types that are keyframes (default:
+                ServerSettings.ws_coalesce_types).
+            send_timeout: Seconds a send may take before the spectator is
+                evicted (default: ServerSettings.ws_send_timeout).
+            heartbeats: Heartbeat monitor to watch spectators with.
+            channel_ttl: Seconds a game's channel is kept without viewers
+                after its last update (default:
+                ServerSettings.spectator_channel_ttl).
+            clock: Monotonic clock, in seconds.
+        """
+        settings = get_server_settings()
+        self.delay = delay if delay is not None else settings.spectator_delay
+        self.queue_size = queue_size or settings.spectator_queue_size
+        self.max_deltas = min(
+            max_deltas or settings.spectator_max_deltas, self.queue_size - 1
+        )
+        self.state_types = frozenset(
+            state_types if state_types is not None else settings.ws_coalesce_types
+        )
+        self.send_timeout = send_timeout or settings.ws_send_timeout
+        self.heartbeats = heartbeats
+        self.channel_ttl = channel_ttl or settings.spectator_channel_ttl
+        self.clock = clock
+        self._channels: dict[str, SpectatorChannel] = {}
+        self._ids = itertools.count(1)
+        self._next_sweep = clock() + self.channel_ttl
+
+    def channel(self, game_id: str) -> SpectatorChannel | None:
+        """Get a game's channel, if it has one."""
+        return self._channels.get(game_id)
+
+    def viewers(self, game_id: str) -> int:
+        """Number of spectators watching a game."""
+        channel = self._channels.get(game_id)
+        return len(channel.viewers) if channel is not None else 0
+
+    def publish(self, message: dict, game_id: str) -> None:
+        """Hand an update over to the game's spectators.
+
+        Only schedules the work, after ``delay``; must be called from the
+        event loop.
+        """
+        asyncio.get_running_loop().call_later(
+            self.delay, self._release, game_id, message
+        )
+
+    def _open(self, game_id: str) -> SpectatorChannel:
+        channel = self._channels.get(game_id)
+        if channel is None:
+            channel = self._channels[game_id] = SpectatorChannel(
+                game_id, self.state_types, self.max_deltas, self.clock()
+            )
+        return channel
+
+    def _release(self, game_id: str, message: dict) -> None:
+        now = self.clock()
+        channel = self._open(game_id)
+        channel.release(message, now)
+        if channel.ended and not channel.viewers:
+            del self._channels[game_id]
+        if now >= self._next_sweep:
+            self.sweep(now)
+
+    def _expired(self, channel: SpectatorChannel, now: float) -> bool:
+        return not channel.viewers and (
+            channel.ended or now - channel.last_release >= self.channel_ttl
+        )
+
+    def sweep(self, now: float | None = None) -> int:
+        """Drop the channels of games nobody watches that ended or went quiet.
+
+        Runs on its own as updates are released, at most once per
+        ``channel_ttl``.
+
+        Returns:
+            Number of channels dropped.
+        """
+        now = self.clock() if now is None else now
+        self._next_sweep = now + self.channel_ttl
+        expired = [
+            game_id
+            for game_id, channel in self._channels.items()
+            if self._expired(channel, now)
+        ]
+        for game_id in expired:
+            del self._channels[game_id]
+        return len(expired)
+
+    async def join(
+        self, websocket: WebSocket, game_id: str, protocol: str | None = None
+    ) -> tuple[str, OutboundQueue]:
+        """Accept a spectator and catch it up with the game.
+
+        Args:
+            websocket: The socket to accept.
+            game_id: Game to watch.
+            protocol: Subprotocol negotiated with the client, if any.
+
+        Returns:
+            The spectator's ID and outbound queue.
+        """
+        await websocket.accept(subprotocol=protocol)
+        channel = self._open(game_id)
+        viewer_id = f"spectator-{next(self._ids)}"
+        queue = OutboundQueue(
+            websocket,
+            viewer_id,
+            on_close=partial(self.leave, game_id),
+            maxsize=self.queue_size,
+            policy=DISCONNECT,
+            send_timeout=self.send_timeout,
+            session=channel.session(protocol),
+        )
+        channel.viewers[viewer_id] = queue
+        channel.catch_up(queue)
+        if self.heartbeats is not None:
+            self.heartbeats.watch(queue)
+        SPECTATORS.inc()
+        logger.info("Spectator joined", game_id=game_id, viewer_id=viewer_id)
+        return viewer_id, queue
+
+    def leave(self, game_id: str, viewer_id: str) -> None:
+        """Remove a spectator."""
+        channel = self._channels.get(game_id)
+        if channel is None:
+            return
+        queue = channel.viewers.pop(viewer_id, None)
+        if queue is None:
+            return
+        queue.close()
+        if self.heartbeats is not None:
+            self.heartbeats.forget(queue)
+        SPECTATORS.dec()
+        if self._expired(channel, self.clock()):
+            del self._channels[game_id]
+        logger.info("Spectator left", game_id=game_id, viewer_id=viewer_id)
+
+    def discard(self, game_id: str) -> None:
+        """Drop a game's channel and disconnect its spectators.
+
+        Must be called from the event loop.
+        """
+        channel = self._channels.pop(game_id, None)
+        if channel is None:
+            return
+        for queue in channel.viewers.values():
+            queue.evict(close_code=1000, reason="Game deleted")
+            if self.heartbeats is not None:
+                self.heartbeats.forget(queue)
+            SPECTATORS.dec()
+        channel.viewers.clear()
+
+
+# Global spectator hub
+hub = SpectatorHub(heartbeats=heartbeats)
+
+router = APIRouter()
+
+
+async def reject_unknown_game(websocket: WebSocket) -> None:
+    """Refuse a spectator handshake for a game that does not exist.
+
+    Answers with an HTTP 404 when the server supports handshake denial
+    responses, else closes with 1008 (Policy Violation).
+    """
+    if "websocket.http.response" in websocket.scope.get("extensions", {}):
+        await websocket.send_denial_response(
+            JSONResponse({"message": "Game not found"}, status_code=404)
+        )
+    else:
+        await websocket.close(code=1008, reason="Game not found")
+
+
+@router.websocket("/ws/spectate/{game_id}")
+async def spectator_endpoint(websocket: WebSocket, game_id: str) -> None:
+    """Read-only WebSocket endpoint streaming a game's updates."""
+    rejection = get_admission_controller().check("connection")
+    if rejection is not None:
+        await reject_connection(websocket, rejection)
+        return
+
+    offered = websocket.scope.get("subprotocols", [])
+    protocol = select_protocol(offered)
+    if offered and protocol is None:
+        await reject_protocol(websocket)
+        return
+
+    if not GameStateManager().has_game(game_id):
+        await reject_unknown_game(websocket)
+        return
+
+    viewer_id, queue = await hub.join(websocket, game_id, protocol)
+    limiter = open_message_limiter(client_ip(websocket))
+
+    async def reply(message: dict) -> None:
+        queue.put(Payload(message))
+
+    try:
+        while True:
+            data = await receive_frame(websocket)
+            if hub.heartbeats is not None:
+                hub.heartbeats.touch(queue)
+            if await throttle(limiter, queue.session, data, reply):
+                if limiter is not None and limiter.exhausted:
+                    await websocket.close(code=1008, reason="Rate limit exceeded")
+                    return
+                continue
+            try:
+                message = queue.session.parse(data)
+            except (ProtocolError, ValidationError) as e:
+                answer = {"type": "error", "message": e.message, "code": e.code}
+            else:
+                if isinstance(message, PingMessage):
+                    answer = {"type": "pong"}
+                elif isinstance(message, PongMessage):
+                    continue  # answers a heartbeat; receiving it was enough
+                else:
+                    answer = {"type": "error", "message": "Spectators are read-only"}
+            await reply(answer)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        hub.leave(game_id, viewer_id)
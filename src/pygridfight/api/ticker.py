@@ -0,0 +1,191 @@
+"""Per-game tick batching of WebSocket broadcasts for PyGridFight.
+
+Game state changes arrive in bursts (every avatar move of every player in a
+turn), and sending a full update for each one multiplies frames and encoding
+work without giving clients anything they can use: only the newest state
+matters. The ticker holds a game's broadcasts for one tick and sends the
+merged result.
+"""
+
+import asyncio
+import itertools
+from collections.abc import Hashable
+
+from pygridfight.api.spectators import SpectatorHub, hub
+from pygridfight.api.websocket import ConnectionManager, manager
+from pygridfight.core.config import get_server_settings
+from pygridfight.core.metrics import get_metrics_registry
+from pygridfight.services.bot_service import BotService
+from pygridfight.services.turn_timer import TurnTimers
+
+_metrics = get_metrics_registry()
+TICK_MESSAGES = _metrics.counter(
+    "pygridfight_tick_messages_total",
+    "Game broadcasts published to the ticker, by what became of them.",
+    labelnames=("outcome",),
+)
+_BATCHED = TICK_MESSAGES.labels("batched")
+_MERGED = TICK_MESSAGES.labels("merged")
+_URGENT = TICK_MESSAGES.labels("urgent")
+TICK_FLUSHES = _metrics.counter(
+    "pygridfight_tick_flushes_total",
+    "Game ticks that sent pending broadcasts.",
+).labels()
+
+
+class GameTicker:
+    """Batches each game's broadcasts and sends them once per tick.
+
+    The first message published for an idle game schedules that game's flush
+    ``interval`` seconds later, and everything published until then goes out
+    in that flush, in publication order. Messages of a state type (full
+    snapshots such as ``game_state``) replace the pending one of the same
+    type and take its place at the end, so any number of state changes
+    within a tick become one update per recipient. Idle games cost nothing.
+
+    Urgent message types skip the wait: they flush the game's pending
+    messages first, then go out immediately, so clients still see messages
+    in the order they were published.
+
+    Whatever is sent to players is also handed over to the game's
+    spectators, if a spectator hub is attached. Turn changes set the game's
+    turn deadline, if turn timers are attached, and have seated bots play,
+    if bots are attached.
+    """
+
+    def __init__(
+        self,
+        manager: ConnectionManager,
+        interval: float | None = None,
+        state_types: list[str] | None = None,
+        urgent_types: list[str] | None = None,
+        spectators: SpectatorHub | None = None,
+        turn_timers: TurnTimers | None = None,
+        bots: BotService | None = None,
+    ) -> None:
+        """Initialize the ticker.
+
+        Args:
+            manager: Connection manager to broadcast through.
+            interval: Seconds to batch a game's broadcasts for; 0 disables
+                batching (default: ServerSettings.ws_tick_interval).
+            state_types: Message types where only the newest pending one is
+                sent (default: ServerSettings.ws_coalesce_types).
+            urgent_types: Message types sent without waiting for the tick
+                (default: ServerSettings.ws_urgent_types).
+            spectators: Spectator hub to hand sent messages over to.
+            turn_timers: Turn deadlines to keep up with published turn
+                changes.
+            bots: Bots to play their turns on published turn changes.
+        """
+        settings = get_server_settings()
+        self.manager = manager
+        self.spectators = spectators
+        self.turn_timers = turn_timers
+        self.bots = bots
+        self.interval = interval if interval is not None else settings.ws_tick_interval
+        self.state_types = frozenset(
+            state_types if state_types is not None else settings.ws_coalesce_types
+        )
+        self.urgent_types = frozenset(
+            urgent_types if urgent_types is not None else settings.ws_urgent_types
+        )
+        # game_id -> pending messages, keyed by state type or a unique number.
+        self._pending: dict[str, dict[Hashable, dict]] = {}
+        self._timers: dict[str, asyncio.TimerHandle] = {}
+        self._sequence = itertools.count()
+
+    def pending(self, game_id: str) -> int:
+        """Number of messages waiting for a game's next tick."""
+        return len(self._pending.get(game_id, ()))
+
+    def publish(self, message: dict, game_id: str) -> None:
+        """Schedule a message for every player connected to a game.
+
+        Never blocks; must be called from the event loop.
+        """
+        if self.turn_timers is not None:
+            self.turn_timers.observe(message, game_id)
+        if self.bots is not None:
+            self.bots.observe(message, game_id)
+        message_type = message.get("type")
+        if message_type in self.urgent_types:
+            _URGENT.inc()
+        elif self.interval > 0:
+            self._hold(message, message_type, game_id)
+            return
+        self.flush(game_id)
+        self._send(message, game_id)
+
+    def _hold(self, message: dict, message_type: str | None, game_id: str) -> None:
+        pending = self._pending.get(game_id)
+        if pending is None:
+            pending = self._pending[game_id] = {}
+            self._timers[game_id] = asyncio.get_running_loop().call_later(
+                self.interval, self.flush, game_id
+            )
+        if message_type in self.state_types:
+            if pending.pop(message_type, None) is not None:
+                _MERGED.inc()
+            pending[message_type] = message
+        else:
+            pending[next(self._sequence)] = message
+
+    def flush(self, game_id: str) -> int:
+        """Send a game's pending messages now.
+
+        Returns:
+            Number of messages sent.
+        """
+        timer = self._timers.pop(game_id, None)
+        if timer is not None:
+            timer.cancel()
+        pending = self._pending.pop(game_id, None)
+        if not pending:
+            return 0
+        for message in pending.values():
+            self._send(message, game_id)
+        _BATCHED.inc(len(pending))
+        TICK_FLUSHES.inc()
+        return len(pending)
+
+    def _send(self, message: dict, game_id: str) -> None:
+        self.manager.queue_broadcast(message, game_id)
+        if self.spectators is not None:
+            self.spectators.publish(message, game_id)
+
+    def discard(self, game_id: str) -> None:
+        """Forget a deleted game.
+
+        Drops the game's pending messages and whatever the attached
+        subsystems keep for it: its spectators' channel (disconnecting
+        them), turn deadline and bots, and the connection manager's replay
+        journal and areas of interest.
+        """
+        timer = self._timers.pop(game_id, None)
+        if timer is not None:
+            timer.cancel()
+        self._pending.pop(game_id, None)
+        if self.spectators is not None:
+            self.spectators.discard(game_id)
+        if self.turn_timers is not None:
+            self.turn_timers.cancel(game_id)
+        if self.bots is not None:
+            self.bots.unseat(game_id)
+        if self.manager.replay is not None:
+            self.manager.replay.discard(game_id)
+        if self.manager.interest is not None:
+            self.manager.interest.discard(game_id)
+
+    def close(self) -> None:
+        """Cancel every pending tick and drop what it would have sent."""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        self._pending.clear()
+
+
+# Global ticker for the global connection manager and spectator hub. Turn
+# timers and bots are not attached: nothing publishes turn_changed or
+# applies a server-side action to the stored game yet.
+ticker = GameTicker(manager, spectators=hub)
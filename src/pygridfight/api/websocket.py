@@ -1,106 +1,526 @@
 """WebSocket handlers for PyGridFight."""
 
-import json
+import asyncio
+import itertools
+import time
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from typing import Any
 
 import structlog
-from fastapi import WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse
 
-from pygridfight.core.exceptions import GameError, PlayerError
+from pygridfight.api.heartbeat import HeartbeatMonitor, heartbeats
+from pygridfight.api.interest import InterestManager, View
+from pygridfight.api.outbound import DISCONNECT, DROP_OLDEST, OutboundQueue
+from pygridfight.api.protocol import (
+    SUPPORTED_PROTOCOLS,
+    Payload,
+    Session,
+    open_session,
+    select_protocol,
+)
+from pygridfight.api.replay import ReplayBuffer
+from pygridfight.api.schemas.messages import (
+    ClientMessage,
+    JoinGameMessage,
+    LeaveGameMessage,
+    MessageType,
+    PingMessage,
+    PongMessage,
+    ResumeMessage,
+    SetViewMessage,
+)
+from pygridfight.core.config import get_server_settings
+from pygridfight.core.exceptions import (
+    GameError,
+    GameNotFoundError,
+    PlayerError,
+    ProtocolError,
+    ValidationError,
+)
+from pygridfight.core.metrics import get_metrics_registry
+from pygridfight.domain.models.game import Game
+from pygridfight.domain.models.player import Player
+from pygridfight.infrastructure.admission import Rejection, get_admission_controller
+from pygridfight.infrastructure.connections import (
+    ConnectionRegistry,
+    get_connection_registry,
+)
+from pygridfight.infrastructure.game_state import GameStateManager
+from pygridfight.infrastructure.rate_limit import (
+    MessageLimiter,
+    open_message_limiter,
+)
 
 logger = structlog.get_logger(__name__)
 
+_metrics = get_metrics_registry()
+BROADCAST_SECONDS = _metrics.histogram(
+    "pygridfight_broadcast_duration_seconds",
+    "Time to encode a game broadcast and queue it for every recipient.",
+)
+BROADCAST_RECIPIENTS = _metrics.histogram(
+    "pygridfight_broadcast_recipients",
+    "Number of sockets a game broadcast was queued for.",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+ACTIVE_CONNECTIONS = _metrics.gauge(
+    "pygridfight_websocket_connections",
+    "Currently open WebSocket connections.",
+)
+
+
+class _Hold:
+    """Broadcasts held back from a reconnected player, by game."""
+
+    __slots__ = ("frames", "timer")
+
+    def __init__(
+        self,
+        frames: dict[str, list[tuple[Payload, Hashable | None]]],
+        timer: asyncio.TimerHandle,
+    ) -> None:
+        self.frames = frames
+        self.timer = timer
+
 
 class ConnectionManager:
-    """Manages WebSocket connections for the game."""
+    """Manages WebSocket connections for the game.
+
+    Every connection gets an OutboundQueue with its own writer task, so
+    sending never waits on a client's network: messages are encoded once
+    and queued, and slow clients are handled by the queue's overflow policy.
+    """
+
+    def __init__(
+        self,
+        send_timeout: float | None = None,
+        queue_size: int | None = None,
+        overflow_grace: float | None = None,
+        coalesce_types: list[str] | None = None,
+        registry: ConnectionRegistry | None = None,
+        heartbeats: HeartbeatMonitor | None = None,
+        replay: ReplayBuffer | None = None,
+        interest: InterestManager | None = None,
+        resume_hold: float | None = None,
+    ) -> None:
+        """Initialize the manager.
+
+        Args:
+            send_timeout: Seconds a send may take before the socket is
+                evicted (default: ServerSettings.ws_send_timeout).
+            queue_size: Outbound queue size per connection (default:
+                ServerSettings.ws_queue_size).
+            overflow_grace: Seconds a player's queue may stay full before the
+                connection is closed (default: ServerSettings.ws_overflow_grace).
+            coalesce_types: Message types whose queued, unsent messages are
+                replaced by newer ones for the same game (default:
+                ServerSettings.ws_coalesce_types).
+            registry: Connection registry to track sockets and game groups in
+                (default: a private one).
+            heartbeats: Heartbeat monitor to watch connections with.
+            replay: Replay buffer numbering game broadcasts, for players to
+                resume from after reconnecting.
+            interest: Area-of-interest filter for the broadcasts of area
+                games.
+            resume_hold: Seconds a reconnected player's game broadcasts are
+                held back waiting for it to resume (default:
+                ServerSettings.ws_resume_hold).
+        """
+        settings = get_server_settings()
+        self.send_timeout = send_timeout or settings.ws_send_timeout
+        self.queue_size = queue_size or settings.ws_queue_size
+        self.overflow_grace = (
+            overflow_grace if overflow_grace is not None else settings.ws_overflow_grace
+        )
+        self.coalesce_types = frozenset(
+            coalesce_types if coalesce_types is not None else settings.ws_coalesce_types
+        )
+        self.registry = registry if registry is not None else ConnectionRegistry()
+        self.heartbeats = heartbeats
+        self.replay = replay
+        self.interest = interest
+        self.resume_hold = (
+            resume_hold if resume_hold is not None else settings.ws_resume_hold
+        )
+        self._holds: dict[str, _Hold] = {}
 
-    def __init__(self) -> None:
-        self.active_connections: dict[str, WebSocket] = {}
-        self.game_connections: dict[str, set[str]] = {}
+    def is_connected(self, player_id: str) -> bool:
+        """Whether a player has an open connection."""
+        return player_id in self.registry
 
-    async def connect(self, websocket: WebSocket, player_id: str) -> None:
-        """Accept a new WebSocket connection."""
-        await websocket.accept()
-        self.active_connections[player_id] = websocket
-        logger.info("Player connected", player_id=player_id)
+    async def connect(
+        self,
+        websocket: WebSocket,
+        player_id: str,
+        spectator: bool = False,
+        protocol: str | None = None,
+    ) -> Session:
+        """Accept a new WebSocket connection.
 
-    def disconnect(self, player_id: str) -> None:
-        """Remove a WebSocket connection."""
-        if player_id in self.active_connections:
-            del self.active_connections[player_id]
+        A reconnecting player replaces their previous connection and keeps
+        their game memberships. Broadcasts to those games are held back until
+        the player resumes or rejoins each game, or for ``resume_hold``
+        seconds, so they neither duplicate nor overtake the replay.
 
-        # Remove from all games
-        for _, players in self.game_connections.items():
-            players.discard(player_id)
+        Args:
+            websocket: The socket to accept.
+            player_id: ID to register the connection under.
+            spectator: Spectators drop their oldest queued messages when they
+                fall behind; players are disconnected on sustained overflow.
+            protocol: Subprotocol negotiated with the client, or None if the
+                client did not ask for one (JSON).
 
+        Returns:
+            The connection's protocol session, to decode incoming frames.
+        """
+        await websocket.accept(subprotocol=protocol)
+        session = open_session(protocol)
+
+        def on_close(player_id: str) -> None:
+            self.disconnect(player_id, session)
+
+        queue = OutboundQueue(
+            websocket,
+            player_id,
+            on_close=on_close,
+            maxsize=self.queue_size,
+            policy=DROP_OLDEST if spectator else DISCONNECT,
+            send_timeout=self.send_timeout,
+            overflow_grace=self.overflow_grace,
+            session=session,
+        )
+        previous = self.registry.register(player_id, queue)
+        if previous is not None:
+            previous.close()
+            self._hold(player_id)
+        if self.heartbeats is not None:
+            if previous is not None:
+                self.heartbeats.forget(previous)
+            self.heartbeats.watch(queue)
+        ACTIVE_CONNECTIONS.set(len(self.registry))
+        logger.info(
+            "Player connected",
+            player_id=player_id,
+            spectator=spectator,
+            protocol=session.protocol,
+        )
+        return session
+
+    def disconnect(self, player_id: str, session: Session | None = None) -> None:
+        """Remove a WebSocket connection and its game memberships.
+
+        Args:
+            player_id: The player to disconnect.
+            session: The session of the connection being closed, if known.
+                Nothing is removed if the player has since reconnected: the
+                old socket's disconnect may be noticed after the new one was
+                accepted, and must not drop it.
+        """
+        if session is not None:
+            current = self.registry.get(player_id)
+            if current is None or current.session is not session:
+                return
+        hold = self._holds.pop(player_id, None)
+        if hold is not None:
+            hold.timer.cancel()
+        queue = self.registry.unregister(player_id)
+        if queue is not None:
+            queue.close()
+            if self.heartbeats is not None:
+                self.heartbeats.forget(queue)
+        ACTIVE_CONNECTIONS.set(len(self.registry))
         logger.info("Player disconnected", player_id=player_id)
 
+    def seen(self, player_id: str) -> None:
+        """Record that a frame was received from a player, for heartbeats."""
+        if self.heartbeats is not None:
+            queue = self.registry.get(player_id)
+            if queue is not None:
+                self.heartbeats.touch(queue)
+
     def add_to_game(self, player_id: str, game_id: str) -> None:
-        """Add a player to a game's connection group."""
-        if game_id not in self.game_connections:
-            self.game_connections[game_id] = set()
-        self.game_connections[game_id].add(player_id)
+        """Add a player to a game's connection group.
+
+        Broadcasts held back since the player reconnected are queued first.
+        """
+        self._unhold(player_id, game_id)
+        self.registry.join(game_id, player_id)
 
     def remove_from_game(self, player_id: str, game_id: str) -> None:
         """Remove a player from a game's connection group."""
-        if game_id in self.game_connections:
-            self.game_connections[game_id].discard(player_id)
+        self._unhold(player_id, game_id, deliver=False)
+        self.registry.leave(game_id, player_id)
+        if self.interest is not None:
+            self.interest.forget(game_id, player_id)
 
     async def send_personal_message(self, message: dict, player_id: str) -> None:
-        """Send a message to a specific player."""
-        if player_id in self.active_connections:
-            websocket = self.active_connections[player_id]
-            try:
-                await websocket.send_text(json.dumps(message))
-            except Exception as e:
-                logger.error(
-                    "Failed to send message", player_id=player_id, error=str(e)
-                )
-                self.disconnect(player_id)
+        """Queue a message for a specific player."""
+        queue = self.registry.get(player_id)
+        if queue is not None:
+            queue.put(Payload(message), self._coalesce_key(message))
 
     async def broadcast_to_game(self, message: dict, game_id: str) -> None:
-        """Broadcast a message to all players in a game."""
-        if game_id not in self.game_connections:
+        """Queue a message for every player connected to a game.
+
+        The message is encoded once per wire protocol in use; each
+        connection's writer task then sends it at that client's own pace.
+        """
+        self.queue_broadcast(message, game_id)
+
+    def queue_broadcast(self, message: dict, game_id: str) -> int:
+        """Synchronous form of ``broadcast_to_game``, for timer callbacks.
+
+        Returns:
+            Number of connections the message was queued for.
+        """
+        # Numbered even with nobody connected, for players about to resume.
+        if self.replay is not None:
+            payload = self.replay.record(message, game_id)
+        else:
+            payload = Payload(message)
+        players = self.registry.players_in(game_id)
+        if not players:
+            return 0
+
+        start = time.perf_counter()
+        key = self._coalesce_key(message, game_id)
+        # Snapshots: a put may close a connection and unregister its player.
+        recipients: Iterable[tuple[str, Payload]]
+        if self.interest is not None and self.interest.observe(message, game_id):
+            recipients = self.interest.fan_out(payload, game_id, list(players))
+        else:
+            recipients = zip(list(players), itertools.repeat(payload))
+        holds = self._holds
+        queued = 0
+        for player_id, item in recipients:
+            hold = holds.get(player_id) if holds else None
+            if hold is not None and game_id in hold.frames:
+                hold.frames[game_id].append((item, key))
+                queued += 1
+                continue
+            queue = self.registry.get(player_id)
+            if queue is not None and queue.put(item, key):
+                queued += 1
+        BROADCAST_SECONDS.observe(time.perf_counter() - start)
+        BROADCAST_RECIPIENTS.observe(queued)
+        return queued
+
+    def catch_up(self, player_id: str, game_id: str, payloads: list[Payload]) -> None:
+        """Queue game messages for one player, then subscribe them to the game.
+
+        Area games' messages are filtered as they would have been when
+        broadcast. Nothing can be broadcast to the game in between, and
+        broadcasts held back since a reconnect are dropped: ``payloads``
+        bring the player up to date.
+        """
+        self._unhold(player_id, game_id, deliver=False)
+        queue = self.registry.get(player_id)
+        if queue is None:
+            return
+        for payload in payloads:
+            if self.interest is not None and self.interest.covers(
+                payload.message, game_id
+            ):
+                for _, item in self.interest.fan_out(payload, game_id, [player_id]):
+                    queue.put(item)
+            else:
+                queue.put(payload)
+        self.add_to_game(player_id, game_id)
+
+    async def flush(self) -> None:
+        """Wait until every connection's queued messages have been sent."""
+        for queue in self.registry.connections():
+            await queue.drained()
+
+    def _hold(self, player_id: str) -> None:
+        games = self.registry.games_of(player_id)
+        if not games or self.resume_hold <= 0:
             return
+        # A player reconnecting again keeps what was held so far.
+        hold = self._holds.pop(player_id, None)
+        frames = hold.frames if hold is not None else {}
+        if hold is not None:
+            hold.timer.cancel()
+        for game_id in games:
+            frames.setdefault(game_id, [])
+        timer = asyncio.get_running_loop().call_later(
+            self.resume_hold, self._unhold, player_id
+        )
+        self._holds[player_id] = _Hold(frames, timer)
+
+    def _unhold(
+        self, player_id: str, game_id: str | None = None, deliver: bool = True
+    ) -> None:
+        """Stop holding back a player's broadcasts of one game (default: all).
+
+        Args:
+            player_id: The reconnected player.
+            game_id: The game to release, or None for all of them.
+            deliver: Queue the held broadcasts, else drop them.
+        """
+        hold = self._holds.get(player_id)
+        if hold is None:
+            return
+        game_ids = list(hold.frames) if game_id is None else [game_id]
+        queue = self.registry.get(player_id)
+        for held_game_id in game_ids:
+            frames = hold.frames.pop(held_game_id, None)
+            if deliver and frames and queue is not None:
+                for payload, key in frames:
+                    queue.put(payload, key)
+        if not hold.frames:
+            hold.timer.cancel()
+            del self._holds[player_id]
+
+    def _coalesce_key(
+        self, message: dict, game_id: str | None = None
+    ) -> tuple[str, str | None] | None:
+        message_type = message.get("type")
+        if message_type not in self.coalesce_types:
+            return None
+        return message_type, game_id or message.get("game_id")
 
-        disconnected_players = []
-        for player_id in self.game_connections[game_id]:
-            if player_id in self.active_connections:
-                try:
-                    websocket = self.active_connections[player_id]
-                    await websocket.send_text(json.dumps(message))
-                except Exception as e:
-                    logger.error(
-                        "Failed to broadcast message",
-                        player_id=player_id,
-                        game_id=game_id,
-                        error=str(e),
-                    )
-                    disconnected_players.append(player_id)
 
-        # Clean up disconnected players
-        for player_id in disconnected_players:
-            self.disconnect(player_id)
+# Global connection manager instance, sharing the registry GameStateManager uses
+manager = ConnectionManager(
+    registry=get_connection_registry(),
+    heartbeats=heartbeats,
+    replay=ReplayBuffer(),
+    interest=InterestManager(),
+)
 
+router = APIRouter()
 
-# Global connection manager instance
-manager = ConnectionManager()
 
+async def reject_connection(websocket: WebSocket, rejection: Rejection) -> None:
+    """Refuse a WebSocket handshake because the server is saturated.
 
+    Answers with an HTTP 503 and Retry-After when the server supports
+    handshake denial responses, else closes with 1013 (Try Again Later).
+    """
+    if "websocket.http.response" in websocket.scope.get("extensions", {}):
+        await websocket.send_denial_response(
+            JSONResponse(
+                {"message": "Server busy, retry later", "reason": rejection.reason},
+                status_code=503,
+                headers={"Retry-After": str(rejection.retry_after)},
+            )
+        )
+    else:
+        await websocket.close(code=1013, reason="Server busy")
+
+
+async def reject_protocol(websocket: WebSocket) -> None:
+    """Refuse a WebSocket handshake offering no supported subprotocol.
+
+    Answers with an HTTP 400 listing the supported protocols when the server
+    supports handshake denial responses, else closes with 1002 (Protocol
+    Error).
+    """
+    if "websocket.http.response" in websocket.scope.get("extensions", {}):
+        await websocket.send_denial_response(
+            JSONResponse(
+                {
+                    "message": "Unsupported WebSocket protocol",
+                    "supported": list(SUPPORTED_PROTOCOLS),
+                },
+                status_code=400,
+            )
+        )
+    else:
+        await websocket.close(code=1002, reason="Unsupported protocol")
+
+
+def client_ip(websocket: WebSocket) -> str:
+    """The address of a WebSocket's client, as seen by the server."""
+    return websocket.client.host if websocket.client is not None else "unknown"
+
+
+async def throttle(
+    limiter: MessageLimiter | None,
+    session: Session,
+    data: str | bytes,
+    reply: Callable[[dict], Awaitable[None]],
+) -> bool:
+    """Charge a received frame to the connection's rate limits.
+
+    Only the first of a run of rejected frames is answered with an error,
+    so a flood gets no flood of replies. Once ``limiter.exhausted``, the
+    caller should close the connection.
+
+    Args:
+        limiter: The connection's limits, None if rate limiting is off.
+        session: The connection's protocol session, to find the frame's
+            message type without parsing it.
+        data: The frame.
+        reply: Queues a message for the client.
+
+    Returns:
+        True if the frame must be dropped.
+    """
+    if limiter is None or limiter.check(session.peek_type(data)) is None:
+        return False
+    if limiter.strikes == 1:
+        await reply(
+            {"type": "error", "message": "Rate limit exceeded", "code": "RATE_LIMITED"}
+        )
+    return True
+
+
+async def receive_frame(websocket: WebSocket) -> str | bytes:
+    """Receive the next text or binary frame.
+
+    Raises:
+        WebSocketDisconnect: If the client disconnected.
+    """
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000), message.get("reason"))
+    text = message.get("text")
+    return text if text is not None else message.get("bytes", b"")
+
+
+@router.websocket("/ws/{player_id}")
 async def websocket_endpoint(websocket: WebSocket, player_id: str) -> None:
     """Main WebSocket endpoint for game communication."""
-    await manager.connect(websocket, player_id)
+    rejection = get_admission_controller().check("connection")
+    if rejection is not None:
+        await reject_connection(websocket, rejection)
+        return
+
+    offered = websocket.scope.get("subprotocols", [])
+    protocol = select_protocol(offered)
+    if offered and protocol is None:
+        await reject_protocol(websocket)
+        return
+
+    session = await manager.connect(websocket, player_id, protocol=protocol)
+    limiter = open_message_limiter(client_ip(websocket))
+
+    async def reply(message: dict) -> None:
+        await manager.send_personal_message(message, player_id)
 
     try:
         while True:
             # Receive message from client
-            data = await websocket.receive_text()
+            data = await receive_frame(websocket)
+            manager.seen(player_id)
+            if await throttle(limiter, session, data, reply):
+                if limiter is not None and limiter.exhausted:
+                    manager.disconnect(player_id, session)
+                    await websocket.close(code=1008, reason="Rate limit exceeded")
+                    return
+                continue
 
             try:
-                message = json.loads(data)
+                message = session.parse(data)
                 await handle_websocket_message(message, player_id)
-            except json.JSONDecodeError:
+            except (ProtocolError, ValidationError) as e:
                 await manager.send_personal_message(
-                    {"type": "error", "message": "Invalid JSON format"}, player_id
+                    {"type": "error", "message": e.message, "code": e.code},
+                    player_id,
                 )
             except (GameError, PlayerError) as e:
                 await manager.send_personal_message(
@@ -117,19 +537,131 @@ async def websocket_endpoint(websocket: WebSocket, player_id: str) -> None:
                 )
 
     except WebSocketDisconnect:
-        manager.disconnect(player_id)
+        manager.disconnect(player_id, session)
+
+
+async def handle_ping(message: PingMessage, player_id: str) -> None:
+    """Answer a ping."""
+    await manager.send_personal_message({"type": "pong"}, player_id)
+
+
+async def handle_pong(message: PongMessage, player_id: str) -> None:
+    """Nothing to do: receiving the pong already kept the connection alive."""
+
 
+async def handle_join_game(message: JoinGameMessage, player_id: str) -> None:
+    """Join a game and subscribe to its updates.
 
-async def handle_websocket_message(message: dict, player_id: str) -> None:
-    """Handle incoming WebSocket messages."""
-    message_type = message.get("type")
+    A player who already joined the game (e.g. over REST) is only
+    subscribed. The new state is published through the ticker, so everyone
+    in the game and its spectators see it.
+    """
+    # Imported here: the ticker module imports this one.
+    from pygridfight.api.ticker import ticker
 
-    if message_type == "ping":
-        await manager.send_personal_message({"type": "pong"}, player_id)
+    games = GameStateManager()
+    player = Player(id=player_id, display_name=message.player_name)
+    try:
+        game = await games.join_game(message.game_id, player)
+    except ValueError:
+        # Already a player of the game (join_game checked that it exists).
+        game = await games.get_game(message.game_id)
+    manager.add_to_game(player_id, message.game_id)
+    ticker.publish({"type": "game_state", "game": game.get_state()}, message.game_id)
+
+
+async def handle_leave_game(message: LeaveGameMessage, player_id: str) -> None:
+    """Stop sending a game's updates to the player."""
+    manager.remove_from_game(player_id, message.game_id)
+
+
+async def member_game(game_id: str, player_id: str) -> Game:
+    """Get a game the player is in.
+
+    Raises:
+        GameNotFoundError: If the game does not exist.
+        PlayerError: If the player is not in the game.
+    """
+    game = await GameStateManager().get_game(game_id)
+    if game is None:
+        raise GameNotFoundError(game_id)
+    if player_id not in game.players:
+        raise PlayerError(
+            f"Player '{player_id}' is not in game '{game_id}'", "NOT_IN_GAME"
+        )
+    return game
+
+
+async def handle_resume(message: ResumeMessage, player_id: str) -> None:
+    """Subscribe a reconnected player to a game again and catch them up.
+
+    The player is sent the game's broadcasts numbered after
+    ``message.last_seq`` if they are still kept, else the current state,
+    numbered with the latest broadcast's ``seq``.
+    """
+    game = await member_game(message.game_id, player_id)
+    replay = manager.replay
+    frames = replay.since(message.game_id, message.last_seq) if replay else None
+    if frames is None:
+        seq = replay.last_seq(message.game_id) if replay else None
+        frames = [Payload({"type": "game_state", "game": game.get_state(), "seq": seq})]
+    manager.catch_up(player_id, message.game_id, frames)
+
+
+async def handle_set_view(message: SetViewMessage, player_id: str) -> None:
+    """Choose the player's area of interest in an area game.
+
+    The player is sent the game's current state as seen from the new area.
+    """
+    game = await member_game(message.game_id, player_id)
+    if game.visibility != "area" or manager.interest is None:
+        raise GameError(
+            f"Game '{message.game_id}' has full visibility", "NOT_AREA_GAME"
+        )
+    if message.viewport is not None:
+        area = message.viewport
+        view = View(
+            viewport=(area.x, area.y, area.x + area.width - 1, area.y + area.height - 1)
+        )
+    elif message.radius is not None:
+        view = View(radius=message.radius)
     else:
-        # TODO: Implement other message handlers
-        logger.warning("Unknown message type", type=message_type, player_id=player_id)
+        view = None
+    manager.interest.set_view(message.game_id, player_id, view, game.view_radius)
+    seq = manager.replay.last_seq(message.game_id) if manager.replay else None
+    state = Payload({"type": "game_state", "game": game.get_state(), "seq": seq})
+    manager.catch_up(player_id, message.game_id, [state])
+
+
+MessageHandler = Callable[[Any, str], Awaitable[None]]
+
+# Handler of each client message type; types without one are answered
+# with an error. player_action and player_ready are parsed and validated
+# but deliberately left unrouted until the game applies actions and tracks
+# readiness.
+MESSAGE_HANDLERS: dict[MessageType, MessageHandler] = {
+    MessageType.PING: handle_ping,
+    MessageType.PONG: handle_pong,
+    MessageType.JOIN_GAME: handle_join_game,
+    MessageType.LEAVE_GAME: handle_leave_game,
+    MessageType.RESUME: handle_resume,
+    MessageType.SET_VIEW: handle_set_view,
+}
+
+
+async def handle_websocket_message(message: ClientMessage, player_id: str) -> None:
+    """Route a parsed WebSocket message to the handler of its type."""
+    handler = MESSAGE_HANDLERS.get(message.type)
+    if handler is None:
+        logger.warning(
+            "Unsupported message type", type=message.type.value, player_id=player_id
+        )
         await manager.send_personal_message(
-            {"type": "error", "message": f"Unknown message type: {message_type}"},
+            {
+                "type": "error",
+                "message": f"Unsupported message type: {message.type.value}",
+            },
             player_id,
         )
+        return
+    await handler(message, player_id)
@@ -1,8 +1,9 @@
 """Configuration management for PyGridFight."""
 
 from functools import lru_cache
+from typing import Literal
 
-from pydantic import Field
+from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings
 
 
@@ -30,6 +31,262 @@ class ServerSettings(BaseSettings):
         default_factory=lambda: ["*"], description="Allowed CORS origins"
     )
     log_level: str = Field(default="INFO", description="Logging level")
+    log_async: bool = Field(
+        default=False,
+        description="Render and write logs on a background thread via a queue",
+    )
+    log_queue_size: int = Field(
+        default=10_000, gt=0, description="Maximum queued log events"
+    )
+    log_queue_overflow: Literal["drop_new", "drop_oldest", "block"] = Field(
+        default="drop_new",
+        description="What to do with events when the queue is full; 'block' "
+        "only waits off the event loop and drops new events on it",
+    )
+    log_batch_size: int = Field(
+        default=256, gt=0, description="Maximum log events written per batch"
+    )
+    log_sample_rates: dict[str, float] = Field(
+        default_factory=dict,
+        description="Fraction of events kept per event name, e.g. "
+        '{"Request started": 0.1}',
+    )
+    game_loop_timestep: float = Field(
+        default=0.1, gt=0, description="Seconds between two ticks of a running game"
+    )
+    game_loop_slots: int = Field(
+        default=10,
+        gt=0,
+        description="Phases the game loop timestep is split into, to spread "
+        "games' ticks across it",
+    )
+    game_loop_sync_interval: float = Field(
+        default=1.0,
+        gt=0,
+        description="Seconds between refreshes of the games the game loop steps",
+    )
+    turn_timeout: float = Field(
+        default=60.0,
+        gt=0,
+        description="Seconds a player has for a turn before it is ended for them",
+    )
+    turn_timer_resolution: float = Field(
+        default=0.1,
+        gt=0,
+        description="Seconds turn deadlines are rounded up to; deadlines within "
+        "one such step expire together",
+    )
+    turn_timer_batch: int = Field(
+        default=1000,
+        gt=0,
+        description="Expired turns ended per event loop callback",
+    )
+    bot_workers: int = Field(
+        default=2, gt=0, description="Worker processes computing bot moves"
+    )
+    bot_policy: Literal["greedy", "mcts"] = Field(
+        default="mcts", description="How bots pick their moves"
+    )
+    bot_move_budget: float = Field(
+        default=0.5, gt=0, description="Seconds a bot may think about a move"
+    )
+    bot_move_grace: float = Field(
+        default=1.0,
+        ge=0,
+        description="Seconds a bot move may take beyond its budget (queueing, "
+        "worker start-up) before the bot ends its turn instead",
+    )
+    matchmaking_interval: float = Field(
+        default=0.5, gt=0, description="Seconds between matchmaking ticks"
+    )
+    ws_send_timeout: float = Field(
+        default=1.0,
+        gt=0,
+        description="Seconds a WebSocket send may take before the socket is evicted",
+    )
+    ws_queue_size: int = Field(
+        default=256, gt=0, description="Outbound messages queued per WebSocket"
+    )
+    ws_overflow_grace: float = Field(
+        default=5.0,
+        ge=0,
+        description="Seconds a player's outbound queue may stay full before "
+        "the connection is closed",
+    )
+    ws_coalesce_types: list[str] = Field(
+        default_factory=lambda: ["game_state"],
+        description="Message types where a newer queued message for the same "
+        "game replaces an unsent older one",
+    )
+    ws_tick_interval: float = Field(
+        default=0.05,
+        ge=0,
+        description="Seconds a game's broadcasts are batched for before they "
+        "are sent (0 sends them immediately)",
+    )
+    ws_urgent_types: list[str] = Field(
+        default_factory=lambda: ["error", "game_ended"],
+        description="Message types that are broadcast immediately instead of "
+        "waiting for the game's next tick",
+    )
+    spectator_delay: float = Field(
+        default=0.0,
+        ge=0,
+        description="Seconds game updates are held back from spectators",
+    )
+    spectator_queue_size: int = Field(
+        default=64,
+        gt=0,
+        description="Outbound messages queued per spectator before it is "
+        "skipped ahead to the latest keyframe",
+    )
+    spectator_max_deltas: int = Field(
+        default=48,
+        gt=0,
+        description="Updates kept after the latest keyframe for spectators "
+        "joining mid-game; must be below spectator_queue_size",
+    )
+    spectator_channel_ttl: float = Field(
+        default=300.0,
+        gt=0,
+        description="Seconds a game's spectator channel is kept without "
+        "viewers after its last update",
+    )
+    loop_lag_interval: float = Field(
+        default=0.5, gt=0, description="Seconds between event loop lag probes"
+    )
+    ready_max_loop_lag: float = Field(
+        default=0.25,
+        gt=0,
+        description="Loop lag in seconds above which /ready reports unready",
+    )
+    admission_enabled: bool = Field(
+        default=True, description="Shed new lobbies and connections under load"
+    )
+    admission_max_loop_lag: float = Field(
+        default=0.1, gt=0, description="Loop lag in seconds above which to shed"
+    )
+    admission_max_in_flight: int = Field(
+        default=1000, gt=0, description="In-flight HTTP requests above which to shed"
+    )
+    admission_max_connections: int = Field(
+        default=10_000,
+        gt=0,
+        description="Open WebSocket connections above which new ones are refused",
+    )
+    admission_max_pending_sends: int = Field(
+        default=10_000,
+        gt=0,
+        description="Pending outbound WebSocket messages above which to shed",
+    )
+    admission_retry_after: int = Field(
+        default=1, ge=0, description="Retry-After seconds sent with a 503"
+    )
+    ws_heartbeat_interval: float = Field(
+        default=20.0,
+        ge=0,
+        description="Seconds a WebSocket may stay quiet before it is pinged, and "
+        "between heartbeat sweeps (0 disables heartbeats)",
+    )
+    ws_heartbeat_missed: int = Field(
+        default=2,
+        gt=0,
+        description="Heartbeat pings a WebSocket may leave unanswered before it "
+        "is closed",
+    )
+    ws_heartbeat_batch: int = Field(
+        default=500,
+        gt=0,
+        description="Connections checked per event loop turn of a heartbeat sweep",
+    )
+    ws_replay_size: int = Field(
+        default=128,
+        ge=0,
+        description="Recent broadcasts kept per game for reconnecting players to "
+        "resume from; older gaps get a full snapshot",
+    )
+    interest_bucket_size: int = Field(
+        default=8,
+        gt=0,
+        description="Side, in cells, of the spatial index buckets used to find "
+        "what is in a player's area of interest",
+    )
+    ws_replay_games: int = Field(
+        default=10_000, gt=0, description="Games whose recent broadcasts are kept"
+    )
+    ws_resume_hold: float = Field(
+        default=2.0,
+        ge=0,
+        description="Seconds a reconnected player's game broadcasts are held "
+        "back waiting for it to resume, so replayed and live messages do not "
+        "overlap (0 disables)",
+    )
+    rate_limit_enabled: bool = Field(
+        default=True, description="Rate limit WebSocket messages and REST requests"
+    )
+    ws_message_rate: float = Field(
+        default=20.0, gt=0, description="WebSocket messages per second per connection"
+    )
+    ws_message_burst: int = Field(
+        default=40, gt=0, description="WebSocket messages a connection can save up"
+    )
+    ws_message_type_limits: dict[str, tuple[float, int]] = Field(
+        default={
+            "ping": (1.0, 5),
+            "pong": (1.0, 5),
+            "join_game": (1.0, 5),
+            "leave_game": (1.0, 5),
+            "player_ready": (1.0, 5),
+            "resume": (1.0, 5),
+            "set_view": (5.0, 10),
+            "player_action": (10.0, 20),
+        },
+        description="Per-connection messages per second and burst, by message type",
+    )
+    ws_ip_message_rate: float = Field(
+        default=200.0,
+        gt=0,
+        description="WebSocket messages per second per client IP, all connections",
+    )
+    ws_ip_message_burst: int = Field(
+        default=400, gt=0, description="WebSocket messages a client IP can save up"
+    )
+    ws_rate_limit_strikes: int = Field(
+        default=100,
+        gt=0,
+        description="Rate-limited messages in a row before a connection is closed",
+    )
+    rest_request_rate: float = Field(
+        default=50.0, gt=0, description="REST requests per second per client IP"
+    )
+    rest_request_burst: int = Field(
+        default=200, gt=0, description="REST requests a client IP can save up"
+    )
+    rest_rate_limit_exempt: list[str] = Field(
+        default=["/health", "/ready", "/metrics"],
+        description="Paths not rate limited, such as probes",
+    )
+    admin_token: str | None = Field(
+        default=None,
+        description="Token required in X-Admin-Token by admin endpoints; "
+        "admin endpoints are disabled when unset",
+    )
+    profiler_interval: float = Field(
+        default=0.005, ge=0.001, description="Seconds between profiler samples"
+    )
+    profiler_max_seconds: float = Field(
+        default=30.0, gt=0, description="Longest profile the admin endpoint runs"
+    )
+
+    @model_validator(mode="after")
+    def _check_spectator_backlog(self) -> "ServerSettings":
+        # A spectator catching up is sent the keyframe and every delta at
+        # once, which must fit in its queue.
+        if self.spectator_max_deltas >= self.spectator_queue_size:
+            raise ValueError(
+                "spectator_max_deltas must be less than spectator_queue_size"
+            )
+        return self
 
     class Config:
         env_prefix = "PYGRIDFIGHT_"
@@ -66,3 +66,10 @@ class ValidationError(PyGridFightError):
         self.field = field
         self.value = value
         self.reason = reason
+
+
+class ProtocolError(PyGridFightError):
+    """Raised when a WebSocket frame cannot be decoded."""
+
+    def __init__(self, message: str) -> None:
+        super().__init__(message, "PROTOCOL_ERROR")
@@ -0,0 +1,225 @@
+"""Non-blocking log pipeline for PyGridFight.
+
+Log calls on the event loop only enqueue an event dict; a background thread
+renders queued events and writes them to the stream in batches, so a slow
+stdout never stalls request handling.
+"""
+
+import asyncio
+import contextlib
+import logging
+import random
+import sys
+import threading
+from collections import deque
+from collections.abc import Callable, Mapping
+from datetime import UTC, datetime
+from typing import Any, Literal, TextIO
+
+import structlog
+from structlog.typing import EventDict
+
+OverflowPolicy = Literal["drop_new", "drop_oldest", "block"]
+
+Renderer = Callable[[Any, str, EventDict], str | bytes]
+
+
+def _on_event_loop() -> bool:
+    """Whether the calling thread is running an event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class QueuedLogWriter:
+    """Bounded log queue drained by a background writer thread.
+
+    When the queue is full, ``overflow`` decides what happens to a new event:
+    ``drop_new`` discards it, ``drop_oldest`` evicts the oldest queued event,
+    and ``block`` makes the caller wait for room. ``block`` only ever waits
+    on threads without a running event loop: on the event loop it would
+    freeze every connection behind a slow stream, so there it drops the new
+    event like ``drop_new``. Dropped events are counted in ``dropped``.
+
+    Once the writer is closed, events are rendered and written to stderr
+    on the caller's thread, so logs from late shutdown hooks are not lost.
+    """
+
+    def __init__(
+        self,
+        renderer: Renderer,
+        stream: TextIO | None = None,
+        maxsize: int = 10_000,
+        overflow: OverflowPolicy = "drop_new",
+        batch_size: int = 256,
+    ) -> None:
+        """Initialize the writer and start its thread.
+
+        Args:
+            renderer: structlog renderer turning an event dict into a line.
+            stream: Output stream (default: sys.stdout).
+            maxsize: Maximum number of queued events.
+            overflow: Policy applied when the queue is full.
+            batch_size: Maximum number of events rendered per write.
+        """
+        self._renderer = renderer
+        self._stream = stream or sys.stdout
+        self._maxsize = maxsize
+        self._overflow = overflow
+        self._batch_size = batch_size
+        self._queue: deque[dict] = deque()
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._closed = False
+        self.dropped = 0
+        self._thread = threading.Thread(
+            target=self._run, name="pygridfight-log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, event_dict: dict) -> None:
+        """Queue an event for rendering, applying the overflow policy."""
+        with self._cond:
+            if not self._closed and len(self._queue) >= self._maxsize:
+                if self._overflow == "drop_new" or _on_event_loop():
+                    self.dropped += 1
+                    return
+                if self._overflow == "drop_oldest":
+                    self._queue.popleft()
+                    self.dropped += 1
+                else:
+                    while len(self._queue) >= self._maxsize and not self._closed:
+                        self._cond.wait()
+            if not self._closed:
+                self._queue.append(event_dict)
+                self._cond.notify_all()
+                return
+        self._write([event_dict], sys.stderr)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every queued event has been written.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely).
+
+        Returns:
+            True if the queue drained, False on timeout.
+        """
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._queue and not self._in_flight, timeout
+            )
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        """Flush pending events and stop the writer thread."""
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._closed)
+                if not self._queue:
+                    return
+                count = min(len(self._queue), self._batch_size)
+                batch = [self._queue.popleft() for _ in range(count)]
+                self._in_flight = count
+                self._cond.notify_all()
+            try:
+                self._write(batch)
+            finally:
+                with self._cond:
+                    self._in_flight = 0
+                    self._cond.notify_all()
+
+    def _write(self, batch: list[dict], stream: TextIO | None = None) -> None:
+        stream = stream or self._stream
+        lines = []
+        for event_dict in batch:
+            try:
+                line = self._renderer(None, "", event_dict)
+                lines.append(line.decode() if isinstance(line, bytes) else line)
+            except (TypeError, ValueError) as e:
+                lines.append(f"Failed to render log event: {e!r}")
+        # Never let a broken or closed stream kill the writer thread.
+        with contextlib.suppress(OSError, ValueError):
+            stream.write("\n".join(lines) + "\n")
+            stream.flush()
+
+
+class QueueLogger:
+    """structlog logger that hands processed event dicts to a QueuedLogWriter."""
+
+    def __init__(self, writer: QueuedLogWriter, name: str | None = None) -> None:
+        self._writer = writer
+        self.name = name or ""
+
+    def msg(self, event_dict: dict) -> None:
+        self._writer.submit(event_dict)
+
+    debug = info = warning = warn = error = critical = exception = fatal = msg
+
+
+class QueueLoggerFactory:
+    """structlog logger factory producing QueueLoggers bound to one writer."""
+
+    def __init__(self, writer: QueuedLogWriter) -> None:
+        self._writer = writer
+
+    def __call__(self, *args: Any) -> QueueLogger:
+        return QueueLogger(self._writer, args[0] if args else None)
+
+
+class QueueHandler(logging.Handler):
+    """stdlib handler routing records from other libraries into the writer."""
+
+    def __init__(self, writer: QueuedLogWriter) -> None:
+        super().__init__()
+        self._writer = writer
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self._writer.submit(
+                {
+                    "event": record.getMessage(),
+                    "logger": record.name,
+                    "level": record.levelname.lower(),
+                    "timestamp": datetime.fromtimestamp(record.created, UTC)
+                    .isoformat()
+                    .replace("+00:00", "Z"),
+                }
+            )
+        except (TypeError, ValueError):
+            # Bad format arguments for the record's message.
+            self.handleError(record)
+
+
+def enqueue_event(logger: Any, method_name: str, event_dict: EventDict) -> tuple:
+    """Final processor: pass the unrendered event dict to the QueueLogger."""
+    return (event_dict,), {}
+
+
+class EventSampler:
+    """structlog processor keeping only a fraction of high-volume events.
+
+    Args:
+        rates: Mapping of event name to the probability (0.0-1.0) that an
+            event with that name is kept. Unlisted events are always kept.
+    """
+
+    def __init__(self, rates: Mapping[str, float]) -> None:
+        self._rates = dict(rates)
+        self._random = random.random
+
+    def __call__(
+        self, logger: Any, method_name: str, event_dict: EventDict
+    ) -> EventDict:
+        rate = self._rates.get(event_dict.get("event", ""))
+        if rate is not None and self._random() >= rate:
+            raise structlog.DropEvent
+        return event_dict
@@ -1,5 +1,6 @@
 """Logging configuration for PyGridFight."""
 
+import atexit
 import contextvars
 import logging
 import sys
@@ -9,12 +10,24 @@ from functools import wraps
 from typing import Any
 
 import structlog
-
+from structlog.typing import Processor
+
+from pygridfight.core.log_pipeline import (
+    EventSampler,
+    QueuedLogWriter,
+    QueueHandler,
+    QueueLoggerFactory,
+    Renderer,
+    enqueue_event,
+)
 from src.pygridfight.core.config import get_server_settings
 
 # Context variable for correlation ID
 _correlation_id_ctx = contextvars.ContextVar("correlation_id", default=None)
 
+# Background writer used when ServerSettings.log_async is enabled
+_log_writer: QueuedLogWriter | None = None
+
 
 def _add_correlation_id(logger, method_name, event_dict):
     cid = _correlation_id_ctx.get()
@@ -28,14 +41,9 @@ def setup_logging() -> None:
     settings = get_server_settings()
     log_level = getattr(logging, settings.log_level.upper(), logging.INFO)
     log_format = getattr(settings, "log_format", "json")
+    shutdown_logging()
 
-    logging.basicConfig(
-        format="%(message)s",
-        stream=sys.stdout,
-        level=log_level,
-    )
-
-    processors = [
+    processors: list[Processor] = [
         structlog.stdlib.filter_by_level,
         structlog.stdlib.add_logger_name,
         structlog.stdlib.add_log_level,
@@ -46,20 +54,84 @@ def setup_logging() -> None:
         structlog.processors.UnicodeDecoder(),
         _add_correlation_id,
     ]
+    if settings.log_sample_rates:
+        processors.insert(1, EventSampler(settings.log_sample_rates))
 
+    renderer: Renderer
     if log_format == "json":
-        processors.append(structlog.processors.JSONRenderer())
+        renderer = structlog.processors.JSONRenderer()
     else:
-        processors.append(structlog.dev.ConsoleRenderer())
+        renderer = structlog.dev.ConsoleRenderer()
+
+    if settings.log_async:
+        _setup_queued_logging(settings, log_level, processors, renderer)
+        return
+
+    logging.basicConfig(
+        format="%(message)s",
+        stream=sys.stdout,
+        level=log_level,
+    )
 
     structlog.configure(
-        processors=processors,
+        processors=[*processors, renderer],
         wrapper_class=structlog.stdlib.BoundLogger,
         logger_factory=structlog.stdlib.LoggerFactory(),
         cache_logger_on_first_use=True,
     )
 
 
+def _setup_queued_logging(
+    settings, log_level: int, processors: list[Processor], renderer: Renderer
+) -> None:
+    """Route all logging through a bounded queue and a background writer.
+
+    Level filtering, timestamps and context run on the caller; rendering and
+    the blocking write happen on the writer thread, in batches.
+    """
+    global _log_writer
+    _log_writer = QueuedLogWriter(
+        renderer,
+        stream=sys.stdout,
+        maxsize=settings.log_queue_size,
+        overflow=settings.log_queue_overflow,
+        batch_size=settings.log_batch_size,
+    )
+
+    # stdlib loggers (uvicorn, libraries) share the same queue.
+    root = logging.getLogger()
+    root.addHandler(QueueHandler(_log_writer))
+    root.setLevel(log_level)
+
+    # filter_by_level needs a stdlib logger; the filtering bound logger
+    # already drops events below log_level before any processor runs.
+    structlog.configure(
+        processors=[*processors[1:], enqueue_event],
+        wrapper_class=structlog.make_filtering_bound_logger(log_level),
+        logger_factory=QueueLoggerFactory(_log_writer),
+        cache_logger_on_first_use=True,
+    )
+
+
+def shutdown_logging(timeout: float = 5.0) -> None:
+    """Flush queued log events and stop the background writer, if any.
+
+    Later log calls are written synchronously to stderr.
+    """
+    global _log_writer
+    if _log_writer is not None:
+        root = logging.getLogger()
+        for handler in [h for h in root.handlers if isinstance(h, QueueHandler)]:
+            root.removeHandler(handler)
+        # structlog keeps its loggers, which now write through the closed
+        # writer synchronously to stderr.
+        _log_writer.close(timeout)
+        _log_writer = None
+
+
+atexit.register(shutdown_logging)
+
+
 def get_logger(name: str = __name__) -> structlog.BoundLogger:
     """Get a structured logger instance."""
     return structlog.get_logger(name)
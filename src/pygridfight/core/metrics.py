@@ -0,0 +1,322 @@
+"""In-process metrics for PyGridFight.
+
+Counters, gauges and fixed-bucket histograms kept in plain Python attributes
+and rendered in the Prometheus text exposition format on demand.
+
+Recording is built for hot paths: a labelled child is looked up once and can
+be cached by the caller, and ``inc``/``set``/``observe`` only update numbers
+in place (a histogram observation is one ``bisect`` plus two additions), so
+no containers are allocated per observation.
+"""
+
+import math
+from bisect import bisect_left
+from collections.abc import Iterable, Sequence
+from functools import lru_cache
+from typing import Any
+
+# Latency buckets in seconds, from 10µs to 10s.
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class CounterChild:
+    """A single monotonically increasing counter series."""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the counter by ``amount`` (must not be negative)."""
+        self.value += amount
+
+
+class GaugeChild:
+    """A single gauge series that can go up and down."""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        """Set the gauge to ``value``."""
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the gauge by ``amount``."""
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Decrease the gauge by ``amount``."""
+        self.value -= amount
+
+
+class HistogramChild:
+    """A single histogram series with fixed upper bounds.
+
+    Bucket counts are stored per bucket (not cumulative) and accumulated only
+    when rendered, so an observation touches exactly one bucket.
+    """
+
+    __slots__ = ("_bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self._bounds = bounds
+        # One slot per bound plus the implicit +Inf bucket.
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        self.counts[bisect_left(self._bounds, value)] += 1
+        self.sum += value
+
+    @property
+    def count(self) -> int:
+        """Total number of observations."""
+        return sum(self.counts)
+
+
+class _Metric[ChildT]:
+    """Base for a named metric family with optional labels."""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], ChildT] = {}
+        self._default: ChildT | None = None if self.labelnames else self.labels()
+
+    def _new_child(self) -> ChildT:
+        raise NotImplementedError
+
+    def _unlabelled(self) -> ChildT:
+        """The series of a family without labels."""
+        if self._default is None:
+            raise ValueError(f"{self.name} has labels {self.labelnames}; use labels()")
+        return self._default
+
+    def labels(self, *values: str) -> ChildT:
+        """Return the child series for the given label values.
+
+        The child is created on first use and cached; hot paths should keep
+        the returned object rather than call ``labels`` per observation.
+        """
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(
+                    f"{self.name} expects labels {self.labelnames}, got {values}"
+                )
+            child = self._children[values] = self._new_child()
+        return child
+
+    def samples(self) -> Iterable[tuple[str, dict[str, str], float]]:
+        """Yield (sample name, labels, value) for every series."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """Render this family in the Prometheus text format."""
+        lines = [
+            f"# HELP {self.name} {_escape_help(self.documentation)}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        for name, labels, value in self.samples():
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class _ValueMetric[ChildT: (CounterChild, GaugeChild)](_Metric[ChildT]):
+    """Base for a metric family whose series each hold one value."""
+
+    def samples(self) -> Iterable[tuple[str, dict[str, str], float]]:
+        for values, child in list(self._children.items()):
+            yield (
+                self.name,
+                dict(zip(self.labelnames, values, strict=True)),
+                child.value,
+            )
+
+
+class Counter(_ValueMetric[CounterChild]):
+    """Counter metric family."""
+
+    type_name = "counter"
+
+    def _new_child(self) -> CounterChild:
+        return CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the unlabelled counter."""
+        self._unlabelled().inc(amount)
+
+
+class Gauge(_ValueMetric[GaugeChild]):
+    """Gauge metric family."""
+
+    type_name = "gauge"
+
+    def _new_child(self) -> GaugeChild:
+        return GaugeChild()
+
+    def set(self, value: float) -> None:
+        """Set the unlabelled gauge."""
+        self._unlabelled().set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the unlabelled gauge."""
+        self._unlabelled().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Decrease the unlabelled gauge."""
+        self._unlabelled().dec(amount)
+
+
+class Histogram(_Metric[HistogramChild]):
+    """Histogram metric family with fixed bucket bounds."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        bounds = tuple(sorted(float(b) for b in buckets if b != math.inf))
+        if not bounds:
+            raise ValueError("Histogram needs at least one finite bucket")
+        self.buckets = bounds
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> HistogramChild:
+        return HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Record one observation on the unlabelled histogram."""
+        self._unlabelled().observe(value)
+
+    def samples(self) -> Iterable[tuple[str, dict[str, str], float]]:
+        for values, child in list(self._children.items()):
+            labels = dict(zip(self.labelnames, values, strict=True))
+            counts = list(child.counts)
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts, strict=True):
+                cumulative += count
+                le = "+Inf" if bound == math.inf else _format_value(bound)
+                yield f"{self.name}_bucket", {**labels, "le": le}, cumulative
+            yield f"{self.name}_sum", labels, child.sum
+            yield f"{self.name}_count", labels, cumulative
+
+
+class MetricsRegistry:
+    """Collection of metric families, rendered together for scraping.
+
+    Metric constructors are get-or-create, so modules may declare the
+    metrics they record at import time without coordinating.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric[Any]] = {}
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        """Get or create a counter."""
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Gauge:
+        """Get or create a gauge."""
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Get or create a histogram."""
+        return self._get_or_create(
+            Histogram, name, documentation, labelnames, buckets=buckets
+        )
+
+    def get(self, name: str) -> _Metric[Any] | None:
+        """Look up a registered metric family by name."""
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Render every registered family in the Prometheus text format."""
+        return "".join(metric.render() + "\n" for metric in self._metrics.values())
+
+    def _get_or_create(self, cls, name, documentation, labelnames, **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls(
+                name, documentation, labelnames, **kwargs
+            )
+        elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+            raise ValueError(f"Metric {name} already registered with another shape")
+        return metric
+
+
+@lru_cache
+def get_metrics_registry() -> MetricsRegistry:
+    """Get the process-wide metrics registry."""
+    return MetricsRegistry()
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        f'{key}="{_escape_label(str(value))}"' for key, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
@@ -0,0 +1,115 @@
+"""On-demand statistical stack sampler for PyGridFight.
+
+A background thread periodically snapshots every thread's stack with
+``sys._current_frames`` and aggregates them into collapsed stacks
+(``frame;frame;frame count``), the input format of flame graph tools.
+Nothing is installed or hooked while no profile is running, so the
+profiler costs nothing when idle.
+"""
+
+import contextlib
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable, Mapping
+from types import CodeType, FrameType
+
+# Called with a frame whose code is registered as a context code; returns
+# tags (e.g. "route=/games") prepended to every stack passing through it.
+FrameTagger = Callable[[FrameType], Iterable[str]]
+
+
+class SamplingProfiler:
+    """Thread-based sampling profiler producing collapsed stacks.
+
+    Args:
+        interval: Seconds between samples.
+        taggers: Mapping of code objects to taggers. When a sampled stack
+            passes through a frame running one of these code objects, the
+            tagger's tags are put at the root of the collapsed stack, so
+            flame graphs split by request context (route, game id, ...).
+        max_depth: Frames kept per stack, counted from the root.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.005,
+        taggers: Mapping[CodeType, FrameTagger] | None = None,
+        max_depth: int = 128,
+    ) -> None:
+        self.interval = interval
+        self._taggers = dict(taggers or {})
+        self._max_depth = max_depth
+        self._labels: dict[CodeType, str] = {}
+        self._stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.samples = 0
+
+    def sample_once(self) -> None:
+        """Take one snapshot of every other thread's stack."""
+        own = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own:
+                continue
+            stack = self._collapse(frame)
+            self._stacks[f"thread={names.get(thread_id, thread_id)};{stack}"] += 1
+        self.samples += 1
+
+    def start(self) -> None:
+        """Start sampling in a background thread."""
+        if self._thread is not None:
+            raise RuntimeError("Profiler already started")
+        self._thread = threading.Thread(
+            target=self._run, name="pygridfight-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampler thread to exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def collapsed(self) -> str:
+        """Render aggregated stacks, one ``stack count`` line each."""
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self._stacks.most_common()
+        )
+
+    def _run(self) -> None:
+        next_at = time.perf_counter()
+        while not self._stop.is_set():
+            self.sample_once()
+            next_at += self.interval
+            delay = next_at - time.perf_counter()
+            if delay < 0:
+                # Fell behind (e.g. GIL contention): skip missed samples
+                # rather than bursting to catch up.
+                next_at = time.perf_counter()
+                delay = 0
+            self._stop.wait(delay)
+
+    def _collapse(self, frame: FrameType | None) -> str:
+        frames: list[str] = []
+        tags: list[str] = []
+        while frame is not None:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                module = frame.f_globals.get("__name__", "?")
+                label = self._labels[code] = f"{module}:{code.co_qualname}"
+            frames.append(label)
+            tagger = self._taggers.get(code)
+            if tagger is not None and not tags:
+                # A frame's locals may change under us; skip its tags then,
+                # but keep the stack.
+                with contextlib.suppress(
+                    AttributeError, KeyError, TypeError, RuntimeError
+                ):
+                    tags.extend(tagger(frame))
+            frame = frame.f_back
+        frames.reverse()
+        return ";".join([*tags, *frames[: self._max_depth]])
@@ -86,3 +86,11 @@ class CombatResult(str, Enum):
     MISS = "miss"
     CRITICAL = "critical"
     BLOCKED = "blocked"
+
+
+class TicketStatus(str, Enum):
+    """Matchmaking ticket status enumeration."""
+
+    QUEUED = "queued"
+    MATCHED = "matched"
+    CANCELLED = "cancelled"
@@ -1,6 +1,7 @@
 """Game domain model for PyGridFight."""
 
 import uuid
+from datetime import datetime
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -15,6 +16,8 @@ class GameSettings(BaseModel):
     max_players: int
     grid_size: int
     is_private: bool = False
+    visibility: str = "full"
+    view_radius: int = 8
 
 
 class Game(BaseModel):
@@ -27,6 +30,12 @@ class Game(BaseModel):
         avatars: Dictionary of avatar_id to Avatar.
         status: Game status ("waiting", "active", "finished").
         turn: Current turn number.
+        version: Store-wide revision of the last persisted change, bumped by
+            GameStateManager on create and update. Used as the HTTP ETag.
+        visibility: "full" sends every update to every player; "area" sends
+            each player only what happens within their area of interest.
+        view_radius: Default area of interest of an "area" game, in cells
+            around each of the player's avatars.
     """
 
     id: str = Field(..., min_length=1)
@@ -35,12 +44,23 @@ class Game(BaseModel):
     avatars: dict[str, Avatar] = Field(default_factory=dict)
     status: str = Field(default="waiting", pattern="^(waiting|active|finished)$")
     turn: int = Field(default=0, ge=0)
+    version: int = Field(default=0, ge=0)
+    visibility: str = Field(default="full", pattern="^(full|area)$")
+    view_radius: int = Field(default=8, ge=1)
 
     # API metadata fields
     name: str | None = None
     max_players: int | None = None
     grid_size: int | None = None
     is_private: bool | None = None
+    created_at: datetime | None = None
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    @property
+    def has_free_slots(self) -> bool:
+        """Whether another player can still join the game."""
+        return self.max_players is None or len(self.players) < self.max_players
 
     @field_validator("id")
     @classmethod
@@ -137,4 +157,28 @@ class Game(BaseModel):
                 aid: avatar.model_dump() for aid, avatar in self.avatars.items()
             },
             "grid": self.grid.model_dump(),
+            "visibility": self.visibility,
+            "view_radius": self.view_radius,
+        }
+
+    def get_summary(self) -> dict:
+        """Get a lightweight lobby representation of the game.
+
+        Unlike get_state, this leaves out the grid, players and avatars so it
+        stays small and cheap to build for every game in a listing.
+
+        Returns:
+            A dictionary matching the GameInfo API schema.
+        """
+        return {
+            "id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "max_players": self.max_players,
+            "current_players": len(self.players),
+            "grid_size": self.grid_size,
+            "is_private": self.is_private,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
         }
@@ -1,5 +1,6 @@
 """Grid domain model for PyGridFight."""
 
+import itertools
 from dataclasses import dataclass
 
 from pydantic import BaseModel, Field, model_validator
@@ -32,6 +33,139 @@ class Cell:
         return self.terrain_type != TerrainType.WALL and self.avatar_id is None
 
 
+class SpatialIndex:
+    """
+    Uniform bucket index of items placed on a grid, for area queries.
+
+    The grid is split into square buckets of ``bucket_size`` cells, each
+    holding the IDs of the items in it, so a query only looks at the items
+    of the buckets its area overlaps, however large the grid. Moving an item
+    costs two set operations at most.
+
+    Attributes:
+        bucket_size (int): Side of a bucket, in cells.
+    """
+
+    __slots__ = ("_buckets", "_cells", "bucket_size")
+
+    def __init__(self, bucket_size: int = 8) -> None:
+        if bucket_size <= 0:
+            raise ValueError("Bucket size must be a positive integer.")
+        self.bucket_size = bucket_size
+        self._buckets: dict[tuple[int, int], set[str]] = {}
+        self._cells: dict[str, tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._cells
+
+    def _bucket(self, x: int, y: int) -> tuple[int, int]:
+        return x // self.bucket_size, y // self.bucket_size
+
+    def place(self, item_id: str, x: int, y: int) -> None:
+        """
+        Add an item at a cell, or move it there if already indexed.
+
+        Args:
+            item_id (str): The item's ID.
+            x (int): Column of the cell.
+            y (int): Row of the cell.
+        """
+        old = self._cells.get(item_id)
+        self._cells[item_id] = (x, y)
+        bucket = self._bucket(x, y)
+        if old is not None:
+            old_bucket = self._bucket(*old)
+            if old_bucket == bucket:
+                return
+            self._discard(item_id, old_bucket)
+        self._buckets.setdefault(bucket, set()).add(item_id)
+
+    def remove(self, item_id: str) -> None:
+        """
+        Remove an item, if indexed.
+
+        Args:
+            item_id (str): The item's ID.
+        """
+        cell = self._cells.pop(item_id, None)
+        if cell is not None:
+            self._discard(item_id, self._bucket(*cell))
+
+    def _discard(self, item_id: str, bucket: tuple[int, int]) -> None:
+        items = self._buckets[bucket]
+        items.discard(item_id)
+        if not items:
+            del self._buckets[bucket]
+
+    def cell(self, item_id: str) -> tuple[int, int] | None:
+        """
+        Get the cell an item is at.
+
+        Args:
+            item_id (str): The item's ID.
+
+        Returns:
+            tuple[int, int] | None: The item's (x, y), or None if not indexed.
+        """
+        return self._cells.get(item_id)
+
+    def query(self, x0: int, y0: int, x1: int, y1: int) -> set[str]:
+        """
+        Get the items inside a rectangle, bounds included.
+
+        Args:
+            x0 (int): Leftmost column.
+            y0 (int): Top row.
+            x1 (int): Rightmost column.
+            y1 (int): Bottom row.
+
+        Returns:
+            set[str]: IDs of the items in the rectangle.
+        """
+        found: set[str] = set()
+        if x1 < x0 or y1 < y0:
+            return found
+        bx0, by0 = self._bucket(x0, y0)
+        bx1, by1 = self._bucket(x1, y1)
+        if (bx1 - bx0 + 1) * (by1 - by0 + 1) > len(self._buckets):
+            # Wider than the occupied buckets: walk those instead.
+            buckets = [
+                items
+                for (bx, by), items in self._buckets.items()
+                if bx0 <= bx <= bx1 and by0 <= by <= by1
+            ]
+        else:
+            buckets = [
+                self._buckets[key]
+                for key in itertools.product(range(bx0, bx1 + 1), range(by0, by1 + 1))
+                if key in self._buckets
+            ]
+        cells = self._cells
+        for items in buckets:
+            for item_id in items:
+                x, y = cells[item_id]
+                if x0 <= x <= x1 and y0 <= y <= y1:
+                    found.add(item_id)
+        return found
+
+    def query_radius(self, x: int, y: int, radius: int) -> set[str]:
+        """
+        Get the items within ``radius`` cells of a cell on both axes.
+
+        Args:
+            x (int): Column of the center cell.
+            y (int): Row of the center cell.
+            radius (int): Reach, in cells.
+
+        Returns:
+            set[str]: IDs of the items in the square around the cell.
+        """
+        return self.query(x - radius, y - radius, x + radius, y + radius)
+
+
 class Grid(BaseModel):
     """
     Represents the game grid.
@@ -98,3 +232,16 @@ class Grid(BaseModel):
             int: The Manhattan distance.
         """
         return abs(pos1.x - pos2.x) + abs(pos1.y - pos2.y)
+
+    def spatial_index(self, bucket_size: int = 8) -> SpatialIndex:
+        """
+        Create an empty spatial index for items placed on this grid.
+
+        Args:
+            bucket_size (int): Side of the index's buckets, in cells; capped
+                at the grid's larger side.
+
+        Returns:
+            SpatialIndex: The index.
+        """
+        return SpatialIndex(min(bucket_size, max(self.width, self.height)))
@@ -0,0 +1,124 @@
+"""Admission control for new lobbies and connections.
+
+When the process is saturated, accepting more games or sockets only slows
+down the games already running. The controller checks live load signals
+before new work is admitted and tells callers to retry later instead.
+Requests that serve existing games (joins, reads, game messages) are never
+shed here.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+
+import structlog
+
+from pygridfight.core.config import ServerSettings, get_server_settings
+from pygridfight.core.metrics import get_metrics_registry
+from pygridfight.infrastructure.loop_monitor import get_loop_monitor
+
+logger = structlog.get_logger(__name__)
+
+_metrics = get_metrics_registry()
+ADMISSION_REJECTIONS = _metrics.counter(
+    "pygridfight_admission_rejections_total",
+    "New lobbies and connections rejected by admission control.",
+    labelnames=("kind", "reason"),
+)
+
+Signal = Callable[[], float]
+
+
+@dataclass(frozen=True)
+class Rejection:
+    """Why admission was refused and when to come back."""
+
+    reason: str
+    retry_after: int
+
+
+class AdmissionController:
+    """Decides whether new lobbies and connections may be admitted.
+
+    Each signal is a zero-argument callable read at decision time, so a
+    check costs a few attribute reads and comparisons.
+    """
+
+    def __init__(
+        self,
+        settings: ServerSettings,
+        loop_lag: Signal,
+        in_flight: Signal,
+        connections: Signal,
+        pending_sends: Signal,
+    ) -> None:
+        """Initialize the controller.
+
+        Args:
+            settings: Server settings holding the admission limits.
+            loop_lag: Current event loop lag in seconds.
+            in_flight: HTTP requests currently being handled.
+            connections: Open WebSocket connections.
+            pending_sends: Outbound WebSocket messages not yet sent.
+        """
+        self.enabled = settings.admission_enabled
+        self.retry_after = settings.admission_retry_after
+        # (reason, signal, limit), checked in order.
+        self._checks: list[tuple[str, Signal, float]] = [
+            ("loop_lag", loop_lag, settings.admission_max_loop_lag),
+            ("in_flight", in_flight, settings.admission_max_in_flight),
+            ("pending_sends", pending_sends, settings.admission_max_pending_sends),
+        ]
+        self._connection_check = (
+            "connections",
+            connections,
+            settings.admission_max_connections,
+        )
+
+    def check(self, kind: str) -> Rejection | None:
+        """Check whether new work of ``kind`` may be admitted.
+
+        Args:
+            kind: "lobby" for game creation, "connection" for WebSocket
+                connects. Connections are also capped by connection count.
+
+        Returns:
+            None if admitted, else the Rejection to report to the client.
+        """
+        if not self.enabled:
+            return None
+        checks = self._checks
+        if kind == "connection":
+            checks = [*checks, self._connection_check]
+        for reason, signal, limit in checks:
+            value = signal()
+            if value > limit:
+                ADMISSION_REJECTIONS.labels(kind, reason).inc()
+                logger.warning(
+                    "Admission rejected", kind=kind, reason=reason, value=value
+                )
+                return Rejection(reason=reason, retry_after=self.retry_after)
+        return None
+
+
+def _gauge_signal(name: str) -> Signal:
+    """Read an unlabelled gauge by name, as registered by its owner module."""
+    registry = get_metrics_registry()
+
+    def read() -> float:
+        gauge = registry.get(name)
+        return gauge.labels().value if gauge is not None else 0.0
+
+    return read
+
+
+@lru_cache
+def get_admission_controller() -> AdmissionController:
+    """Get the process-wide admission controller."""
+    return AdmissionController(
+        get_server_settings(),
+        loop_lag=get_loop_monitor().current_lag,
+        in_flight=_gauge_signal("pygridfight_http_requests_in_flight"),
+        connections=_gauge_signal("pygridfight_websocket_connections"),
+        pending_sends=_gauge_signal("pygridfight_websocket_pending_sends"),
+    )
@@ -0,0 +1,116 @@
+"""Connection registry shared by the REST and WebSocket layers."""
+
+from collections.abc import Iterator
+from collections.abc import Set as AbstractSet
+from functools import lru_cache
+from typing import Any
+
+_EMPTY: frozenset[str] = frozenset()
+
+
+class ConnectionRegistry:
+    """Single source of truth for who is connected and to which games.
+
+    Keeps three indexes in step so every lookup and update is O(1) (or
+    O(games of one player) for removing a player):
+
+    * player -> connection (the player's socket or outbound queue);
+    * game -> players connected to it;
+    * player -> games the player is connected to.
+
+    All methods are synchronous and run to completion without awaiting, so
+    the indexes are consistent whenever another coroutine observes them.
+    """
+
+    def __init__(self) -> None:
+        self._connections: dict[str, Any] = {}
+        self._game_players: dict[str, set[str]] = {}
+        self._player_games: dict[str, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._connections)
+
+    def __contains__(self, player_id: object) -> bool:
+        return player_id in self._connections
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._connections)
+
+    def register(self, player_id: str, connection: Any) -> Any | None:
+        """Set a player's connection, keeping their game memberships.
+
+        Returns:
+            The connection it replaced, if any, for the caller to close.
+        """
+        previous = self._connections.get(player_id)
+        self._connections[player_id] = connection
+        return previous
+
+    def unregister(self, player_id: str) -> Any | None:
+        """Remove a player's connection and all their game memberships.
+
+        Returns:
+            The removed connection, if any.
+        """
+        for game_id in self._player_games.pop(player_id, _EMPTY):
+            players = self._game_players.get(game_id)
+            if players is not None:
+                players.discard(player_id)
+                if not players:
+                    del self._game_players[game_id]
+        return self._connections.pop(player_id, None)
+
+    def join(self, game_id: str, player_id: str) -> None:
+        """Add a player to a game's group."""
+        self._game_players.setdefault(game_id, set()).add(player_id)
+        self._player_games.setdefault(player_id, set()).add(game_id)
+
+    def leave(self, game_id: str, player_id: str) -> None:
+        """Remove a player from a game's group."""
+        players = self._game_players.get(game_id)
+        if players is not None:
+            players.discard(player_id)
+            if not players:
+                del self._game_players[game_id]
+        games = self._player_games.get(player_id)
+        if games is not None:
+            games.discard(game_id)
+            if not games:
+                del self._player_games[player_id]
+
+    def remove_game(self, game_id: str) -> None:
+        """Drop a game's group; its players stay connected."""
+        for player_id in self._game_players.pop(game_id, _EMPTY):
+            games = self._player_games.get(player_id)
+            if games is not None:
+                games.discard(game_id)
+                if not games:
+                    del self._player_games[player_id]
+
+    def get(self, player_id: str) -> Any | None:
+        """Get a player's connection."""
+        return self._connections.get(player_id)
+
+    def players_in(self, game_id: str) -> AbstractSet[str]:
+        """Players in a game's group (a live view; copy before awaiting)."""
+        return self._game_players.get(game_id, _EMPTY)
+
+    def games_of(self, player_id: str) -> AbstractSet[str]:
+        """Games a player is in (a live view; copy before awaiting)."""
+        return self._player_games.get(player_id, _EMPTY)
+
+    def connections(self) -> list[Any]:
+        """Snapshot of all registered connections."""
+        return list(self._connections.values())
+
+    def clear(self) -> None:
+        """Forget every connection and group (for testing only)."""
+        self._connections.clear()
+        self._game_players.clear()
+        self._player_games.clear()
+
+
+@lru_cache
+def get_connection_registry() -> ConnectionRegistry:
+    """Get the process-wide connection registry."""
+    return ConnectionRegistry()
@@ -1,12 +1,52 @@
 """In-memory game state management for PyGridFight."""
 
+import bisect
+import heapq
+import itertools
 import time
+from datetime import UTC, datetime
+from typing import Any
 
 import anyio
 
+from pygridfight.core.exceptions import GameError, GameFullError, GameNotFoundError
+from pygridfight.core.metrics import HistogramChild, get_metrics_registry
+from pygridfight.domain.models.player import Player
+from pygridfight.infrastructure.connections import get_connection_registry
 from src.pygridfight.core.config import GameSettings
 from src.pygridfight.domain.models.game import Game
 
+LOCK_WAIT_SECONDS = get_metrics_registry().histogram(
+    "pygridfight_state_lock_wait_seconds",
+    "Time spent waiting to acquire the GameStateManager lock.",
+)
+
+# What the lobby listing filters games on: (status, is_private, has_free_slots).
+_Facets = tuple[str, bool, bool]
+
+
+def _facets(game: Game) -> _Facets:
+    return game.status, bool(game.is_private), game.has_free_slots
+
+
+class _InstrumentedLock:
+    """anyio.Lock wrapper that records how long each acquisition waited."""
+
+    def __init__(self, lock: anyio.Lock, wait_seconds: HistogramChild) -> None:
+        self._lock = lock
+        self._wait_seconds = wait_seconds
+
+    async def __aenter__(self) -> None:
+        start = time.perf_counter()
+        await self._lock.acquire()
+        self._wait_seconds.observe(time.perf_counter() - start)
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._lock.release()
+
+    def locked(self) -> bool:
+        return self._lock.locked()
+
 
 class GameStateManager:
     """Thread-safe, in-memory manager for PyGridFight game state.
@@ -34,9 +74,21 @@ class GameStateManager:
         if hasattr(self, "_initialized") and self._initialized:
             return
         self._games: dict[str, Game] = {}
-        self._connections: dict[str, dict[str, dict]] = {}
+        self._registry = get_connection_registry()
         self._game_timestamps: dict[str, float] = {}
-        self._lock = anyio.Lock()
+        # Creation sequence numbers, used as stable pagination cursors. They
+        # increase in the insertion order of _games.
+        self._game_seq: dict[str, int] = {}
+        self._seq_game: dict[int, str] = {}
+        self._sequence = itertools.count(1)
+        # Sorted sequence numbers of the games of each lobby facet
+        # combination, kept up to date at every commit, so a listing page
+        # is a few bisects instead of a scan of every game.
+        self._by_facets: dict[_Facets, list[int]] = {}
+        self._facets_of: dict[str, _Facets] = {}
+        # Store-wide revision, bumped on every create, update and delete.
+        self._version = 0
+        self._lock = _InstrumentedLock(anyio.Lock(), LOCK_WAIT_SECONDS.labels())
         self._game_timeout = game_timeout
         self._initialized = True
 
@@ -50,25 +102,80 @@ class GameStateManager:
         Returns:
             The created Game instance.
         """
-        from src.pygridfight.domain.models.grid import (
-            Grid,
-        )  # Local import to avoid circular
+        async with self._lock:
+            return self._create_locked(game_id, settings)
+
+    async def create_games(
+        self, requests: list[tuple[str, GameSettings]]
+    ) -> list[Game | ValueError]:
+        """Create several games under a single lock acquisition.
+
+        Args:
+            requests: (game_id, settings) pairs.
 
+        Returns:
+            For each request, in order, the created Game or the ValueError
+            explaining why it could not be created.
+        """
+        results: list[Game | ValueError] = []
         async with self._lock:
-            if game_id in self._games:
-                raise ValueError(f"Game {game_id} already exists")
-            grid = Grid(width=settings.grid_size, height=settings.grid_size)
-            game = Game(
-                id=game_id,
-                grid=grid,
-                players={},
-                avatars={},
-                status="waiting",
-                turn=0,
-            )
-            self._games[game_id] = game
-            self._game_timestamps[game_id] = time.monotonic()
-            return game
+            for game_id, settings in requests:
+                try:
+                    results.append(self._create_locked(game_id, settings))
+                except ValueError as e:
+                    results.append(e)
+        return results
+
+    async def join_game(self, game_id: str, player: Player) -> Game:
+        """Add a player to a game, checking capacity atomically.
+
+        Args:
+            game_id: Game ID.
+            player: The Player to add.
+
+        Returns:
+            The updated Game instance.
+
+        Raises:
+            GameNotFoundError: If the game does not exist.
+            GameFullError: If the game has no free slots.
+            ValueError: If the player is already in the game.
+        """
+        async with self._lock:
+            return self._join_locked(game_id, player)
+
+    async def join_games(
+        self, requests: list[tuple[str, Player]]
+    ) -> list[Game | GameError | ValueError]:
+        """Add several players to games under a single lock acquisition.
+
+        Args:
+            requests: (game_id, player) pairs.
+
+        Returns:
+            For each request, in order, the updated Game or the error that
+            ``join_game`` would have raised.
+        """
+        results: list[Game | GameError | ValueError] = []
+        async with self._lock:
+            for game_id, player in requests:
+                try:
+                    results.append(self._join_locked(game_id, player))
+                except (GameError, ValueError) as e:
+                    results.append(e)
+        return results
+
+    @property
+    def version(self) -> int:
+        """Store-wide revision, changed by every create, update and delete."""
+        return self._version
+
+    def has_game(self, game_id: str) -> bool:
+        """Check whether a game exists, without taking the store lock.
+
+        The answer may be stale by the time the caller acts on it.
+        """
+        return game_id in self._games
 
     async def get_game(self, game_id: str) -> Game | None:
         """Retrieve a game by its ID.
@@ -85,6 +192,9 @@ class GameStateManager:
     async def update_game(self, game_id: str, game: Game) -> None:
         """Update the game state for a given game ID.
 
+        This is the commit point for game changes: it stamps the game with a
+        new version so cached representations (ETags) are invalidated.
+
         Args:
             game_id: Unique identifier for the game.
             game: The updated Game instance.
@@ -92,8 +202,10 @@ class GameStateManager:
         async with self._lock:
             if game_id not in self._games:
                 raise ValueError(f"Game {game_id} does not exist")
+            game.version = self._bump_version()
             self._games[game_id] = game
             self._game_timestamps[game_id] = time.monotonic()
+            self._index(game_id, game)
 
     async def delete_game(self, game_id: str) -> bool:
         """Delete a game by its ID.
@@ -106,9 +218,9 @@ class GameStateManager:
         """
         async with self._lock:
             existed = game_id in self._games
-            self._games.pop(game_id, None)
-            self._connections.pop(game_id, None)
-            self._game_timestamps.pop(game_id, None)
+            if existed:
+                self._forget(game_id)
+                self._bump_version()
             return existed
 
     async def list_active_games(self) -> list[str]:
@@ -120,20 +232,79 @@ class GameStateManager:
         async with self._lock:
             return list(self._games.keys())
 
-    async def add_player_connection(
-        self, game_id: str, player_id: str, connection_info: dict
-    ) -> None:
-        """Track a player's connection to a game.
+    async def list_running_games(self) -> list[str]:
+        """List the IDs of games in progress (status "active").
+
+        Returns:
+            List of running game IDs.
+        """
+        async with self._lock:
+            return [
+                game_id
+                for game_id, game in self._games.items()
+                if game.status == "active"
+            ]
+
+    async def list_open_games(self) -> list[Game]:
+        """List public waiting games that still have free player slots.
+
+        Returns:
+            List of joinable Game instances, in creation order.
+        """
+        async with self._lock:
+            return [
+                game
+                for game in self._games.values()
+                if game.status == "waiting"
+                and not game.is_private
+                and game.max_players is not None
+                and len(game.players) < game.max_players
+            ]
+
+    async def list_games_page(
+        self,
+        after: int = 0,
+        limit: int = 50,
+        status: str | None = None,
+        is_private: bool | None = None,
+        has_free_slots: bool | None = None,
+    ) -> tuple[list[Game], int, int | None]:
+        """List games in creation order, one page at a time.
+
+        Filters see games as of their last commit (create, join or update).
+        A page costs O(k log n) for the k facet combinations matching the
+        filters, however deep the cursor.
 
         Args:
-            game_id: Game ID.
-            player_id: Player ID.
-            connection_info: Arbitrary connection info (e.g., WebSocket object).
+            after: Sequence number of the last game of the previous page
+                (0 for the first page).
+            limit: Maximum number of games to return.
+            status: Only games with this status.
+            is_private: Only private (True) or public (False) games.
+            has_free_slots: Only games that can (True) or cannot (False)
+                take another player.
+
+        Returns:
+            Tuple of (games on this page, total number of matching games,
+            sequence number to pass as ``after`` for the next page or None
+            when this is the last page).
         """
+        wanted = (status, is_private, has_free_slots)
         async with self._lock:
-            if game_id not in self._connections:
-                self._connections[game_id] = {}
-            self._connections[game_id][player_id] = connection_info
+            runs = [
+                seqs
+                for facets, seqs in self._by_facets.items()
+                if all(w is None or w == f for w, f in zip(wanted, facets, strict=True))
+            ]
+            total = sum(map(len, runs))
+            heads = []
+            for seqs in runs:
+                start = bisect.bisect_right(seqs, after)
+                heads.append(seqs[start : start + limit + 1])
+            seqs = list(itertools.islice(heapq.merge(*heads), limit + 1))
+            page = [self._games[self._seq_game[seq]] for seq in seqs[:limit]]
+            next_after = seqs[limit - 1] if len(seqs) > limit else None
+            return page, total, next_after
 
     async def remove_player_connection(self, game_id: str, player_id: str) -> None:
         """Remove a player's connection from a game.
@@ -142,13 +313,9 @@ class GameStateManager:
             game_id: Game ID.
             player_id: Player ID.
         """
-        async with self._lock:
-            if game_id in self._connections:
-                self._connections[game_id].pop(player_id, None)
-                if not self._connections[game_id]:
-                    self._connections.pop(game_id, None)
+        self._registry.leave(game_id, player_id)
 
-    async def get_player_connections(self, game_id: str) -> dict[str, dict]:
+    async def get_player_connections(self, game_id: str) -> dict[str, Any]:
         """Get all player connections for a game.
 
         Args:
@@ -157,8 +324,8 @@ class GameStateManager:
         Returns:
             Dict mapping player_id to connection_info.
         """
-        async with self._lock:
-            return dict(self._connections.get(game_id, {}))
+        registry = self._registry
+        return {pid: registry.get(pid) for pid in registry.players_in(game_id)}
 
     async def cleanup_expired_games(self) -> None:
         """Remove games that have expired based on the configured timeout."""
@@ -170,12 +337,97 @@ class GameStateManager:
                 if now - ts > self._game_timeout
             ]
             for gid in expired:
-                self._games.pop(gid, None)
-                self._connections.pop(gid, None)
-                self._game_timestamps.pop(gid, None)
+                self._forget(gid)
+            if expired:
+                self._bump_version()
 
     def reset(self) -> None:
         """Reset all in-memory state (for testing only)."""
         self._games.clear()
-        self._connections.clear()
+        self._registry.clear()
         self._game_timestamps.clear()
+        self._game_seq.clear()
+        self._seq_game.clear()
+        self._by_facets.clear()
+        self._facets_of.clear()
+
+    def _create_locked(self, game_id: str, settings: GameSettings) -> Game:
+        """Create and register a game. Caller must hold the lock."""
+        from src.pygridfight.domain.models.grid import (
+            Grid,
+        )  # Local import to avoid circular
+
+        if game_id in self._games:
+            raise ValueError(f"Game {game_id} already exists")
+        grid = Grid(width=settings.grid_size, height=settings.grid_size)
+        game = Game(
+            id=game_id,
+            grid=grid,
+            players={},
+            avatars={},
+            status="waiting",
+            turn=0,
+            name=getattr(settings, "name", None),
+            max_players=settings.max_players,
+            grid_size=settings.grid_size,
+            is_private=getattr(settings, "is_private", False),
+            visibility=getattr(settings, "visibility", "full"),
+            view_radius=getattr(settings, "view_radius", 8),
+            created_at=datetime.now(UTC),
+            version=self._bump_version(),
+        )
+        self._games[game_id] = game
+        self._game_timestamps[game_id] = time.monotonic()
+        seq = self._game_seq[game_id] = next(self._sequence)
+        self._seq_game[seq] = game_id
+        self._index(game_id, game)
+        return game
+
+    def _join_locked(self, game_id: str, player: Player) -> Game:
+        """Add a player to a game and commit it. Caller must hold the lock."""
+        game = self._games.get(game_id)
+        if game is None:
+            raise GameNotFoundError(game_id)
+        # A player already in the game gets add_player's ValueError even if
+        # the game is full, so callers can tell rejoining from a full game.
+        if player.id not in game.players and not game.has_free_slots:
+            raise GameFullError(game_id)
+        game.add_player(player)
+        game.version = self._bump_version()
+        self._game_timestamps[game_id] = time.monotonic()
+        self._index(game_id, game)
+        return game
+
+    def _bump_version(self) -> int:
+        """Advance the store-wide revision. Caller must hold the lock."""
+        self._version += 1
+        return self._version
+
+    def _forget(self, game_id: str) -> None:
+        """Drop all state for a game. Caller must hold the lock."""
+        self._games.pop(game_id, None)
+        self._registry.remove_game(game_id)
+        self._game_timestamps.pop(game_id, None)
+        self._unindex(game_id)
+        seq = self._game_seq.pop(game_id, None)
+        if seq is not None:
+            del self._seq_game[seq]
+
+    def _index(self, game_id: str, game: Game) -> None:
+        """File a game under its current facets. Caller must hold the lock."""
+        facets = _facets(game)
+        if self._facets_of.get(game_id) == facets:
+            return
+        self._unindex(game_id)
+        self._facets_of[game_id] = facets
+        bisect.insort(self._by_facets.setdefault(facets, []), self._game_seq[game_id])
+
+    def _unindex(self, game_id: str) -> None:
+        """Drop a game from the facet index. Caller must hold the lock."""
+        facets = self._facets_of.pop(game_id, None)
+        if facets is None:
+            return
+        seqs = self._by_facets[facets]
+        del seqs[bisect.bisect_left(seqs, self._game_seq[game_id])]
+        if not seqs:
+            del self._by_facets[facets]
@@ -0,0 +1,100 @@
+"""Event loop health monitoring for PyGridFight."""
+
+import asyncio
+from functools import lru_cache
+
+import structlog
+
+from pygridfight.core.config import get_server_settings
+from pygridfight.core.metrics import get_metrics_registry
+
+logger = structlog.get_logger(__name__)
+
+_metrics = get_metrics_registry()
+LOOP_LAG_SECONDS = _metrics.gauge(
+    "pygridfight_event_loop_lag_seconds",
+    "Delay of the latest loop-lag probe past its scheduled wake-up.",
+)
+LOOP_LAG_HISTOGRAM = _metrics.histogram(
+    "pygridfight_event_loop_lag_probe_seconds",
+    "Distribution of loop-lag probe delays.",
+)
+LOOP_TASKS = _metrics.gauge(
+    "pygridfight_event_loop_tasks",
+    "Number of unfinished asyncio tasks.",
+)
+
+
+class LoopLagMonitor:
+    """Background probe measuring how late the event loop runs callbacks.
+
+    Every ``interval`` seconds the probe sleeps and measures how much later
+    than requested it woke up. A busy or blocked loop wakes late, so the
+    delay is a direct measure of how long any ready callback waits to run.
+    """
+
+    def __init__(self, interval: float = 0.5, max_lag: float = 0.25) -> None:
+        """Initialize the monitor.
+
+        Args:
+            interval: Seconds between probes.
+            max_lag: Lag in seconds above which the loop counts as saturated.
+        """
+        self.interval = interval
+        self.max_lag = max_lag
+        self.lag = 0.0
+        self.tasks = 0
+        self._probe_due: float | None = None
+
+    def current_lag(self) -> float:
+        """Latest measured lag, or the overdue time of a late pending probe.
+
+        A probe that has not woken up yet by the time this is called is
+        already late by at least that much, which catches a loop stall
+        before the probe itself can report it.
+        """
+        if self._probe_due is None:
+            return self.lag
+        overdue = asyncio.get_running_loop().time() - self._probe_due
+        return max(self.lag, overdue)
+
+    @property
+    def healthy(self) -> bool:
+        """Whether loop lag is within ``max_lag``."""
+        return self.current_lag() <= self.max_lag
+
+    async def probe(self) -> float:
+        """Run one probe and record its result.
+
+        Returns:
+            The measured lag in seconds.
+        """
+        loop = asyncio.get_running_loop()
+        due = self._probe_due = loop.time() + self.interval
+        try:
+            await asyncio.sleep(self.interval)
+        finally:
+            self._probe_due = None
+        lag = max(0.0, loop.time() - due)
+        self.lag = lag
+        self.tasks = len(asyncio.all_tasks(loop))
+        LOOP_LAG_SECONDS.set(lag)
+        LOOP_LAG_HISTOGRAM.observe(lag)
+        LOOP_TASKS.set(self.tasks)
+        if lag > self.max_lag:
+            logger.warning("Event loop lagging", lag_seconds=round(lag, 4))
+        return lag
+
+    async def run(self) -> None:
+        """Probe forever."""
+        while True:
+            await self.probe()
+
+
+@lru_cache
+def get_loop_monitor() -> LoopLagMonitor:
+    """Get the process-wide loop lag monitor."""
+    settings = get_server_settings()
+    return LoopLagMonitor(
+        interval=settings.loop_lag_interval, max_lag=settings.ready_max_loop_lag
+    )
@@ -0,0 +1,271 @@
+"""Token-bucket rate limiting for WebSocket messages and REST requests.
+
+Every WebSocket message costs a handler run, so one client sending as fast
+as it can would hog the event loop. Each message is charged to token
+buckets before it is parsed: one for its type on its connection, one for
+the connection, and one for the client's IP address, shared by all of
+that address's connections. REST requests are charged to a bucket per IP.
+
+Buckets refill lazily when they are charged, so a check is a few float
+operations and needs no timers however many clients are connected. Idle
+IP buckets are pruned as the table grows, so a flood from many addresses
+cannot grow it without bound.
+"""
+
+import math
+import time
+from collections.abc import Callable, Mapping
+from functools import lru_cache
+
+from pygridfight.core.config import get_server_settings
+from pygridfight.core.metrics import get_metrics_registry
+
+_metrics = get_metrics_registry()
+RATE_LIMITED = _metrics.counter(
+    "pygridfight_rate_limited_total",
+    "WebSocket messages and HTTP requests rejected by rate limiting, by the "
+    "bucket that ran out.",
+    labelnames=("scope",),
+)
+_LIMITED_TYPE = RATE_LIMITED.labels("type")
+_LIMITED_CONNECTION = RATE_LIMITED.labels("connection")
+_LIMITED_IP = RATE_LIMITED.labels("ip")
+_LIMITED_REST = RATE_LIMITED.labels("rest")
+
+Clock = Callable[[], float]
+
+
+class TokenBucket:
+    """Allows ``rate`` events per second on average, in bursts of ``burst``."""
+
+    __slots__ = ("burst", "rate", "stamp", "tokens")
+
+    def __init__(self, rate: float, burst: int, now: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.stamp = now
+
+    def take(self, now: float) -> bool:
+        """Take a token if one is available."""
+        tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        if tokens < 1:
+            self.tokens = tokens
+            return False
+        self.tokens = tokens - 1
+        return True
+
+    def retry_after(self, now: float) -> float:
+        """Seconds until a token is available."""
+        tokens = self.tokens + (now - self.stamp) * self.rate
+        return max(0.0, (1 - tokens) / self.rate)
+
+    def full(self, now: float) -> bool:
+        """Whether the bucket has refilled, i.e. forgetting it changes nothing."""
+        return self.tokens + (now - self.stamp) * self.rate >= self.burst
+
+
+class KeyedRateLimiter:
+    """Token buckets keyed by client, such as an IP address."""
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        clock: Clock = time.monotonic,
+        prune_threshold: int = 1024,
+    ) -> None:
+        """Initialize the limiter.
+
+        Args:
+            rate: Tokens per second each key gets.
+            burst: Tokens a key can save up.
+            clock: Monotonic clock, in seconds.
+            prune_threshold: Table size that triggers the first pruning of
+                refilled buckets; later prunings wait for the table to
+                double from what survived.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self._buckets: dict[str, TokenBucket] = {}
+        self._min_prune = prune_threshold
+        self._next_prune = prune_threshold
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def bucket(self, key: str) -> TokenBucket:
+        """Get the bucket of a key, creating a full one if needed."""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self._next_prune:
+                self.prune()
+            bucket = self._buckets[key] = TokenBucket(
+                self.rate, self.burst, self.clock()
+            )
+        return bucket
+
+    def allow(self, key: str) -> bool:
+        """Charge one token to a key."""
+        return self.bucket(key).take(self.clock())
+
+    def retry_after(self, key: str) -> float:
+        """Seconds until a key has a token again."""
+        bucket = self._buckets.get(key)
+        return bucket.retry_after(self.clock()) if bucket is not None else 0.0
+
+    def prune(self) -> int:
+        """Forget the buckets that have refilled.
+
+        Returns:
+            Number of buckets removed.
+        """
+        now = self.clock()
+        before = len(self._buckets)
+        self._buckets = {
+            key: bucket for key, bucket in self._buckets.items() if not bucket.full(now)
+        }
+        self._next_prune = max(self._min_prune, 2 * len(self._buckets))
+        return before - len(self._buckets)
+
+    def reset(self) -> None:
+        """Forget every bucket."""
+        self._buckets.clear()
+        self._next_prune = self._min_prune
+
+
+class MessageLimiter:
+    """Rate limits of one WebSocket connection."""
+
+    __slots__ = (
+        "clock",
+        "connection",
+        "ip",
+        "ips",
+        "max_strikes",
+        "strikes",
+        "type_limits",
+        "types",
+    )
+
+    def __init__(
+        self,
+        ip: str,
+        ips: KeyedRateLimiter,
+        rate: float,
+        burst: int,
+        type_limits: Mapping[str, tuple[float, int]],
+        max_strikes: int,
+    ) -> None:
+        """Initialize the connection's limits.
+
+        Args:
+            ip: The client's IP address.
+            ips: Limiter shared by every connection, keyed by IP.
+            rate: Messages per second the connection may send.
+            burst: Messages the connection can save up.
+            type_limits: Messages per second and burst, by message type.
+                Types without an entry are only charged to the connection
+                and IP buckets.
+            max_strikes: Messages rejected in a row after which the
+                connection should be closed.
+        """
+        self.ip = ip
+        self.ips = ips
+        self.clock = ips.clock
+        self.connection = TokenBucket(rate, burst, self.clock())
+        self.type_limits = type_limits
+        self.types: dict[str, TokenBucket] = {}
+        self.max_strikes = max_strikes
+        # Messages rejected since the last one let through.
+        self.strikes = 0
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether the client kept sending after enough rejections to close."""
+        return self.strikes >= self.max_strikes
+
+    def check(self, message_type: str | None) -> str | None:
+        """Charge a message to the connection's buckets.
+
+        Args:
+            message_type: The message's type, if known before parsing.
+
+        Returns:
+            None if the message may be handled, else the scope of the bucket
+            that ran out: "type", "connection" or "ip".
+        """
+        scope = self._charge(message_type)
+        self.strikes = self.strikes + 1 if scope is not None else 0
+        return scope
+
+    def _charge(self, message_type: str | None) -> str | None:
+        now = self.clock()
+        if message_type is not None:
+            bucket = self.types.get(message_type)
+            if bucket is None and message_type in self.type_limits:
+                rate, burst = self.type_limits[message_type]
+                bucket = self.types[message_type] = TokenBucket(rate, burst, now)
+            if bucket is not None and not bucket.take(now):
+                _LIMITED_TYPE.inc()
+                return "type"
+        if not self.connection.take(now):
+            _LIMITED_CONNECTION.inc()
+            return "connection"
+        if not self.ips.bucket(self.ip).take(now):
+            _LIMITED_IP.inc()
+            return "ip"
+        return None
+
+
+class RestRateLimiter(KeyedRateLimiter):
+    """Per-IP limit on REST requests."""
+
+    def check(self, ip: str) -> int | None:
+        """Charge a request to an IP.
+
+        Returns:
+            None if the request may be handled, else the seconds to wait
+            before retrying, rounded up.
+        """
+        if self.allow(ip):
+            return None
+        _LIMITED_REST.inc()
+        return math.ceil(self.retry_after(ip))
+
+
+@lru_cache
+def get_ip_message_limiter() -> KeyedRateLimiter:
+    """Get the per-IP WebSocket message limiter shared by all connections."""
+    settings = get_server_settings()
+    return KeyedRateLimiter(settings.ws_ip_message_rate, settings.ws_ip_message_burst)
+
+
+def open_message_limiter(ip: str) -> MessageLimiter | None:
+    """Create the rate limits of a new WebSocket connection.
+
+    Returns:
+        None if rate limiting is disabled.
+    """
+    settings = get_server_settings()
+    if not settings.rate_limit_enabled:
+        return None
+    return MessageLimiter(
+        ip,
+        get_ip_message_limiter(),
+        settings.ws_message_rate,
+        settings.ws_message_burst,
+        settings.ws_message_type_limits,
+        settings.ws_rate_limit_strikes,
+    )
+
+
+@lru_cache
+def get_rest_limiter() -> RestRateLimiter | None:
+    """Get the per-IP REST request limiter, or None if rate limiting is off."""
+    settings = get_server_settings()
+    if not settings.rate_limit_enabled:
+        return None
+    return RestRateLimiter(settings.rest_request_rate, settings.rest_request_burst)
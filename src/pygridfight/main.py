@@ -1,18 +1,16 @@
 """FastAPI application entry point for PyGridFight."""
 
+import asyncio
+
 import structlog
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
-from pygridfight.api.middleware import (
-    ErrorHandlingMiddleware,
-    LoggingMiddleware,
-    RequestIDMiddleware,
-)
-from pygridfight.core.config import get_settings
+from pygridfight.api.middleware import RateLimitMiddleware, RequestContextMiddleware
+from pygridfight.core.config import get_server_settings, get_settings
 from pygridfight.core.exceptions import GameError, PlayerError
-from pygridfight.core.logging import setup_logging
+from pygridfight.core.logging import setup_logging, shutdown_logging
 
 logger = structlog.get_logger()
 
@@ -40,9 +38,9 @@ def create_app() -> FastAPI:
     )
 
     # Add custom middleware
-    app.add_middleware(RequestIDMiddleware)
-    app.add_middleware(LoggingMiddleware)
-    app.add_middleware(ErrorHandlingMiddleware)
+    app.add_middleware(RequestContextMiddleware)
+    # Outermost, so over-limit requests are turned away before anything runs
+    app.add_middleware(RateLimitMiddleware)
 
     # Register global exception handlers for custom exceptions
     @app.exception_handler(GameError)
@@ -69,19 +67,48 @@ def create_app() -> FastAPI:
             content={"error": "PlayerError", "message": str(exc)},
         )
 
+    from pygridfight.api.heartbeat import heartbeats
+    from pygridfight.api.rest import get_health_info, get_matchmaking_service
+    from pygridfight.api.rest import router as rest_router
+    from pygridfight.api.spectators import router as spectator_router
+    from pygridfight.api.ticker import ticker
+    from pygridfight.api.websocket import router as websocket_router
+    from pygridfight.infrastructure.game_state import GameStateManager
+    from pygridfight.infrastructure.loop_monitor import get_loop_monitor
+    from pygridfight.services.game_loop import game_loop
+
     # Startup/shutdown event handlers
     @app.on_event("startup")
     async def on_startup():
-        logger.info("App startup", event="startup")
+        logger.info("App startup")
+        get_health_info()
+        app.state.loop_monitor_task = asyncio.create_task(get_loop_monitor().run())
+        app.state.matchmaking_task = asyncio.create_task(
+            get_matchmaking_service().run(get_server_settings().matchmaking_interval)
+        )
+        # Nothing registers a game system yet; an idle loop would only
+        # re-list the running games and count ticks.
+        app.state.game_loop_task = None
+        if game_loop.systems:
+            app.state.game_loop_task = asyncio.create_task(
+                game_loop.run(GameStateManager().list_running_games)
+            )
 
     @app.on_event("shutdown")
     async def on_shutdown():
-        logger.info("App shutdown", event="shutdown")
+        if app.state.game_loop_task is not None:
+            app.state.game_loop_task.cancel()
+        app.state.matchmaking_task.cancel()
+        app.state.loop_monitor_task.cancel()
+        ticker.close()
+        heartbeats.close()
+        logger.info("App shutdown")
+        shutdown_logging()
 
     # Include routers
-    from pygridfight.api.rest import router as rest_router
-
     app.include_router(rest_router)
+    app.include_router(websocket_router)
+    app.include_router(spectator_router)
 
     return app
 
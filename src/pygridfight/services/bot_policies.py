@@ -0,0 +1,327 @@
+"""Bot policies for PyGridFight.
+
+Bots plan on a compact copy of a game (``BotState``): a tuple of small
+ints that pickles to a few hundred bytes, so a decision is cheap to ship
+to a worker process and a search can copy states freely without touching
+the pydantic models. ``pack_state`` builds it from ``Game.get_state()``.
+
+The rules bots plan with follow the domain model: on their turn a player
+either moves one of their avatars to a free, cardinally adjacent cell of
+the grid (``Grid.get_adjacent_positions``), attacks an enemy avatar on
+such a cell, which takes 1 damage (``Avatar.take_damage``), or ends their
+turn. An avatar brought to 0 health scores its attacker a point; the first
+player to reach ``WIN_SCORE`` (``Game.check_victory_conditions``), or the
+last one with living avatars, wins.
+
+This module only depends on the standard library, so worker processes
+start quickly.
+"""
+
+import math
+import random
+import time
+from abc import ABC, abstractmethod
+from typing import NamedTuple
+
+# Score that wins a game, as in Game.check_victory_conditions.
+WIN_SCORE = 10
+_DELTAS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+# A move is (kind, avatar index, x, y): the avatar moves to, or attacks,
+# cell (x, y). END_TURN has no avatar.
+MOVE, ATTACK, END = 0, 1, 2
+Move = tuple[int, int, int, int]
+END_TURN: Move = (END, -1, 0, 0)
+
+
+class BotState(NamedTuple):
+    """Compact game state for bot planning.
+
+    Players are numbered in the order of the game's ``players`` mapping.
+
+    Attributes:
+        width: Grid width.
+        height: Grid height.
+        to_move: Number of the player whose turn it is.
+        scores: Score of each player.
+        avatars: (owner number, x, y, health) of each living avatar.
+    """
+
+    width: int
+    height: int
+    to_move: int
+    scores: tuple[int, ...]
+    avatars: tuple[tuple[int, int, int, int], ...]
+
+
+def pack_state(game: dict, player_id: str) -> BotState:
+    """Build the compact state of a game, on a player's turn.
+
+    Args:
+        game: The game, as returned by ``Game.get_state()``.
+        player_id: The player to move; must be in the game.
+
+    Returns:
+        The state.
+    """
+    players = list(game["players"])
+    number = {pid: index for index, pid in enumerate(players)}
+    avatars = []
+    for avatar in game["avatars"].values():
+        owner = number.get(avatar["owner_id"])
+        if owner is None or not avatar.get("active", True) or avatar["health"] <= 0:
+            continue
+        position = avatar["position"]
+        avatars.append((owner, position["x"], position["y"], avatar["health"]))
+    return BotState(
+        width=game["grid"]["width"],
+        height=game["grid"]["height"],
+        to_move=number[player_id],
+        scores=tuple(game["players"][pid].get("score", 0) for pid in players),
+        avatars=tuple(avatars),
+    )
+
+
+def legal_moves(state: BotState) -> list[Move]:
+    """Moves open to the player to move; ending the turn always is."""
+    occupied = {(x, y): owner for owner, x, y, _ in state.avatars}
+    moves = []
+    for index, (owner, x, y, _) in enumerate(state.avatars):
+        if owner != state.to_move:
+            continue
+        for dx, dy in _DELTAS:
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < state.width and 0 <= ny < state.height):
+                continue
+            other = occupied.get((nx, ny))
+            if other is None:
+                moves.append((MOVE, index, nx, ny))
+            elif other != owner:
+                moves.append((ATTACK, index, nx, ny))
+    moves.append(END_TURN)
+    return moves
+
+
+def play(state: BotState, move: Move) -> BotState:
+    """The state after the player to move plays a legal move."""
+    kind, index, x, y = move
+    avatars, scores = state.avatars, state.scores
+    if kind == MOVE:
+        owner, _, _, health = avatars[index]
+        avatars = (*avatars[:index], (owner, x, y, health), *avatars[index + 1 :])
+    elif kind == ATTACK:
+        target = next(i for i, a in enumerate(avatars) if a[1] == x and a[2] == y)
+        owner, _, _, health = avatars[target]
+        if health > 1:
+            hit = ((owner, x, y, health - 1),)
+            avatars = (*avatars[:target], *hit, *avatars[target + 1 :])
+        else:
+            avatars = (*avatars[:target], *avatars[target + 1 :])
+            mover = state.to_move
+            scores = (*scores[:mover], scores[mover] + 1, *scores[mover + 1 :])
+    return BotState(
+        state.width,
+        state.height,
+        (state.to_move + 1) % len(scores),
+        scores,
+        avatars,
+    )
+
+
+def winner(state: BotState) -> int | None:
+    """Number of the player who has won, if any."""
+    for player, score in enumerate(state.scores):
+        if score >= WIN_SCORE:
+            return player
+    owners = {owner for owner, _, _, _ in state.avatars}
+    if len(owners) == 1 and len(state.scores) > 1:
+        return owners.pop()
+    return None
+
+
+def evaluate(state: BotState, player: int) -> float:
+    """Heuristic value of a state for a player, from 0 (lost) to 1 (won).
+
+    Weighs score and remaining health against the strongest opponent, and
+    slightly favours standing close to an enemy avatar.
+    """
+    won = winner(state)
+    if won is not None:
+        return 1.0 if won == player else 0.0
+    health = [0] * len(state.scores)
+    for owner, _, _, hp in state.avatars:
+        health[owner] += hp
+    own = [(x, y) for owner, x, y, _ in state.avatars if owner == player]
+    enemies = [(x, y) for owner, x, y, _ in state.avatars if owner != player]
+    if not own:
+        return 0.0
+    rivals = [p for p in range(len(state.scores)) if p != player]
+    if not rivals:
+        return 0.5
+    rival = max(rivals, key=lambda p: (state.scores[p], health[p]))
+    closest = min(
+        (abs(x - ex) + abs(y - ey) for x, y in own for ex, ey in enemies),
+        default=0,
+    )
+    advantage = (
+        2.0 * (state.scores[player] - state.scores[rival])
+        + (health[player] - health[rival])
+        - closest / (state.width + state.height)
+    )
+    return 1.0 / (1.0 + math.exp(-advantage))
+
+
+class BotPolicy(ABC):
+    """How a bot picks its move.
+
+    Policies are pickled into the worker processes, so they must be defined
+    at module level and keep their settings in plain attributes.
+    """
+
+    name = "policy"
+
+    @abstractmethod
+    def choose(self, state: BotState, budget: float, rng: random.Random) -> Move:
+        """Pick a move for the player to move.
+
+        Args:
+            state: The game.
+            budget: Seconds the policy may think for.
+            rng: Source of randomness.
+
+        Returns:
+            One of ``legal_moves(state)``.
+        """
+
+
+class GreedyPolicy(BotPolicy):
+    """Plays the move that looks best one move ahead (see ``evaluate``)."""
+
+    name = "greedy"
+
+    def choose(self, state: BotState, budget: float, rng: random.Random) -> Move:
+        player = state.to_move
+        return max(legal_moves(state), key=lambda m: evaluate(play(state, m), player))
+
+
+class _Node:
+    """A state of the search tree, reached by ``move`` from its parent."""
+
+    __slots__ = ("children", "move", "parent", "state", "untried", "value", "visits")
+
+    def __init__(self, state: BotState, move: Move | None, parent: "_Node | None"):
+        self.state = state
+        self.move = move
+        self.parent = parent
+        self.children: list[_Node] = []
+        self.untried = legal_moves(state) if winner(state) is None else []
+        self.visits = 0
+        # Total reward of the player who played ``move``.
+        self.value = 0.0
+
+
+class MCTSPolicy(BotPolicy):
+    """Time-boxed Monte Carlo tree search (UCT).
+
+    Searches until the budget runs out, each iteration playing random moves
+    ``rollout_depth`` moves past the tree and scoring the result with
+    ``evaluate`` for every player, then plays the most visited move. Every
+    player is assumed to play for themselves.
+    """
+
+    name = "mcts"
+
+    def __init__(
+        self,
+        exploration: float = 1.4,
+        rollout_depth: int = 8,
+        max_iterations: int | None = None,
+    ) -> None:
+        """Initialize the policy.
+
+        Args:
+            exploration: UCT exploration constant.
+            rollout_depth: Random moves played past the tree per iteration.
+            max_iterations: Iterations to stop at even within budget, for
+                reproducible searches.
+        """
+        self.exploration = exploration
+        self.rollout_depth = rollout_depth
+        self.max_iterations = max_iterations
+
+    def choose(self, state: BotState, budget: float, rng: random.Random) -> Move:
+        root = _Node(state, None, None)
+        if len(root.untried) <= 1:
+            return root.untried[0] if root.untried else END_TURN
+        deadline = time.perf_counter() + budget
+        iterations = 0
+        while self.max_iterations is None or iterations < self.max_iterations:
+            if iterations and time.perf_counter() >= deadline:
+                break
+            self._iterate(root, rng)
+            iterations += 1
+        best = max(root.children, key=lambda node: node.visits)
+        # Only the root has no move.
+        return best.move if best.move is not None else END_TURN
+
+    def _iterate(self, root: _Node, rng: random.Random) -> None:
+        node = root
+        while not node.untried and node.children:
+            node = self._select(node)
+        if node.untried:
+            move = node.untried.pop(rng.randrange(len(node.untried)))
+            child = _Node(play(node.state, move), move, node)
+            node.children.append(child)
+            node = child
+        state = node.state
+        for _ in range(self.rollout_depth):
+            if winner(state) is not None:
+                break
+            state = play(state, rng.choice(legal_moves(state)))
+        rewards = [evaluate(state, player) for player in range(len(state.scores))]
+        current: _Node | None = node
+        while current is not None:
+            current.visits += 1
+            if current.parent is not None:
+                # The parent's player to move played this node's move.
+                current.value += rewards[current.parent.state.to_move]
+            current = current.parent
+
+    def _select(self, node: _Node) -> _Node:
+        log_visits = math.log(node.visits)
+        exploration = self.exploration
+        return max(
+            node.children,
+            key=lambda child: (
+                child.value / child.visits
+                + exploration * math.sqrt(log_visits / child.visits)
+            ),
+        )
+
+
+# Built-in policies, by name.
+POLICIES: dict[str, type[BotPolicy]] = {
+    GreedyPolicy.name: GreedyPolicy,
+    MCTSPolicy.name: MCTSPolicy,
+}
+
+
+def warm_up() -> None:
+    """Worker initializer: running it has the worker import this module."""
+
+
+def decide(
+    policy: BotPolicy, state: BotState, budget: float, seed: int | None = None
+) -> Move:
+    """Pick a bot's move; the entry point of worker processes.
+
+    Args:
+        policy: The policy to follow.
+        state: The game, on the bot's turn.
+        budget: Seconds the policy may think for.
+        seed: Seed of the policy's randomness, for reproducible moves.
+
+    Returns:
+        The move.
+    """
+    return policy.choose(state, budget, random.Random(seed))
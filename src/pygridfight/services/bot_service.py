@@ -0,0 +1,283 @@
+"""Bot players for PyGridFight.
+
+Bots fill seats of games and play their turns. Their thinking never runs
+on the event loop: each move is computed in a pool of worker processes,
+which the game is sent to in compact form (see ``bot_policies``), and the
+event loop only awaits the result. Workers are started once and reused
+for every move.
+
+A move is given a time budget that the policy searches within, and a
+grace period on top for queueing and transfer; a bot whose move is not
+back by then, or whose worker failed, ends its turn instead, so a busy
+pool slows bots down but never stalls a game. A worker still busy past
+that is stopped along with its pool, which is replaced.
+"""
+
+import asyncio
+import multiprocessing
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import structlog
+
+from pygridfight.api.schemas.actions import (
+    AttackAction,
+    BaseAction,
+    EndTurnAction,
+    MoveAction,
+)
+from pygridfight.api.schemas.player import Position
+from pygridfight.core.config import get_server_settings
+from pygridfight.core.metrics import get_metrics_registry
+from pygridfight.services.bot_policies import (
+    ATTACK,
+    END_TURN,
+    MOVE,
+    POLICIES,
+    BotPolicy,
+    BotState,
+    Move,
+    decide,
+    pack_state,
+    warm_up,
+)
+
+logger = structlog.get_logger(__name__)
+
+_metrics = get_metrics_registry()
+BOT_DECISION_SECONDS = _metrics.histogram(
+    "pygridfight_bot_decision_seconds",
+    "Time from asking for a bot move to getting it, by policy.",
+    labelnames=("policy",),
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+BOT_FALLBACKS = _metrics.counter(
+    "pygridfight_bot_fallbacks_total",
+    "Bot moves replaced by ending the turn, by reason.",
+    labelnames=("reason",),
+)
+_TIMED_OUT = BOT_FALLBACKS.labels("timeout")
+_FAILED = BOT_FALLBACKS.labels("error")
+
+# Called with the game ID, the turn number and the bot's action.
+BotActionHandler = Callable[[str, int, BaseAction], None]
+
+
+def to_action(move: Move, player_id: str) -> BaseAction:
+    """Turn a compact move into the action a player would send."""
+    kind, _, x, y = move
+    if kind == MOVE:
+        return MoveAction(player_id=player_id, target_position=Position(x=x, y=y))
+    if kind == ATTACK:
+        return AttackAction(
+            player_id=player_id, target_position=Position(x=x, y=y), weapon_id=None
+        )
+    return EndTurnAction(player_id=player_id)
+
+
+class BotService:
+    """Seats bots in games and computes their moves in worker processes."""
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        policy: BotPolicy | None = None,
+        budget: float | None = None,
+        grace: float | None = None,
+        load_game: Callable[[str], Awaitable[dict | None]] | None = None,
+        on_action: BotActionHandler | None = None,
+        executor: Executor | None = None,
+    ) -> None:
+        """Initialize the service.
+
+        Args:
+            workers: Worker processes (default: ServerSettings.bot_workers).
+            policy: Policy of bots seated without one (default: the
+                ServerSettings.bot_policy built-in policy).
+            budget: Seconds a bot may think about a move (default:
+                ServerSettings.bot_move_budget).
+            grace: Seconds a move may take beyond its budget (default:
+                ServerSettings.bot_move_grace).
+            load_game: Returns a game's ``Game.get_state()``, or None if it
+                is gone; needed for seated bots to play.
+            on_action: Called with each move of a seated bot.
+            executor: Executor to compute moves in, instead of a process
+                pool of ``workers`` (which the service then owns).
+        """
+        settings = get_server_settings()
+        self.workers = workers or settings.bot_workers
+        self.policy = policy or POLICIES[settings.bot_policy]()
+        self.budget = budget or settings.bot_move_budget
+        self.grace = grace if grace is not None else settings.bot_move_grace
+        self.load_game = load_game
+        self.on_action = on_action
+        self._executor = executor
+        self._owns_executor = executor is None
+        # game_id -> bot player_id -> policy
+        self._seats: dict[str, dict[str, BotPolicy]] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def _pool(self) -> Executor:
+        if self._executor is None:
+            # Spawned, not forked: the server process runs threads.
+            self._executor = ProcessPoolExecutor(
+                self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=warm_up,
+            )
+        return self._executor
+
+    async def start(self) -> None:
+        """Start every worker now rather than on the first moves."""
+        loop = asyncio.get_running_loop()
+        pool = self._pool()
+        await asyncio.gather(
+            *(loop.run_in_executor(pool, warm_up) for _ in range(self.workers))
+        )
+
+    async def decide(
+        self,
+        state: BotState,
+        policy: BotPolicy | None = None,
+        budget: float | None = None,
+        seed: int | None = None,
+    ) -> Move:
+        """Compute a move in a worker process.
+
+        Args:
+            state: The game, on the bot's turn.
+            policy: The policy to follow (default: ``self.policy``).
+            budget: Seconds to think for (default: ``self.budget``).
+            seed: Seed of the policy's randomness.
+
+        Returns:
+            The move, or ``END_TURN`` if it was not back within the budget
+            and grace period or its worker failed.
+        """
+        policy = policy or self.policy
+        budget = budget or self.budget
+        loop = asyncio.get_running_loop()
+        pool = self._pool()
+        start = time.perf_counter()
+        try:
+            move = await asyncio.wait_for(
+                loop.run_in_executor(pool, decide, policy, state, budget, seed),
+                budget + self.grace,
+            )
+        except TimeoutError:
+            _TIMED_OUT.inc()
+            logger.warning("Bot move timed out", policy=policy.name, budget=budget)
+            self._recycle(pool)
+            move = END_TURN
+        except BrokenProcessPool as e:
+            _FAILED.inc()
+            logger.error("Bot worker pool broke", error=str(e))
+            if self._owns_executor and self._executor is pool:
+                self._executor = None  # the next move starts a new pool
+            move = END_TURN
+        except Exception:
+            _FAILED.inc()
+            logger.exception("Bot move failed", policy=policy.name)
+            move = END_TURN
+        BOT_DECISION_SECONDS.labels(policy.name).observe(time.perf_counter() - start)
+        return move
+
+    def _recycle(self, pool: Executor) -> None:
+        """Replace an owned pool after a move overran its time.
+
+        Abandoning the move's future leaves its worker running the policy,
+        and every move queued behind it would time out too; the pool's
+        workers are stopped instead and the next move starts a new pool.
+        Other moves in progress in the pool end their bots' turns.
+        """
+        if not self._owns_executor or self._executor is not pool:
+            return
+        self._executor = None
+        processes = list((getattr(pool, "_processes", None) or {}).values())
+        pool.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+    async def choose_action(
+        self, game: dict, player_id: str, policy: BotPolicy | None = None
+    ) -> BaseAction:
+        """Compute a bot's action on its turn.
+
+        Args:
+            game: The game, as returned by ``Game.get_state()``.
+            player_id: The bot's player ID.
+            policy: The policy to follow (default: ``self.policy``).
+
+        Returns:
+            The action.
+        """
+        move = await self.decide(pack_state(game, player_id), policy)
+        return to_action(move, player_id)
+
+    def seat(
+        self, game_id: str, player_id: str, policy: BotPolicy | None = None
+    ) -> None:
+        """Let a bot play a player's turns in a game."""
+        self._seats.setdefault(game_id, {})[player_id] = policy or self.policy
+
+    def unseat(self, game_id: str, player_id: str | None = None) -> None:
+        """Stop a game's bot (or all of them) from playing."""
+        if player_id is None:
+            self._seats.pop(game_id, None)
+            return
+        seats = self._seats.get(game_id)
+        if seats is not None:
+            seats.pop(player_id, None)
+            if not seats:
+                del self._seats[game_id]
+
+    def is_bot(self, game_id: str, player_id: str) -> bool:
+        """Whether a bot plays a player's turns in a game."""
+        return player_id in self._seats.get(game_id, ())
+
+    def observe(self, message: dict, game_id: str) -> None:
+        """Track a game broadcast.
+
+        A ``turn_changed`` to a seated bot has it play its turn in the
+        background; ``game_ended`` unseats the game's bots.
+        """
+        message_type = message.get("type")
+        if message_type == "turn_changed":
+            player_id = message["current_player_id"]
+            policy = self._seats.get(game_id, {}).get(player_id)
+            if policy is None:
+                return
+            task = asyncio.get_running_loop().create_task(
+                self._play(game_id, player_id, message["turn_number"], policy)
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        elif message_type == "game_ended":
+            self.unseat(game_id)
+
+    async def _play(
+        self, game_id: str, player_id: str, turn: int, policy: BotPolicy
+    ) -> None:
+        if self.load_game is None:
+            return
+        try:
+            game = await self.load_game(game_id)
+            if game is None or player_id not in game.get("players", {}):
+                return
+            action = await self.choose_action(game, player_id, policy)
+            if self.is_bot(game_id, player_id) and self.on_action is not None:
+                self.on_action(game_id, turn, action)
+        except Exception:
+            logger.exception("Bot turn failed", game_id=game_id)
+
+    def close(self) -> None:
+        """Stop every bot turn in progress and the worker processes."""
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+        self._seats.clear()
+        if self._executor is not None and self._owns_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,205 @@
+"""Fixed-timestep game loop for PyGridFight.
+
+Games advance over time (turn deadlines, resource spawns at the end of a
+turn cycle, stalemate after ``max_turns``), so something has to step them.
+One asyncio task per game would not scale to tens of thousands of games
+per process: every task costs memory and a timer, and tasks started
+together wake together. Instead one loop steps every running game on a
+fixed timestep.
+
+The timestep is split into ``slots`` phases and each game is pinned to the
+least loaded one, so a timestep's work is spread evenly across it instead
+of arriving in one burst. Each phase has ``timestep / slots`` seconds of
+budget; phases that overrun it are counted and logged, and a loop that
+falls more than a whole timestep behind skips ahead instead of running the
+backlog in a burst.
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Iterable
+
+import anyio
+import structlog
+
+from pygridfight.core.config import get_server_settings
+from pygridfight.core.metrics import get_metrics_registry
+
+logger = structlog.get_logger(__name__)
+
+_metrics = get_metrics_registry()
+SCHEDULED_GAMES = _metrics.gauge(
+    "pygridfight_game_loop_games",
+    "Games stepped by the game loop.",
+).labels()
+PHASE_SECONDS = _metrics.histogram(
+    "pygridfight_game_loop_phase_seconds",
+    "Time spent stepping the games of one game loop phase.",
+).labels()
+PHASE_OVERRUNS = _metrics.counter(
+    "pygridfight_game_loop_overruns_total",
+    "Game loop phases that took longer than their share of the timestep.",
+).labels()
+SKIPPED_PHASES = _metrics.counter(
+    "pygridfight_game_loop_skipped_phases_total",
+    "Game loop phase slots skipped because the loop fell a timestep behind "
+    "(games' ticks are delayed, not lost).",
+).labels()
+
+# Called with a game's ID and tick number on each of the game's ticks.
+GameSystem = Callable[[str, int], None]
+
+
+class GameLoop:
+    """Steps every scheduled game once per timestep, from one task.
+
+    Systems (see ``GameSystem``) are run for each game in the order they
+    were added. They run on the event loop and must not block; a system
+    that needs the game store should schedule that work rather than wait
+    for it. A failing system is logged and does not stop the loop.
+    """
+
+    def __init__(
+        self,
+        timestep: float | None = None,
+        slots: int | None = None,
+        sync_interval: float | None = None,
+    ) -> None:
+        """Initialize the loop.
+
+        Args:
+            timestep: Seconds between two ticks of a game (default:
+                ServerSettings.game_loop_timestep).
+            slots: Phases the timestep is split into (default:
+                ServerSettings.game_loop_slots).
+            sync_interval: Seconds between refreshes of the running games
+                in ``run`` (default: ServerSettings.game_loop_sync_interval).
+        """
+        settings = get_server_settings()
+        self.timestep = timestep or settings.game_loop_timestep
+        self.slots = slots or settings.game_loop_slots
+        self.sync_interval = sync_interval or settings.game_loop_sync_interval
+        self.budget = self.timestep / self.slots
+        self.systems: list[GameSystem] = []
+        # Per phase: game_id -> the game's tick count.
+        self._phases: list[dict[str, int]] = [{} for _ in range(self.slots)]
+        self._phase_of: dict[str, int] = {}
+        self._next_phase = 0
+        self._last_warning = 0.0
+
+    def __len__(self) -> int:
+        return len(self._phase_of)
+
+    def __contains__(self, game_id: object) -> bool:
+        return game_id in self._phase_of
+
+    def add_system(self, system: GameSystem) -> None:
+        """Run a system on every tick of every game."""
+        self.systems.append(system)
+
+    def add(self, game_id: str) -> None:
+        """Start stepping a game, in the least loaded phase."""
+        if game_id in self._phase_of:
+            return
+        phase = min(range(self.slots), key=lambda index: len(self._phases[index]))
+        self._phases[phase][game_id] = 0
+        self._phase_of[game_id] = phase
+        SCHEDULED_GAMES.set(len(self._phase_of))
+
+    def remove(self, game_id: str) -> None:
+        """Stop stepping a game."""
+        phase = self._phase_of.pop(game_id, None)
+        if phase is not None:
+            del self._phases[phase][game_id]
+            SCHEDULED_GAMES.set(len(self._phase_of))
+
+    def sync(self, game_ids: Iterable[str]) -> None:
+        """Step exactly the given games, keeping the phases of known ones."""
+        wanted = set(game_ids)
+        for game_id in [g for g in self._phase_of if g not in wanted]:
+            self.remove(game_id)
+        for game_id in wanted:
+            self.add(game_id)
+
+    def step_phase(self) -> int:
+        """Tick the games of the next phase.
+
+        Returns:
+            Number of games ticked.
+        """
+        phase = self._phases[self._next_phase]
+        self._next_phase = (self._next_phase + 1) % self.slots
+        systems = self.systems
+        # Snapshot: systems may add or remove games.
+        for game_id in list(phase):
+            tick = phase.get(game_id)
+            if tick is None:
+                continue
+            tick += 1
+            phase[game_id] = tick
+            for system in systems:
+                try:
+                    system(game_id, tick)
+                except Exception:
+                    logger.exception("Game system failed", game_id=game_id, tick=tick)
+        return len(phase)
+
+    async def run(
+        self, running_games: Callable[[], Awaitable[Iterable[str]]] | None = None
+    ) -> None:
+        """Step the games forever.
+
+        Args:
+            running_games: Returns the IDs of the games to step; polled
+                every ``sync_interval`` seconds if given.
+        """
+        async with anyio.create_task_group() as tg:
+            if running_games is not None:
+                tg.start_soon(self._sync_forever, running_games)
+            await self._step_forever()
+
+    async def _sync_forever(
+        self, running_games: Callable[[], Awaitable[Iterable[str]]]
+    ) -> None:
+        while True:
+            try:
+                self.sync(await running_games())
+            except Exception:
+                logger.exception("Game loop sync failed")
+            await anyio.sleep(self.sync_interval)
+
+    async def _step_forever(self) -> None:
+        loop = asyncio.get_running_loop()
+        due = loop.time()
+        while True:
+            delay = due - loop.time()
+            # Always yield, even when late, so the loop never starves I/O.
+            await asyncio.sleep(max(0.0, delay))
+            start = time.perf_counter()
+            games = self.step_phase()
+            elapsed = time.perf_counter() - start
+            PHASE_SECONDS.observe(elapsed)
+            if elapsed > self.budget:
+                self._overrun(elapsed, games)
+            due += self.budget
+            behind = loop.time() - due
+            if behind > self.timestep:
+                skipped = int(behind / self.budget)
+                SKIPPED_PHASES.inc(skipped)
+                due += skipped * self.budget
+
+    def _overrun(self, elapsed: float, games: int) -> None:
+        PHASE_OVERRUNS.inc()
+        now = time.monotonic()
+        if now - self._last_warning >= 1.0:  # at most one warning per second
+            self._last_warning = now
+            logger.warning(
+                "Game loop phase overran its budget",
+                elapsed_ms=round(elapsed * 1000, 2),
+                budget_ms=round(self.budget * 1000, 2),
+                games=games,
+            )
+
+
+# Global game loop
+game_loop = GameLoop()
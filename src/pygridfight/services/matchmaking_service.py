@@ -0,0 +1,267 @@
+"""Matchmaking service for PyGridFight."""
+
+import heapq
+import itertools
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+
+import anyio
+import structlog
+
+from pygridfight.domain.enums import TicketStatus
+from pygridfight.domain.models.game import Game, GameSettings
+from pygridfight.domain.models.player import Player
+from pygridfight.infrastructure.game_state import GameStateManager
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class MatchPreferences:
+    """Game shape a queued player is willing to join."""
+
+    max_players: int = 4
+    grid_size: int = 20
+
+
+@dataclass
+class MatchTicket:
+    """A player's place in the matchmaking queue."""
+
+    id: str
+    player_id: str
+    player_name: str
+    preferences: MatchPreferences
+    enqueued_at: float = field(default_factory=time.monotonic)
+    status: TicketStatus = TicketStatus.QUEUED
+    game_id: str | None = None
+
+
+class MatchmakingService:
+    """Queues players by preferences and matches them into games in batches.
+
+    Each preference bucket is a FIFO heap keyed by an enqueue sequence number,
+    so enqueueing is O(log n) and cancelling is O(1) (entries are dropped
+    lazily when they reach the top of the heap). Matching happens in
+    ``run_tick``, which snapshots joinable lobbies once per tick instead of
+    letting every client race for the same game through ``join_game``.
+    """
+
+    def __init__(
+        self,
+        manager: GameStateManager,
+        batch_size: int = 1000,
+        ticket_ttl: float = 300.0,
+    ) -> None:
+        """Initialize the MatchmakingService.
+
+        Args:
+            manager: Game state manager holding the games to fill.
+            batch_size: Maximum number of tickets matched per tick.
+            ticket_ttl: Seconds a matched or cancelled ticket stays queryable.
+        """
+        self._manager = manager
+        self._batch_size = batch_size
+        self._ticket_ttl = ticket_ttl
+        self._queues: dict[MatchPreferences, list[tuple[int, str]]] = {}
+        self._tickets: dict[str, MatchTicket] = {}
+        self._finished: deque[tuple[float, str]] = deque()
+        self._sequence = itertools.count()
+        self._queued = 0
+
+    @property
+    def queue_size(self) -> int:
+        """Number of tickets currently waiting for a match."""
+        return self._queued
+
+    def enqueue(self, player_name: str, preferences: MatchPreferences) -> MatchTicket:
+        """Put a player in the queue for games matching the given preferences.
+
+        Args:
+            player_name: Display name of the player.
+            preferences: Desired game shape.
+
+        Returns:
+            The queued MatchTicket.
+        """
+        ticket = MatchTicket(
+            id=str(uuid.uuid4()),
+            player_id=str(uuid.uuid4()),
+            player_name=player_name,
+            preferences=preferences,
+        )
+        self._tickets[ticket.id] = ticket
+        heap = self._queues.setdefault(preferences, [])
+        heapq.heappush(heap, (next(self._sequence), ticket.id))
+        self._queued += 1
+        return ticket
+
+    def cancel(self, ticket_id: str) -> bool:
+        """Remove a queued ticket from matchmaking.
+
+        Args:
+            ticket_id: ID of the ticket to cancel.
+
+        Returns:
+            True if the ticket was queued and is now cancelled, else False.
+        """
+        ticket = self._tickets.get(ticket_id)
+        if ticket is None or ticket.status != TicketStatus.QUEUED:
+            return False
+        ticket.status = TicketStatus.CANCELLED
+        self._queued -= 1
+        self._finished.append((time.monotonic(), ticket_id))
+        return True
+
+    def get_ticket(self, ticket_id: str) -> MatchTicket | None:
+        """Look up a ticket by its ID.
+
+        Args:
+            ticket_id: ID of the ticket.
+
+        Returns:
+            The MatchTicket if known, else None.
+        """
+        return self._tickets.get(ticket_id)
+
+    async def run_tick(self) -> int:
+        """Match up to ``batch_size`` queued tickets into games.
+
+        Open lobbies are filled first, oldest first; remaining tickets are
+        grouped into newly created games.
+
+        Returns:
+            Number of tickets matched during this tick.
+        """
+        self._expire_finished()
+        if not self._queued:
+            return 0
+
+        open_games: dict[MatchPreferences, list[Game]] = {}
+        for game in await self._manager.list_open_games():
+            prefs = MatchPreferences(game.max_players, game.grid_size)
+            if prefs in self._queues:
+                open_games.setdefault(prefs, []).append(game)
+
+        budget = self._batch_size
+        matched = 0
+        for prefs, heap in list(self._queues.items()):
+            if budget <= 0:
+                break
+            pending = self._pop_tickets(heap, budget)
+            budget -= len(pending)
+            try:
+                matched += await self._fill(prefs, pending, open_games.get(prefs, []))
+            finally:
+                # Tickets not yet in a stored game wait for the next tick.
+                self._requeue(pending)
+
+        self._queues = {prefs: heap for prefs, heap in self._queues.items() if heap}
+        if matched:
+            logger.info("Matchmaking tick", matched=matched, queued=self._queued)
+        return matched
+
+    async def _fill(
+        self, prefs: MatchPreferences, pending: list[MatchTicket], games: list[Game]
+    ) -> int:
+        """Seat tickets in open games, then in new ones.
+
+        Tickets are taken off ``pending`` once their join was attempted, so
+        on failure ``pending`` holds exactly the tickets that were not.
+
+        Returns:
+            Number of tickets seated.
+        """
+        matched = 0
+        for game in games:
+            if not pending:
+                break
+            # The lobby may have filled up since the snapshot; the store
+            # checks capacity again and turns away what no longer fits.
+            batch = pending[: (game.max_players or 0) - len(game.players)]
+            matched += await self._join(game.id, batch)
+            del pending[: len(batch)]
+        while pending:
+            batch = pending[: prefs.max_players]
+            game_id = str(uuid.uuid4())
+            await self._manager.create_game(
+                game_id,
+                GameSettings(
+                    name=f"Matchmaking {game_id[:8]}",
+                    max_players=prefs.max_players,
+                    grid_size=prefs.grid_size,
+                ),
+            )
+            matched += await self._join(game_id, batch)
+            del pending[: len(batch)]
+        return matched
+
+    async def _join(self, game_id: str, tickets: list[MatchTicket]) -> int:
+        """Add the tickets' players to a game through the store.
+
+        Tickets that could not join (the game filled up or was deleted)
+        are put back in the queue.
+
+        Returns:
+            Number of tickets seated.
+        """
+        results = await self._manager.join_games(
+            [
+                (game_id, Player(id=ticket.player_id, display_name=ticket.player_name))
+                for ticket in tickets
+            ]
+        )
+        now = time.monotonic()
+        seated = 0
+        for ticket, result in zip(tickets, results, strict=True):
+            if isinstance(result, Exception):
+                self._requeue([ticket])
+                continue
+            ticket.status = TicketStatus.MATCHED
+            ticket.game_id = game_id
+            self._finished.append((now, ticket.id))
+            seated += 1
+        self._queued -= seated
+        return seated
+
+    async def run(self, interval: float) -> None:
+        """Run matchmaking ticks forever.
+
+        Args:
+            interval: Seconds between ticks.
+        """
+        while True:
+            try:
+                await self.run_tick()
+            except Exception:
+                logger.exception("Matchmaking tick failed")
+            await anyio.sleep(interval)
+
+    def _pop_tickets(
+        self, heap: list[tuple[int, str]], limit: int
+    ) -> list[MatchTicket]:
+        """Pop up to ``limit`` live tickets from a bucket, skipping cancelled ones."""
+        tickets: list[MatchTicket] = []
+        while heap and len(tickets) < limit:
+            _, ticket_id = heapq.heappop(heap)
+            ticket = self._tickets.get(ticket_id)
+            if ticket is not None and ticket.status == TicketStatus.QUEUED:
+                tickets.append(ticket)
+        return tickets
+
+    def _requeue(self, tickets: list[MatchTicket]) -> None:
+        """Put queued tickets back at the front of their queue."""
+        for ticket in tickets:
+            heap = self._queues.setdefault(ticket.preferences, [])
+            heapq.heappush(heap, (-1, ticket.id))
+
+    def _expire_finished(self) -> None:
+        """Forget matched and cancelled tickets older than the TTL."""
+        cutoff = time.monotonic() - self._ticket_ttl
+        while self._finished and self._finished[0][0] < cutoff:
+            _, ticket_id = self._finished.popleft()
+            ticket = self._tickets.get(ticket_id)
+            if ticket is not None and ticket.status != TicketStatus.QUEUED:
+                del self._tickets[ticket_id]
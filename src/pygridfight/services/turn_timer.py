@@ -0,0 +1,249 @@
+"""Turn deadlines for PyGridFight.
+
+Without deadlines one AFK player stalls their game forever. Every turn
+change (``turn_changed``) gives the game a deadline; when it passes before
+the next turn change, the current player's turn is ended for them with an
+``EndTurnAction``.
+
+Deadlines of every game live in one hashed timing wheel: they are rounded
+up to the next multiple of ``resolution`` and kept in a dict per such tick,
+and a single event loop timer fires for the earliest tick that has
+deadlines. Hundreds of thousands of pending deadlines therefore cost no
+task or timer each; setting or cancelling one is O(1) (plus O(log k) to
+track a new tick, k being the few distinct ticks in use), and expired
+turns are ended in batches so a burst of them never holds up the loop.
+"""
+
+import asyncio
+import heapq
+import math
+import time
+from collections.abc import Callable
+
+import structlog
+
+from pygridfight.api.schemas.actions import EndTurnAction
+from pygridfight.core.config import get_server_settings
+from pygridfight.core.metrics import get_metrics_registry
+
+logger = structlog.get_logger(__name__)
+
+_metrics = get_metrics_registry()
+PENDING_TURN_TIMERS = _metrics.gauge(
+    "pygridfight_turn_timers",
+    "Games with a pending turn deadline.",
+).labels()
+TURN_TIMEOUTS = _metrics.counter(
+    "pygridfight_turn_timeouts_total",
+    "Turns ended by the server because their deadline passed.",
+).labels()
+
+# Called with the game ID, the turn number and the action ending the turn.
+ExpiryHandler = Callable[[str, int, EndTurnAction], None]
+
+
+class _Deadline:
+    """A pending turn deadline."""
+
+    __slots__ = ("player_id", "tick", "turn")
+
+    def __init__(self, tick: int, player_id: str, turn: int) -> None:
+        self.tick = tick
+        self.player_id = player_id
+        self.turn = turn
+
+
+class TurnTimers:
+    """Per-game turn deadlines that end expired turns automatically."""
+
+    def __init__(
+        self,
+        timeout: float | None = None,
+        on_expire: ExpiryHandler | None = None,
+        resolution: float | None = None,
+        batch_size: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the timers.
+
+        Args:
+            timeout: Seconds a player has for a turn (default:
+                ServerSettings.turn_timeout).
+            on_expire: Called for each expired turn; exceptions are logged.
+            resolution: Seconds deadlines are rounded up to (default:
+                ServerSettings.turn_timer_resolution).
+            batch_size: Turns ended per event loop callback (default:
+                ServerSettings.turn_timer_batch).
+            clock: Monotonic clock, in seconds.
+        """
+        settings = get_server_settings()
+        self.timeout = timeout or settings.turn_timeout
+        self.resolution = resolution or settings.turn_timer_resolution
+        self.on_expire = on_expire
+        self.batch_size = batch_size or settings.turn_timer_batch
+        self.clock = clock
+        # tick -> game_id -> deadline, and the ticks in use (may hold ticks
+        # whose dict was emptied by cancellations).
+        self._buckets: dict[int, dict[str, _Deadline]] = {}
+        self._ticks: list[int] = []
+        self._current: dict[str, _Deadline] = {}
+        self._timer: asyncio.Handle | None = None
+        self._timer_tick: int | None = None
+
+    def __len__(self) -> int:
+        return len(self._current)
+
+    def deadline(self, game_id: str) -> float | None:
+        """When a game's current turn expires, on ``clock``, if it has one."""
+        entry = self._current.get(game_id)
+        return entry.tick * self.resolution if entry is not None else None
+
+    def start(
+        self, game_id: str, player_id: str, turn: int, timeout: float | None = None
+    ) -> float:
+        """Give a game's new turn a deadline, replacing any pending one.
+
+        Arms the expiry timer if an event loop is running; without one,
+        call ``expire`` to fire due deadlines.
+
+        Args:
+            game_id: The game.
+            player_id: Whose turn it is.
+            turn: The turn number.
+            timeout: Seconds the player has (default: ``self.timeout``).
+
+        Returns:
+            The deadline, on ``clock``, rounded up to ``resolution``.
+        """
+        self._remove(game_id)
+        when = self.clock() + (timeout if timeout is not None else self.timeout)
+        tick = math.ceil(when / self.resolution)
+        entry = self._current[game_id] = _Deadline(tick, player_id, turn)
+        bucket = self._buckets.get(tick)
+        if bucket is None:
+            bucket = self._buckets[tick] = {}
+            heapq.heappush(self._ticks, tick)
+        bucket[game_id] = entry
+        PENDING_TURN_TIMERS.set(len(self._current))
+        self._arm()
+        return tick * self.resolution
+
+    def cancel(self, game_id: str) -> bool:
+        """Drop a game's pending deadline, e.g. when the game ends.
+
+        Returns:
+            True if the game had a deadline.
+        """
+        if not self._remove(game_id):
+            return False
+        PENDING_TURN_TIMERS.set(len(self._current))
+        return True
+
+    def _remove(self, game_id: str) -> bool:
+        entry = self._current.pop(game_id, None)
+        if entry is None:
+            return False
+        bucket = self._buckets[entry.tick]
+        del bucket[game_id]
+        if not bucket:
+            del self._buckets[entry.tick]  # its tick is skipped when reached
+        return True
+
+    def observe(self, message: dict, game_id: str) -> None:
+        """Track a game broadcast.
+
+        ``turn_changed`` starts the new turn's deadline and ``game_ended``
+        cancels it.
+        """
+        message_type = message.get("type")
+        if message_type == "turn_changed":
+            self.start(game_id, message["current_player_id"], message["turn_number"])
+        elif message_type == "game_ended":
+            self.cancel(game_id)
+
+    def expire(
+        self, now: float | None = None, limit: int | None = None
+    ) -> list[tuple[str, int, EndTurnAction]]:
+        """End the turns whose deadline has passed.
+
+        Args:
+            now: Current time, on ``clock`` (default: ``clock()``).
+            limit: Most turns to end; the rest wait for the next call.
+
+        Returns:
+            (game ID, turn, action) of each expired turn, earliest deadline
+            first (to within ``resolution``).
+        """
+        now = self.clock() if now is None else now
+        due = math.floor(now / self.resolution)
+        limit = limit if limit is not None else len(self._current)
+        ticks = self._ticks
+        expired: list[tuple[str, int, EndTurnAction]] = []
+        while ticks and ticks[0] <= due and len(expired) < limit:
+            tick = ticks[0]
+            bucket = self._buckets.get(tick)
+            while bucket and len(expired) < limit:
+                game_id, entry = bucket.popitem()
+                del self._current[game_id]
+                action = EndTurnAction(player_id=entry.player_id)
+                expired.append((game_id, entry.turn, action))
+            if not bucket:
+                heapq.heappop(ticks)
+                self._buckets.pop(tick, None)
+        if expired:
+            TURN_TIMEOUTS.inc(len(expired))
+            PENDING_TURN_TIMERS.set(len(self._current))
+            if self.on_expire is not None:
+                for game_id, turn, action in expired:
+                    try:
+                        self.on_expire(game_id, turn, action)
+                    except Exception:
+                        logger.exception("Turn expiry handler failed", game_id=game_id)
+        return expired
+
+    def _next_tick(self) -> int | None:
+        # Drop ticks whose deadlines were all cancelled.
+        ticks = self._ticks
+        while ticks and ticks[0] not in self._buckets:
+            heapq.heappop(ticks)
+        return ticks[0] if ticks else None
+
+    def _arm(self) -> None:
+        """Make sure the timer fires by the earliest deadline."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        tick = self._next_tick()
+        if tick is None:
+            return
+        if self._timer_tick is not None and self._timer_tick <= tick:
+            return  # fires early enough; it re-arms for what is left
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer_tick = tick
+        delay = max(0.0, tick * self.resolution - self.clock())
+        self._timer = loop.call_later(delay, self._fire)
+
+    def _fire(self) -> None:
+        self._timer = None
+        self._timer_tick = None
+        self.expire(limit=self.batch_size)
+        tick = self._next_tick()
+        if tick is not None and tick * self.resolution <= self.clock():
+            # More are due: continue after letting the loop run.
+            self._timer_tick = tick
+            self._timer = asyncio.get_running_loop().call_soon(self._fire)
+        else:
+            self._arm()
+
+    def close(self) -> None:
+        """Stop the timer and forget every deadline."""
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = None
+        self._timer_tick = None
+        self._buckets.clear()
+        self._ticks.clear()
+        self._current.clear()
+        PENDING_TURN_TIMERS.set(0)
@@ -1,5 +1,9 @@
+import time
+
+import pytest
 from fastapi.testclient import TestClient
 
+from pygridfight.api.spectators import hub
 from src.pygridfight.main import app
 
 client = TestClient(app)
@@ -129,3 +133,514 @@ def test_leave_game_invalid_payload():
     # Missing player_id
     resp = client.request("DELETE", "/games/someid/leave", json={})
     assert resp.status_code == 422
+
+
+def test_matchmaking_ticket_lifecycle():
+    resp = client.post(
+        "/matchmaking/tickets",
+        json={"player_name": "Alice", "max_players": 2, "grid_size": 10},
+    )
+    assert resp.status_code == 202
+    ticket = resp.json()
+    assert ticket["status"] == "queued"
+
+    resp = client.get(f"/matchmaking/tickets/{ticket['id']}")
+    assert resp.status_code == 200
+    assert resp.json()["player_id"] == ticket["player_id"]
+
+    resp = client.delete(f"/matchmaking/tickets/{ticket['id']}")
+    assert resp.status_code == 204
+    assert client.get(f"/matchmaking/tickets/{ticket['id']}").json()["status"] == (
+        "cancelled"
+    )
+    assert client.delete(f"/matchmaking/tickets/{ticket['id']}").status_code == 404
+
+
+def test_matchmaking_unknown_ticket():
+    resp = client.get("/matchmaking/tickets/doesnotexist")
+    assert resp.status_code == 404
+
+
+def test_list_games_returns_summaries():
+    client.post("/games", json=create_game_payload())
+    resp = client.get("/games")
+    game = resp.json()["games"][0]
+    assert set(game) == {
+        "id",
+        "name",
+        "status",
+        "max_players",
+        "current_players",
+        "grid_size",
+        "is_private",
+        "created_at",
+        "started_at",
+        "finished_at",
+    }
+
+
+def test_list_games_cursor_pagination():
+    from pygridfight.infrastructure.game_state import GameStateManager
+
+    GameStateManager().reset()
+    created = [
+        client.post("/games", json=create_game_payload()).json()["game"]["id"]
+        for _ in range(5)
+    ]
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        data = client.get("/games", params=params).json()
+        assert data["total"] == 5
+        seen.extend(game["id"] for game in data["games"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == created
+
+
+def test_list_games_filters():
+    from pygridfight.infrastructure.game_state import GameStateManager
+
+    GameStateManager().reset()
+    private = create_game_payload()
+    private["is_private"] = True
+    client.post("/games", json=private)
+    full = create_game_payload()
+    full["max_players"] = 2
+    full_id = client.post("/games", json=full).json()["game"]["id"]
+    client.post(f"/games/{full_id}/join", json=join_game_payload("P1"))
+    client.post(f"/games/{full_id}/join", json=join_game_payload("P2"))
+
+    data = client.get("/games", params={"is_private": "false"}).json()
+    assert [g["id"] for g in data["games"]] == [full_id]
+    data = client.get("/games", params={"has_free_slots": "true"}).json()
+    assert data["total"] == 1 and data["games"][0]["is_private"] is True
+    data = client.get("/games", params={"status": "active"}).json()
+    assert data["total"] == 0
+
+
+def test_list_games_invalid_cursor():
+    resp = client.get("/games", params={"cursor": "not-a-cursor"})
+    assert resp.status_code == 400
+
+
+def test_get_game_conditional_request():
+    game_id = client.post("/games", json=create_game_payload()).json()["game"]["id"]
+    resp = client.get(f"/games/{game_id}")
+    etag = resp.headers["etag"]
+
+    resp = client.get(f"/games/{game_id}", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.headers["etag"] == etag
+    assert resp.content == b""
+
+    client.post(f"/games/{game_id}/join", json=join_game_payload("Alice"))
+    resp = client.get(f"/games/{game_id}", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != etag
+
+
+def test_list_games_conditional_request():
+    client.post("/games", json=create_game_payload())
+    etag = client.get("/games").headers["etag"]
+
+    resp = client.get("/games", headers={"If-None-Match": f'W/{etag}, "other"'})
+    assert resp.status_code == 304
+
+    client.post("/games", json=create_game_payload())
+    resp = client.get("/games", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+
+
+def test_etags_do_not_survive_a_restart(monkeypatch):
+    from pygridfight.api import rest
+
+    game_id = client.post("/games", json=create_game_payload()).json()["game"]["id"]
+    game_etag = client.get(f"/games/{game_id}").headers["etag"]
+    lobby_etag = client.get("/games").headers["etag"]
+
+    # A restarted process counts versions from scratch under a new nonce.
+    monkeypatch.setattr(rest, "_BOOT_ID", "rebooted")
+
+    resp = client.get(f"/games/{game_id}", headers={"If-None-Match": game_etag})
+    assert resp.status_code == 200
+    assert resp.headers["etag"].startswith('"rebooted-')
+    resp = client.get("/games", headers={"If-None-Match": lobby_etag})
+    assert resp.status_code == 200
+
+
+def test_batch_create_games():
+    resp = client.post(
+        "/games/batch", json={"games": [create_game_payload() for _ in range(3)]}
+    )
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert [r["index"] for r in results] == [0, 1, 2]
+    assert all(r["status"] == 201 and r["player_id"] for r in results)
+    game_id = results[0]["game_id"]
+    assert client.get(f"/games/{game_id}").json()["name"] == "Test Game"
+
+
+def test_batch_join_reports_per_item_errors():
+    payload = create_game_payload()
+    payload["max_players"] = 2
+    game_id = client.post("/games", json=payload).json()["game"]["id"]
+    joins = [{"game_id": game_id, "player_name": f"P{i}"} for i in range(3)]
+    joins.append({"game_id": "doesnotexist", "player_name": "Ghost"})
+
+    resp = client.post("/games/batch/join", json={"joins": joins})
+
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert [r["status"] for r in results] == [200, 200, 400, 404]
+    assert results[1]["game"]["current_players"] == 2
+    assert results[2]["error"]["code"] == "GAME_FULL"
+    assert results[3]["error"]["code"] == "GAME_NOT_FOUND"
+
+
+def test_large_batch_is_streamed():
+    resp = client.post(
+        "/games/batch", json={"games": [create_game_payload() for _ in range(250)]}
+    )
+    assert resp.status_code == 200
+    assert "content-length" not in resp.headers
+    results = resp.json()["results"]
+    assert len(results) == 250
+    assert results[-1]["index"] == 249
+
+
+def test_metrics_endpoint_exposes_instrumented_paths():
+    resp = client.post(
+        "/games", json={"name": "Metrics", "max_players": 2, "grid_size": 10}
+    )
+    client.get(f"/games/{resp.json()['game']['id']}")
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = resp.text
+    assert (
+        'pygridfight_http_request_duration_seconds_count{method="POST",'
+        'route="/games",status="201"}'
+    ) in body
+    assert 'route="/games/{game_id}",status="200"' in body
+    assert "pygridfight_state_lock_wait_seconds_count" in body
+    assert "pygridfight_game_get_state_seconds_count" in body
+
+
+@pytest.fixture
+def admin_token(monkeypatch):
+    from pygridfight.core.config import get_server_settings
+
+    monkeypatch.setenv("PYGRIDFIGHT_ADMIN_TOKEN", "s3cret")
+    get_server_settings.cache_clear()
+    yield "s3cret"
+    monkeypatch.undo()
+    get_server_settings.cache_clear()
+
+
+def test_profile_requires_admin_token(admin_token):
+    resp = client.get("/admin/profile", params={"seconds": 0.01})
+    assert resp.status_code == 403
+    resp = client.get(
+        "/admin/profile", params={"seconds": 0.01}, headers={"X-Admin-Token": "nope"}
+    )
+    assert resp.status_code == 403
+
+
+def test_profile_disabled_without_token():
+    resp = client.get(
+        "/admin/profile", params={"seconds": 0.01}, headers={"X-Admin-Token": ""}
+    )
+    assert resp.status_code == 403
+    assert resp.json()["detail"]["message"] == "Admin endpoints are disabled"
+
+
+def test_profile_returns_collapsed_stacks(admin_token):
+    headers = {"X-Admin-Token": admin_token}
+    resp = client.get(
+        "/admin/profile", params={"seconds": 0.1, "interval": 0.005}, headers=headers
+    )
+    assert resp.status_code == 200
+    assert int(resp.headers["x-profile-samples"]) > 0
+    for line in resp.text.splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert stack.startswith("thread=")
+        assert int(count) > 0
+
+    resp = client.get("/admin/profile", params={"seconds": 3600}, headers=headers)
+    assert resp.status_code == 400
+
+
+def test_ready_reports_loop_lag():
+    from pygridfight.infrastructure.loop_monitor import get_loop_monitor
+
+    resp = client.get("/ready")
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "ready"
+
+    monitor = get_loop_monitor()
+    monitor.lag = monitor.max_lag * 2
+    try:
+        resp = client.get("/ready")
+    finally:
+        monitor.lag = 0.0
+    assert resp.status_code == 503
+    assert resp.json()["status"] == "unready"
+
+
+@pytest.fixture
+def saturated_loop():
+    from pygridfight.infrastructure.loop_monitor import get_loop_monitor
+
+    monitor = get_loop_monitor()
+    monitor.lag = 10.0
+    yield
+    monitor.lag = 0.0
+
+
+def test_game_creation_is_shed_under_load(saturated_loop):
+    resp = client.post("/games", json=create_game_payload())
+    assert resp.status_code == 503
+    assert resp.headers["retry-after"] == "1"
+    assert resp.json()["detail"]["reason"] == "loop_lag"
+    resp = client.post("/matchmaking/tickets", json={"player_name": "Shed"})
+    assert resp.status_code == 503
+
+
+def test_existing_games_are_served_under_load():
+    from pygridfight.infrastructure.loop_monitor import get_loop_monitor
+
+    game_id = client.post("/games", json=create_game_payload()).json()["game"]["id"]
+    get_loop_monitor().lag = 10.0
+    try:
+        assert client.get(f"/games/{game_id}").status_code == 200
+        resp = client.post(f"/games/{game_id}/join", json=join_game_payload())
+        assert resp.status_code == 200
+    finally:
+        get_loop_monitor().lag = 0.0
+
+
+def test_websocket_ping():
+    with client.websocket_connect("/ws/ws-player") as ws:
+        ws.send_json({"type": "ping"})
+        assert ws.receive_json() == {"type": "pong"}
+
+
+def test_websocket_join_game_sends_state():
+    resp = client.post("/games", json=create_game_payload())
+    game_id = resp.json()["game"]["id"]
+    with client.websocket_connect("/ws/ws-joiner") as ws:
+        ws.send_json({"type": "join_game", "game_id": game_id, "player_name": "Alice"})
+        message = ws.receive_json()
+        assert message["type"] == "game_state"
+        assert "ws-joiner" in message["game"]["players"]
+
+
+def test_websocket_join_of_a_full_game_subscribes_its_players():
+    payload = {**create_game_payload(), "max_players": 2}
+    game_id = client.post("/games", json=payload).json()["game"]["id"]
+    client.post(f"/games/{game_id}/join", json=join_game_payload("P1"))
+    resp = client.post(f"/games/{game_id}/join", json=join_game_payload("P2"))
+    player_id = resp.json()["player_id"]
+
+    with client.websocket_connect(f"/ws/{player_id}") as ws:
+        ws.send_json({"type": "join_game", "game_id": game_id, "player_name": "P2"})
+        message = ws.receive_json()
+        assert message["type"] == "game_state"
+        assert len(message["game"]["players"]) == 2
+
+
+def test_spectators_see_players_join():
+    game_id = client.post("/games", json=create_game_payload()).json()["game"]["id"]
+    with (
+        client.websocket_connect(f"/ws/spectate/{game_id}") as spectator,
+        client.websocket_connect("/ws/ws-watched") as ws,
+    ):
+        ws.send_json({"type": "join_game", "game_id": game_id, "player_name": "A"})
+        assert ws.receive_json()["type"] == "game_state"
+        # Bounded wait, so a missing update fails instead of blocking.
+        for _ in range(100):
+            if hub.channel(game_id).keyframe is not None:
+                break
+            time.sleep(0.01)
+        assert hub.channel(game_id).keyframe is not None
+        message = spectator.receive_json()
+        assert message["type"] == "game_state"
+        assert "ws-watched" in message["game"]["players"]
+
+
+def test_websocket_resume_replays_missed_broadcasts():
+    game_id = client.post("/games", json=create_game_payload()).json()["game"]["id"]
+    with client.websocket_connect("/ws/ws-resumer") as ws:
+        ws.send_json({"type": "join_game", "game_id": game_id, "player_name": "A"})
+        last_seq = ws.receive_json()["seq"]
+    # Broadcast while ws-resumer is away.
+    with client.websocket_connect("/ws/ws-other") as ws:
+        ws.send_json({"type": "join_game", "game_id": game_id, "player_name": "B"})
+        ws.receive_json()
+
+    with client.websocket_connect("/ws/ws-resumer") as ws:
+        ws.send_json({"type": "resume", "game_id": game_id, "last_seq": last_seq})
+        missed = ws.receive_json()
+        assert missed["seq"] == last_seq + 1
+        assert "ws-other" in missed["game"]["players"]
+        # Too far back to replay: a snapshot of the current state instead.
+        ws.send_json({"type": "resume", "game_id": game_id, "last_seq": 10**9})
+        snapshot = ws.receive_json()
+        assert snapshot["type"] == "game_state"
+        assert snapshot["seq"] == last_seq + 1
+
+
+def test_websocket_resume_requires_membership():
+    game_id = client.post("/games", json=create_game_payload()).json()["game"]["id"]
+    with client.websocket_connect("/ws/ws-stranger") as ws:
+        ws.send_json({"type": "resume", "game_id": game_id, "last_seq": 0})
+        assert ws.receive_json()["code"] == "NOT_IN_GAME"
+
+
+def test_large_grids_need_area_visibility():
+    payload = {**create_game_payload(), "grid_size": 120}
+    assert client.post("/games", json=payload).status_code == 422
+    resp = client.post("/games", json={**payload, "visibility": "area"})
+    assert resp.status_code == 201
+
+
+def test_websocket_set_view_sends_state_of_new_area():
+    payload = {**create_game_payload(), "grid_size": 120, "visibility": "area"}
+    game_id = client.post("/games", json=payload).json()["game"]["id"]
+    with client.websocket_connect("/ws/ws-viewer") as ws:
+        ws.send_json({"type": "join_game", "game_id": game_id, "player_name": "A"})
+        assert ws.receive_json()["game"]["visibility"] == "area"
+        ws.send_json(
+            {
+                "type": "set_view",
+                "game_id": game_id,
+                "viewport": {"x": 0, "y": 0, "width": 30, "height": 20},
+            }
+        )
+        assert ws.receive_json()["type"] == "game_state"
+        ws.send_json({"type": "set_view", "game_id": game_id, "radius": 3})
+        assert ws.receive_json()["type"] == "game_state"
+
+    full_id = client.post("/games", json=create_game_payload()).json()["game"]["id"]
+    with client.websocket_connect("/ws/ws-viewer") as ws:
+        ws.send_json({"type": "join_game", "game_id": full_id, "player_name": "A"})
+        ws.receive_json()
+        ws.send_json({"type": "set_view", "game_id": full_id, "radius": 3})
+        assert ws.receive_json()["code"] == "NOT_AREA_GAME"
+
+
+def test_websocket_invalid_messages_get_errors():
+    with client.websocket_connect("/ws/ws-invalid") as ws:
+        ws.send_json({"type": "teleport"})
+        assert ws.receive_json() == {
+            "type": "error",
+            "message": "Unknown message type: teleport",
+            "code": "PROTOCOL_ERROR",
+        }
+        ws.send_json({"type": "join_game"})
+        assert ws.receive_json()["code"] == "VALIDATION_ERROR"
+        ws.send_json({"type": "player_ready", "ready": True})
+        assert ws.receive_json() == {
+            "type": "error",
+            "message": "Unsupported message type: player_ready",
+        }
+
+
+def test_websocket_flood_is_rate_limited_then_closed():
+    from starlette.websockets import WebSocketDisconnect
+
+    from pygridfight.core.config import get_server_settings
+
+    settings = get_server_settings()
+    burst = settings.ws_message_type_limits["ping"][1]
+    with client.websocket_connect("/ws/ws-flooder") as ws:
+        for _ in range(burst + settings.ws_rate_limit_strikes):
+            ws.send_json({"type": "ping"})
+        assert [ws.receive_json() for _ in range(burst)] == [{"type": "pong"}] * burst
+        assert ws.receive_json()["code"] == "RATE_LIMITED"
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            ws.receive_json()
+        assert exc_info.value.code == 1008
+
+
+def test_websocket_binary_protocol():
+    from pygridfight.api.protocol import BINARY_V1, BinaryClient
+
+    codec = BinaryClient()
+    with client.websocket_connect(
+        "/ws/bin-player", subprotocols=["pygridfight.bin.v9", BINARY_V1]
+    ) as ws:
+        assert ws.accepted_subprotocol == BINARY_V1
+        ws.send_bytes(codec.encode({"type": "ping"}))
+        assert codec.decode(ws.receive_bytes()) == {"type": "pong"}
+        ws.send_bytes(b"\xff")
+        error = codec.decode(ws.receive_bytes())
+        assert error["type"] == "error" and error["code"] == "PROTOCOL_ERROR"
+
+
+def test_websocket_unsupported_protocol_is_refused():
+    from starlette.testclient import WebSocketDenialResponse
+
+    with (
+        pytest.raises(WebSocketDenialResponse) as exc_info,
+        client.websocket_connect("/ws/old-player", subprotocols=["v0"]),
+    ):
+        pass
+    assert exc_info.value.status_code == 400
+    assert "pygridfight.bin.v1" in exc_info.value.json()["supported"]
+
+
+def test_spectator_websocket_is_read_only():
+    game_id = client.post("/games", json=create_game_payload()).json()["game"]["id"]
+    with client.websocket_connect(f"/ws/spectate/{game_id}") as ws:
+        ws.send_json({"type": "ping"})
+        assert ws.receive_json() == {"type": "pong"}
+        ws.send_json({"type": "player_ready", "ready": True})
+        assert ws.receive_json() == {
+            "type": "error",
+            "message": "Spectators are read-only",
+        }
+
+
+def test_spectating_an_unknown_game_is_refused():
+    from starlette.testclient import WebSocketDenialResponse
+
+    with (
+        pytest.raises(WebSocketDenialResponse) as exc_info,
+        client.websocket_connect("/ws/spectate/no-such-game"),
+    ):
+        pass
+    assert exc_info.value.status_code == 404
+    assert hub.channel("no-such-game") is None
+
+
+def test_deleting_a_game_disconnects_its_spectators():
+    from starlette.websockets import WebSocketDisconnect
+
+    game_id = client.post("/games", json=create_game_payload()).json()["game"]["id"]
+    with client.websocket_connect(f"/ws/spectate/{game_id}") as ws:
+        assert hub.viewers(game_id) == 1
+        assert client.delete(f"/games/{game_id}").status_code == 204
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            ws.receive_json()
+    assert exc_info.value.code == 1000
+    assert hub.channel(game_id) is None
+
+
+def test_websocket_connect_is_shed_under_load(saturated_loop):
+    from starlette.testclient import WebSocketDenialResponse
+
+    with (
+        pytest.raises(WebSocketDenialResponse) as exc_info,
+        client.websocket_connect("/ws/shed-player"),
+    ):
+        pass
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers["retry-after"] == "1"
@@ -0,0 +1,43 @@
+from pygridfight.core.config import ServerSettings
+from pygridfight.infrastructure.admission import AdmissionController
+
+
+def make_controller(**signals):
+    values = {"loop_lag": 0.0, "in_flight": 0, "connections": 0, "pending_sends": 0}
+    values.update(signals)
+    settings = ServerSettings(
+        admission_max_loop_lag=0.1,
+        admission_max_in_flight=10,
+        admission_max_connections=5,
+        admission_max_pending_sends=100,
+        admission_retry_after=3,
+    )
+    return AdmissionController(
+        settings, **{name: (lambda v=v: v) for name, v in values.items()}
+    )
+
+
+def test_admits_when_idle():
+    controller = make_controller()
+    assert controller.check("lobby") is None
+    assert controller.check("connection") is None
+
+
+def test_rejects_on_each_load_signal():
+    for signal, value in [("loop_lag", 0.5), ("in_flight", 11), ("pending_sends", 101)]:
+        rejection = make_controller(**{signal: value}).check("lobby")
+        assert rejection is not None
+        assert rejection.reason == signal
+        assert rejection.retry_after == 3
+
+
+def test_connection_cap_only_applies_to_connections():
+    controller = make_controller(connections=6)
+    assert controller.check("lobby") is None
+    assert controller.check("connection").reason == "connections"
+
+
+def test_disabled_admits_everything():
+    controller = make_controller(loop_lag=10.0)
+    controller.enabled = False
+    assert controller.check("lobby") is None
@@ -0,0 +1,212 @@
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import anyio
+import pytest
+
+from pygridfight.api.schemas.actions import ActionType
+from pygridfight.api.ticker import GameTicker
+from pygridfight.services.bot_policies import (
+    ATTACK,
+    END_TURN,
+    MOVE,
+    BotPolicy,
+    BotState,
+    GreedyPolicy,
+    MCTSPolicy,
+    legal_moves,
+    pack_state,
+    play,
+    winner,
+)
+from pygridfight.services.bot_service import BotService, to_action
+from src.pygridfight.domain.models.game import Game
+from src.pygridfight.domain.models.grid import Grid
+from src.pygridfight.domain.models.player import Player
+
+
+def make_state(*avatars, scores=(0, 0), size=5) -> BotState:
+    return BotState(size, size, 0, scores, avatars)
+
+
+class SlowPolicy(BotPolicy):
+    name = "slow"
+
+    def choose(self, state, budget, rng):
+        time.sleep(budget * 4)
+        return END_TURN
+
+
+class StuckPolicy(BotPolicy):
+    name = "stuck"
+
+    def choose(self, state, budget, rng):
+        time.sleep(60)
+        return END_TURN
+
+
+class FailingPolicy(BotPolicy):
+    name = "failing"
+
+    def choose(self, state, budget, rng):
+        raise RuntimeError("boom")
+
+
+def test_pack_state_from_a_game():
+    game = Game(id="g1", grid=Grid(width=6, height=4))
+    for pid in ("p1", "p2"):
+        game.add_player(Player(id=pid, display_name=pid))
+        game.create_initial_avatar(pid)
+    game.players["p2"].score = 3
+
+    state = pack_state(game.get_state(), "p2")
+
+    assert state == BotState(6, 4, 1, (0, 3), ((0, 0, 0, 1), (1, 5, 3, 1)))
+
+
+def test_legal_moves_stay_on_free_cells_and_attack_enemies():
+    state = make_state((0, 0, 0, 1), (0, 1, 0, 1), (1, 0, 1, 1))
+
+    assert sorted(legal_moves(state)) == [
+        (MOVE, 1, 1, 1),
+        (MOVE, 1, 2, 0),
+        (ATTACK, 0, 0, 1),
+        END_TURN,
+    ]
+
+
+def test_killing_an_avatar_scores_and_can_win():
+    state = make_state((0, 0, 0, 1), (1, 0, 1, 2), scores=(9, 0))
+
+    hit = play(state, (ATTACK, 0, 0, 1))
+    assert hit.avatars == ((0, 0, 0, 1), (1, 0, 1, 1))
+    assert hit.to_move == 1 and winner(hit) is None
+
+    killed = play(hit._replace(to_move=0), (ATTACK, 0, 0, 1))
+    assert killed.scores == (10, 0)
+    assert winner(killed) == 0
+
+
+def test_greedy_attacks_or_closes_in():
+    rng = random.Random(0)
+    adjacent = make_state((0, 2, 2, 1), (1, 2, 3, 1))
+    assert GreedyPolicy().choose(adjacent, 0, rng) == (ATTACK, 0, 2, 3)
+
+    apart = make_state((0, 0, 0, 1), (1, 4, 0, 1))
+    assert GreedyPolicy().choose(apart, 0, rng) == (MOVE, 0, 1, 0)
+
+
+def test_mcts_finds_the_winning_attack():
+    state = make_state((0, 1, 1, 1), (1, 1, 2, 1), (1, 4, 4, 1), scores=(9, 0), size=6)
+
+    move = MCTSPolicy(max_iterations=300).choose(state, 10.0, random.Random(1))
+
+    assert move == (ATTACK, 0, 1, 2)
+
+
+def test_mcts_keeps_to_its_budget():
+    rng = random.Random(2)
+    cells = rng.sample([(x, y) for x in range(20) for y in range(20)], 8)
+    state = BotState(
+        20, 20, 0, (0, 0), tuple((i % 2, x, y, 3) for i, (x, y) in enumerate(cells))
+    )
+
+    start = time.perf_counter()
+    move = MCTSPolicy().choose(state, 0.05, rng)
+
+    assert time.perf_counter() - start < 0.5
+    assert move in legal_moves(state)
+
+
+def test_moves_become_actions():
+    move = to_action((MOVE, 0, 3, 4), "p1")
+    assert move.type == ActionType.MOVE
+    assert (move.target_position.x, move.target_position.y) == (3, 4)
+    assert to_action((ATTACK, 0, 1, 1), "p1").type == ActionType.ATTACK
+    assert to_action(END_TURN, "p1").type == ActionType.END_TURN
+
+
+@pytest.mark.anyio
+async def test_moves_are_computed_in_worker_processes():
+    bots = BotService(workers=1, policy=GreedyPolicy(), budget=0.05, grace=30.0)
+    try:
+        await bots.start()
+        state = make_state((0, 2, 2, 1), (1, 2, 3, 1))
+        assert await bots.decide(state) == (ATTACK, 0, 2, 3)
+    finally:
+        bots.close()
+
+
+@pytest.mark.anyio
+async def test_overrunning_workers_are_replaced():
+    bots = BotService(workers=1, policy=GreedyPolicy(), budget=0.05, grace=0.5)
+    try:
+        await bots.start()
+        stuck = list(bots._executor._processes.values())
+        state = make_state((0, 2, 2, 1), (1, 2, 3, 1))
+
+        assert await bots.decide(state, StuckPolicy()) == END_TURN
+        bots.grace = 30.0
+        assert await bots.decide(state) == (ATTACK, 0, 2, 3)
+        for process in stuck:
+            process.join(5)
+            assert not process.is_alive()
+    finally:
+        bots.close()
+
+
+@pytest.mark.anyio
+async def test_late_or_failed_moves_end_the_turn():
+    with ThreadPoolExecutor(1) as executor:
+        bots = BotService(budget=0.01, grace=0.01, executor=executor)
+        state = make_state((0, 2, 2, 1), (1, 2, 3, 1))
+
+        assert await bots.decide(state, SlowPolicy()) == END_TURN
+        assert await bots.decide(state, FailingPolicy()) == END_TURN
+
+
+@pytest.mark.anyio
+async def test_seated_bots_play_their_turns():
+    game = Game(id="g1", grid=Grid(width=5, height=5))
+    for pid in ("p1", "bot"):
+        game.add_player(Player(id=pid, display_name=pid))
+        game.create_initial_avatar(pid)
+
+    async def load_game(game_id):
+        return game.get_state()
+
+    class RecordingManager:
+        def queue_broadcast(self, message: dict, game_id: str) -> int:
+            return 1
+
+    actions = []
+    with ThreadPoolExecutor(1) as executor:
+        bots = BotService(
+            policy=GreedyPolicy(),
+            load_game=load_game,
+            on_action=lambda *args: actions.append(args),
+            executor=executor,
+        )
+        ticker = GameTicker(RecordingManager(), interval=0, bots=bots)
+        bots.seat("g1", "bot")
+
+        ticker.publish(
+            {"type": "turn_changed", "current_player_id": "p1", "turn_number": 1},
+            "g1",
+        )
+        ticker.publish(
+            {"type": "turn_changed", "current_player_id": "bot", "turn_number": 2},
+            "g1",
+        )
+        with anyio.fail_after(5):
+            while not actions:
+                await anyio.sleep(0.01)
+
+        game_id, turn, action = actions[0]
+        assert (game_id, turn, action.player_id) == ("g1", 2, "bot")
+        assert action.type == ActionType.MOVE
+
+        ticker.publish({"type": "game_ended"}, "g1")
+        assert not bots.is_bot("g1", "bot")
+        bots.close()
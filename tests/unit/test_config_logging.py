@@ -51,6 +51,11 @@ def test_server_settings_env_override(monkeypatch):
     assert settings.log_level == "DEBUG"
 
 
+def test_spectator_deltas_must_fit_in_the_queue():
+    with pytest.raises(ValueError):
+        config_mod.ServerSettings(spectator_queue_size=32, spectator_max_deltas=32)
+
+
 def test_global_settings_instances():
     gs = config_mod.get_game_settings()
     ss = config_mod.get_server_settings()
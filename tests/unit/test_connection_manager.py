@@ -0,0 +1,257 @@
+import asyncio
+import time
+
+import anyio
+import pytest
+
+from pygridfight.api import protocol
+from pygridfight.api.protocol import BINARY_V1, BinaryClient
+from pygridfight.api.websocket import ConnectionManager
+
+
+class FakeWebSocket:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.sent: list[str] = []
+        self.closed_with: int | None = None
+        self.gate: asyncio.Event | None = None
+
+    async def accept(self, subprotocol: str | None = None):
+        pass
+
+    async def send_text(self, text: str):
+        if self.gate is not None:
+            await self.gate.wait()
+        await anyio.sleep(self.delay)
+        self.sent.append(text)
+
+    async def send_bytes(self, data: bytes):
+        self.sent.append(data)
+
+    async def close(self, code: int = 1000, reason: str | None = None):
+        self.closed_with = code
+
+
+async def make_manager(sockets: dict[str, FakeWebSocket], spectator=False, **kwargs):
+    manager = ConnectionManager(**kwargs)
+    for player_id, socket in sockets.items():
+        await manager.connect(socket, player_id, spectator=spectator)
+        manager.add_to_game(player_id, "g1")
+    return manager
+
+
+def state(turn: int) -> dict:
+    return {"type": "game_state", "turn": turn}
+
+
+@pytest.mark.anyio
+async def test_broadcast_encodes_once(monkeypatch):
+    calls = []
+    real_dumps = protocol.dumps
+    monkeypatch.setattr(protocol, "dumps", lambda m: calls.append(m) or real_dumps(m))
+    sockets = {f"p{i}": FakeWebSocket() for i in range(5)}
+    manager = await make_manager(sockets)
+
+    await manager.broadcast_to_game(state(1), "g1")
+    await manager.flush()
+
+    assert len(calls) == 1
+    assert all(s.sent == ['{"type":"game_state","turn":1}'] for s in sockets.values())
+
+
+@pytest.mark.anyio
+async def test_broadcast_uses_each_connections_protocol(monkeypatch):
+    calls = []
+    real_compile = protocol.compile_frame
+    monkeypatch.setattr(
+        protocol, "compile_frame", lambda m: calls.append(m) or real_compile(m)
+    )
+    sockets = {f"p{i}": FakeWebSocket() for i in range(4)}
+    manager = ConnectionManager()
+    for i, (player_id, socket) in enumerate(sockets.items()):
+        await manager.connect(socket, player_id, protocol=BINARY_V1 if i else None)
+        manager.add_to_game(player_id, "g1")
+
+    message = {"type": "player_left", "player_id": "p0", "game_id": "g1"}
+    await manager.broadcast_to_game(message, "g1")
+    await manager.flush()
+
+    assert len(calls) == 1
+    assert sockets["p0"].sent == [
+        '{"type":"player_left","player_id":"p0","game_id":"g1"}'
+    ]
+    frames = [sockets[f"p{i}"].sent[0] for i in range(1, 4)]
+    assert frames[0] == frames[1] == frames[2]
+    assert BinaryClient().decode(frames[0]) == message
+
+
+@pytest.mark.anyio
+async def test_producers_never_wait_for_clients():
+    sockets = {f"p{i}": FakeWebSocket(delay=0.05) for i in range(20)}
+    manager = await make_manager(sockets)
+
+    start = time.perf_counter()
+    await manager.broadcast_to_game({"type": "tick"}, "g1")
+    await manager.send_personal_message({"type": "pong"}, "p0")
+    assert time.perf_counter() - start < 0.01
+
+    await manager.flush()
+    assert sockets["p0"].sent == ['{"type":"tick"}', '{"type":"pong"}']
+    assert all(len(s.sent) >= 1 for s in sockets.values())
+
+
+@pytest.mark.anyio
+async def test_stuck_socket_is_evicted_without_delaying_others():
+    stuck = FakeWebSocket(delay=60)
+    fast = FakeWebSocket()
+    manager = await make_manager({"stuck": stuck, "fast": fast}, send_timeout=0.05)
+
+    await manager.broadcast_to_game({"type": "tick"}, "g1")
+    await manager.registry.get("fast").drained()
+    assert fast.sent == ['{"type":"tick"}']
+
+    await anyio.sleep(0.1)
+    assert stuck.closed_with == 1008
+    assert not manager.is_connected("stuck")
+    assert manager.is_connected("fast")
+
+
+@pytest.mark.anyio
+async def test_superseded_game_state_is_coalesced():
+    slow = FakeWebSocket()
+    slow.gate = asyncio.Event()
+    manager = await make_manager({"p1": slow})
+
+    for turn in range(1, 5):
+        await manager.broadcast_to_game(state(turn), "g1")
+        await anyio.lowlevel.checkpoint()  # let the writer pick up the first message
+    await manager.broadcast_to_game({"type": "chat", "text": "hi"}, "g1")
+    slow.gate.set()
+    await manager.flush()
+
+    # Turn 1 was already being sent; turns 2 and 3 were superseded by 4.
+    assert slow.sent == [
+        '{"type":"game_state","turn":1}',
+        '{"type":"game_state","turn":4}',
+        '{"type":"chat","text":"hi"}',
+    ]
+
+
+@pytest.mark.anyio
+async def test_spectators_drop_oldest_on_overflow():
+    slow = FakeWebSocket()
+    slow.gate = asyncio.Event()
+    manager = await make_manager({"s1": slow}, spectator=True, queue_size=2)
+
+    for i in range(6):
+        await manager.broadcast_to_game({"type": "event", "n": i}, "g1")
+        await anyio.lowlevel.checkpoint()
+    slow.gate.set()
+    await manager.flush()
+
+    assert [text[-2] for text in slow.sent] == ["0", "4", "5"]
+    assert manager.is_connected("s1")
+
+
+@pytest.mark.anyio
+async def test_players_are_disconnected_on_sustained_overflow():
+    slow = FakeWebSocket()
+    slow.gate = asyncio.Event()
+    manager = await make_manager({"p1": slow}, queue_size=2, overflow_grace=0.05)
+
+    for i in range(4):
+        await manager.broadcast_to_game({"type": "event", "n": i}, "g1")
+        await anyio.lowlevel.checkpoint()
+    # Briefly over the limit: tolerated.
+    assert len(manager.registry.get("p1")) == 3
+    assert manager.is_connected("p1")
+
+    await anyio.sleep(0.06)
+    await manager.broadcast_to_game({"type": "event", "n": 4}, "g1")
+    assert not manager.is_connected("p1")
+    await anyio.lowlevel.checkpoint()
+    assert slow.closed_with == 1008
+
+
+@pytest.mark.anyio
+async def test_broadcasts_are_numbered_for_resuming():
+    from pygridfight.api.replay import ReplayBuffer
+
+    socket = FakeWebSocket()
+    replay = ReplayBuffer(size=8, max_games=10)
+    manager = await make_manager({"p1": socket}, replay=replay)
+
+    await manager.broadcast_to_game(state(1), "g1")
+    await manager.broadcast_to_game(state(2), "nobody-connected")
+    await manager.flush()
+
+    assert socket.sent == ['{"type":"game_state","turn":1,"seq":1}']
+    assert replay.last_seq("nobody-connected") == 1
+
+
+@pytest.mark.anyio
+async def test_broadcasts_between_reconnect_and_resume_are_not_repeated():
+    from pygridfight.api.replay import ReplayBuffer
+
+    replay = ReplayBuffer(size=8, max_games=10)
+    manager = await make_manager({"p1": FakeWebSocket()}, replay=replay)
+    await manager.broadcast_to_game({"type": "event", "n": 1}, "g1")
+    # Reconnects before the old socket's disconnect is noticed.
+    socket = FakeWebSocket()
+    await manager.connect(socket, "p1")
+    await manager.broadcast_to_game({"type": "event", "n": 2}, "g1")
+
+    manager.catch_up("p1", "g1", replay.since("g1", 0))
+    await manager.broadcast_to_game({"type": "event", "n": 3}, "g1")
+    await manager.flush()
+
+    assert socket.sent == [
+        '{"type":"event","n":1,"seq":1}',
+        '{"type":"event","n":2,"seq":2}',
+        '{"type":"event","n":3,"seq":3}',
+    ]
+
+
+@pytest.mark.anyio
+async def test_held_broadcasts_are_sent_if_the_player_does_not_resume():
+    manager = await make_manager({"p1": FakeWebSocket()}, resume_hold=0.01)
+    socket = FakeWebSocket()
+    await manager.connect(socket, "p1")
+    await manager.broadcast_to_game({"type": "event", "n": 1}, "g1")
+    assert socket.sent == []
+
+    await anyio.sleep(0.02)
+    await manager.flush()
+    assert socket.sent == ['{"type":"event","n":1}']
+
+
+@pytest.mark.anyio
+async def test_late_disconnect_of_replaced_connection_is_ignored():
+    manager = await make_manager({"p1": FakeWebSocket()})
+    old_session = manager.registry.get("p1").session
+    await manager.connect(FakeWebSocket(), "p1")
+    manager.add_to_game("p1", "g1")
+
+    manager.disconnect("p1", old_session)
+
+    assert manager.is_connected("p1")
+    assert "p1" in manager.registry.players_in("g1")
+
+
+@pytest.mark.anyio
+async def test_area_game_broadcasts_are_filtered_per_player():
+    from pygridfight.api.interest import InterestManager
+
+    sockets = {"p1": FakeWebSocket(), "p2": FakeWebSocket()}
+    manager = await make_manager(sockets, interest=InterestManager(bucket_size=8))
+    avatars = {
+        "a1": {"id": "a1", "owner_id": "p1", "position": {"x": 0, "y": 0}},
+        "a2": {"id": "a2", "owner_id": "p2", "position": {"x": 90, "y": 90}},
+    }
+    game = {"avatars": avatars, "visibility": "area", "view_radius": 5}
+
+    await manager.broadcast_to_game({"type": "game_state", "game": game}, "g1")
+    await manager.flush()
+
+    assert '"a1"' in sockets["p1"].sent[0] and '"a2"' not in sockets["p1"].sent[0]
+    assert '"a2"' in sockets["p2"].sent[0] and '"a1"' not in sockets["p2"].sent[0]
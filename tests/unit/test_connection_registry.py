@@ -0,0 +1,74 @@
+import pytest
+
+from pygridfight.infrastructure.connections import (
+    ConnectionRegistry,
+    get_connection_registry,
+)
+
+
+def test_indexes_stay_in_step():
+    registry = ConnectionRegistry()
+    registry.register("p1", "socket-1")
+    registry.register("p2", "socket-2")
+    registry.join("g1", "p1")
+    registry.join("g1", "p2")
+    registry.join("g2", "p1")
+
+    assert registry.get("p1") == "socket-1"
+    assert set(registry.players_in("g1")) == {"p1", "p2"}
+    assert set(registry.games_of("p1")) == {"g1", "g2"}
+
+    registry.leave("g1", "p1")
+    assert set(registry.players_in("g1")) == {"p2"}
+    assert set(registry.games_of("p1")) == {"g2"}
+
+
+def test_unregister_removes_memberships():
+    registry = ConnectionRegistry()
+    registry.register("p1", "socket-1")
+    registry.join("g1", "p1")
+    registry.join("g2", "p1")
+
+    assert registry.unregister("p1") == "socket-1"
+    assert "p1" not in registry
+    assert not registry.players_in("g1")
+    assert not registry.games_of("p1")
+    assert registry.unregister("p1") is None
+
+
+def test_reconnect_keeps_memberships():
+    registry = ConnectionRegistry()
+    registry.register("p1", "old")
+    registry.join("g1", "p1")
+
+    assert registry.register("p1", "new") == "old"
+    assert registry.get("p1") == "new"
+    assert set(registry.players_in("g1")) == {"p1"}
+
+
+def test_remove_game_keeps_players_connected():
+    registry = ConnectionRegistry()
+    registry.register("p1", "socket-1")
+    registry.join("g1", "p1")
+    registry.join("g2", "p1")
+
+    registry.remove_game("g1")
+    assert "p1" in registry
+    assert set(registry.games_of("p1")) == {"g2"}
+    assert not registry.players_in("g1")
+
+
+@pytest.mark.anyio
+async def test_game_state_and_websocket_layers_share_registry():
+    from pygridfight.api.websocket import manager
+    from pygridfight.infrastructure.game_state import GameStateManager
+
+    assert manager.registry is get_connection_registry()
+    state = GameStateManager()
+    manager.registry.register("shared-player", "conn")
+    manager.registry.join("shared-game", "shared-player")
+    try:
+        connections = await state.get_player_connections("shared-game")
+        assert connections == {"shared-player": "conn"}
+    finally:
+        get_connection_registry().unregister("shared-player")
@@ -57,3 +57,9 @@ def test_player_error_handler(monkeypatch):
     resp = client.get("/raise-player-error")
     assert resp.status_code == 400
     assert resp.json()["error"] == "PlayerError"
+
+
+def test_idle_game_loop_is_not_started():
+    with TestClient(app) as started:
+        assert started.get("/health").status_code == 200
+        assert app.state.game_loop_task is None
@@ -77,3 +77,23 @@ def test_check_victory_conditions(game, sample_player, another_player):
     game.players["p1"].score = 5
     result = game.check_victory_conditions()
     assert result is None
+
+
+def test_get_summary(game, sample_player):
+    game.name = "Lobby"
+    game.max_players = 2
+    game.add_player(sample_player)
+    summary = game.get_summary()
+    assert summary["id"] == "game-1"
+    assert summary["name"] == "Lobby"
+    assert summary["current_players"] == 1
+    assert "grid" not in summary
+    assert "avatars" not in summary
+
+
+def test_has_free_slots(game, sample_player, another_player):
+    game.max_players = 2
+    game.add_player(sample_player)
+    assert game.has_free_slots
+    game.add_player(another_player)
+    assert not game.has_free_slots
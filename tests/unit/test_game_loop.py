@@ -0,0 +1,97 @@
+import time
+
+import anyio
+import pytest
+
+from pygridfight.domain.models.game import GameSettings
+from pygridfight.infrastructure.game_state import GameStateManager
+from pygridfight.services import game_loop as game_loop_mod
+from pygridfight.services.game_loop import GameLoop
+
+
+def make_loop(**kwargs) -> tuple[GameLoop, list[tuple[str, int]]]:
+    loop = GameLoop(**{"timestep": 0.1, "slots": 4, "sync_interval": 1.0, **kwargs})
+    ticks = []
+    loop.add_system(lambda game_id, tick: ticks.append((game_id, tick)))
+    return loop, ticks
+
+
+def test_games_are_spread_across_phases():
+    loop, ticks = make_loop()
+    for n in range(10):
+        loop.add(f"g{n}")
+
+    per_phase = [loop.step_phase() for _ in range(4)]
+
+    assert sorted(per_phase) == [2, 2, 3, 3]
+    assert sorted(game_id for game_id, _ in ticks) == sorted(f"g{n}" for n in range(10))
+
+
+def test_each_game_ticks_once_per_timestep():
+    loop, ticks = make_loop()
+    loop.add("g1")
+    loop.add("g2")
+
+    for _ in range(4 * 3):
+        loop.step_phase()
+
+    assert [tick for game_id, tick in ticks if game_id == "g1"] == [1, 2, 3]
+    assert [tick for game_id, tick in ticks if game_id == "g2"] == [1, 2, 3]
+
+
+def test_sync_keeps_known_games_and_drops_others():
+    loop, _ = make_loop()
+    loop.sync(["g1", "g2"])
+    loop.step_phase()
+    loop.sync(["g2", "g3"])
+
+    assert "g1" not in loop
+    assert len(loop) == 2
+
+
+def test_failing_system_does_not_stop_other_games():
+    loop, ticks = make_loop(slots=1)
+
+    def fail(game_id: str, tick: int) -> None:
+        if game_id == "bad":
+            raise RuntimeError("boom")
+
+    loop.systems.insert(0, fail)
+    loop.add("bad")
+    loop.add("good")
+    loop.step_phase()
+
+    assert ("good", 1) in ticks
+
+
+def test_systems_may_remove_games_while_stepping():
+    loop = GameLoop(timestep=0.1, slots=1, sync_interval=1.0)
+    loop.add_system(lambda game_id, tick: loop.remove("g2"))
+    loop.add("g1")
+    loop.add("g2")
+
+    assert loop.step_phase() == 1
+
+
+@pytest.mark.anyio
+async def test_run_steps_running_games_and_reports_overruns():
+    GameStateManager().reset()
+    manager = GameStateManager()
+    settings = GameSettings(name="Game", max_players=2, grid_size=10)
+    game = await manager.create_game("live", settings)
+    game.status = "active"
+    await manager.update_game("live", game)
+    await manager.create_game("lobby", settings)
+    overruns = game_loop_mod.PHASE_OVERRUNS.value
+    loop, ticks = make_loop(timestep=0.02, slots=2, sync_interval=0.01)
+
+    def slow(game_id: str, tick: int) -> None:
+        if tick == 2:
+            time.sleep(0.02)
+
+    loop.add_system(slow)
+    with anyio.move_on_after(0.1):
+        await loop.run(manager.list_running_games)
+
+    assert {game_id for game_id, _ in ticks} == {"live"}
+    assert game_loop_mod.PHASE_OVERRUNS.value > overruns
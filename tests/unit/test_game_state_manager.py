@@ -3,6 +3,7 @@ import asyncio
 import anyio
 import pytest
 
+from pygridfight.infrastructure.connections import get_connection_registry
 from src.pygridfight.core.config import GameSettings
 from src.pygridfight.domain.models.game import Game
 from src.pygridfight.infrastructure.game_state import GameStateManager
@@ -91,13 +92,17 @@ async def test_player_connection_tracking(
     GameStateManager().reset()
     mgr = GameStateManager()
     await mgr.create_game(game_id, game_settings)
-    await mgr.add_player_connection(game_id, player_id, connection_info)
+    # Connections are opened by the WebSocket layer, in the shared registry.
+    registry = get_connection_registry()
+    registry.register(player_id, connection_info)
+    registry.join(game_id, player_id)
     conns = await mgr.get_player_connections(game_id)
     assert player_id in conns
     assert conns[player_id] == connection_info
     await mgr.remove_player_connection(game_id, player_id)
     conns = await mgr.get_player_connections(game_id)
     assert player_id not in conns
+    registry.unregister(player_id)
 
 
 @pytest.mark.anyio
@@ -123,3 +128,82 @@ async def test_thread_safety_concurrent_create_and_get(game_settings):
 
     results = await asyncio.gather(*[create_and_get(i) for i in range(10)])
     assert all(isinstance(g, Game) for g in results)
+
+
+@pytest.mark.anyio
+async def test_versions_bump_on_every_write(game_id, game_settings):
+    GameStateManager().reset()
+    mgr = GameStateManager()
+    start = mgr.version
+    game = await mgr.create_game(game_id, game_settings)
+    created = game.version
+    assert created > start
+
+    await mgr.update_game(game_id, game)
+    assert game.version > created
+    assert mgr.version == game.version
+
+    await mgr.delete_game(game_id)
+    assert mgr.version > game.version
+
+
+@pytest.mark.anyio
+async def test_create_games_in_one_batch(game_settings):
+    GameStateManager().reset()
+    mgr = GameStateManager()
+    await mgr.create_game("dup", game_settings)
+    results = await mgr.create_games(
+        [("b1", game_settings), ("dup", game_settings), ("b2", game_settings)]
+    )
+    assert isinstance(results[0], Game)
+    assert isinstance(results[1], ValueError)
+    assert isinstance(results[2], Game)
+    assert set(await mgr.list_active_games()) == {"dup", "b1", "b2"}
+
+
+@pytest.mark.anyio
+async def test_join_games_checks_capacity(game_settings):
+    from pygridfight.core.exceptions import GameFullError, GameNotFoundError
+    from src.pygridfight.domain.models.player import Player
+
+    GameStateManager().reset()
+    mgr = GameStateManager()
+    await mgr.create_game("g1", game_settings)  # max_players=2
+    results = await mgr.join_games(
+        [("g1", Player(id=f"p{i}", display_name=f"P{i}")) for i in range(3)]
+        + [("missing", Player(id="p9", display_name="P9"))]
+    )
+    assert isinstance(results[0], Game) and isinstance(results[1], Game)
+    assert isinstance(results[2], GameFullError)
+    assert isinstance(results[3], GameNotFoundError)
+    assert set((await mgr.get_game("g1")).players) == {"p0", "p1"}
+
+
+@pytest.mark.anyio
+async def test_games_page_filters_on_committed_state(game_settings):
+    from src.pygridfight.domain.models.player import Player
+
+    GameStateManager().reset()
+    mgr = GameStateManager()
+    for i in range(5):
+        await mgr.create_game(f"g{i}", game_settings)
+    for i in range(2):
+        await mgr.join_game("g1", Player(id=f"p{i}", display_name=f"P{i}"))
+    game = await mgr.get_game("g3")
+    game.status = "active"
+    await mgr.update_game("g3", game)
+    await mgr.delete_game("g4")
+
+    page, total, after = await mgr.list_games_page(limit=1, status="waiting")
+    assert ([g.id for g in page], total) == (["g0"], 3)
+    page, _, after = await mgr.list_games_page(after=after, limit=1, status="waiting")
+    assert [g.id for g in page] == ["g1"]
+    page, _, after = await mgr.list_games_page(
+        after=after, limit=5, status="waiting", has_free_slots=True
+    )
+    assert ([g.id for g in page], after) == (["g2"], None)
+
+    page, total, _ = await mgr.list_games_page(has_free_slots=False)
+    assert ([g.id for g in page], total) == (["g1"], 1)
+    page, total, _ = await mgr.list_games_page()
+    assert ([g.id for g in page], total) == (["g0", "g1", "g2", "g3"], 4)
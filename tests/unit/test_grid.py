@@ -1,7 +1,7 @@
 import pytest
 from pydantic import ValidationError
 
-from src.pygridfight.domain.models.grid import Grid, Position
+from src.pygridfight.domain.models.grid import Grid, Position, SpatialIndex
 
 
 class TestPosition:
@@ -136,3 +136,32 @@ class TestGrid:
     )
     def test_distance(self, pos1, pos2, expected):
         assert Grid.distance(pos1, pos2) == expected
+
+
+class TestSpatialIndex:
+    def test_query_finds_items_in_rectangle(self):
+        index = Grid(width=100, height=100).spatial_index(bucket_size=8)
+        index.place("a", 3, 3)
+        index.place("b", 7, 9)
+        index.place("c", 60, 60)
+        assert index.query(0, 0, 7, 9) == {"a", "b"}
+        assert index.query(4, 0, 100, 8) == set()
+        assert index.query(0, 0, 99, 99) == {"a", "b", "c"}
+        assert index.query(5, 5, 4, 4) == set()
+
+    def test_place_moves_and_remove_forgets(self):
+        index = SpatialIndex(bucket_size=4)
+        index.place("a", 1, 1)
+        index.place("a", 30, 2)
+        assert index.cell("a") == (30, 2)
+        assert index.query(0, 0, 3, 3) == set()
+        assert index.query_radius(28, 4, 2) == {"a"}
+        index.remove("a")
+        assert "a" not in index
+        assert len(index) == 0
+        assert index.query(0, 0, 99, 99) == set()
+
+    def test_bucket_size_is_capped_at_grid(self):
+        assert Grid(width=5, height=3).spatial_index(bucket_size=8).bucket_size == 5
+        with pytest.raises(ValueError):
+            SpatialIndex(bucket_size=0)
@@ -0,0 +1,125 @@
+import json
+
+import anyio
+import pytest
+
+from pygridfight.api.heartbeat import PING, REAP_CLOSE_CODE, HeartbeatMonitor
+from pygridfight.api.protocol import Payload
+from pygridfight.api.websocket import ConnectionManager
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent: list[str] = []
+        self.closed_with: int | None = None
+
+    async def accept(self, subprotocol: str | None = None):
+        pass
+
+    async def send_text(self, text: str):
+        self.sent.append(text)
+
+    async def close(self, code: int = 1000, reason: str | None = None):
+        self.closed_with = code
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def connect(heartbeats: HeartbeatMonitor, players: int):
+    manager = ConnectionManager(heartbeats=heartbeats)
+    sockets = {f"p{i}": FakeWebSocket() for i in range(players)}
+    for player_id, socket in sockets.items():
+        await manager.connect(socket, player_id)
+    return manager, sockets
+
+
+def pings(socket: FakeWebSocket) -> int:
+    return sum(json.loads(text) == PING for text in socket.sent)
+
+
+@pytest.mark.anyio
+async def test_quiet_connections_are_pinged_then_reaped():
+    clock = FakeClock()
+    heartbeats = HeartbeatMonitor(interval=10, missed=2, clock=clock)
+    manager, sockets = await connect(heartbeats, 2)
+    queues = [manager.registry.get(player_id) for player_id in sockets]
+
+    for _ in range(2):
+        clock.now += 10
+        manager.seen("p1")  # p1 keeps talking
+        assert heartbeats.check(queues, Payload(PING)) == 0
+    await manager.flush()
+    assert pings(sockets["p0"]) == 2
+    assert pings(sockets["p1"]) == 0
+
+    clock.now += 10
+    assert heartbeats.check(queues, Payload(PING)) == 1
+    await anyio.lowlevel.checkpoint()
+    assert sockets["p0"].closed_with == REAP_CLOSE_CODE
+    assert not manager.is_connected("p0")
+    assert manager.is_connected("p1")
+    assert len(heartbeats) == 1
+
+
+@pytest.mark.anyio
+async def test_answered_pings_keep_the_connection():
+    clock = FakeClock()
+    heartbeats = HeartbeatMonitor(interval=10, missed=1, clock=clock)
+    manager, sockets = await connect(heartbeats, 1)
+    queue = manager.registry.get("p0")
+
+    for _ in range(5):
+        clock.now += 10
+        heartbeats.check([queue], Payload(PING))
+        manager.seen("p0")  # the pong
+
+    assert manager.is_connected("p0")
+    assert sockets["p0"].closed_with is None
+
+
+@pytest.mark.anyio
+async def test_one_timer_sweeps_in_batches():
+    clock = FakeClock()
+    heartbeats = HeartbeatMonitor(interval=10, missed=1, batch_size=10, clock=clock)
+    batches = []
+    check = heartbeats.check
+    heartbeats.check = lambda queues, ping: (
+        batches.append(len(queues)) or check(queues, ping)
+    )
+    manager, sockets = await connect(heartbeats, 35)
+
+    for _ in range(2):  # a sweep to ping everyone, then one to reap them
+        clock.now += 10
+        heartbeats.sweep()
+        for _ in range(6):
+            await anyio.lowlevel.checkpoint()
+
+    assert batches == [10, 10, 10, 5] * 2
+    assert all(socket.closed_with == REAP_CLOSE_CODE for socket in sockets.values())
+    assert not any(manager.is_connected(player_id) for player_id in sockets)
+    assert len(heartbeats) == 0
+    assert heartbeats._timer is None  # nothing left to watch
+
+
+@pytest.mark.anyio
+async def test_disconnect_and_reconnect_update_the_watch_list():
+    heartbeats = HeartbeatMonitor(interval=10, missed=1)
+    manager, _ = await connect(heartbeats, 2)
+
+    manager.disconnect("p0")
+    await manager.connect(FakeWebSocket(), "p1")
+
+    assert len(heartbeats) == 1
+    heartbeats.close()
+
+
+def test_zero_interval_disables_heartbeats():
+    heartbeats = HeartbeatMonitor(interval=0)
+    heartbeats.watch(object())
+    assert len(heartbeats) == 0
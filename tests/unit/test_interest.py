@@ -0,0 +1,114 @@
+from pygridfight.api.interest import InterestManager, View
+from pygridfight.api.protocol import Payload
+
+
+def avatar(avatar_id: str, owner_id: str, x: int, y: int) -> dict:
+    return {"id": avatar_id, "owner_id": owner_id, "position": {"x": x, "y": y}}
+
+
+def state(*avatars: dict, visibility: str = "area") -> dict:
+    return {
+        "type": "game_state",
+        "game": {
+            "id": "g1",
+            "avatars": {a["id"]: a for a in avatars},
+            "grid": {"width": 100, "height": 100},
+            "visibility": visibility,
+            "view_radius": 5,
+        },
+    }
+
+
+def sent(recipients) -> dict[str, set[str]]:
+    return {
+        player_id: set(payload.message["game"]["avatars"])
+        for player_id, payload in recipients
+    }
+
+
+def broadcast(interest: InterestManager, message: dict, players) -> list:
+    assert interest.observe(message, "g1")
+    return interest.fan_out(Payload(message), "g1", players)
+
+
+def test_full_visibility_games_are_not_filtered():
+    interest = InterestManager(bucket_size=8)
+    assert not interest.observe(state(visibility="full"), "g1")
+    assert not interest.observe({"type": "event"}, "g1")
+    assert len(interest) == 0
+
+
+def test_state_is_trimmed_to_each_players_radius():
+    interest = InterestManager(bucket_size=8)
+    message = state(
+        avatar("a1", "p1", 10, 10),
+        avatar("a2", "p2", 14, 15),
+        avatar("a3", "p3", 80, 80),
+    )
+
+    assert sent(broadcast(interest, message, ["p1", "p2", "p3"])) == {
+        "p1": {"a1", "a2"},
+        "p2": {"a1", "a2"},
+        "p3": {"a3"},
+    }
+
+
+def test_players_seeing_the_same_avatars_share_a_payload():
+    interest = InterestManager(bucket_size=8)
+    message = state(avatar("a1", "p1", 10, 10), avatar("a2", "p2", 12, 12))
+
+    recipients = broadcast(interest, message, ["p1", "p2"])
+
+    # Both see everything: the original payload is reused.
+    assert recipients[0][1] is recipients[1][1]
+
+
+def test_moves_and_removals_update_the_index():
+    interest = InterestManager(bucket_size=8)
+    broadcast(
+        interest, state(avatar("a1", "p1", 10, 10), avatar("a2", "p2", 90, 90)), []
+    )
+    message = state(avatar("a1", "p1", 88, 88))
+
+    assert sent(broadcast(interest, message, ["p1"])) == {"p1": {"a1"}}
+    event = {"type": "explosion", "position": {"x": 90, "y": 90}}
+    assert interest.observe(event, "g1")
+    assert [p for p, _ in interest.fan_out(Payload(event), "g1", ["p1", "p2"])] == [
+        "p1"
+    ]
+
+
+def test_chosen_viewport_replaces_radius():
+    interest = InterestManager(bucket_size=8)
+    interest.set_view("g1", "p1", View(viewport=(70, 70, 99, 99)), radius=5)
+    message = state(avatar("a1", "p1", 10, 10), avatar("a3", "p3", 80, 80))
+
+    assert sent(broadcast(interest, message, ["p1"])) == {"p1": {"a1", "a3"}}
+    interest.set_view("g1", "p1", None, radius=5)
+    assert sent(broadcast(interest, message, ["p1"])) == {"p1": {"a1"}}
+
+
+def test_events_without_position_go_to_everyone():
+    interest = InterestManager(bucket_size=8)
+    broadcast(interest, state(avatar("a1", "p1", 10, 10)), [])
+    event = {"type": "turn_changed", "turn_number": 2}
+
+    assert interest.observe(event, "g1")
+    assert len(interest.fan_out(Payload(event), "g1", ["p1", "p2"])) == 2
+    partial = {"type": "explosion", "position": {"x": 3}}
+    assert len(interest.fan_out(Payload(partial), "g1", ["p1", "p2"])) == 2
+    ended = {"type": "game_ended"}
+    interest.fan_out(Payload(ended), "g1", ["p1"])
+    assert len(interest) == 0
+
+
+def test_past_states_are_filtered_by_their_own_positions():
+    interest = InterestManager(bucket_size=8)
+    old = state(avatar("a1", "p1", 10, 10), avatar("a2", "p2", 12, 12))
+    broadcast(interest, old, [])
+    broadcast(
+        interest, state(avatar("a1", "p1", 10, 10), avatar("a2", "p2", 60, 60)), []
+    )
+
+    assert interest.covers(old, "g1")
+    assert sent(interest.fan_out(Payload(old), "g1", ["p1"])) == {"p1": {"a1", "a2"}}
@@ -0,0 +1,133 @@
+import asyncio
+import io
+import json
+import threading
+
+import pytest
+import structlog
+
+from pygridfight.core.log_pipeline import EventSampler, QueuedLogWriter
+
+
+class GatedStream(io.StringIO):
+    """Stream whose writes block until the gate is opened."""
+
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+        self.entered = threading.Event()
+
+    def write(self, s):
+        self.entered.set()
+        self.gate.wait(5)
+        return super().write(s)
+
+
+def render(logger, method_name, event_dict):
+    return json.dumps(event_dict)
+
+
+def lines(stream):
+    return [json.loads(line)["event"] for line in stream.getvalue().splitlines()]
+
+
+def test_writer_renders_events_in_order():
+    stream = io.StringIO()
+    writer = QueuedLogWriter(render, stream=stream, batch_size=3)
+    for i in range(10):
+        writer.submit({"event": f"e{i}"})
+    assert writer.flush(timeout=5)
+    writer.close()
+    assert lines(stream) == [f"e{i}" for i in range(10)]
+
+
+@pytest.mark.parametrize(
+    "overflow, expected",
+    [("drop_new", ["busy", "e0", "e1"]), ("drop_oldest", ["busy", "e2", "e3"])],
+)
+def test_overflow_policies(overflow, expected):
+    stream = GatedStream()
+    writer = QueuedLogWriter(render, stream=stream, maxsize=2, overflow=overflow)
+    writer.submit({"event": "busy"})
+    assert stream.entered.wait(5)  # the writer thread is now stuck writing
+    for i in range(4):
+        writer.submit({"event": f"e{i}"})
+    assert writer.dropped == 2
+    stream.gate.set()
+    writer.close()
+    assert lines(stream) == expected
+
+
+def test_block_waits_off_the_event_loop_only():
+    stream = GatedStream()
+    writer = QueuedLogWriter(render, stream=stream, maxsize=1, overflow="block")
+    writer.submit({"event": "busy"})
+    assert stream.entered.wait(5)
+    writer.submit({"event": "queued"})
+
+    async def log_on_loop():
+        writer.submit({"event": "on-loop"})  # would deadlock if it waited
+
+    asyncio.run(log_on_loop())
+    assert writer.dropped == 1
+
+    blocked = threading.Thread(target=writer.submit, args=({"event": "thread"},))
+    blocked.start()
+    blocked.join(0.1)
+    assert blocked.is_alive()  # waiting for room
+    stream.gate.set()
+    blocked.join(5)
+    writer.close()
+    assert lines(stream) == ["busy", "queued", "thread"]
+
+
+def test_close_flushes_and_ignores_later_events():
+    stream = io.StringIO()
+    writer = QueuedLogWriter(render, stream=stream)
+    writer.submit({"event": "before"})
+    writer.close()
+    writer.submit({"event": "after"})
+    assert lines(stream) == ["before"]
+
+
+def test_event_sampler():
+    sampler = EventSampler({"noisy": 0.0, "kept": 1.0})
+    assert sampler(None, "info", {"event": "kept"}) == {"event": "kept"}
+    assert sampler(None, "info", {"event": "other"}) == {"event": "other"}
+    with pytest.raises(structlog.DropEvent):
+        sampler(None, "info", {"event": "noisy"})
+
+
+def test_setup_logging_async_mode(monkeypatch, capsys):
+    from src.pygridfight.core import config
+    from src.pygridfight.core import logging as log_mod
+
+    monkeypatch.setenv("PYGRIDFIGHT_LOG_ASYNC", "true")
+    monkeypatch.setenv("PYGRIDFIGHT_LOG_SAMPLE_RATES", '{"dropped": 0.0}')
+    config.get_server_settings.cache_clear()
+    try:
+        log_mod.setup_logging()
+        logger = structlog.get_logger("test")
+        logger.info("queued event", answer=42)
+        logger.info("dropped")
+        logger.debug("below level")
+        log_mod.shutdown_logging()
+        logger.info("after shutdown")
+        structlog.get_logger("late").info("new logger after shutdown")
+    finally:
+        monkeypatch.undo()
+        config.get_server_settings.cache_clear()
+        log_mod.setup_logging()
+
+    captured = capsys.readouterr()
+    out = [json.loads(line) for line in captured.out.splitlines()]
+    events = [entry["event"] for entry in out]
+    assert "queued event" in events
+    assert "dropped" not in events
+    assert "below level" not in events
+    entry = out[events.index("queued event")]
+    assert entry["answer"] == 42
+    assert entry["level"] == "info"
+    assert entry["logger"] == "test"
+    late = [json.loads(line)["event"] for line in captured.err.splitlines()]
+    assert late == ["after shutdown", "new logger after shutdown"]
@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+import pytest
+
+from pygridfight.infrastructure.loop_monitor import LoopLagMonitor
+
+
+def block_loop(seconds: float) -> None:
+    """Hold up the event loop, as a slow synchronous handler would."""
+    time.sleep(seconds)
+
+
+@pytest.mark.anyio
+async def test_probe_measures_blocked_loop():
+    monitor = LoopLagMonitor(interval=0.01, max_lag=0.05)
+    probe = asyncio.create_task(monitor.probe())
+    await asyncio.sleep(0)
+    block_loop(0.1)  # Past the probe's wake-up
+    lag = await probe
+    assert lag >= 0.08
+    assert monitor.lag == lag
+    assert monitor.tasks >= 1
+    assert not monitor.healthy
+
+
+@pytest.mark.anyio
+async def test_idle_loop_is_healthy():
+    monitor = LoopLagMonitor(interval=0.01, max_lag=0.05)
+    await monitor.probe()
+    assert monitor.lag < 0.05
+    assert monitor.healthy
+
+
+@pytest.mark.anyio
+async def test_overdue_probe_counts_as_lag():
+    monitor = LoopLagMonitor(interval=0.01, max_lag=0.05)
+    probe = asyncio.create_task(monitor.probe())
+    await asyncio.sleep(0)
+    block_loop(0.1)
+    # The probe has not had a chance to run yet, but is already overdue.
+    assert monitor.current_lag() >= 0.08
+    await probe
+
+
+@pytest.mark.anyio
+async def test_cancelled_probe_does_not_leave_stale_deadline():
+    monitor = LoopLagMonitor(interval=10, max_lag=0.05)
+    probe = asyncio.create_task(monitor.probe())
+    await asyncio.sleep(0)
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+    assert monitor.current_lag() == 0.0
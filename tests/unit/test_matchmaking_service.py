@@ -0,0 +1,181 @@
+import pytest
+
+from pygridfight.domain.enums import TicketStatus
+from pygridfight.domain.models.game import GameSettings
+from pygridfight.domain.models.player import Player
+from pygridfight.infrastructure.game_state import GameStateManager
+from pygridfight.services.matchmaking_service import (
+    MatchmakingService,
+    MatchPreferences,
+)
+
+
+@pytest.fixture
+def manager():
+    mgr = GameStateManager()
+    mgr.reset()
+    return mgr
+
+
+@pytest.fixture
+def service(manager):
+    return MatchmakingService(manager)
+
+
+@pytest.mark.anyio
+async def test_enqueue_and_match_into_new_game(service, manager):
+    prefs = MatchPreferences(max_players=2, grid_size=10)
+    t1 = service.enqueue("Alice", prefs)
+    t2 = service.enqueue("Bob", prefs)
+    assert service.queue_size == 2
+
+    matched = await service.run_tick()
+
+    assert matched == 2
+    assert service.queue_size == 0
+    assert t1.status == TicketStatus.MATCHED
+    assert t1.game_id == t2.game_id
+    game = await manager.get_game(t1.game_id)
+    assert set(game.players) == {t1.player_id, t2.player_id}
+    assert game.max_players == 2
+    assert game.grid_size == 10
+
+
+@pytest.mark.anyio
+async def test_fills_open_games_before_creating_new_ones(service, manager):
+    await manager.create_game(
+        "lobby", GameSettings(name="Lobby", max_players=4, grid_size=20)
+    )
+    tickets = [service.enqueue(f"P{i}", MatchPreferences()) for i in range(6)]
+
+    await service.run_tick()
+
+    assert [t.game_id for t in tickets[:4]] == ["lobby"] * 4
+    assert tickets[4].game_id == tickets[5].game_id != "lobby"
+
+
+@pytest.mark.anyio
+async def test_private_games_are_not_filled(service, manager):
+    await manager.create_game(
+        "private",
+        GameSettings(name="Private", max_players=4, grid_size=20, is_private=True),
+    )
+    ticket = service.enqueue("Alice", MatchPreferences())
+
+    await service.run_tick()
+
+    assert ticket.game_id != "private"
+
+
+@pytest.mark.anyio
+async def test_preferences_are_matched_separately(service):
+    small = service.enqueue("Alice", MatchPreferences(max_players=2, grid_size=10))
+    large = service.enqueue("Bob", MatchPreferences(max_players=8, grid_size=50))
+
+    await service.run_tick()
+
+    assert small.game_id is not None
+    assert large.game_id is not None
+    assert small.game_id != large.game_id
+
+
+@pytest.mark.anyio
+async def test_cancelled_tickets_are_skipped(service):
+    ticket = service.enqueue("Alice", MatchPreferences())
+    assert service.cancel(ticket.id) is True
+    assert service.cancel(ticket.id) is False
+    assert service.queue_size == 0
+
+    assert await service.run_tick() == 0
+    assert ticket.status == TicketStatus.CANCELLED
+    assert ticket.game_id is None
+
+
+@pytest.mark.anyio
+async def test_batch_size_limits_matches_per_tick(manager):
+    service = MatchmakingService(manager, batch_size=3)
+    for i in range(5):
+        service.enqueue(f"P{i}", MatchPreferences())
+
+    assert await service.run_tick() == 3
+    assert service.queue_size == 2
+    assert await service.run_tick() == 2
+
+
+@pytest.mark.anyio
+async def test_finished_tickets_expire(manager):
+    service = MatchmakingService(manager, ticket_ttl=0.0)
+    ticket = service.enqueue("Alice", MatchPreferences())
+    await service.run_tick()
+    assert service.get_ticket(ticket.id) is not None
+
+    await service.run_tick()
+
+    assert service.get_ticket(ticket.id) is None
+
+
+@pytest.mark.anyio
+async def test_failed_tick_requeues_unseated_tickets(manager):
+    class FlakyManager:
+        failures = 1
+
+        async def list_open_games(self):
+            return await manager.list_open_games()
+
+        async def create_game(self, game_id, settings):
+            return await manager.create_game(game_id, settings)
+
+        async def join_games(self, requests):
+            if self.failures:
+                self.failures -= 1
+                raise RuntimeError("store unavailable")
+            return await manager.join_games(requests)
+
+    service = MatchmakingService(FlakyManager())
+    tickets = [
+        service.enqueue(f"P{i}", MatchPreferences(max_players=2)) for i in range(4)
+    ]
+
+    with pytest.raises(RuntimeError):
+        await service.run_tick()
+    assert service.queue_size == 4
+    assert all(t.status == TicketStatus.QUEUED for t in tickets)
+
+    assert await service.run_tick() == 4
+    assert all(t.status == TicketStatus.MATCHED for t in tickets)
+
+
+@pytest.mark.anyio
+async def test_lobbies_filled_during_a_tick_are_not_overfilled(manager):
+    await manager.create_game(
+        "lobby", GameSettings(name="Lobby", max_players=2, grid_size=20)
+    )
+
+    class RacingManager:
+        raced = False
+
+        async def join_games(self, requests):
+            if not self.raced:
+                # Someone joins over REST once the tick has sized its batch.
+                self.raced = True
+                await manager.join_game("lobby", Player(id="rest", display_name="Rest"))
+            return await manager.join_games(requests)
+
+        def __getattr__(self, name):
+            return getattr(manager, name)
+
+    service = MatchmakingService(RacingManager())
+    tickets = [
+        service.enqueue(f"P{i}", MatchPreferences(max_players=2)) for i in range(2)
+    ]
+
+    assert await service.run_tick() == 1
+    lobby = await manager.get_game("lobby")
+    assert len(lobby.players) == 2
+    seated = [t for t in tickets if t.game_id == "lobby"]
+    assert len(seated) == 1
+    assert service.queue_size == 1
+
+    assert await service.run_tick() == 1
+    assert all(t.status == TicketStatus.MATCHED for t in tickets)
+    assert tickets[0].game_id != tickets[1].game_id
@@ -0,0 +1,51 @@
+import pytest
+
+from pygridfight.core.metrics import MetricsRegistry
+
+
+def test_counter_and_gauge_render():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests.", ["route"])
+    requests.labels("/games").inc()
+    requests.labels("/games").inc(2)
+    connections = registry.gauge("connections", "Open sockets.")
+    connections.inc(3)
+    connections.dec()
+
+    text = registry.render()
+    assert "# HELP requests_total Requests.\n# TYPE requests_total counter" in text
+    assert 'requests_total{route="/games"} 3\n' in text
+    assert "# TYPE connections gauge\nconnections 2\n" in text
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        latency.observe(value)
+
+    text = registry.render()
+    assert 'latency_seconds_bucket{le="0.1"} 2\n' in text
+    assert 'latency_seconds_bucket{le="1"} 3\n' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 4\n' in text
+    assert "latency_seconds_sum 2.65\n" in text
+    assert "latency_seconds_count 4\n" in text
+    assert latency.labels().count == 4
+
+
+def test_registration_is_get_or_create():
+    registry = MetricsRegistry()
+    first = registry.counter("events_total", "Events.")
+    assert registry.counter("events_total", "Events.") is first
+    with pytest.raises(ValueError):
+        registry.gauge("events_total", "Events.")
+    with pytest.raises(ValueError):
+        first.labels("unexpected")
+    with pytest.raises(ValueError):
+        registry.counter("labelled_total", "Labelled.", ["route"]).inc()
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    registry.counter("c_total", "C.", ["path"]).labels('a"b\\c').inc()
+    assert 'c_total{path="a\\"b\\\\c"} 1' in registry.render()
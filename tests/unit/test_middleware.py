@@ -0,0 +1,86 @@
+import sys
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route, WebSocketRoute
+from starlette.testclient import TestClient
+
+from pygridfight.api.middleware import PROFILE_TAGGERS, RequestContextMiddleware
+from pygridfight.core.profiler import SamplingProfiler
+
+
+async def echo_request_id(request):
+    return JSONResponse({"request_id": request.state.request_id})
+
+
+async def stream(request):
+    async def body():
+        yield b"a"
+        yield b"b"
+
+    return StreamingResponse(body())
+
+
+async def boom(request):
+    raise RuntimeError("boom")
+
+
+async def own_stack(request):
+    profiler = SamplingProfiler(taggers=PROFILE_TAGGERS)
+    return JSONResponse({"stack": profiler._collapse(sys._getframe())})
+
+
+async def ws_echo(websocket):
+    await websocket.accept()
+    await websocket.send_json({"request_id": websocket.state.request_id})
+    await websocket.close()
+
+
+@pytest.fixture
+def client():
+    app = Starlette(
+        routes=[
+            Route("/id", echo_request_id),
+            Route("/stream", stream),
+            Route("/boom", boom),
+            Route("/games/{game_id}/stack", own_stack),
+            WebSocketRoute("/ws", ws_echo),
+        ]
+    )
+    app.add_middleware(RequestContextMiddleware)
+    return TestClient(app, raise_server_exceptions=False)
+
+
+def test_request_id_is_exposed_and_returned(client):
+    resp = client.get("/id")
+    assert resp.status_code == 200
+    assert resp.headers["x-request-id"] == resp.json()["request_id"]
+
+
+def test_request_ids_are_unique(client):
+    assert (
+        client.get("/id").headers["x-request-id"]
+        != (client.get("/id").headers["x-request-id"])
+    )
+
+
+def test_streaming_response_passes_through(client):
+    resp = client.get("/stream")
+    assert resp.content == b"ab"
+    assert "x-request-id" in resp.headers
+
+
+def test_unhandled_exception_is_reraised(client):
+    resp = client.get("/boom")
+    assert resp.status_code == 500
+
+
+def test_websocket_gets_request_id(client):
+    with client.websocket_connect("/ws") as ws:
+        assert ws.receive_json()["request_id"]
+
+
+def test_profile_tags_name_route_and_game(client):
+    frames = client.get("/games/g-1/stack").json()["stack"].split(";")
+    assert frames[:2] == ["route=/games/{game_id}/stack", "game_id=g-1"]
@@ -0,0 +1,48 @@
+import threading
+import time
+
+from pygridfight.core.profiler import SamplingProfiler
+
+
+def spin(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(100))
+
+
+def handle_request(stop: threading.Event) -> None:
+    spin(stop)
+
+
+def test_profiler_collapses_stacks_with_tags():
+    stop = threading.Event()
+    worker = threading.Thread(target=handle_request, args=(stop,), name="worker")
+    worker.start()
+    profiler = SamplingProfiler(
+        interval=0.001,
+        taggers={handle_request.__code__: lambda frame: ["route=/games"]},
+    )
+    profiler.start()
+    time.sleep(0.05)
+    profiler.stop()
+    stop.set()
+    worker.join()
+
+    assert profiler.samples > 0
+    lines = profiler.collapsed().splitlines()
+    worker_lines = [line for line in lines if line.startswith("thread=worker;")]
+    assert worker_lines
+    stack, count = worker_lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    frames = stack.split(";")
+    assert frames[1] == "route=/games"
+    assert f"{__name__}:handle_request" in frames
+    assert frames.index(f"{__name__}:handle_request") < frames.index(f"{__name__}:spin")
+    # The sampler never samples itself.
+    assert not any(line.startswith("thread=pygridfight-profiler") for line in lines)
+
+
+def test_profiler_idle_until_started():
+    profiler = SamplingProfiler()
+    assert profiler.samples == 0
+    assert profiler.collapsed() == ""
+    profiler.stop()
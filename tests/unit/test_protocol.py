@@ -0,0 +1,246 @@
+import json
+
+import pytest
+
+from pygridfight.api.protocol import (
+    BINARY_V1,
+    JSON_CODE,
+    JSON_V1,
+    BinaryClient,
+    BinarySession,
+    JsonSession,
+    Payload,
+    compile_frame,
+    open_session,
+    select_protocol,
+)
+from pygridfight.api.schemas.messages import (
+    JoinGameMessage,
+    PingMessage,
+    PlayerActionMessage,
+)
+from pygridfight.core.exceptions import ProtocolError, ValidationError
+
+
+def game_state(players: int = 8) -> dict:
+    avatars = {
+        f"avatar-{i}": {
+            "id": f"avatar-{i}",
+            "owner_id": f"player-{i}",
+            "position": {"x": i, "y": 200 + i},
+            "health": 1,
+            "active": True,
+        }
+        for i in range(players)
+    }
+    return {
+        "type": "game_state",
+        "game": {
+            "id": "game-1",
+            "status": "active",
+            "turn": 3,
+            "players": {
+                f"player-{i}": {
+                    "id": f"player-{i}",
+                    "display_name": f"Player {i}",
+                    "score": i * 10,
+                    "avatar_ids": [f"avatar-{i}"],
+                }
+                for i in range(players)
+            },
+            "avatars": avatars,
+            "grid": {"width": 20, "height": 20},
+        },
+    }
+
+
+MESSAGES = [
+    {"type": "ping"},
+    {"type": "pong", "timestamp": "2024-01-01T00:00:00"},
+    {"type": "error", "message": "Nope", "code": None},
+    {"type": "join_game", "game_id": "game-1", "player_name": "Ann"},
+    {"type": "player_ready", "ready": True},
+    {
+        "type": "player_action",
+        "action": {
+            "type": "move",
+            "player_id": "player-1",
+            "target_position": {"x": 3, "y": 4},
+        },
+    },
+    {"type": "turn_changed", "current_player_id": "player-2", "turn_number": -1},
+    {"type": "game_ended", "game_id": "game-1", "winner_id": None, "reason": "x"},
+    {
+        "type": "action_result",
+        "result": {"action_id": "a1", "status": "success", "data": {"k": [1]}},
+    },
+    game_state(),
+]
+
+
+@pytest.mark.parametrize(
+    ("offered", "expected"),
+    [
+        ([], None),
+        ([BINARY_V1, JSON_V1], BINARY_V1),
+        (["pygridfight.bin.v9", JSON_V1], JSON_V1),
+        (["other"], None),
+    ],
+)
+def test_select_protocol(offered, expected):
+    assert select_protocol(offered) == expected
+
+
+def test_open_session_defaults_to_json():
+    assert isinstance(open_session(None), JsonSession)
+    assert isinstance(open_session(BINARY_V1), BinarySession)
+
+
+@pytest.mark.parametrize("message", MESSAGES, ids=lambda m: m["type"])
+def test_binary_round_trip_matches_json(message):
+    payload = Payload(message)
+    frame = BinarySession().render(payload)
+
+    assert payload.frame.code != JSON_CODE
+    assert BinaryClient().decode(frame) == json.loads(payload.text)
+    assert len(frame) < len(payload.text)
+
+
+def test_ids_are_defined_once_per_session():
+    session = BinarySession()
+    first = session.render(Payload(game_state()))
+    second = session.render(Payload(game_state()))
+
+    assert len(second) < len(first)
+    assert b"player-1" in first and b"player-1" not in second
+    client = BinaryClient()
+    assert client.decode(first) == client.decode(second)
+    # Another session starts with an empty table.
+    assert BinarySession().render(Payload(game_state())) == first
+
+
+def test_frames_are_shared_between_sessions():
+    payload = Payload(game_state())
+    sessions = [BinarySession() for _ in range(3)]
+    sessions[0].render(
+        Payload({"type": "player_left", "player_id": "x", "game_id": "y"})
+    )
+
+    frames = [session.render(payload) for session in sessions]
+
+    assert payload.frame is payload.frame
+    assert frames[1] == frames[2] != frames[0]
+    assert BinaryClient().decode(frames[1]) == BinaryClient().decode(frames[2])
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        {"type": "chat", "text": "hi"},
+        {"type": "pong", "extra": 1},
+        {"type": "turn_changed", "current_player_id": "p", "turn_number": True},
+        {"type": "player_action", "action": {"type": "dance", "player_id": "p"}},
+    ],
+)
+def test_messages_outside_their_schema_use_json_escape(message):
+    frame = compile_frame(message)
+
+    assert frame.code == JSON_CODE
+    assert BinaryClient().decode(BinarySession().link(frame)) == message
+
+
+def test_client_frames_use_known_handles_or_inline_ids():
+    session = BinarySession()
+    client = BinaryClient()
+    client.decode(session.render(Payload(game_state())))
+    known = {"type": "leave_game", "game_id": "game-1"}
+    unknown = {"type": "leave_game", "game_id": "game-2"}
+
+    assert session.decode(client.encode(known)) == known
+    assert session.decode(client.encode(unknown)) == unknown
+    assert len(client.encode(known)) < len(client.encode(unknown))
+
+
+@pytest.mark.parametrize(
+    ("session", "data"),
+    [
+        (BinarySession(), b""),
+        (BinarySession(), bytes((3, 0, 0, 5))),  # truncated id string
+        (BinarySession(), bytes((3, 0, 0, 7))),  # unknown handle
+        (BinarySession(), bytes((99, 0))),  # unknown type
+        (BinarySession(), bytes((1, 0, 0, 0, 0))),  # trailing bytes
+        (BinarySession(), bytes((1, 1, 1, 1, 65, 0))),  # client definitions
+        (BinarySession(), '{"type": "ping"}'),
+        (JsonSession(), "not json"),
+        (JsonSession(), "[1, 2]"),
+    ],
+)
+def test_malformed_frames_raise_protocol_error(session, data):
+    with pytest.raises(ProtocolError):
+        session.decode(data)
+
+
+@pytest.mark.parametrize("message", MESSAGES, ids=lambda m: m["type"])
+def test_truncated_frames_raise_protocol_error(message):
+    frame = BinarySession().render(Payload(message))
+    for end in range(len(frame)):
+        with pytest.raises(ProtocolError):
+            BinaryClient().decode(frame[:end])
+
+
+@pytest.mark.parametrize("session", [JsonSession(), BinarySession()])
+@pytest.mark.parametrize(
+    ("message", "model"),
+    [
+        ({"type": "ping"}, PingMessage),
+        (
+            {"type": "join_game", "game_id": "game-1", "player_name": "Alice"},
+            JoinGameMessage,
+        ),
+        (
+            {
+                "type": "player_action",
+                "action": {"type": "end_turn", "player_id": "player-1"},
+            },
+            PlayerActionMessage,
+        ),
+    ],
+)
+def test_parse_picks_the_model_from_the_type(session, message, model):
+    if isinstance(session, BinarySession):
+        data = BinaryClient().encode(message)
+    else:
+        data = json.dumps(message).encode()
+
+    parsed = session.parse(data)
+
+    assert type(parsed) is model
+    assert parsed.model_dump(exclude_none=True, mode="json") == message
+
+
+@pytest.mark.parametrize(
+    ("data", "error", "text"),
+    [
+        ("not json", ProtocolError, "Invalid JSON format"),
+        ("[1, 2]", ProtocolError, "Messages must be JSON objects"),
+        ("{}", ProtocolError, "Messages must have a type"),
+        ('{"type": "game_state"}', ProtocolError, "Unknown message type: game_state"),
+        ('{"type": "join_game", "game_id": "g"}', ValidationError, "player_name"),
+        ('{"type": "player_ready", "ready": "maybe"}', ValidationError, "ready"),
+    ],
+)
+def test_parse_rejects_invalid_messages(data, error, text):
+    with pytest.raises(error) as exc_info:
+        JsonSession().parse(data)
+    assert text in exc_info.value.message
+
+
+def test_peek_type_reads_the_type_without_parsing():
+    action = {"type": "player_action", "action": {"type": "end_turn"}}
+
+    assert JsonSession().peek_type(json.dumps(action)) == "player_action"
+    assert JsonSession().peek_type(b'{"type": "ping"}') == "ping"
+    assert JsonSession().peek_type("not json") is None
+    assert BinarySession().peek_type(BinaryClient().encode(action)) == "player_action"
+    assert BinarySession().peek_type(BinaryClient().encode({"type": "ping"})) == "ping"
+    assert BinarySession().peek_type(b"") is None
@@ -0,0 +1,153 @@
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from pygridfight.api.middleware import RateLimitMiddleware
+from pygridfight.infrastructure.rate_limit import (
+    KeyedRateLimiter,
+    MessageLimiter,
+    RestRateLimiter,
+    TokenBucket,
+)
+
+TYPE_LIMITS = {"ping": (1.0, 2), "player_action": (10.0, 5)}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def limiter(ips: KeyedRateLimiter, ip: str = "10.0.0.1", **kwargs) -> MessageLimiter:
+    options = {"rate": 5.0, "burst": 10, "type_limits": TYPE_LIMITS, "max_strikes": 3}
+    options.update(kwargs)
+    return MessageLimiter(ip, ips, **options)
+
+
+def test_bucket_allows_burst_then_refills_at_rate():
+    bucket = TokenBucket(rate=2.0, burst=3, now=0.0)
+
+    assert [bucket.take(0.0) for _ in range(4)] == [True, True, True, False]
+    assert bucket.retry_after(0.0) == pytest.approx(0.5)
+    assert bucket.take(0.5)
+    assert not bucket.take(0.5)
+    assert not bucket.full(1.0)
+    assert bucket.full(2.0)
+
+
+def test_type_budgets_are_separate():
+    clock = FakeClock()
+    connection = limiter(KeyedRateLimiter(100.0, 100, clock))
+
+    assert [connection.check("ping") for _ in range(3)] == [None, None, "type"]
+    assert connection.check("player_action") is None
+    assert connection.check("leave_game") is None  # no budget of its own
+    assert connection.check(None) is None
+
+
+def test_connection_and_ip_budgets_cap_all_types():
+    clock = FakeClock()
+    ips = KeyedRateLimiter(100.0, 15, clock)
+    first, second = limiter(ips), limiter(ips)
+
+    assert sum(first.check(None) is None for _ in range(20)) == 10
+    assert sum(second.check(None) is None for _ in range(20)) == 5  # IP ran out
+    assert second.check(None) == "connection"
+
+    clock.now += 1
+    assert first.check(None) is None
+
+
+def test_strikes_count_rejections_in_a_row():
+    clock = FakeClock()
+    connection = limiter(KeyedRateLimiter(100.0, 100, clock))
+    connection.check("ping")
+    connection.check("ping")
+
+    connection.check("ping")
+    connection.check("ping")
+    assert connection.strikes == 2 and not connection.exhausted
+    assert connection.check("player_action") is None
+    assert connection.strikes == 0
+
+    for _ in range(3):
+        connection.check("ping")
+    assert connection.exhausted
+
+
+def test_flood_from_one_ip_is_capped_by_its_shared_bucket():
+    clock = FakeClock()
+    ips = KeyedRateLimiter(200.0, 400, clock)
+    connections = [limiter(ips, "192.0.2.1") for _ in range(10_000)]
+
+    accepted = sum(
+        connection.check("player_action") is None
+        for connection in connections
+        for _ in range(5)
+    )
+
+    assert accepted == 400
+    assert len(ips) == 1
+
+
+def test_flood_from_many_ips_keeps_the_ip_table_bounded():
+    clock = FakeClock()
+    ips = KeyedRateLimiter(1.0, 2, clock, prune_threshold=1024)
+    largest = 0
+
+    for wave in range(5):
+        for n in range(10_000):
+            address = f"10.{wave}.{n // 256}.{n % 256}"
+            assert limiter(ips, address).check("ping") is None
+            largest = max(largest, len(ips))
+        clock.now += 10  # every bucket of the wave refills
+
+    # Earlier waves are pruned: the table never holds much more than
+    # the addresses active at once.
+    assert largest < 2 * 10_000 + 1024
+    ips.prune()
+    assert len(ips) == 0
+
+
+def test_prune_keeps_buckets_that_are_still_draining():
+    clock = FakeClock()
+    ips = KeyedRateLimiter(1.0, 2, clock)
+    ips.allow("idle")
+    ips.allow("busy")
+    ips.allow("busy")
+    clock.now += 1
+
+    assert ips.prune() == 1
+    assert len(ips) == 1
+    assert not ips.bucket("busy").full(clock.now)
+
+
+@pytest.mark.anyio
+async def test_middleware_answers_429_with_retry_after():
+    app = FastAPI()
+
+    @app.get("/games")
+    async def games():
+        return {"games": []}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    app.add_middleware(
+        RateLimitMiddleware,
+        limiter=RestRateLimiter(0.5, 2),
+        exempt=["/health"],
+    )
+    transport = httpx.ASGITransport(app=app, client=("198.51.100.7", 1234))
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as http:
+        statuses = [(await http.get("/games")).status_code for _ in range(3)]
+        limited = await http.get("/games")
+        health = await http.get("/health")
+
+    assert statuses == [200, 200, 429]
+    assert limited.headers["Retry-After"] == "2"
+    assert health.status_code == 200
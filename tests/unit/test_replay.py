@@ -0,0 +1,81 @@
+from pygridfight.api.replay import ReplayBuffer
+
+
+def state(turn: int) -> dict:
+    return {"type": "game_state", "turn": turn}
+
+
+def event(n: int) -> dict:
+    return {"type": "event", "n": n}
+
+
+def messages(payloads) -> list[dict]:
+    return [payload.message for payload in payloads]
+
+
+def test_broadcasts_are_numbered_per_game():
+    replay = ReplayBuffer(size=8, max_games=10, state_types=["game_state"])
+
+    assert replay.record(event(0), "g1").message == {"type": "event", "n": 0, "seq": 1}
+    assert replay.record(event(1), "g1").message["seq"] == 2
+    assert replay.record(event(0), "g2").message["seq"] == 1
+    assert replay.last_seq("g1") == 2
+    assert replay.last_seq("unknown") == 0
+
+
+def test_since_returns_missed_broadcasts():
+    replay = ReplayBuffer(size=8, max_games=10, state_types=["game_state"])
+    for n in range(5):
+        replay.record(event(n), "g1")
+
+    assert [m["n"] for m in messages(replay.since("g1", 2))] == [2, 3, 4]
+    assert replay.since("g1", 5) == []
+
+
+def test_since_skips_superseded_states():
+    replay = ReplayBuffer(size=8, max_games=10, state_types=["game_state"])
+    replay.record(state(1), "g1")
+    replay.record(event(0), "g1")
+    replay.record(state(2), "g1")
+    replay.record(event(1), "g1")
+
+    assert messages(replay.since("g1", 0)) == [
+        {"type": "event", "n": 0, "seq": 2},
+        {"type": "game_state", "turn": 2, "seq": 3},
+        {"type": "event", "n": 1, "seq": 4},
+    ]
+
+
+def test_gaps_older_than_the_buffer_need_a_snapshot():
+    replay = ReplayBuffer(size=3, max_games=10, state_types=["game_state"])
+    for n in range(5):
+        replay.record(event(n), "g1")
+
+    assert replay.since("g1", 1) is None
+    assert [m["n"] for m in messages(replay.since("g1", 2))] == [2, 3, 4]
+    assert replay.since("g1", 6) is None  # from the future
+    assert replay.since("unknown", 0) is None
+
+
+def test_least_recent_games_are_dropped():
+    replay = ReplayBuffer(size=8, max_games=2, state_types=["game_state"])
+    replay.record(event(0), "g1")
+    replay.record(event(0), "g2")
+    replay.record(event(1), "g1")
+    replay.record(event(0), "g3")
+
+    assert len(replay) == 2
+    assert replay.last_seq("g2") == 0
+    assert replay.last_seq("g1") == 2
+
+
+def test_numbering_of_a_dropped_game_never_repeats():
+    replay = ReplayBuffer(size=8, max_games=10, state_types=["game_state"])
+    for n in range(3):
+        replay.record(event(n), "g1")
+    replay.discard("g1")
+
+    assert replay.record(event(9), "g1").message["seq"] == 4
+    # A client that last saw seq 2 missed broadcasts that are gone.
+    assert replay.since("g1", 2) is None
+    assert messages(replay.since("g1", 3)) == [{"type": "event", "n": 9, "seq": 4}]
@@ -0,0 +1,32 @@
+import json
+from datetime import UTC, datetime
+
+from pygridfight.api.responses import FastJSONResponse, dumps
+from pygridfight.domain.enums import GameStatus
+
+
+def test_dumps_handles_payload_types():
+    created = datetime(2025, 1, 2, 3, 4, 5, tzinfo=UTC)
+    data = json.loads(
+        dumps(
+            {
+                "id": "g1",
+                "status": GameStatus.WAITING,
+                "created_at": created,
+                "players": ["p1"],
+                "finished_at": None,
+            }
+        )
+    )
+    assert data["status"] == "waiting"
+    assert datetime.fromisoformat(data["created_at"]) == created
+    assert data["players"] == ["p1"]
+    assert data["finished_at"] is None
+
+
+def test_fast_json_response_renders_bytes():
+    response = FastJSONResponse({"a": 1}, status_code=201, headers={"ETag": '"x"'})
+    assert response.status_code == 201
+    assert json.loads(response.body) == {"a": 1}
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["etag"] == '"x"'
@@ -0,0 +1,293 @@
+import asyncio
+
+import anyio
+import pytest
+
+from pygridfight.api import protocol
+from pygridfight.api.protocol import BINARY_V1, BinaryClient
+from pygridfight.api.spectators import SpectatorHub
+from pygridfight.api.ticker import GameTicker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent: list[str | bytes] = []
+        self.gate: asyncio.Event | None = None
+        self.closed_with: int | None = None
+
+    async def accept(self, subprotocol: str | None = None):
+        pass
+
+    async def send_text(self, text: str):
+        await self.send(text)
+
+    async def send_bytes(self, data: bytes):
+        await self.send(data)
+
+    async def send(self, data):
+        if self.gate is not None:
+            await self.gate.wait()
+        self.sent.append(data)
+
+    async def close(self, code: int = 1000, reason: str | None = None):
+        self.closed_with = code
+
+
+def state(turn: int, players: int = 2) -> dict:
+    return {
+        "type": "game_state",
+        "game": {
+            "id": "g1",
+            "status": "active",
+            "turn": turn,
+            "players": {
+                f"p{i}": {
+                    "id": f"p{i}",
+                    "display_name": f"P{i}",
+                    "score": turn,
+                    "avatar_ids": [],
+                }
+                for i in range(players)
+            },
+            "avatars": {},
+            "grid": {"width": 10, "height": 10},
+        },
+    }
+
+
+def event(n: int) -> dict:
+    return {"type": "turn_changed", "current_player_id": f"p{n}", "turn_number": n}
+
+
+def make_hub(**kwargs) -> SpectatorHub:
+    options = {"delay": 0, "queue_size": 8, "max_deltas": 16}
+    options.update(kwargs)
+    return SpectatorHub(state_types=["game_state"], **options)
+
+
+async def drain(hub: SpectatorHub, game_id: str = "g1") -> None:
+    await anyio.sleep(0.01)  # let the delayed releases run
+    for queue in hub.channel(game_id).viewers.values():
+        await queue.drained()
+
+
+@pytest.mark.anyio
+async def test_updates_are_encoded_once_and_shared(monkeypatch):
+    compiled = []
+    real_compile = protocol.compile_frame
+    monkeypatch.setattr(
+        protocol, "compile_frame", lambda m: compiled.append(m) or real_compile(m)
+    )
+    hub = make_hub()
+    json_viewers = [FakeWebSocket() for _ in range(3)]
+    binary_viewers = [FakeWebSocket() for _ in range(3)]
+    for socket in json_viewers:
+        await hub.join(socket, "g1")
+    for socket in binary_viewers:
+        await hub.join(socket, "g1", protocol=BINARY_V1)
+
+    hub.publish(state(1), "g1")
+    await drain(hub)
+
+    assert len(compiled) == 1
+    texts = [socket.sent[0] for socket in json_viewers]
+    frames = [socket.sent[0] for socket in binary_viewers]
+    assert all(text is texts[0] for text in texts)
+    assert all(frame is frames[0] for frame in frames)
+    assert BinaryClient().decode(frames[0]) == state(1)
+
+
+@pytest.mark.anyio
+async def test_mid_game_join_starts_from_keyframe_and_deltas():
+    hub = make_hub()
+    early = FakeWebSocket()
+    await hub.join(early, "g1", protocol=BINARY_V1)
+    for message in (state(1), event(1), state(2, players=3), event(2), event(3)):
+        hub.publish(message, "g1")
+    await drain(hub)
+
+    late = FakeWebSocket()
+    await hub.join(late, "g1", protocol=BINARY_V1)
+    hub.publish(event(4), "g1")
+    await drain(hub)
+
+    client = BinaryClient()
+    assert [client.decode(frame) for frame in late.sent] == [
+        state(2, players=3),
+        event(2),
+        event(3),
+        event(4),
+    ]
+    assert late.sent[-1] is early.sent[-1]
+
+
+@pytest.mark.anyio
+async def test_lagging_viewer_skips_to_latest_keyframe():
+    hub = make_hub(queue_size=3)
+    slow = FakeWebSocket()
+    slow.gate = asyncio.Event()
+    await hub.join(slow, "g1", protocol=BINARY_V1)
+
+    hub.publish(state(1), "g1")
+    await anyio.lowlevel.checkpoint()
+    await anyio.lowlevel.checkpoint()  # the writer is now blocked sending state 1
+    for n in range(1, 6):
+        hub.publish(event(n), "g1")
+    hub.publish(state(2), "g1")
+    hub.publish(event(6), "g1")
+    await anyio.lowlevel.checkpoint()
+    slow.gate.set()
+    await drain(hub)
+
+    client = BinaryClient()
+    received = [client.decode(frame) for frame in slow.sent]
+    assert received[0] == state(1)
+    assert received[-2:] == [state(2), event(6)]
+    assert len(received) < 8
+
+
+@pytest.mark.anyio
+async def test_join_after_more_deltas_than_fit_in_the_queue():
+    hub = make_hub(queue_size=8, max_deltas=64)
+    hub.publish(state(1), "g1")
+    for n in range(1, 21):
+        hub.publish(event(n), "g1")
+    await anyio.sleep(0.01)
+
+    late = FakeWebSocket()
+    await hub.join(late, "g1")
+    await drain(hub)
+
+    assert late.closed_with is None
+    assert hub.viewers("g1") == 1
+    assert len(late.sent) == 8  # the keyframe and the 7 deltas kept
+
+
+@pytest.mark.anyio
+async def test_full_viewer_is_not_resynced_when_the_deltas_do_not_fit():
+    hub = make_hub(queue_size=4)
+    slow = FakeWebSocket()
+    slow.gate = asyncio.Event()
+    await hub.join(slow, "g1", protocol=BINARY_V1)
+
+    hub.publish(state(1), "g1")
+    await anyio.lowlevel.checkpoint()
+    await anyio.lowlevel.checkpoint()  # the writer is now blocked sending state 1
+    for n in range(1, 6):
+        hub.publish(event(n), "g1")
+    await anyio.lowlevel.checkpoint()
+    slow.gate.set()
+    await drain(hub)
+
+    client = BinaryClient()
+    received = [client.decode(frame) for frame in slow.sent]
+    assert received == [state(1)] + [event(n) for n in range(1, 6)]
+
+
+@pytest.mark.anyio
+async def test_delay_holds_updates_back():
+    hub = make_hub(delay=0.05)
+    viewer = FakeWebSocket()
+    await hub.join(viewer, "g1")
+
+    hub.publish(event(1), "g1")
+    await anyio.sleep(0.01)
+    assert viewer.sent == []
+
+    await anyio.sleep(0.06)
+    await drain(hub)
+    assert len(viewer.sent) == 1
+
+
+@pytest.mark.anyio
+async def test_ended_game_channel_is_dropped_when_last_viewer_leaves():
+    hub = make_hub()
+    viewer_id, _ = await hub.join(FakeWebSocket(), "g1")
+    hub.publish({"type": "game_ended", "game_id": "g1", "reason": "won"}, "g1")
+    await drain(hub)
+
+    assert hub.viewers("g1") == 1
+    hub.leave("g1", viewer_id)
+    assert hub.channel("g1") is None
+
+
+@pytest.mark.anyio
+async def test_quiet_channel_is_dropped_when_last_viewer_leaves():
+    clock = FakeClock()
+    hub = make_hub(channel_ttl=60, clock=clock)
+    viewer_id, _ = await hub.join(FakeWebSocket(), "g1")
+    hub.publish(state(1), "g1")
+    await drain(hub)
+
+    clock.now += 30
+    other_id, _ = await hub.join(FakeWebSocket(), "g1")
+    hub.leave("g1", viewer_id)
+    assert hub.channel("g1") is not None  # still watched
+
+    clock.now += 30
+    hub.leave("g1", other_id)
+    assert hub.channel("g1") is None
+
+
+@pytest.mark.anyio
+async def test_unwatched_channels_are_swept_once_quiet():
+    clock = FakeClock()
+    hub = make_hub(channel_ttl=60, clock=clock)
+    hub.publish(state(1), "old")
+    await anyio.sleep(0.01)
+
+    clock.now += 59
+    hub.publish(state(1), "live")
+    await anyio.sleep(0.01)
+    assert hub.channel("old") is not None
+
+    clock.now += 1
+    hub.publish(state(2), "live")
+    await anyio.sleep(0.01)
+    assert hub.channel("old") is None
+    assert hub.channel("live") is not None
+
+
+@pytest.mark.anyio
+async def test_discard_disconnects_viewers():
+    hub = make_hub()
+    viewer = FakeWebSocket()
+    await hub.join(viewer, "g1")
+
+    hub.discard("g1")
+    await anyio.sleep(0.01)
+
+    assert hub.channel("g1") is None
+    assert viewer.closed_with == 1000
+
+
+@pytest.mark.anyio
+async def test_ticker_hands_updates_over_without_fanning_out():
+    class RecordingManager:
+        def __init__(self):
+            self.sent = []
+
+        def queue_broadcast(self, message, game_id):
+            self.sent.append(message)
+            return 1
+
+    hub = make_hub()
+    viewer = FakeWebSocket()
+    await hub.join(viewer, "g1")
+    manager = RecordingManager()
+    ticker = GameTicker(manager, interval=0, spectators=hub)
+
+    ticker.publish(state(1), "g1")
+    assert manager.sent == [state(1)]
+    assert len(hub.channel("g1").viewers["spectator-1"]) == 0
+
+    await drain(hub)
+    assert len(viewer.sent) == 1
@@ -0,0 +1,103 @@
+import anyio
+import pytest
+
+from pygridfight.api.ticker import GameTicker
+
+
+class RecordingManager:
+    replay = None
+    interest = None
+
+    def __init__(self):
+        self.sent: list[tuple[str, dict]] = []
+
+    def queue_broadcast(self, message: dict, game_id: str) -> int:
+        self.sent.append((game_id, message))
+        return 1
+
+
+def make_ticker(interval: float = 0.02) -> tuple[GameTicker, RecordingManager]:
+    manager = RecordingManager()
+    ticker = GameTicker(
+        manager,
+        interval=interval,
+        state_types=["game_state"],
+        urgent_types=["error", "game_ended"],
+    )
+    return ticker, manager
+
+
+def state(turn: int) -> dict:
+    return {"type": "game_state", "turn": turn}
+
+
+@pytest.mark.anyio
+async def test_state_changes_within_a_tick_are_merged():
+    ticker, manager = make_ticker()
+
+    ticker.publish(state(1), "g1")
+    ticker.publish({"type": "turn_changed", "turn_number": 1}, "g1")
+    ticker.publish(state(2), "g1")
+    ticker.publish({"type": "action_result", "n": 1}, "g1")
+    ticker.publish(state(3), "g1")
+    ticker.publish(state(9), "g2")
+    assert manager.sent == []
+    assert ticker.pending("g1") == 3
+
+    await anyio.sleep(0.05)
+
+    assert manager.sent == [
+        ("g1", {"type": "turn_changed", "turn_number": 1}),
+        ("g1", {"type": "action_result", "n": 1}),
+        ("g1", state(3)),
+        ("g2", state(9)),
+    ]
+    assert ticker.pending("g1") == 0
+
+
+@pytest.mark.anyio
+async def test_each_tick_starts_with_the_first_message():
+    ticker, manager = make_ticker()
+
+    ticker.publish(state(1), "g1")
+    await anyio.sleep(0.05)
+    ticker.publish(state(2), "g1")
+    assert manager.sent == [("g1", state(1))]
+
+    await anyio.sleep(0.05)
+    assert manager.sent == [("g1", state(1)), ("g1", state(2))]
+
+
+@pytest.mark.anyio
+async def test_urgent_messages_bypass_the_tick_in_order():
+    ticker, manager = make_ticker(interval=60)
+
+    ticker.publish(state(1), "g1")
+    ticker.publish({"type": "game_ended", "game_id": "g1"}, "g1")
+
+    assert manager.sent == [
+        ("g1", state(1)),
+        ("g1", {"type": "game_ended", "game_id": "g1"}),
+    ]
+    assert ticker.pending("g1") == 0
+
+
+@pytest.mark.anyio
+async def test_zero_interval_sends_immediately():
+    ticker, manager = make_ticker(interval=0)
+
+    ticker.publish(state(1), "g1")
+    ticker.publish(state(2), "g1")
+
+    assert manager.sent == [("g1", state(1)), ("g1", state(2))]
+
+
+@pytest.mark.anyio
+async def test_discard_drops_pending_messages():
+    ticker, manager = make_ticker()
+
+    ticker.publish(state(1), "g1")
+    ticker.discard("g1")
+    await anyio.sleep(0.05)
+
+    assert manager.sent == []
@@ -0,0 +1,165 @@
+import anyio
+import pytest
+
+from pygridfight.api.schemas.actions import ActionType
+from pygridfight.api.ticker import GameTicker
+from pygridfight.services.turn_timer import TurnTimers
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_timers(**kwargs) -> tuple[TurnTimers, FakeClock, list]:
+    clock = FakeClock()
+    expired = []
+    kwargs.setdefault("resolution", 1.0)
+    timers = TurnTimers(
+        timeout=30.0,
+        on_expire=lambda *args: expired.append(args),
+        clock=clock,
+        **kwargs,
+    )
+    return timers, clock, expired
+
+
+def test_expired_turns_are_ended_for_the_player():
+    timers, clock, expired = make_timers()
+    timers.start("g1", "p1", 1)
+    timers.start("g2", "p2", 4, timeout=10.0)
+
+    clock.now += 10
+    assert [(g, t) for g, t, _ in timers.expire()] == [("g2", 4)]
+    clock.now += 20
+    timers.expire()
+
+    assert [(g, t, a.player_id) for g, t, a in expired] == [
+        ("g2", 4, "p2"),
+        ("g1", 1, "p1"),
+    ]
+    assert expired[0][2].type == ActionType.END_TURN
+    assert len(timers) == 0
+
+
+def test_new_turn_replaces_the_deadline():
+    timers, clock, expired = make_timers()
+    timers.start("g1", "p1", 1)
+    clock.now += 20
+    timers.start("g1", "p2", 2)
+
+    clock.now += 15
+    assert timers.expire() == []
+    assert timers.deadline("g1") == 150.0
+    clock.now += 15
+    timers.expire()
+    assert [(g, t) for g, t, _ in expired] == [("g1", 2)]
+
+
+def test_cancelled_deadlines_never_fire():
+    timers, clock, expired = make_timers()
+    timers.start("g1", "p1", 1)
+
+    assert timers.cancel("g1")
+    assert not timers.cancel("g1")
+    clock.now += 60
+    assert timers.expire() == []
+    assert expired == []
+
+
+def test_deadlines_are_rounded_up_to_the_resolution():
+    timers, clock, _ = make_timers(resolution=4.0)
+    clock.now = 101.0
+
+    assert timers.start("g1", "p1", 1) == 132.0
+    clock.now = 131.9
+    assert timers.expire() == []
+    clock.now = 132.0
+    assert len(timers.expire()) == 1
+
+
+def test_expiry_is_limited_per_call():
+    timers, clock, expired = make_timers()
+    for index in range(5):
+        timers.start(f"g{index}", "p1", 1)
+    clock.now += 30
+
+    assert len(timers.expire(limit=2)) == 2
+    assert len(timers.expire(limit=2)) == 2
+    assert len(timers.expire(limit=2)) == 1
+    assert len(expired) == 5
+    assert len(timers) == 0 and timers._buckets == {}
+
+
+def test_failing_handler_does_not_stop_expiry():
+    clock = FakeClock()
+
+    def fail(game_id, turn, action):
+        raise RuntimeError("boom")
+
+    timers = TurnTimers(timeout=1.0, on_expire=fail, resolution=1.0, clock=clock)
+    timers.start("g1", "p1", 1)
+    timers.start("g2", "p2", 1)
+    clock.now += 1
+
+    assert len(timers.expire()) == 2
+
+
+@pytest.mark.anyio
+async def test_timer_fires_on_the_event_loop():
+    expired = []
+    timers = TurnTimers(
+        timeout=0.05,
+        on_expire=lambda *args: expired.append(args),
+        resolution=0.001,
+        batch_size=1,
+    )
+    timers.start("g1", "p1", 1)
+    timers.start("g2", "p2", 1, timeout=0.01)
+    timers.start("g3", "p3", 1, timeout=0.03)
+    timers.cancel("g3")
+
+    await anyio.sleep(0.03)
+    assert [g for g, _, _ in expired] == ["g2"]
+    await anyio.sleep(0.05)
+    assert [g for g, _, _ in expired] == ["g2", "g1"]
+    timers.close()
+
+
+@pytest.mark.anyio
+async def test_timer_ends_a_burst_in_batches():
+    expired = []
+    timers = TurnTimers(
+        timeout=0.01,
+        on_expire=lambda *args: expired.append(args),
+        resolution=0.001,
+        batch_size=2,
+    )
+    for index in range(5):
+        timers.start(f"g{index}", "p1", 1)
+
+    await anyio.sleep(0.05)
+    assert len(expired) == 5
+    assert len(timers) == 0
+    timers.close()
+
+
+@pytest.mark.anyio
+async def test_ticker_keeps_deadlines_up_to_date():
+    class RecordingManager:
+        def queue_broadcast(self, message: dict, game_id: str) -> int:
+            return 1
+
+    timers, _, _ = make_timers()
+    ticker = GameTicker(RecordingManager(), interval=0, turn_timers=timers)
+
+    ticker.publish(
+        {"type": "turn_changed", "current_player_id": "p1", "turn_number": 3}, "g1"
+    )
+    assert timers.deadline("g1") == 130.0
+    ticker.publish({"type": "game_ended"}, "g1")
+    assert timers.deadline("g1") is None
+    timers.close()